@@ -0,0 +1,303 @@
+"""Asyncio Playwright engine for running EduPage scenarios concurrently in one process."""
+
+import asyncio
+import inspect
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import FrameLocator, Locator, Page, async_playwright
+
+from edu_page_automat.auth_manager import AsyncAuthManager, SessionRequiredError
+from edu_page_automat.execution_profile import ExecutionProfile, get_execution_profile
+from edu_page_automat.logging_config import setup_logging
+from edu_page_automat.playwright_browsers import is_missing_browser_error, missing_browser_message
+from edu_page_automat.request_blocking import (
+    RequestBlockingPolicy,
+    get_request_blocking,
+    install_request_blocking_async,
+)
+from edu_page_automat.scenario_runner import (
+    _AUTO_WAIT_ACTION_STATES,
+    _NAVIGATION_METHODS,
+    _PLAYWRIGHT_AUTO_WAIT_ACTIONS,
+    DEFAULT_WAIT_TIMEOUT,
+    ScenarioJobResult,
+    ScenarioRunnerError,
+    _report_spans,
+)
+from edu_page_automat.tracing import SpanRecorder, get_trace_output
+
+DEFAULT_CONCURRENCY = 4
+
+logger = setup_logging()
+
+
+def _wrap_result(result: Any, timeout: Optional[float]):
+    """Wrap async Playwright locator-like return values with auto-wait proxies."""
+    if isinstance(result, Locator):
+        return AsyncAutoWaitLocator(result, timeout)
+    if isinstance(result, FrameLocator):
+        return AsyncAutoWaitFrameLocator(result, timeout)
+    return result
+
+
+def _delegate(proxy, target, item: str, timeout: Optional[float]):
+    """Return `target.item`, caching a result-wrapping method wrapper on the proxy instance.
+
+    Coroutine methods get an async wrapper that awaits them before wrapping
+    the result.
+    """
+    attr = getattr(target, item)
+    if not callable(attr):
+        return attr
+    if inspect.iscoroutinefunction(attr):
+        async def wrapper(*args, **kwargs):
+            return _wrap_result(await attr(*args, **kwargs), timeout)
+    else:
+        def wrapper(*args, **kwargs):
+            return _wrap_result(attr(*args, **kwargs), timeout)
+
+    proxy.__dict__[item] = wrapper
+    return wrapper
+
+
+def _locator_action(name: str, state: str):
+    """Build the async proxy method for a locator action, like the sync runner's `_locator_action`."""
+    if name in _PLAYWRIGHT_AUTO_WAIT_ACTIONS:
+        async def action(self, *args, **kwargs):
+            return _wrap_result(await getattr(self._locator, name)(*args, **kwargs), self._timeout)
+    else:
+        async def action(self, *args, **kwargs):
+            locator = self._locator
+            logger.debug("Waiting for locator {} before {}", locator, name)
+            await locator.wait_for(state=state, timeout=self._timeout)
+            return _wrap_result(await getattr(locator, name)(*args, **kwargs), self._timeout)
+
+    action.__name__ = action.__qualname__ = name
+    action.__doc__ = f"Await `Locator.{name}` on the wrapped locator."
+    return action
+
+
+class AsyncAutoWaitLocator:
+    """Async locator proxy that waits for element readiness before actions Playwright does not auto-wait for."""
+
+    def __init__(self, locator: Locator, timeout: Optional[float]):
+        """Store the wrapped locator and default wait timeout."""
+        self._locator = locator
+        self._timeout = timeout
+
+    @property
+    def __class__(self):
+        """Preserve Playwright class identity for wrapped locators."""
+        return self._locator.__class__
+
+    def __getattr__(self, item):
+        """Delegate locator attributes and wrap methods that return locators."""
+        return _delegate(self, self._locator, item, self._timeout)
+
+    def unwrap(self) -> Locator:
+        """Return the underlying Playwright locator."""
+        return self._locator
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the wrapped locator."""
+        return f"AsyncAutoWaitLocator({self._locator!r})"
+
+
+for _name, _state in _AUTO_WAIT_ACTION_STATES.items():
+    setattr(AsyncAutoWaitLocator, _name, _locator_action(_name, _state))
+
+
+class AsyncAutoWaitFrameLocator:
+    """Async FrameLocator proxy that wraps returned locators with auto wait."""
+
+    def __init__(self, frame_locator: FrameLocator, timeout: Optional[float]):
+        """Store the wrapped frame locator and default wait timeout."""
+        self._frame_locator = frame_locator
+        self._timeout = timeout
+
+    @property
+    def __class__(self):
+        """Preserve Playwright class identity for wrapped frame locators."""
+        return self._frame_locator.__class__
+
+    def __getattr__(self, item):
+        """Delegate frame locator attributes and wrap returned locators."""
+        return _delegate(self, self._frame_locator, item, self._timeout)
+
+    def unwrap(self) -> FrameLocator:
+        """Return the underlying Playwright frame locator."""
+        return self._frame_locator
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the wrapped frame locator."""
+        return f"AsyncAutoWaitFrameLocator({self._frame_locator!r})"
+
+
+def _navigation_method(name: str):
+    """Build the async page proxy method that runs the first-navigation hook after a navigation."""
+
+    async def navigate(self, *args, **kwargs):
+        page = self._page
+        result = await getattr(page, name)(*args, **kwargs)
+        on_first_navigation = self._on_first_navigation
+        if on_first_navigation is not None:
+            self._on_first_navigation = None
+            on_first_navigation(page)
+        return _wrap_result(result, self._timeout)
+
+    navigate.__name__ = navigate.__qualname__ = name
+    navigate.__doc__ = f"Await `Page.{name}` and run the first-navigation hook once."
+    return navigate
+
+
+class AsyncAutoWaitPage:
+    """Async page proxy that ensures locators wait for readiness before interactions."""
+
+    def __init__(self, page: Page, timeout: Optional[float], on_first_navigation=None):
+        """Store the wrapped page, default wait timeout, and optional first-navigation hook."""
+        self._page = page
+        self._timeout = timeout
+        self._on_first_navigation = on_first_navigation
+
+    @property
+    def __class__(self):
+        """Preserve Playwright class identity for wrapped pages."""
+        return self._page.__class__
+
+    def __getattr__(self, item):
+        """Delegate page attributes and wrap returned locators, awaiting coroutine methods."""
+        return _delegate(self, self._page, item, self._timeout)
+
+    def unwrap(self) -> Page:
+        """Return the underlying Playwright page."""
+        return self._page
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the wrapped page."""
+        return f"AsyncAutoWaitPage({self._page!r})"
+
+
+for _name in _NAVIGATION_METHODS:
+    setattr(AsyncAutoWaitPage, _name, _navigation_method(_name))
+
+
+async def run_scenario_async(
+    scenario_factory: Callable[[], Any],
+    *,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    profile: ExecutionProfile | None = None,
+    trace_out: Path | None = None,
+    request_blocking: RequestBlockingPolicy | None = None,
+):
+    """Run one async scenario with the stored session and return the finished scenario.
+
+    The scenario error is re-raised; a missing or expired session raises
+    `ScenarioRunnerError` because the async engine never opens the login form.
+    """
+    [result] = await run_scenarios_async(
+        [scenario_factory],
+        concurrency=1,
+        wait_timeout=wait_timeout,
+        profile=profile,
+        trace_out=trace_out,
+        request_blocking=request_blocking,
+    )
+    if not result.ok:
+        raise result.error
+    return result.scenario
+
+
+async def run_scenarios_async(
+    scenario_factories: list[Callable[[], Any]],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    profile: ExecutionProfile | None = None,
+    trace_out: Path | None = None,
+    request_blocking: RequestBlockingPolicy | None = None,
+) -> list[ScenarioJobResult]:
+    """Run async scenarios concurrently on one browser, each in its own context.
+
+    The stored session is validated once; at most `concurrency` contexts are
+    open at a time. A failing scenario does not stop the others; results are
+    returned in job order with the error of each failed job.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    profile = profile or get_execution_profile()
+    request_blocking = request_blocking or get_request_blocking()
+    trace_out = trace_out or get_trace_output()
+    recorder = SpanRecorder()
+    try:
+        async with async_playwright() as playwright:
+            auth = AsyncAuthManager(playwright, profile)
+            try:
+                with recorder.span("open_session", category="runner"):
+                    await auth.ensure_session()
+                    browser = await auth.launch_browser()
+            except SessionRequiredError as exc:
+                raise ScenarioRunnerError(str(exc)) from exc
+            except PlaywrightError as exc:
+                if is_missing_browser_error(exc):
+                    raise ScenarioRunnerError(missing_browser_message()) from exc
+                raise
+
+            semaphore = asyncio.Semaphore(concurrency)
+            try:
+                return list(
+                    await asyncio.gather(
+                        *(
+                            _run_job(index, factory, auth, browser, semaphore, wait_timeout, recorder, request_blocking)
+                            for index, factory in enumerate(scenario_factories)
+                        )
+                    )
+                )
+            finally:
+                with recorder.span("close", category="runner"):
+                    await browser.close()
+    finally:
+        _report_spans(recorder, trace_out)
+
+
+async def _run_job(
+    index: int,
+    factory,
+    auth: AsyncAuthManager,
+    browser,
+    semaphore: asyncio.Semaphore,
+    wait_timeout: float,
+    recorder: SpanRecorder,
+    request_blocking: RequestBlockingPolicy,
+) -> ScenarioJobResult:
+    """Run one async scenario in a fresh context once a concurrency slot is free."""
+    async with semaphore:
+        scenario = None
+        context = None
+        try:
+            context = await auth.new_context(browser)
+            request_stats = await install_request_blocking_async(context, request_blocking)
+            page = await context.new_page()
+            page.set_default_timeout(wait_timeout)
+            page.set_default_navigation_timeout(wait_timeout)
+
+            scenario = factory()
+            scenario.span_recorder = recorder
+            scenario_name = scenario.__class__.__name__
+            logger.info("Running scenario {} (job {})", scenario_name, index + 1)
+            on_first_navigation = auth.confirm_session if auth.session_probe_pending else None
+            with recorder.span("run", category="runner", scenario=scenario_name, job=index + 1):
+                await scenario.run(AsyncAutoWaitPage(page, wait_timeout, on_first_navigation))
+        except SessionRequiredError as exc:
+            return ScenarioJobResult(index, scenario, ScenarioRunnerError(str(exc)))
+        except Exception as exc:
+            logger.exception("Scenario job {} failed", index + 1)
+            return ScenarioJobResult(index, scenario, exc)
+        finally:
+            if context is not None:
+                await context.close()
+        if request_blocking.enabled:
+            logger.info("Request blocking: {}", request_stats.format_summary())
+        logger.info("Scenario {} completed (job {})", scenario_name, index + 1)
+        return ScenarioJobResult(index, scenario)
@@ -1,52 +1,214 @@
 """Session management for EduPage Playwright contexts."""
 
+import asyncio
+
 from playwright.sync_api import Playwright
 
 from edu_page_automat.auth_storage import get_auth_file_path
+from edu_page_automat.browser_daemon import async_connect_or_launch, connect_or_launch, get_daemon_state_path
+from edu_page_automat.edupage_site import get_user_page_url
+from edu_page_automat.execution_profile import ExecutionProfile, get_execution_profile
 from edu_page_automat.logging_config import setup_logging
+from edu_page_automat.session_cache import (
+    get_session_cache_path,
+    get_session_ttl,
+    invalidate_session_validation,
+    is_session_recently_validated,
+    record_session_validation,
+)
+from edu_page_automat.session_probe import probe_session, start_session_probe
 from edu_page_automat.setup_login import run as setup_login
 
 AUTH_FILE = get_auth_file_path()
+DAEMON_STATE_FILE = get_daemon_state_path()
+SESSION_CACHE_FILE = get_session_cache_path()
 logger = setup_logging()
 
+
+class SessionExpiredError(RuntimeError):
+    """Raised when a session trusted from the validation cache turns out to be logged out."""
+
+
+class SessionRequiredError(RuntimeError):
+    """Raised when a non-interactive run has no valid stored session to use."""
+
 class AuthManager:
     """Create authenticated Playwright contexts for EduPage scenarios."""
 
-    def __init__(self, playwright: Playwright):
-        """Store the Playwright driver used to launch browsers."""
+    def __init__(self, playwright: Playwright, profile: ExecutionProfile | None = None):
+        """Store the Playwright driver and the execution profile used to launch browsers."""
         self.playwright = playwright
+        self.profile = profile or get_execution_profile()
+        self.session_probe_pending = False
 
     def has_session(self) -> bool:
         """Return whether a stored EduPage session file is available."""
         return AUTH_FILE.exists()
 
-    def try_open_session(self, headless=False, slow_mo=200):
-        """Try to open and validate the stored EduPage session."""
+    def try_open_session(
+        self,
+        headless: bool | None = None,
+        slow_mo: float | None = None,
+        *,
+        trust_cache: bool = True,
+    ):
+        """Try to open and validate the stored EduPage session.
+
+        With `trust_cache`, a session validated within the TTL is opened without
+        a probe and confirmed on the first scenario navigation instead. A
+        rejected session returns `(False, browser, None)` with the launched
+        browser still open, so `login` can reuse it instead of launching again.
+        """
         if not self.has_session():
             logger.debug("No stored session found")
             return False, None, None
 
-        browser = self.playwright.firefox.launch(headless=headless, slow_mo=slow_mo)
+        profile = self.profile.with_overrides(headless=headless, slow_mo=slow_mo)
+        cached = trust_cache and is_session_recently_validated(SESSION_CACHE_FILE, AUTH_FILE, get_session_ttl())
+        probe = None if cached else start_session_probe(AUTH_FILE, get_user_page_url())
+        browser = connect_or_launch(self.playwright, profile, DAEMON_STATE_FILE)
         context = browser.new_context(storage_state=str(AUTH_FILE))
-        page = context.new_page()
-        page.goto("https://1itg.edupage.org/user/")
+        if cached:
+            logger.debug("Stored session validated recently; deferring check to the first navigation")
+            self.session_probe_pending = True
+            return True, browser, context
+
+        logged_in = probe.result()
+        if logged_in is None:
+            logger.debug("HTTP session probe was inconclusive; validating with page navigation")
+            page = context.new_page()
+            page.goto(get_user_page_url())
+            logged_in = "login" not in page.url
 
-        logged_in = "login" not in page.url
         if not logged_in:
             logger.debug("Stored session invalid, discarding")
+            invalidate_session_validation(SESSION_CACHE_FILE)
             context.close()
-            browser.close()
-            return False, None, None
+            return False, browser, None
 
         logger.debug("Stored session validated")
+        record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
         return True, browser, context
 
+    def confirm_session(self, page) -> None:
+        """Use the first scenario navigation to confirm a session trusted from the cache."""
+        if not self.session_probe_pending:
+            return
+        self.session_probe_pending = False
+        if "login" in page.url:
+            logger.debug("Cached session validation was stale; discarding")
+            invalidate_session_validation(SESSION_CACHE_FILE)
+            raise SessionExpiredError("Stored EduPage session expired")
+        record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
+
     def new_context(self):
         """Return a valid authenticated `(browser, context)` pair."""
-        valid, browser, context = self.try_open_session(headless=False, slow_mo=200)
+        valid, browser, context = self.try_open_session(headless=self.profile.headless, slow_mo=self.profile.slow_mo)
         if valid:
             logger.info("Reusing existing EduPage session")
             return browser, context
 
+        return self.login(browser)
+
+    def ensure_session(self) -> None:
+        """Make sure the stored session is valid before several contexts share it.
+
+        The validation cache is not trusted here: the contexts opened from the
+        stored session have no first-navigation check that could log in again,
+        so the session is always confirmed by the HTTP probe, or by a page
+        navigation when the probe is inconclusive. A browser is only launched in
+        that case or when a login is needed.
+        """
+        if self.has_session():
+            logged_in = probe_session(AUTH_FILE, get_user_page_url())
+            if logged_in:
+                logger.debug("Stored session validated by HTTP probe")
+                record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
+                return
+            if logged_in is False:
+                invalidate_session_validation(SESSION_CACHE_FILE)
+                browser, context = self.login()
+            else:
+                valid, browser, context = self.try_open_session(
+                    headless=self.profile.headless,
+                    slow_mo=self.profile.slow_mo,
+                    trust_cache=False,
+                )
+                if not valid:
+                    browser, context = self.login(browser)
+        else:
+            browser, context = self.login()
+        context.close()
+        browser.close()
+
+    def open_stored_context(self):
+        """Return a `(browser, context)` pair using the stored session without validating it again."""
+        browser = connect_or_launch(self.playwright, self.profile, DAEMON_STATE_FILE)
+        return browser, browser.new_context(storage_state=str(AUTH_FILE))
+
+    def login(self, browser=None):
+        """Perform the interactive login fallback and return a `(browser, context)` pair.
+
+        An already launched `browser` is reused for the login form.
+        """
         logger.info("Session missing or invalid, performing login")
-        return setup_login(self.playwright, auth_file=AUTH_FILE)
+        self.session_probe_pending = False
+        browser, context = setup_login(self.playwright, browser=browser, auth_file=AUTH_FILE, profile=self.profile)
+        record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
+        return browser, context
+
+
+class AsyncAuthManager:
+    """Open authenticated contexts through the async Playwright API without interactive login.
+
+    The async engine runs where nobody can fill in the login form, so a missing
+    or logged-out session raises `SessionRequiredError` instead of opening the
+    login browser. Run `edupage login` to store a fresh session.
+    """
+
+    def __init__(self, playwright, profile: ExecutionProfile | None = None):
+        """Store the async Playwright driver and the execution profile used to launch browsers."""
+        self.playwright = playwright
+        self.profile = profile or get_execution_profile()
+        self.session_probe_pending = False
+
+    async def ensure_session(self) -> None:
+        """Validate the stored session with the cache or the HTTP probe before contexts use it.
+
+        An inconclusive probe defers the check to the first scenario navigation.
+        """
+        if not AUTH_FILE.exists():
+            raise SessionRequiredError("No stored EduPage session. Run `edupage login` first.")
+        if is_session_recently_validated(SESSION_CACHE_FILE, AUTH_FILE, get_session_ttl()):
+            logger.debug("Stored session validated recently; deferring check to the first navigation")
+            self.session_probe_pending = True
+            return
+
+        logged_in = await asyncio.to_thread(probe_session, AUTH_FILE, get_user_page_url())
+        if logged_in is False:
+            invalidate_session_validation(SESSION_CACHE_FILE)
+            raise SessionRequiredError("Stored EduPage session expired. Run `edupage login` again.")
+        if logged_in:
+            logger.debug("Stored session validated by HTTP probe")
+            record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
+            return
+        logger.debug("HTTP session probe was inconclusive; validating on the first navigation")
+        self.session_probe_pending = True
+
+    async def launch_browser(self):
+        """Attach to the browser daemon or launch Firefox."""
+        return await async_connect_or_launch(self.playwright, self.profile, DAEMON_STATE_FILE)
+
+    async def new_context(self, browser):
+        """Return a new context of `browser` using the stored session."""
+        return await browser.new_context(storage_state=str(AUTH_FILE))
+
+    def confirm_session(self, page) -> None:
+        """Use the first scenario navigation to confirm a session that was not validated up front."""
+        if not self.session_probe_pending:
+            return
+        self.session_probe_pending = False
+        if "login" in page.url:
+            invalidate_session_validation(SESSION_CACHE_FILE)
+            raise SessionRequiredError("Stored EduPage session expired. Run `edupage login` again.")
+        record_session_validation(SESSION_CACHE_FILE, AUTH_FILE)
@@ -1,8 +1,10 @@
 """Filesystem locations for persisted EduPage authentication state."""
 
 import os
-import sys
 from pathlib import Path
+import sys
+import tempfile
+import threading
 
 APP_DIR_NAME = "edu_page_automat"
 AUTH_FILE_NAME = "auth.json"
@@ -25,3 +27,36 @@ def get_auth_file_path() -> Path:
     state_home = os.environ.get("XDG_STATE_HOME")
     base_dir = Path(state_home).expanduser() if state_home else Path.home() / ".local" / "state"
     return base_dir / APP_DIR_NAME / AUTH_FILE_NAME
+
+
+def get_state_file_path(file_name: str) -> Path:
+    """Return the path of an auxiliary state file stored next to the auth file."""
+    return get_auth_file_path().with_name(file_name)
+
+
+_STATE_FILE_LOCKS: dict[str, threading.Lock] = {}
+_STATE_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def state_file_lock(path: Path) -> threading.Lock:
+    """Return the process-wide lock serializing read-modify-write updates of one state file.
+
+    Worker threads of `run_scenarios` update the shared cache files at the same
+    time; holding this lock around read, change, and write keeps one update
+    from dropping another.
+    """
+    with _STATE_FILE_LOCKS_GUARD:
+        return _STATE_FILE_LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def write_state_file(path: Path, text: str) -> None:
+    """Replace a state file atomically, so readers never see a partially written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
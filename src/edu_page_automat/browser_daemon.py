@@ -0,0 +1,161 @@
+"""Long-running Playwright browser server shared by EduPage CLI commands."""
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import TextIO
+
+from edu_page_automat.auth_storage import get_state_file_path
+from edu_page_automat.execution_profile import ExecutionProfile
+from edu_page_automat.logging_config import setup_logging
+from edu_page_automat.playwright_browsers import is_missing_browser_error, missing_browser_message
+
+DAEMON_STATE_FILE_NAME = "browser-daemon.json"
+DAEMON_CONNECT_TIMEOUT = 2_000
+SERVER_OUTPUT_DRAIN_TIMEOUT = 1.0
+
+logger = setup_logging()
+
+
+class BrowserDaemonError(RuntimeError):
+    """User-facing browser daemon startup error."""
+
+
+def get_daemon_state_path() -> Path:
+    """Return the state file advertising the running browser daemon endpoint."""
+    return get_state_file_path(DAEMON_STATE_FILE_NAME)
+
+
+def read_daemon_endpoint(state_path: Path) -> str | None:
+    """Return the advertised browser daemon WebSocket endpoint, if any."""
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    endpoint = state.get("ws_endpoint") if isinstance(state, dict) else None
+    return endpoint or None
+
+
+def _write_daemon_state(state_path: Path, ws_endpoint: str, pid: int, profile: ExecutionProfile) -> None:
+    """Persist the daemon endpoint so other CLI processes can attach to it."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(
+        json.dumps({"ws_endpoint": ws_endpoint, "pid": pid, "headless": profile.headless}),
+        encoding="utf-8",
+    )
+    try:
+        state_path.chmod(0o600)
+    except OSError:
+        pass
+
+
+def _launch_server_command(config_path: Path) -> list[str]:
+    """Return the Playwright CLI command that starts a Firefox browser server."""
+    return [
+        sys.executable,
+        "-m",
+        "playwright",
+        "launch-server",
+        "--browser",
+        "firefox",
+        "--config",
+        str(config_path),
+    ]
+
+
+def _forward_server_output(stream: TextIO) -> None:
+    """Log the browser server's output after its endpoint line until the server closes it.
+
+    Reading keeps the pipe drained; an unread pipe fills with Node and
+    Playwright warnings and then blocks the server on its next write.
+    """
+    for line in stream:
+        line = line.rstrip()
+        if line:
+            logger.warning("Browser server: {}", line)
+
+
+def run_browser_daemon(profile: ExecutionProfile, *, port: int = 0, state_path: Path | None = None) -> None:
+    """Run a Firefox browser server in the foreground until it exits or is interrupted."""
+    state_path = state_path or get_daemon_state_path()
+    with tempfile.TemporaryDirectory(prefix="edupage-daemon-") as temp_dir:
+        config_path = Path(temp_dir) / "launch-server.json"
+        config_path.write_text(
+            json.dumps({"headless": profile.headless, "host": "127.0.0.1", "port": port}),
+            encoding="utf-8",
+        )
+        process = subprocess.Popen(
+            _launch_server_command(config_path),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+
+        ws_endpoint = process.stdout.readline().strip()
+        if not ws_endpoint.startswith("ws"):
+            output = ws_endpoint + process.stdout.read()
+            process.wait()
+            if is_missing_browser_error(RuntimeError(output)):
+                raise BrowserDaemonError(missing_browser_message())
+            raise BrowserDaemonError(f"Playwright browser server did not start: {output.strip()}")
+
+        output_thread = threading.Thread(
+            target=_forward_server_output,
+            args=(process.stdout,),
+            name="browser-daemon-output",
+            daemon=True,
+        )
+        output_thread.start()
+        _write_daemon_state(state_path, ws_endpoint, process.pid, profile)
+        logger.info("Browser daemon listening on {} (pid={})", ws_endpoint, process.pid)
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            logger.info("Stopping browser daemon")
+            process.terminate()
+            process.wait()
+        finally:
+            if read_daemon_endpoint(state_path) == ws_endpoint:
+                state_path.unlink(missing_ok=True)
+            output_thread.join(timeout=SERVER_OUTPUT_DRAIN_TIMEOUT)
+
+
+def connect_or_launch(playwright, profile: ExecutionProfile, state_path: Path):
+    """Attach to the running browser daemon or launch a new Firefox browser."""
+    ws_endpoint = read_daemon_endpoint(state_path)
+    if ws_endpoint:
+        try:
+            browser = playwright.firefox.connect(
+                ws_endpoint,
+                timeout=DAEMON_CONNECT_TIMEOUT,
+                slow_mo=profile.slow_mo,
+            )
+        except Exception as exc:
+            logger.debug("Browser daemon at {} is unavailable ({}); launching Firefox", ws_endpoint, exc)
+        else:
+            logger.debug("Attached to browser daemon at {}", ws_endpoint)
+            return browser
+
+    return playwright.firefox.launch(**profile.launch_options())
+
+
+async def async_connect_or_launch(playwright, profile: ExecutionProfile, state_path: Path):
+    """Attach to the running browser daemon or launch Firefox through the async Playwright API."""
+    ws_endpoint = read_daemon_endpoint(state_path)
+    if ws_endpoint:
+        try:
+            browser = await playwright.firefox.connect(
+                ws_endpoint,
+                timeout=DAEMON_CONNECT_TIMEOUT,
+                slow_mo=profile.slow_mo,
+            )
+        except Exception as exc:
+            logger.debug("Browser daemon at {} is unavailable ({}); launching Firefox", ws_endpoint, exc)
+        else:
+            logger.debug("Attached to browser daemon at {}", ws_endpoint)
+            return browser
+
+    return await playwright.firefox.launch(**profile.launch_options())
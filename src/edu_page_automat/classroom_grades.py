@@ -2,23 +2,11 @@
 
 import csv
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable
 
-EDUPAGE_GRADE_HEADERS = ["jmeno", "prijmeni", "jmeno_ulohy", "pocet_bodu"]
-_CSV_SAMPLE_SIZE = 2048
-
-
-def _normalize_header(header: str) -> str:
-    """Normalize CSV headers for case-insensitive lookup."""
-    return header.strip().casefold().replace(" ", "_").replace("-", "_")
+from edu_page_automat.csv_input import open_csv
 
-
-def _find_header(fieldnames: Sequence[str], accepted_names: set[str], label: str) -> str:
-    """Return the source header matching one of the accepted normalized names."""
-    for fieldname in fieldnames:
-        if _normalize_header(fieldname) in accepted_names:
-            return fieldname
-    raise ValueError(f"CSV header must contain a column for {label}")
+EDUPAGE_GRADE_HEADERS = ["jmeno", "prijmeni", "jmeno_ulohy", "pocet_bodu"]
 
 
 def _split_student_name(student_name: str, row_index: int) -> tuple[str, str]:
@@ -58,46 +46,31 @@ def convert_classroom_grades_csv(
     topic_filter = {topic.strip() for topic in topics if topic.strip()}
     task_filter = {task.strip() for task in tasks if task.strip()}
 
-    with input_csv.open("r", encoding="utf-8", newline="") as input_handle:
-        sample = input_handle.read(_CSV_SAMPLE_SIZE)
-        input_handle.seek(0)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
-        except (csv.Error, TypeError):
-            dialect = csv.excel
-
-        reader = csv.DictReader(input_handle, dialect=dialect)
+    with open_csv(input_csv) as reader:
         if not reader.fieldnames:
             raise ValueError("CSV must include a header")
 
-        student_header = _find_header(reader.fieldnames, {"student"}, "student name")
-        task_header = _find_header(reader.fieldnames, {"task"}, "task name")
-        topic_header = _find_header(reader.fieldnames, {"topic"}, "topic")
-        points_header = _find_header(reader.fieldnames, {"points_earned", "points"}, "points earned")
+        columns = (
+            reader.column({"student"}, "student name"),
+            reader.column({"task"}, "task name"),
+            reader.column({"topic"}, "topic"),
+            reader.column({"points_earned", "points"}, "points earned"),
+        )
 
         output_csv.parent.mkdir(parents=True, exist_ok=True)
         with output_csv.open("w", encoding="utf-8", newline="") as output_handle:
-            writer = csv.DictWriter(output_handle, fieldnames=EDUPAGE_GRADE_HEADERS, lineterminator="\n")
-            writer.writeheader()
+            writer = csv.writer(output_handle, lineterminator="\n")
+            writer.writerow(EDUPAGE_GRADE_HEADERS)
 
             written_rows = 0
-            for row_index, row in enumerate(reader, start=2):
-                task_name = (row.get(task_header) or "").strip()
-                topic_name = (row.get(topic_header) or "").strip()
+            for row_index, (student_name, task_name, topic_name, points) in reader.records(*columns):
                 if task_filter and task_name not in task_filter:
                     continue
                 if topic_filter and topic_name not in topic_filter:
                     continue
 
-                first_name, last_name = _split_student_name((row.get(student_header) or "").strip(), row_index)
-                writer.writerow(
-                    {
-                        "jmeno": first_name,
-                        "prijmeni": last_name,
-                        "jmeno_ulohy": task_name,
-                        "pocet_bodu": _normalize_points(row.get(points_header) or "", row_index),
-                    }
-                )
+                first_name, last_name = _split_student_name(student_name, row_index)
+                writer.writerow((first_name, last_name, task_name, _normalize_points(points, row_index)))
                 written_rows += 1
 
     return written_rows
@@ -1,41 +1,173 @@
 """Command line entry point for EduPage automation scenarios."""
 
+from importlib import import_module
 from pathlib import Path
+import time
 from typing import Annotated
 
-from playwright.sync_api import Error as PlaywrightError
-from playwright.sync_api import sync_playwright
 import typer
+from typer.core import CompletionItem, TyperGroup
 
-from edu_page_automat import setup_login
+from edu_page_automat.auth_storage import get_auth_file_path
+from edu_page_automat.browser_daemon import BrowserDaemonError, get_daemon_state_path, run_browser_daemon
 from edu_page_automat.classroom_grades import convert_classroom_grades_csv
-from edu_page_automat.grade_diff import _default_report_path, write_grade_diff_csv
+from edu_page_automat.edupage_site import set_base_url
+from edu_page_automat.execution_profile import (
+    EXECUTION_PROFILES,
+    ExecutionProfile,
+    get_execution_profile,
+    set_execution_profile,
+)
+from edu_page_automat.grade_diff import DEFAULT_STREAMING_CHUNK_ROWS, _default_report_path, write_grade_diff_csv
+from edu_page_automat.id_cache import clear_id_cache, get_id_cache_path, read_id_cache
+from edu_page_automat.job_file import load_job_file
 from edu_page_automat.logging_config import setup_logging
 from edu_page_automat.playwright_browsers import (
     install_firefox_browser,
     is_missing_browser_error,
     missing_browser_message,
 )
-from edu_page_automat.scenarios.create_task import CreateTaskScenario
-from edu_page_automat.scenarios.export_grades import ExportGradesScenario
-from edu_page_automat.scenarios.fill_grades import FillGradesScenario
+from edu_page_automat.request_blocking import RequestBlockingPolicy, parse_resource_types, set_request_blocking
+from edu_page_automat.tracing import set_trace_output
 
 logger = setup_logging()
-SCENARIOS = [CreateTaskScenario, FillGradesScenario, ExportGradesScenario]
+SCENARIO_COMMANDS = {
+    "create-task": "edu_page_automat.scenarios.create_task:CreateTaskScenario",
+    "fill-grades": "edu_page_automat.scenarios.fill_grades:FillGradesScenario",
+    "export-grades": "edu_page_automat.scenarios.export_grades:ExportGradesScenario",
+    "sync-grades": "edu_page_automat.scenarios.sync_grades:SyncGradesScenario",
+}
+
+
+def load_scenario_class(command_name: str):
+    """Import and return the scenario class registered for a CLI command."""
+    module_name, class_name = SCENARIO_COMMANDS[command_name].split(":", 1)
+    return getattr(import_module(module_name), class_name)
+
+
+class LazyScenarioGroup(TyperGroup):
+    """Typer group that imports scenario modules only when their command runs.
+
+    Scenario modules pull in Playwright through `scenario_runner`, so offline
+    commands and shell completion must not load them.
+    """
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        """Return eager commands followed by not-yet-loaded scenario commands."""
+        commands = super().list_commands(ctx)
+        return commands + [name for name in SCENARIO_COMMANDS if name not in commands]
+
+    def get_command(self, ctx: typer.Context, cmd_name: str):
+        """Return a command, registering its scenario on first use."""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in SCENARIO_COMMANDS:
+            return command
+
+        scenario_app = typer.Typer(add_completion=False)
+        load_scenario_class(cmd_name).register_cli(scenario_app)
+        command = typer.main.get_command(scenario_app)
+        self.add_command(command, cmd_name)
+        return command
+
+    def shell_complete(self, ctx: typer.Context, incomplete: str) -> list[CompletionItem]:
+        """Complete command names without importing scenario modules."""
+        results = []
+        for name in self.list_commands(ctx):
+            if not name.startswith(incomplete):
+                continue
+            command = self.commands.get(name)
+            if command is None:
+                results.append(CompletionItem(name))
+            elif not command.hidden:
+                results.append(CompletionItem(name, help=command.get_short_help_str()))
+        results.extend(super(TyperGroup, self).shell_complete(ctx, incomplete))
+        return results
 
-cli = typer.Typer(help="EduPage automation CLI.")
+
+cli = typer.Typer(cls=LazyScenarioGroup, help="EduPage automation CLI.")
+
+
+@cli.callback()
+def configure_execution(
+    profile_name: Annotated[
+        str | None,
+        typer.Option(
+            "--profile",
+            help=(
+                f"Execution profile ({', '.join(sorted(EXECUTION_PROFILES))}). "
+                "Defaults to EDUPAGE_PROFILE or `debug`."
+            ),
+        ),
+    ] = None,
+    headless: Annotated[
+        bool | None,
+        typer.Option(
+            "--headless/--headed",
+            help="Run Firefox without or with a visible window. Defaults to the execution profile.",
+        ),
+    ] = None,
+    slow_mo: Annotated[
+        float | None,
+        typer.Option("--slow-mo", min=0, help="Delay every Playwright operation by this many milliseconds."),
+    ] = None,
+    base_url: Annotated[
+        str | None,
+        typer.Option("--base-url", help="EduPage site URL. Defaults to EDUPAGE_URL or the school EduPage."),
+    ] = None,
+    trace_out: Annotated[
+        Path | None,
+        typer.Option(
+            "--trace-out",
+            dir_okay=False,
+            help="Write scenario step timings as Chrome trace-event JSON to this file.",
+        ),
+    ] = None,
+    block_resources: Annotated[
+        str | None,
+        typer.Option(
+            "--block-resources",
+            help=(
+                "Comma-separated resource types to abort, or `none`. "
+                "Defaults to EDUPAGE_BLOCK_RESOURCES or `font,image,media`."
+            ),
+        ),
+    ] = None,
+    block_urls: Annotated[
+        list[str] | None,
+        typer.Option("--block-url", help="Additional URL glob pattern to abort. Repeat for multiple patterns."),
+    ] = None,
+):
+    """Apply browser execution settings shared by all browser-backed commands."""
+    try:
+        profile = ExecutionProfile.from_environment(profile_name).with_overrides(headless=headless, slow_mo=slow_mo)
+        set_base_url(base_url)
+        blocking = RequestBlockingPolicy.from_environment().with_overrides(
+            resource_types=parse_resource_types(block_resources) if block_resources is not None else None,
+            extra_url_patterns=tuple(block_urls or ()),
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    set_execution_profile(profile)
+    set_request_blocking(blocking)
+    set_trace_output(trace_out)
 
 
 @cli.command("list")
 def list_commands():
     """List available scenarios."""
-    for scenario_cls in SCENARIOS:
-        typer.echo(scenario_cls.__name__.replace("Scenario", "").lower())
+    for import_path in SCENARIO_COMMANDS.values():
+        class_name = import_path.rsplit(":", 1)[1]
+        typer.echo(class_name.replace("Scenario", "").lower())
 
 
 @cli.command()
 def login():
     """Force a new login and save session."""
+    from playwright.sync_api import Error as PlaywrightError
+    from playwright.sync_api import sync_playwright
+
+    from edu_page_automat import setup_login
+
     with sync_playwright() as playwright:
         try:
             setup_login.run(playwright)
@@ -44,7 +176,55 @@ def login():
                 typer.echo(missing_browser_message(), err=True)
                 raise typer.Exit(code=1) from exc
             raise
-        typer.echo(f"Login complete, session saved to {setup_login.AUTH_FILE}.")
+        typer.echo(f"Login complete, session saved to {get_auth_file_path()}.")
+
+
+@cli.command()
+def daemon(
+    port: Annotated[
+        int,
+        typer.Option("--port", min=0, help="Local port for the browser server. 0 picks a free port."),
+    ] = 0,
+):
+    """Keep a warm Firefox browser running for later EduPage commands."""
+    typer.echo(f"Starting browser daemon; endpoint is advertised in {get_daemon_state_path()}. Press Ctrl+C to stop.")
+    try:
+        run_browser_daemon(get_execution_profile(), port=port)
+    except BrowserDaemonError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1) from exc
+    typer.echo("Browser daemon stopped.")
+
+
+cache_app = typer.Typer(help="Inspect or clear the course id cache used by fill-grades.")
+cli.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("show")
+def show_cache():
+    """Show cached courses with their student and task counts."""
+    cache_path = get_id_cache_path()
+    courses = read_id_cache(cache_path)
+    if not courses:
+        typer.echo(f"No cached course ids in {cache_path}.")
+        return
+    typer.echo(f"Cached course ids in {cache_path}:")
+    for course_ids in sorted(courses.values(), key=lambda course_ids: course_ids.key):
+        updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(course_ids.updated_at))
+        typer.echo(
+            f"{course_ids.class_} / {course_ids.subject} / {course_ids.period}: "
+            f"{len(course_ids.students)} students, {len(course_ids.tasks)} tasks, updated {updated}"
+        )
+
+
+@cache_app.command("clear")
+def clear_cache(
+    class_: Annotated[str | None, typer.Option("--class", help="Only clear courses of this class.")] = None,
+    subject: Annotated[str | None, typer.Option("--subject", help="Only clear courses of this subject.")] = None,
+):
+    """Remove cached course ids so the next fill indexes the grade table again."""
+    removed = clear_id_cache(get_id_cache_path(), class_=class_, subject=subject)
+    typer.echo(f"Removed {removed} cached courses.")
 
 
 @cli.command("install-browsers")
@@ -144,6 +324,22 @@ def diff_grades(
             help="Keep the current EduPage grade when it is higher than the source-of-truth grade. `m` counts as 0.",
         ),
     ] = False,
+    streaming: Annotated[
+        bool,
+        typer.Option(
+            "--streaming",
+            help="Merge-join both CSVs in student-task order with bounded memory. Output rows follow that order.",
+        ),
+    ] = False,
+    chunk_rows: Annotated[
+        int,
+        typer.Option(
+            "--chunk-rows",
+            min=1,
+            help="Rows sorted in memory per spilled run when --streaming has to sort an unsorted CSV.",
+            show_default=True,
+        ),
+    ] = DEFAULT_STREAMING_CHUNK_ROWS,
 ):
     """Write only grade rows that need to be saved to EduPage."""
     try:
@@ -152,6 +348,8 @@ def diff_grades(
             truth_csv,
             output_csv,
             keep_better_current=keep_better_current,
+            streaming=streaming,
+            chunk_rows=chunk_rows,
         )
     except ValueError as exc:
         raise typer.BadParameter(str(exc)) from exc
@@ -165,8 +363,54 @@ def diff_grades(
         f"missing-current={summary.missing_current_rows}, extra-current={summary.extra_current_rows}{report_suffix})"
     )
 
-for scenario_cls in SCENARIOS:
-    scenario_cls.register_cli(cli)
+
+@cli.command("run-jobs")
+def run_jobs(
+    job_file: Annotated[
+        Path,
+        typer.Argument(
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            help="JSON or YAML file listing create-task, fill-grades, and export-grades jobs.",
+        ),
+    ],
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Number of browser contexts running jobs concurrently. 1 runs the jobs in file order.",
+            show_default=True,
+        ),
+    ] = 1,
+):
+    """Run many scenario jobs from a job file in one browser session."""
+    try:
+        jobs = load_job_file(job_file)
+    except (OSError, ValueError) as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    scenarios = []
+    for job in jobs:
+        try:
+            scenarios.append(load_scenario_class(job.command).from_job(job))
+        except (OSError, ValueError) as exc:
+            raise typer.BadParameter(f"{job.label}: {exc}") from exc
+
+    from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenarios
+
+    try:
+        results = run_scenarios([lambda scenario=scenario: scenario for scenario in scenarios], workers=workers)
+    except ScenarioRunnerError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1) from exc
+
+    failures = [f"{jobs[result.index].label}: {result.error}" for result in results if not result.ok]
+    typer.echo(f"Finished {len(jobs) - len(failures)} of {len(jobs)} jobs from {job_file}.")
+    if failures:
+        typer.echo("Failed jobs:\n" + "\n".join(failures), err=True)
+        raise typer.Exit(code=1)
 
 
 def main():
@@ -0,0 +1,70 @@
+"""On-disk catalogue of resolved Známky module URLs per class and subject."""
+
+import json
+from pathlib import Path
+import time
+
+from edu_page_automat.auth_storage import get_state_file_path, state_file_lock, write_state_file
+from edu_page_automat.edupage_site import get_base_url
+
+COURSE_CATALOGUE_FILE_NAME = "course-urls.json"
+
+
+def get_course_catalogue_path() -> Path:
+    """Return the course catalogue path stored next to the auth file."""
+    return get_state_file_path(COURSE_CATALOGUE_FILE_NAME)
+
+
+def _catalogue_key(class_: str, subject: str) -> str:
+    """Return the catalogue key for a class and subject."""
+    return f"{class_}|{subject}"
+
+
+def read_course_catalogue(catalogue_path: Path) -> dict[str, dict]:
+    """Return every catalogue entry, ignoring a missing or malformed file."""
+    try:
+        courses = json.loads(catalogue_path.read_text(encoding="utf-8"))["courses"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    if not isinstance(courses, dict):
+        return {}
+    return {key: entry for key, entry in courses.items() if isinstance(entry, dict) and entry.get("url")}
+
+
+def _write_course_catalogue(catalogue_path: Path, courses: dict[str, dict]) -> None:
+    """Atomically replace the catalogue file with the given entries; callers hold `state_file_lock`."""
+    write_state_file(catalogue_path, json.dumps({"courses": courses}, ensure_ascii=False))
+
+
+def lookup_course_url(catalogue_path: Path, class_: str, subject: str) -> str | None:
+    """Return the recorded Známky URL of a course on the active EduPage site, if any."""
+    entry = read_course_catalogue(catalogue_path).get(_catalogue_key(class_, subject))
+    if entry is None or not str(entry["url"]).startswith(get_base_url()):
+        return None
+    return str(entry["url"])
+
+
+def record_course_url(catalogue_path: Path, class_: str, subject: str, url: str, now: float | None = None) -> None:
+    """Record the Známky URL reached for a course, skipping login or foreign-site URLs."""
+    if "login" in url or not url.startswith(get_base_url()):
+        return
+    with state_file_lock(catalogue_path):
+        courses = read_course_catalogue(catalogue_path)
+        key = _catalogue_key(class_, subject)
+        if courses.get(key, {}).get("url") == url:
+            return
+        courses[key] = {
+            "class": class_,
+            "subject": subject,
+            "url": url,
+            "recorded_at": time.time() if now is None else now,
+        }
+        _write_course_catalogue(catalogue_path, courses)
+
+
+def forget_course_url(catalogue_path: Path, class_: str, subject: str) -> None:
+    """Remove a stale course URL so the next run navigates through the course switcher."""
+    with state_file_lock(catalogue_path):
+        courses = read_course_catalogue(catalogue_path)
+        if courses.pop(_catalogue_key(class_, subject), None) is not None:
+            _write_course_catalogue(catalogue_path, courses)
@@ -0,0 +1,97 @@
+"""Shared reading of input CSV files with sniffed dialects and header columns resolved to indices."""
+
+import csv
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, TextIO
+
+CSV_SAMPLE_SIZE = 2048
+_CSV_DELIMITERS = ",;\t"
+_DIALECT_CACHE_SIZE = 32
+
+# Accepted normalized header names of EduPage-style grade CSV columns.
+FIRST_NAME_HEADERS = {"first_name", "jmeno", "name"}
+LAST_NAME_HEADERS = {"last_name", "prijmeni", "surname"}
+TASK_NAME_HEADERS = {"task_name", "task", "uloha", "jmeno_ulohy", "nazev_ulohy"}
+POINTS_HEADERS = {"points", "point", "score", "body", "pocet_bodu"}
+
+
+def normalize_header(header: str) -> str:
+    """Normalize CSV headers for case-insensitive lookup."""
+    return header.strip().casefold().replace(" ", "_").replace("-", "_")
+
+
+def sniff_dialect(sample: str) -> type[csv.Dialect]:
+    """Return the dialect detected in a CSV sample, falling back to Excel CSV."""
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=_CSV_DELIMITERS)
+    except (csv.Error, TypeError):
+        return csv.excel
+
+
+@lru_cache(maxsize=_DIALECT_CACHE_SIZE)
+def _cached_dialect(path: str, mtime_ns: int, size: int) -> type[csv.Dialect]:
+    """Sniff the dialect of one version of a file; the modification time and size key the cache."""
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        return sniff_dialect(handle.read(CSV_SAMPLE_SIZE))
+
+
+def csv_dialect(csv_path: Path) -> type[csv.Dialect]:
+    """Return the dialect of a CSV file, sniffing it only once per file version."""
+    stat = csv_path.stat()
+    return _cached_dialect(str(csv_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+class CsvInput:
+    """Header and records of one open CSV file.
+
+    Columns are resolved to indices once and records are read as `csv.reader`
+    lists, so no dict is built per row. Like `csv.DictReader`, blank lines are
+    skipped and records are numbered from 2, the line after the header.
+    """
+
+    def __init__(self, handle: TextIO, dialect: type[csv.Dialect] | str = csv.excel):
+        """Read the header row of an open CSV handle."""
+        self._reader = csv.reader(handle, dialect)
+        self.fieldnames: list[str] = next(self._reader, [])
+
+    def find_column(self, accepted_names: set[str]) -> int | None:
+        """Return the index of the first header whose normalized name is accepted, if any."""
+        for fieldname in self.fieldnames:
+            if normalize_header(fieldname) in accepted_names:
+                # A repeated header name reads the last such column, as `csv.DictReader` does.
+                return len(self.fieldnames) - 1 - self.fieldnames[::-1].index(fieldname)
+        return None
+
+    def column(self, accepted_names: set[str], label: str) -> int:
+        """Return the index of a required column, raising `ValueError` when the header lacks it."""
+        index = self.find_column(accepted_names)
+        if index is None:
+            raise ValueError(f"CSV header must contain a column for {label}")
+        return index
+
+    def records(self, *columns: int | None) -> Iterator[tuple[int, tuple[str, ...]]]:
+        """Yield `(row_index, values)` with the stripped cell of each column in `columns`.
+
+        A `None` column and cells missing from a short record read as empty.
+        """
+        last_column = max((column for column in columns if column is not None), default=-1)
+        select = itemgetter(*columns) if len(columns) > 1 and None not in columns else None
+        for row_index, record in enumerate(filter(None, self._reader), start=2):
+            if select is not None and len(record) > last_column:
+                yield row_index, tuple(map(str.strip, select(record)))
+            else:
+                yield row_index, tuple(
+                    record[column].strip() if column is not None and column < len(record) else ""
+                    for column in columns
+                )
+
+
+@contextmanager
+def open_csv(csv_path: Path) -> Iterator[CsvInput]:
+    """Open a UTF-8 CSV file with its sniffed dialect and read its header."""
+    dialect = csv_dialect(csv_path)
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        yield CsvInput(handle, dialect)
@@ -0,0 +1,42 @@
+"""EduPage site address shared by login, session checks, and scenarios."""
+
+import os
+from urllib.parse import urljoin, urlsplit
+
+BASE_URL_ENV_VAR = "EDUPAGE_URL"
+DEFAULT_BASE_URL = "https://1itg.edupage.org/"
+USER_PAGE_PATH = "user/"
+
+_active_base_url: str | None = None
+
+
+def normalize_base_url(url: str) -> str:
+    """Validate an EduPage base URL and return it with a trailing slash."""
+    normalized_url = url.strip()
+    parts = urlsplit(normalized_url)
+    if parts.scheme not in {"http", "https"} or not parts.netloc:
+        raise ValueError(f"EduPage base URL must be an absolute http(s) URL, got '{url}'")
+    return normalized_url if normalized_url.endswith("/") else f"{normalized_url}/"
+
+
+def set_base_url(url: str | None) -> None:
+    """Set the EduPage base URL used in this process, or reset it with `None`."""
+    global _active_base_url
+    _active_base_url = normalize_base_url(url) if url is not None else None
+
+
+def get_base_url() -> str:
+    """Return the active EduPage base URL, falling back to `EDUPAGE_URL` and the school default."""
+    if _active_base_url is not None:
+        return _active_base_url
+    return normalize_base_url(os.environ.get(BASE_URL_ENV_VAR) or DEFAULT_BASE_URL)
+
+
+def edupage_url(path: str = "") -> str:
+    """Return an absolute URL for a path relative to the EduPage base URL."""
+    return urljoin(get_base_url(), path.lstrip("/"))
+
+
+def get_user_page_url() -> str:
+    """Return the signed-in EduPage user page where scenarios start."""
+    return edupage_url(USER_PAGE_PATH)
@@ -0,0 +1,103 @@
+"""Browser execution settings shared by login and scenario commands."""
+
+from dataclasses import dataclass, replace
+import os
+
+PROFILE_ENV_VAR = "EDUPAGE_PROFILE"
+HEADLESS_ENV_VAR = "EDUPAGE_HEADLESS"
+SLOW_MO_ENV_VAR = "EDUPAGE_SLOW_MO"
+DEFAULT_PROFILE_NAME = "debug"
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """Playwright launch settings applied to every browser-backed command."""
+
+    name: str = DEFAULT_PROFILE_NAME
+    headless: bool = False
+    slow_mo: float = 200
+
+    @classmethod
+    def named(cls, name: str) -> "ExecutionProfile":
+        """Return one of the built-in execution profiles."""
+        normalized_name = name.strip().casefold()
+        if normalized_name not in EXECUTION_PROFILES:
+            available = ", ".join(sorted(EXECUTION_PROFILES))
+            raise ValueError(f"Unknown execution profile '{name}'. Available profiles: {available}")
+        return EXECUTION_PROFILES[normalized_name]
+
+    @classmethod
+    def from_environment(cls, profile_name: str | None = None) -> "ExecutionProfile":
+        """Return the execution profile selected by `EDUPAGE_*` environment variables.
+
+        An explicit `profile_name` replaces `EDUPAGE_PROFILE`; `EDUPAGE_HEADLESS`
+        and `EDUPAGE_SLOW_MO` still override the selected profile.
+        """
+        profile = cls.named(profile_name or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE_NAME)
+        return profile.with_overrides(
+            headless=_parse_bool(os.environ.get(HEADLESS_ENV_VAR), HEADLESS_ENV_VAR),
+            slow_mo=_parse_slow_mo(os.environ.get(SLOW_MO_ENV_VAR), SLOW_MO_ENV_VAR),
+        )
+
+    def with_overrides(self, *, headless: bool | None = None, slow_mo: float | None = None) -> "ExecutionProfile":
+        """Return a copy with explicitly provided launch settings replaced."""
+        profile = self
+        if headless is not None:
+            profile = replace(profile, headless=headless)
+        if slow_mo is not None:
+            if slow_mo < 0:
+                raise ValueError("Slow motion delay must not be negative")
+            profile = replace(profile, slow_mo=slow_mo)
+        return profile
+
+    def launch_options(self) -> dict[str, bool | float]:
+        """Return keyword arguments for `BrowserType.launch`."""
+        return {"headless": self.headless, "slow_mo": self.slow_mo}
+
+
+EXECUTION_PROFILES = {
+    "debug": ExecutionProfile(name="debug", headless=False, slow_mo=200),
+    "fast": ExecutionProfile(name="fast", headless=True, slow_mo=0),
+}
+
+_active_profile: ExecutionProfile | None = None
+
+
+def _parse_bool(value: str | None, label: str) -> bool | None:
+    """Parse an optional boolean environment value."""
+    if value is None or not value.strip():
+        return None
+    normalized_value = value.strip().casefold()
+    if normalized_value in _TRUE_VALUES:
+        return True
+    if normalized_value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{label} must be one of: {', '.join(sorted(_TRUE_VALUES | _FALSE_VALUES))}")
+
+
+def _parse_slow_mo(value: str | None, label: str) -> float | None:
+    """Parse an optional non-negative slow motion delay in milliseconds."""
+    if value is None or not value.strip():
+        return None
+    try:
+        slow_mo = float(value)
+    except ValueError as exc:
+        raise ValueError(f"{label} must be a number of milliseconds") from exc
+    if slow_mo < 0:
+        raise ValueError(f"{label} must not be negative")
+    return slow_mo
+
+
+def set_execution_profile(profile: ExecutionProfile | None) -> None:
+    """Set the profile used by browser commands in this process, or reset it with `None`."""
+    global _active_profile
+    _active_profile = profile
+
+
+def get_execution_profile() -> ExecutionProfile:
+    """Return the active execution profile, falling back to the environment."""
+    if _active_profile is not None:
+        return _active_profile
+    return ExecutionProfile.from_environment()
@@ -0,0 +1,80 @@
+"""Append-only journal of grade cells saved by chunked `fill-grades` runs."""
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+from edu_page_automat.auth_storage import get_state_file_path
+from edu_page_automat.id_cache import course_key
+
+FILL_JOURNAL_FILE_NAME = "fill-journal.jsonl"
+
+SavedCell = tuple[str, str, str]
+
+
+def get_fill_journal_path() -> Path:
+    """Return the fill journal path stored next to the auth file."""
+    return get_state_file_path(FILL_JOURNAL_FILE_NAME)
+
+
+def _read_records(journal_path: Path) -> list[dict]:
+    """Return every well-formed journal record, skipping a torn last line or other malformed lines."""
+    try:
+        lines = journal_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and isinstance(record.get("course"), str):
+            records.append(record)
+    return records
+
+
+def read_saved_cells(journal_path: Path, class_: str, subject: str, period: str) -> set[SavedCell]:
+    """Return the `(student, task, points)` cells journalled as saved for one course."""
+    key = course_key(class_, subject, period)
+    return {
+        (str(record.get("student", "")), str(record.get("task", "")), str(record.get("points", "")))
+        for record in _read_records(journal_path)
+        if record["course"] == key
+    }
+
+
+def record_saved_cells(journal_path: Path, class_: str, subject: str, period: str, cells: Iterable[SavedCell]) -> None:
+    """Append cells confirmed as saved for one course to the journal."""
+    key = course_key(class_, subject, period)
+    lines = [
+        json.dumps({"course": key, "student": student, "task": task, "points": points}, ensure_ascii=False)
+        for student, task, points in cells
+    ]
+    if not lines:
+        return
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with journal_path.open("a+b") as handle:
+        # Start on a fresh line when an interrupted write left a torn last record.
+        if handle.tell():
+            handle.seek(-1, 2)
+            if handle.read(1) != b"\n":
+                lines.insert(0, "")
+        handle.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def clear_saved_cells(journal_path: Path, class_: str, subject: str, period: str) -> None:
+    """Remove one course's journalled cells, deleting the journal when nothing else is left."""
+    records = _read_records(journal_path)
+    key = course_key(class_, subject, period)
+    kept = [record for record in records if record["course"] != key]
+    if len(kept) == len(records):
+        return
+    if not kept:
+        journal_path.unlink(missing_ok=True)
+        return
+    journal_path.write_text(
+        "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in kept),
+        encoding="utf-8",
+    )
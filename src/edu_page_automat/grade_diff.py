@@ -1,10 +1,23 @@
 """Create fillable grade CSV diffs between EduPage export and source-of-truth CSV files."""
 
 import csv
-from dataclasses import dataclass
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+import heapq
 from pathlib import Path
 import re
-from typing import Sequence, TextIO
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator, Sequence
+
+from edu_page_automat.csv_input import (
+    FIRST_NAME_HEADERS,
+    LAST_NAME_HEADERS,
+    POINTS_HEADERS,
+    TASK_NAME_HEADERS,
+    CsvInput,
+    open_csv,
+)
 
 EDUPAGE_DIFF_HEADERS = ["jmeno", "prijmeni", "jmeno_ulohy", "pocet_bodu"]
 KEPT_CURRENT_REPORT_HEADERS = [
@@ -14,23 +27,36 @@ KEPT_CURRENT_REPORT_HEADERS = [
     "soucasny_pocet_bodu",
     "pozadovany_pocet_bodu",
 ]
-_CSV_SAMPLE_SIZE = 2048
+DEFAULT_STREAMING_CHUNK_ROWS = 100_000
 _POINTS_WITH_MAX_PATTERN = re.compile(r"^(?P<value>m|\d+)\s*[·•]\s*\d+$", re.IGNORECASE)
+_EMPTY_TARGET = "empty-target"
+_EQUAL = "equal"
+_KEPT_CURRENT = "kept-current"
+_CHANGED = "changed"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GradeRow:
-    """Normalized grade row keyed by student and task."""
+    """Normalized grade row keyed by student and task.
+
+    Names are interned, so the rows of one export share a single string per
+    student and task, and the `(first name, last name, task name)` comparison
+    `key` is built once per row.
+    """
 
     first_name: str
     last_name: str
     task_name: str
     points: str
+    key: tuple[str, str, str] = field(init=False, repr=False, compare=False)
 
-    @property
-    def key(self) -> tuple[str, str, str]:
-        """Return the stable comparison key for one student-task grade."""
-        return (self.first_name, self.last_name, self.task_name)
+    def __post_init__(self):
+        """Intern the student and task names and store the comparison key."""
+        key = (sys.intern(self.first_name), sys.intern(self.last_name), sys.intern(self.task_name))
+        object.__setattr__(self, "first_name", key[0])
+        object.__setattr__(self, "last_name", key[1])
+        object.__setattr__(self, "task_name", key[2])
+        object.__setattr__(self, "key", key)
 
     def as_edupage_row(self) -> dict[str, str]:
         """Return the row in the CSV shape accepted by `fill-grades`."""
@@ -54,7 +80,7 @@ class GradeDiffSummary:
     extra_current_rows: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class KeptCurrentGradeRow:
     """Row describing a better current EduPage grade that was preserved."""
 
@@ -64,6 +90,17 @@ class KeptCurrentGradeRow:
     current_points: str
     truth_points: str
 
+    @classmethod
+    def from_rows(cls, current_row: GradeRow, truth_row: GradeRow) -> "KeptCurrentGradeRow":
+        """Build the report row for a truth grade that lost to a better current grade."""
+        return cls(
+            first_name=truth_row.first_name,
+            last_name=truth_row.last_name,
+            task_name=truth_row.task_name,
+            current_points=current_row.points,
+            truth_points=truth_row.points,
+        )
+
     def as_report_row(self) -> dict[str, str]:
         """Return the row in the CSV shape used by the kept-current report."""
         return {
@@ -75,22 +112,13 @@ class KeptCurrentGradeRow:
         }
 
 
-def _normalize_header(header: str) -> str:
-    """Normalize CSV headers for case-insensitive lookup."""
-    return header.strip().casefold().replace(" ", "_").replace("-", "_")
-
-
-def _find_header(fieldnames: Sequence[str], accepted_names: set[str], label: str) -> str:
-    """Return the source header matching one of the accepted normalized names."""
-    for fieldname in fieldnames:
-        if _normalize_header(fieldname) in accepted_names:
-            return fieldname
-    raise ValueError(f"CSV header must contain a column for {label}")
-
+@dataclass(frozen=True)
+class GradeDiff:
+    """In-memory result of comparing current EduPage grades with source-of-truth grades."""
 
-def _has_header(fieldnames: Sequence[str], accepted_names: set[str]) -> bool:
-    """Return whether fieldnames include one of the accepted normalized names."""
-    return any(_normalize_header(fieldname) in accepted_names for fieldname in fieldnames)
+    rows: list[GradeRow]
+    kept_current_rows: list[KeptCurrentGradeRow]
+    summary: GradeDiffSummary
 
 
 def _split_student_name(student_name: str, row_index: int) -> tuple[str, str]:
@@ -116,22 +144,20 @@ def _normalize_points(points: str, row_index: int, *, empty_value: str = "") ->
     raise ValueError(f"Row {row_index}: points must be a whole number, m, or empty")
 
 
-def _csv_reader(handle: TextIO) -> csv.DictReader:
-    """Return a DictReader using the detected CSV dialect."""
-    sample = handle.read(_CSV_SAMPLE_SIZE)
-    handle.seek(0)
-    try:
-        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
-    except (csv.Error, TypeError):
-        dialect = csv.excel
-    return csv.DictReader(handle, dialect=dialect)
-
-
-def _points_to_score(points: str) -> int:
-    """Convert a normalized grade value to a comparable numeric score."""
+def _points_to_score(points: str) -> int | None:
+    """Convert a normalized grade value to a comparable numeric score, or `None` without one."""
     if points == "m":
         return 0
-    return int(points)
+    if points.isdecimal():
+        return int(points)
+    return None
+
+
+def _is_better_current(current_points: str, truth_points: str) -> bool:
+    """Return whether the current grade scores higher than the source-of-truth grade."""
+    current_score = _points_to_score(current_points)
+    truth_score = _points_to_score(truth_points)
+    return current_score is not None and truth_score is not None and current_score > truth_score
 
 
 def _default_report_path(output_csv: Path) -> Path:
@@ -139,7 +165,7 @@ def _default_report_path(output_csv: Path) -> Path:
     return output_csv.with_name(f"{output_csv.stem}-kept-current{output_csv.suffix}")
 
 
-def _write_kept_current_report(report_path: Path, rows: list[KeptCurrentGradeRow]) -> None:
+def write_kept_current_report(report_path: Path, rows: list[KeptCurrentGradeRow]) -> None:
     """Write the kept-current grade report CSV."""
     report_path.parent.mkdir(parents=True, exist_ok=True)
     with report_path.open("w", encoding="utf-8", newline="") as report_handle:
@@ -149,90 +175,96 @@ def _write_kept_current_report(report_path: Path, rows: list[KeptCurrentGradeRow
             writer.writerow(row.as_report_row())
 
 
-def _validate_unique_row(grade_row: GradeRow, row_index: int, seen_keys: set[tuple[str, str, str]]) -> None:
-    """Validate a normalized grade row and update the duplicate guard."""
+def _validate_row(grade_row: GradeRow, row_index: int) -> None:
+    """Reject a normalized grade row without a student or task name."""
     if not grade_row.first_name:
         raise ValueError(f"Row {row_index}: missing first name")
     if not grade_row.last_name:
         raise ValueError(f"Row {row_index}: missing last name")
     if not grade_row.task_name:
         raise ValueError(f"Row {row_index}: missing task name")
+
+
+def _duplicate_grade_error(grade_row: GradeRow, row_index: int) -> ValueError:
+    """Return the error raised for a second grade of the same student and task."""
+    return ValueError(
+        f"Row {row_index}: duplicate grade for {grade_row.first_name} "
+        f"{grade_row.last_name} in task {grade_row.task_name}"
+    )
+
+
+def _validate_unique_row(grade_row: GradeRow, row_index: int, seen_keys: set[tuple[str, str, str]]) -> None:
+    """Validate a normalized grade row and update the duplicate guard."""
+    _validate_row(grade_row, row_index)
     if grade_row.key in seen_keys:
-        raise ValueError(
-            f"Row {row_index}: duplicate grade for {grade_row.first_name} "
-            f"{grade_row.last_name} in task {grade_row.task_name}"
-        )
+        raise _duplicate_grade_error(grade_row, row_index)
     seen_keys.add(grade_row.key)
 
 
-def _load_classroom_grade_rows(reader: csv.DictReader) -> list[GradeRow]:
-    """Load normalized grade rows from a raw Google Classroom export."""
-    if not reader.fieldnames:
-        raise ValueError("CSV must include a header")
-
-    student_header = _find_header(reader.fieldnames, {"student"}, "student name")
-    task_name_header = _find_header(reader.fieldnames, {"task"}, "task name")
-    points_header = _find_header(reader.fieldnames, {"points_earned", "points"}, "points earned")
+def _read_classroom_grade_rows(reader: CsvInput) -> Iterator[tuple[int, GradeRow]]:
+    """Yield validated grade rows of a raw Google Classroom export with their row numbers."""
+    columns = (
+        reader.column({"student"}, "student name"),
+        reader.column({"task"}, "task name"),
+        reader.column({"points_earned", "points"}, "points earned"),
+    )
 
-    rows: list[GradeRow] = []
-    seen_keys: set[tuple[str, str, str]] = set()
-    for row_index, row in enumerate(reader, start=2):
-        first_name, last_name = _split_student_name((row.get(student_header) or "").strip(), row_index)
+    for row_index, (student_name, task_name, points) in reader.records(*columns):
+        first_name, last_name = _split_student_name(student_name, row_index)
         grade_row = GradeRow(
             first_name=first_name,
             last_name=last_name,
-            task_name=(row.get(task_name_header) or "").strip(),
-            points=_normalize_points(row.get(points_header) or "", row_index, empty_value="m"),
+            task_name=task_name,
+            points=_normalize_points(points, row_index, empty_value="m"),
         )
-        _validate_unique_row(grade_row, row_index, seen_keys)
-        rows.append(grade_row)
-
-    return rows
-
+        _validate_row(grade_row, row_index)
+        yield row_index, grade_row
 
-def _load_edupage_grade_rows(reader: csv.DictReader) -> list[GradeRow]:
-    """Load normalized grade rows from a Czech or English EduPage-style CSV."""
-    if not reader.fieldnames:
-        raise ValueError("CSV must include a header")
 
-    first_name_header = _find_header(reader.fieldnames, {"first_name", "jmeno", "name"}, "first name")
-    last_name_header = _find_header(reader.fieldnames, {"last_name", "prijmeni", "surname"}, "last name")
-    task_name_header = _find_header(
-        reader.fieldnames,
-        {"task_name", "task", "uloha", "jmeno_ulohy", "nazev_ulohy"},
-        "task name",
+def _read_edupage_grade_rows(reader: CsvInput) -> Iterator[tuple[int, GradeRow]]:
+    """Yield validated grade rows of a Czech or English EduPage-style CSV with their row numbers."""
+    columns = (
+        reader.column(FIRST_NAME_HEADERS, "first name"),
+        reader.column(LAST_NAME_HEADERS, "last name"),
+        reader.column(TASK_NAME_HEADERS, "task name"),
+        reader.column(POINTS_HEADERS, "points"),
     )
-    points_header = _find_header(reader.fieldnames, {"points", "point", "score", "body", "pocet_bodu"}, "points")
 
-    rows: list[GradeRow] = []
-    seen_keys: set[tuple[str, str, str]] = set()
-    for row_index, row in enumerate(reader, start=2):
+    for row_index, (first_name, last_name, task_name, points) in reader.records(*columns):
         grade_row = GradeRow(
-            first_name=(row.get(first_name_header) or "").strip(),
-            last_name=(row.get(last_name_header) or "").strip(),
-            task_name=(row.get(task_name_header) or "").strip(),
-            points=_normalize_points(row.get(points_header) or "", row_index),
+            first_name=first_name,
+            last_name=last_name,
+            task_name=task_name,
+            points=_normalize_points(points, row_index),
         )
-        _validate_unique_row(grade_row, row_index, seen_keys)
-        rows.append(grade_row)
+        _validate_row(grade_row, row_index)
+        yield row_index, grade_row
 
-    return rows
 
-
-def _load_grade_rows(csv_path: Path) -> list[GradeRow]:
-    """Load normalized grade rows from an EduPage-style or Google Classroom CSV."""
+@contextmanager
+def _open_grade_rows(csv_path: Path) -> Iterator[Iterator[tuple[int, GradeRow]]]:
+    """Open an EduPage-style or Google Classroom CSV and yield its numbered grade rows, file order."""
     if not csv_path.exists():
         raise ValueError(f"CSV file {csv_path} does not exist")
 
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = _csv_reader(handle)
+    with open_csv(csv_path) as reader:
         if not reader.fieldnames:
             raise ValueError("CSV must include a header")
 
-        if _has_header(reader.fieldnames, {"student"}):
-            rows = _load_classroom_grade_rows(reader)
+        if reader.find_column({"student"}) is not None:
+            yield _read_classroom_grade_rows(reader)
         else:
-            rows = _load_edupage_grade_rows(reader)
+            yield _read_edupage_grade_rows(reader)
+
+
+def load_grade_rows(csv_path: Path) -> list[GradeRow]:
+    """Load normalized grade rows from an EduPage-style or Google Classroom CSV."""
+    rows: list[GradeRow] = []
+    seen_keys: set[tuple[str, str, str]] = set()
+    with _open_grade_rows(csv_path) as grade_rows:
+        for row_index, grade_row in grade_rows:
+            _validate_unique_row(grade_row, row_index, seen_keys)
+            rows.append(grade_row)
 
     if not rows:
         raise ValueError("CSV file did not contain any grade rows")
@@ -240,66 +272,110 @@ def _load_grade_rows(csv_path: Path) -> list[GradeRow]:
     return rows
 
 
-def write_grade_diff_csv(
-    current_csv: Path,
-    truth_csv: Path,
-    output_csv: Path,
+def _diff_outcome(current_points: str, truth_points: str, keep_better_current: bool) -> str:
+    """Classify a student-task grade present in both files as empty-target, equal, kept-current, or changed."""
+    if not truth_points:
+        return _EMPTY_TARGET
+    if current_points == truth_points:
+        return _EQUAL
+    if keep_better_current and _is_better_current(current_points, truth_points):
+        return _KEPT_CURRENT
+    return _CHANGED
+
+
+def diff_grade_rows(
+    current_rows: Iterable[GradeRow],
+    truth_rows: Sequence[GradeRow],
     *,
     keep_better_current: bool = False,
-    kept_current_report_csv: Path | None = None,
-) -> GradeDiffSummary:
-    """Write rows whose truth grade should be saved to EduPage.
+) -> GradeDiff:
+    """Return the truth rows whose grade should be saved to EduPage.
 
-    The generated CSV contains only rows present in both files where the source
-    value is non-empty and differs from the current EduPage value. Source files
-    may use EduPage-style grade headers or raw Google Classroom export headers.
+    A truth row is kept when the same student and task exist in the current
+    rows, its value is non-empty, and it differs from the current value. With
+    `keep_better_current`, a higher current grade is preserved and reported
+    instead; `m` counts as 0 and values without a score are never better.
     """
-    current_rows = _load_grade_rows(current_csv)
-    truth_rows = _load_grade_rows(truth_csv)
     current_by_key = {row.key: row for row in current_rows}
     truth_keys = {row.key for row in truth_rows}
 
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
-    written_rows = 0
+    rows: list[GradeRow] = []
     equal_rows = 0
     skipped_empty_target_rows = 0
-    kept_better_current_rows = 0
     missing_current_rows = 0
     kept_current_rows: list[KeptCurrentGradeRow] = []
 
-    with output_csv.open("w", encoding="utf-8", newline="") as output_handle:
-        writer = csv.DictWriter(output_handle, fieldnames=EDUPAGE_DIFF_HEADERS, lineterminator="\n")
-        writer.writeheader()
+    for truth_row in truth_rows:
+        current_row = current_by_key.get(truth_row.key)
+        if current_row is None:
+            missing_current_rows += 1
+            continue
+        outcome = _diff_outcome(current_row.points, truth_row.points, keep_better_current)
+        if outcome == _EMPTY_TARGET:
+            skipped_empty_target_rows += 1
+        elif outcome == _EQUAL:
+            equal_rows += 1
+        elif outcome == _KEPT_CURRENT:
+            kept_current_rows.append(KeptCurrentGradeRow.from_rows(current_row, truth_row))
+        else:
+            rows.append(truth_row)
+
+    return GradeDiff(
+        rows=rows,
+        kept_current_rows=kept_current_rows,
+        summary=GradeDiffSummary(
+            written_rows=len(rows),
+            equal_rows=equal_rows,
+            skipped_empty_target_rows=skipped_empty_target_rows,
+            kept_better_current_rows=len(kept_current_rows),
+            missing_current_rows=missing_current_rows,
+            extra_current_rows=len(current_by_key.keys() - truth_keys),
+        ),
+    )
 
-        for truth_row in truth_rows:
-            current_row = current_by_key.get(truth_row.key)
-            if current_row is None:
-                missing_current_rows += 1
-                continue
-            if not truth_row.points:
-                skipped_empty_target_rows += 1
-                continue
-            if current_row.points == truth_row.points:
-                equal_rows += 1
-                continue
-            if keep_better_current and _points_to_score(current_row.points) > _points_to_score(truth_row.points):
-                kept_better_current_rows += 1
-                kept_current_rows.append(
-                    KeptCurrentGradeRow(
-                        first_name=truth_row.first_name,
-                        last_name=truth_row.last_name,
-                        task_name=truth_row.task_name,
-                        current_points=current_row.points,
-                        truth_points=truth_row.points,
-                    )
-                )
-                continue
 
-            writer.writerow(truth_row.as_edupage_row())
+def _merge_grade_diff(
+    current_rows: Iterable[GradeRow],
+    truth_rows: Iterable[GradeRow],
+    *,
+    keep_better_current: bool,
+    on_row: Callable[[GradeRow], None],
+    on_kept_current: Callable[[KeptCurrentGradeRow], None],
+) -> GradeDiffSummary:
+    """Merge-join two key-sorted grade row streams with the `diff_grade_rows` rules in one pass.
+
+    Truth rows to save go to `on_row` and preserved better current grades to
+    `on_kept_current`, both in key order; the summary counts match
+    `diff_grade_rows` on the same rows.
+    """
+    current = iter(current_rows)
+    current_row = next(current, None)
+    written_rows = equal_rows = skipped_empty_target_rows = kept_better_current_rows = 0
+    missing_current_rows = extra_current_rows = 0
+
+    for truth_row in truth_rows:
+        while current_row is not None and current_row.key < truth_row.key:
+            extra_current_rows += 1
+            current_row = next(current, None)
+        if current_row is None or current_row.key != truth_row.key:
+            missing_current_rows += 1
+            continue
+
+        outcome = _diff_outcome(current_row.points, truth_row.points, keep_better_current)
+        if outcome == _EMPTY_TARGET:
+            skipped_empty_target_rows += 1
+        elif outcome == _EQUAL:
+            equal_rows += 1
+        elif outcome == _KEPT_CURRENT:
+            kept_better_current_rows += 1
+            on_kept_current(KeptCurrentGradeRow.from_rows(current_row, truth_row))
+        else:
             written_rows += 1
+            on_row(truth_row)
+        current_row = next(current, None)
 
-    if keep_better_current:
-        _write_kept_current_report(kept_current_report_csv or _default_report_path(output_csv), kept_current_rows)
+    if current_row is not None:
+        extra_current_rows += 1 + sum(1 for _ in current)
 
     return GradeDiffSummary(
         written_rows=written_rows,
@@ -307,5 +383,202 @@ def write_grade_diff_csv(
         skipped_empty_target_rows=skipped_empty_target_rows,
         kept_better_current_rows=kept_better_current_rows,
         missing_current_rows=missing_current_rows,
-        extra_current_rows=len({row.key for row in current_rows} - truth_keys),
+        extra_current_rows=extra_current_rows,
     )
+
+
+def _sort_key(item: tuple[int, GradeRow]) -> tuple[tuple[str, str, str], int]:
+    """Order numbered grade rows by student-task key, then by row number."""
+    return item[1].key, item[0]
+
+
+def _rows_are_sorted(csv_path: Path) -> bool:
+    """Return whether a grade CSV is already ordered by student-task key.
+
+    The scan stops at the first row out of order. A sorted file is fully
+    validated on the way, including duplicate keys, which are adjacent in it.
+    """
+    previous_key = None
+    with _open_grade_rows(csv_path) as grade_rows:
+        for row_index, grade_row in grade_rows:
+            if previous_key is not None:
+                if grade_row.key < previous_key:
+                    return False
+                if grade_row.key == previous_key:
+                    raise _duplicate_grade_error(grade_row, row_index)
+            previous_key = grade_row.key
+
+    if previous_key is None:
+        raise ValueError("CSV file did not contain any grade rows")
+    return True
+
+
+def _spill_run(run_path: Path, run: list[tuple[int, GradeRow]]) -> Path:
+    """Write one sorted run of numbered grade rows to a temporary CSV file."""
+    with run_path.open("w", encoding="utf-8", newline="") as handle:
+        csv.writer(handle, lineterminator="\n").writerows(
+            (row_index, row.first_name, row.last_name, row.task_name, row.points) for row_index, row in run
+        )
+    return run_path
+
+
+def _read_run(run_path: Path) -> Iterator[tuple[int, GradeRow]]:
+    """Yield the numbered grade rows of a spilled run."""
+    with run_path.open("r", encoding="utf-8", newline="") as handle:
+        for row_index, first_name, last_name, task_name, points in csv.reader(handle):
+            yield int(row_index), GradeRow(first_name, last_name, task_name, points)
+
+
+def _external_sort(csv_path: Path, chunk_rows: int, spill_dir: Path) -> Iterator[tuple[int, GradeRow]]:
+    """Return the numbered grade rows of a CSV file sorted by key, holding one run of `chunk_rows` rows at a time.
+
+    Full runs are sorted and spilled to `spill_dir`, then merged lazily.
+    """
+    run_dir = Path(tempfile.mkdtemp(prefix=f"{csv_path.stem}-", dir=spill_dir))
+    run_paths: list[Path] = []
+    run: list[tuple[int, GradeRow]] = []
+    with _open_grade_rows(csv_path) as grade_rows:
+        for item in grade_rows:
+            run.append(item)
+            if len(run) >= chunk_rows:
+                run.sort(key=_sort_key)
+                run_paths.append(_spill_run(run_dir / f"run-{len(run_paths)}.csv", run))
+                run = []
+
+    if not run and not run_paths:
+        raise ValueError("CSV file did not contain any grade rows")
+    run.sort(key=_sort_key)
+    if not run_paths:
+        return iter(run)
+    if run:
+        run_paths.append(_spill_run(run_dir / f"run-{len(run_paths)}.csv", run))
+    return heapq.merge(*(_read_run(run_path) for run_path in run_paths), key=_sort_key)
+
+
+def _sorted_grade_rows(csv_path: Path, chunk_rows: int, spill_dir: Path) -> Iterator[GradeRow]:
+    """Yield the grade rows of a CSV file ordered by student-task key, rejecting duplicate keys.
+
+    A file that is already sorted is streamed as it is; other files are sorted
+    externally in runs of `chunk_rows` rows.
+    """
+    if _rows_are_sorted(csv_path):
+        with _open_grade_rows(csv_path) as grade_rows:
+            for _, grade_row in grade_rows:
+                yield grade_row
+        return
+
+    previous_key = None
+    for row_index, grade_row in _external_sort(csv_path, chunk_rows, spill_dir):
+        if grade_row.key == previous_key:
+            raise _duplicate_grade_error(grade_row, row_index)
+        previous_key = grade_row.key
+        yield grade_row
+
+
+def _partial_path(path: Path) -> Path:
+    """Return the hidden sibling file a streaming diff writes before replacing `path`."""
+    return path.with_name(f".{path.name}.partial")
+
+
+def _write_streaming_grade_diff_csv(
+    current_csv: Path,
+    truth_csv: Path,
+    output_csv: Path,
+    *,
+    keep_better_current: bool,
+    kept_current_report_csv: Path | None,
+    chunk_rows: int,
+) -> GradeDiffSummary:
+    """Write the grade diff by merge-joining both files sorted by key, holding at most one run per file in memory.
+
+    The output files are written next to their targets and only replace them
+    once the whole diff succeeded.
+    """
+    if chunk_rows < 1:
+        raise ValueError("Streaming chunk size must be at least 1 row")
+    report_csv = (kept_current_report_csv or _default_report_path(output_csv)) if keep_better_current else None
+    targets = [output_csv] if report_csv is None else [output_csv, report_csv]
+    for target in targets:
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="edupage-grade-diff-") as spill_dir, ExitStack() as stack:
+            writer = csv.DictWriter(
+                stack.enter_context(_partial_path(output_csv).open("w", encoding="utf-8", newline="")),
+                fieldnames=EDUPAGE_DIFF_HEADERS,
+                lineterminator="\n",
+            )
+            writer.writeheader()
+            report_writer = None
+            if report_csv is not None:
+                report_writer = csv.DictWriter(
+                    stack.enter_context(_partial_path(report_csv).open("w", encoding="utf-8", newline="")),
+                    fieldnames=KEPT_CURRENT_REPORT_HEADERS,
+                    lineterminator="\n",
+                )
+                report_writer.writeheader()
+
+            summary = _merge_grade_diff(
+                _sorted_grade_rows(current_csv, chunk_rows, Path(spill_dir)),
+                _sorted_grade_rows(truth_csv, chunk_rows, Path(spill_dir)),
+                keep_better_current=keep_better_current,
+                on_row=lambda row: writer.writerow(row.as_edupage_row()),
+                on_kept_current=lambda row: report_writer.writerow(row.as_report_row()),
+            )
+    except BaseException:
+        for target in targets:
+            _partial_path(target).unlink(missing_ok=True)
+        raise
+
+    for target in targets:
+        _partial_path(target).replace(target)
+    return summary
+
+
+def write_grade_diff_csv(
+    current_csv: Path,
+    truth_csv: Path,
+    output_csv: Path,
+    *,
+    keep_better_current: bool = False,
+    kept_current_report_csv: Path | None = None,
+    streaming: bool = False,
+    chunk_rows: int = DEFAULT_STREAMING_CHUNK_ROWS,
+) -> GradeDiffSummary:
+    """Write rows whose truth grade should be saved to EduPage.
+
+    The generated CSV contains only rows present in both files where the source
+    value is non-empty and differs from the current EduPage value. Source files
+    may use EduPage-style grade headers or raw Google Classroom export headers.
+    With `streaming`, both files are merge-joined in student-task key order
+    with bounded memory: sorted files are read as they are, others are sorted
+    externally in runs of `chunk_rows` rows. The summary is the same, but the
+    output rows follow key order instead of truth file order.
+    """
+    if streaming:
+        return _write_streaming_grade_diff_csv(
+            current_csv,
+            truth_csv,
+            output_csv,
+            keep_better_current=keep_better_current,
+            kept_current_report_csv=kept_current_report_csv,
+            chunk_rows=chunk_rows,
+        )
+
+    diff = diff_grade_rows(
+        load_grade_rows(current_csv),
+        load_grade_rows(truth_csv),
+        keep_better_current=keep_better_current,
+    )
+
+    output_csv.parent.mkdir(parents=True, exist_ok=True)
+    with output_csv.open("w", encoding="utf-8", newline="") as output_handle:
+        writer = csv.DictWriter(output_handle, fieldnames=EDUPAGE_DIFF_HEADERS, lineterminator="\n")
+        writer.writeheader()
+        for row in diff.rows:
+            writer.writerow(row.as_edupage_row())
+
+    if keep_better_current:
+        write_kept_current_report(kept_current_report_csv or _default_report_path(output_csv), diff.kept_current_rows)
+
+    return diff.summary
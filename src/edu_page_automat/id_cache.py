@@ -0,0 +1,172 @@
+"""On-disk cache of grade-table student and task identifiers per course and grading period."""
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import time
+from typing import Iterable
+
+from edu_page_automat.auth_storage import get_state_file_path, state_file_lock, write_state_file
+
+ID_CACHE_FILE_NAME = "course-ids.json"
+
+
+@dataclass(frozen=True)
+class CourseIds:
+    """Student ids and task identifiers of one course grade table, keyed by display name.
+
+    `student_count` and `task_count` describe the table shape when the ids were
+    recorded, so a table with added or removed rows or columns is detected.
+    """
+
+    class_: str
+    subject: str
+    period: str
+    students: dict[str, str]
+    tasks: dict[str, tuple[str, str]]
+    student_count: int
+    task_count: int
+    updated_at: float
+
+    @property
+    def key(self) -> str:
+        """Return the cache key of this course."""
+        return course_key(self.class_, self.subject, self.period)
+
+    def missing_names(self, student_names: Iterable[str], task_names: Iterable[str]) -> list[str]:
+        """Return the requested student and task names that have no cached id."""
+        missing = [name for name in dict.fromkeys(student_names) if name not in self.students]
+        missing.extend(name for name in dict.fromkeys(task_names) if name not in self.tasks)
+        return missing
+
+    def matches_shape(self, student_count: int, task_count: int) -> bool:
+        """Return whether the live grade table still has the recorded number of students and tasks."""
+        return self.student_count == student_count and self.task_count == task_count
+
+    def to_payload(self) -> dict:
+        """Return the JSON representation stored in the cache file."""
+        return {
+            "class": self.class_,
+            "subject": self.subject,
+            "period": self.period,
+            "students": self.students,
+            "tasks": {name: list(identifiers) for name, identifiers in self.tasks.items()},
+            "student_count": self.student_count,
+            "task_count": self.task_count,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "CourseIds":
+        """Build cached course ids from their JSON representation."""
+        return cls(
+            class_=str(payload["class"]),
+            subject=str(payload["subject"]),
+            period=str(payload["period"]),
+            students={str(name): str(student_id) for name, student_id in payload["students"].items()},
+            tasks={str(name): (str(subject_id), str(task_uid)) for name, (subject_id, task_uid) in payload["tasks"].items()},
+            student_count=int(payload["student_count"]),
+            task_count=int(payload["task_count"]),
+            updated_at=float(payload["updated_at"]),
+        )
+
+
+def course_key(class_: str, subject: str, period: str) -> str:
+    """Return the cache key for a class, subject, and grading period."""
+    return f"{class_}|{subject}|{period}"
+
+
+def get_id_cache_path() -> Path:
+    """Return the course id cache path stored next to the auth file."""
+    return get_state_file_path(ID_CACHE_FILE_NAME)
+
+
+def read_id_cache(cache_path: Path) -> dict[str, CourseIds]:
+    """Return every cached course, ignoring a missing or malformed file and malformed entries."""
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        entries = payload["courses"].items()
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+    courses = {}
+    for key, entry in entries:
+        try:
+            courses[key] = CourseIds.from_payload(entry)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return courses
+
+
+def _write_id_cache(cache_path: Path, courses: dict[str, CourseIds]) -> None:
+    """Atomically replace the cache file with the given courses; callers hold `state_file_lock`."""
+    payload = {"courses": {key: ids.to_payload() for key, ids in courses.items()}}
+    write_state_file(cache_path, json.dumps(payload, ensure_ascii=False))
+
+
+def read_course_ids(cache_path: Path, class_: str, subject: str, period: str) -> CourseIds | None:
+    """Return the cached ids of one course, if any."""
+    return read_id_cache(cache_path).get(course_key(class_, subject, period))
+
+
+def record_course_ids(cache_path: Path, course_ids: CourseIds) -> None:
+    """Store or replace the cached ids of one course."""
+    with state_file_lock(cache_path):
+        courses = read_id_cache(cache_path)
+        courses[course_ids.key] = course_ids
+        _write_id_cache(cache_path, courses)
+
+
+def invalidate_course_ids(cache_path: Path, class_: str, subject: str, period: str) -> None:
+    """Forget the cached ids of one course so the next fill scans the grade table again."""
+    with state_file_lock(cache_path):
+        courses = read_id_cache(cache_path)
+        if courses.pop(course_key(class_, subject, period), None) is not None:
+            _write_id_cache(cache_path, courses)
+
+
+def clear_id_cache(cache_path: Path, class_: str | None = None, subject: str | None = None) -> int:
+    """Remove cached courses matching the optional class and subject and return how many were removed."""
+    with state_file_lock(cache_path):
+        courses = read_id_cache(cache_path)
+        kept = {
+            key: ids
+            for key, ids in courses.items()
+            if (class_ is not None and ids.class_ != class_) or (subject is not None and ids.subject != subject)
+        }
+        removed = len(courses) - len(kept)
+        if not kept:
+            cache_path.unlink(missing_ok=True)
+        elif removed:
+            _write_id_cache(cache_path, kept)
+    return removed
+
+
+def new_course_ids(
+    class_: str,
+    subject: str,
+    period: str,
+    student_links: dict[str, list[str]],
+    task_identifiers: dict[str, list[tuple[str, str]]],
+    now: float | None = None,
+) -> CourseIds:
+    """Build cacheable course ids from a grade-table snapshot, skipping ambiguous names."""
+    students = {}
+    for name, hrefs in student_links.items():
+        if len(hrefs) == 1 and "studentid=" in hrefs[0]:
+            students[name] = hrefs[0].split("studentid=", 1)[1].split("&", 1)[0]
+    tasks = {
+        name: identifiers[0]
+        for name, identifiers in task_identifiers.items()
+        if len(identifiers) == 1 and all(identifiers[0])
+    }
+    return CourseIds(
+        class_=class_,
+        subject=subject,
+        period=period,
+        students=students,
+        tasks=tasks,
+        student_count=sum(len(hrefs) for hrefs in student_links.values()),
+        task_count=sum(len(identifiers) for identifiers in task_identifiers.values()),
+        updated_at=time.time() if now is None else now,
+    )
@@ -0,0 +1,144 @@
+"""Batch job files that run several scenario commands in one browser session."""
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+JOB_COMMANDS = ("create-task", "fill-grades", "export-grades")
+YAML_SUFFIXES = {".yaml", ".yml"}
+
+
+@dataclass(frozen=True)
+class ScenarioJob:
+    """One job of a job file: a scenario command with its options.
+
+    Option keys use the CLI option names without the leading dashes
+    (`grades-csv`, `dry-run`); underscores are accepted as well. `defaults` of
+    the job file apply to every job whose command accepts them. Relative paths
+    resolve against the job file directory.
+    """
+
+    number: int
+    command: str
+    options: dict[str, Any]
+    base_dir: Path
+    defaults: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        """Return the job reference used in error messages."""
+        return f"Job {self.number} ({self.command})"
+
+    def check_options(self, allowed: Iterable[str]) -> None:
+        """Raise `ValueError` when the job sets an option its command does not accept."""
+        unknown = sorted(set(self.options) - set(allowed))
+        if unknown:
+            raise ValueError(f"Unknown option(s) for {self.command}: {', '.join(unknown)}")
+
+    def _value(self, key: str) -> Any:
+        """Return the job value of an option, falling back to the file defaults."""
+        return self.options.get(key, self.defaults.get(key))
+
+    def text(self, key: str, default: str | None = None, *, required: bool = False) -> str | None:
+        """Return a text option; numbers are accepted so YAML values such as `3` stay usable."""
+        value = self._value(key)
+        if value is None:
+            if required:
+                raise ValueError(f"Missing required option '{key}'")
+            return default
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"Option '{key}' must be a string")
+        return str(value)
+
+    def text_list(self, key: str) -> list[str]:
+        """Return an option given as one string or a list of strings."""
+        value = self._value(key)
+        if value is None:
+            return []
+        values = value if isinstance(value, list) else [value]
+        if any(isinstance(item, bool) or not isinstance(item, (str, int, float)) for item in values):
+            raise ValueError(f"Option '{key}' must be a string or a list of strings")
+        return [str(item) for item in values]
+
+    def flag(self, key: str, default: bool = False) -> bool:
+        """Return a boolean option."""
+        value = self._value(key)
+        if value is None:
+            return default
+        if not isinstance(value, bool):
+            raise ValueError(f"Option '{key}' must be true or false")
+        return value
+
+    def path(self, key: str, *, required: bool = False) -> Path | None:
+        """Return a path option resolved against the job file directory."""
+        value = self.text(key, required=required)
+        if value is None:
+            return None
+        return self.base_dir / Path(value).expanduser()
+
+
+def _normalize_options(payload: dict, where: str) -> dict[str, Any]:
+    """Return options with CLI-style keys, rejecting non-string keys."""
+    options = {}
+    for key, value in payload.items():
+        if not isinstance(key, str):
+            raise ValueError(f"{where}: option names must be strings")
+        options[key.strip().removeprefix("--").replace("_", "-")] = value
+    return options
+
+
+def _read_payload(job_file: Path) -> Any:
+    """Parse a JSON or YAML job file."""
+    text = job_file.read_text(encoding="utf-8")
+    if job_file.suffix.lower() not in YAML_SUFFIXES:
+        try:
+            return json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"Job file {job_file} is not valid JSON: {exc}") from exc
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ValueError(
+            "YAML job files need the `yaml` extra (`poetry install --extras yaml` or "
+            "`pip install 'EduPageAutomat[yaml]'`); use a .json job file instead"
+        ) from exc
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Job file {job_file} is not valid YAML: {exc}") from exc
+
+
+def load_job_file(job_file: Path) -> list[ScenarioJob]:
+    """Load the jobs of a JSON or YAML job file.
+
+    The file holds either a list of jobs or a mapping with a `jobs` list and
+    optional `defaults`. Every job is a mapping with a `command` from
+    `JOB_COMMANDS` and that command's options.
+    """
+    payload = _read_payload(job_file)
+    defaults: Any = {}
+    if isinstance(payload, dict):
+        unknown = sorted(set(payload) - {"jobs", "defaults"})
+        if unknown:
+            raise ValueError(f"Unknown top-level key(s) in job file: {', '.join(map(str, unknown))}")
+        defaults = payload.get("defaults") or {}
+        payload = payload.get("jobs")
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Job file must contain a non-empty list of jobs")
+    if not isinstance(defaults, dict):
+        raise ValueError("Job file defaults must be a mapping of option names to values")
+
+    base_dir = job_file.resolve().parent
+    default_options = _normalize_options(defaults, "defaults")
+    jobs = []
+    for number, raw_job in enumerate(payload, start=1):
+        if not isinstance(raw_job, dict):
+            raise ValueError(f"Job {number} must be a mapping with a 'command' key")
+        options = _normalize_options(raw_job, f"Job {number}")
+        command = options.pop("command", None)
+        if command not in JOB_COMMANDS:
+            raise ValueError(f"Job {number}: command must be one of {', '.join(JOB_COMMANDS)}, got {command!r}")
+        jobs.append(ScenarioJob(number, command, options, base_dir, default_options))
+    return jobs
@@ -0,0 +1,227 @@
+"""Request routing that aborts page resources scenarios never use."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+import fnmatch
+import os
+import re
+
+from edu_page_automat.logging_config import setup_logging
+
+BLOCK_RESOURCES_ENV_VAR = "EDUPAGE_BLOCK_RESOURCES"
+BLOCK_URLS_ENV_VAR = "EDUPAGE_BLOCK_URLS"
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({"font", "image", "media"})
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.doubleclick.net/*",
+    "*://connect.facebook.net/*",
+    "*://*.hotjar.com/*",
+)
+# Playwright `Request.resource_type` values that may be blocked. Documents are
+# excluded because aborting them would break navigation itself.
+BLOCKABLE_RESOURCE_TYPES = frozenset(
+    {
+        "eventsource",
+        "fetch",
+        "font",
+        "image",
+        "manifest",
+        "media",
+        "other",
+        "script",
+        "stylesheet",
+        "texttrack",
+        "websocket",
+        "xhr",
+    }
+)
+_DISABLED_VALUES = {"", "none", "off"}
+
+logger = setup_logging()
+
+
+def parse_resource_types(value: str) -> frozenset[str]:
+    """Parse a comma-separated resource type list; `none` blocks no types."""
+    if value.strip().casefold() in _DISABLED_VALUES:
+        return frozenset()
+    resource_types = frozenset(part.strip().casefold() for part in value.split(",") if part.strip())
+    unknown = sorted(resource_types - BLOCKABLE_RESOURCE_TYPES)
+    if unknown:
+        available = ", ".join(sorted(BLOCKABLE_RESOURCE_TYPES))
+        raise ValueError(f"Cannot block resource types {', '.join(unknown)}. Available types: {available}")
+    return resource_types
+
+
+def _parse_url_patterns(value: str | None) -> tuple[str, ...]:
+    """Parse a comma-separated list of URL glob patterns."""
+    if not value:
+        return ()
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+@dataclass(frozen=True)
+class RequestBlockingPolicy:
+    """Resource types and URL glob patterns aborted during scenario runs."""
+
+    resource_types: frozenset[str] = DEFAULT_BLOCKED_RESOURCE_TYPES
+    url_patterns: tuple[str, ...] = DEFAULT_BLOCKED_URL_PATTERNS
+    _url_pattern: re.Pattern | None = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        """Compile URL globs into one regular expression."""
+        if self.url_patterns:
+            combined = "|".join(fnmatch.translate(pattern) for pattern in self.url_patterns)
+            object.__setattr__(self, "_url_pattern", re.compile(combined))
+
+    @classmethod
+    def disabled(cls) -> "RequestBlockingPolicy":
+        """Return a policy that lets every request through."""
+        return cls(resource_types=frozenset(), url_patterns=())
+
+    @classmethod
+    def from_environment(cls) -> "RequestBlockingPolicy":
+        """Return the default policy adjusted by `EDUPAGE_BLOCK_*` environment variables.
+
+        `EDUPAGE_BLOCK_RESOURCES` replaces the blocked resource types and
+        `EDUPAGE_BLOCK_URLS` adds URL glob patterns to the default list.
+        """
+        resource_types = os.environ.get(BLOCK_RESOURCES_ENV_VAR)
+        return cls().with_overrides(
+            resource_types=parse_resource_types(resource_types) if resource_types is not None else None,
+            extra_url_patterns=_parse_url_patterns(os.environ.get(BLOCK_URLS_ENV_VAR)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the policy blocks anything at all."""
+        return bool(self.resource_types or self.url_patterns)
+
+    def with_overrides(
+        self,
+        *,
+        resource_types: frozenset[str] | None = None,
+        extra_url_patterns: tuple[str, ...] = (),
+    ) -> "RequestBlockingPolicy":
+        """Return a copy with replaced resource types and additional URL patterns."""
+        return RequestBlockingPolicy(
+            resource_types=self.resource_types if resource_types is None else resource_types,
+            url_patterns=self.url_patterns + tuple(
+                pattern for pattern in extra_url_patterns if pattern not in self.url_patterns
+            ),
+        )
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        """Return whether a request with this resource type and URL should be aborted."""
+        if resource_type in self.resource_types:
+            return True
+        return self._url_pattern is not None and self._url_pattern.match(url) is not None
+
+
+@dataclass
+class RequestBlockingStats:
+    """Per-run request counters collected by the routing handler."""
+
+    requests: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+    loaded_bytes: int = 0
+
+    @property
+    def blocked(self) -> int:
+        """Return the number of aborted requests."""
+        return sum(self.blocked_by_type.values())
+
+    def format_summary(self) -> str:
+        """Describe blocked and loaded traffic in one log line."""
+        blocked_types = ", ".join(f"{kind}={count}" for kind, count in sorted(self.blocked_by_type.items()))
+        return (
+            f"blocked {self.blocked} of {self.requests} requests"
+            f"{f' ({blocked_types})' if blocked_types else ''}, "
+            f"loaded {self.loaded_bytes / 1024:.1f} KiB"
+        )
+
+
+def install_request_blocking(context, policy: RequestBlockingPolicy) -> RequestBlockingStats:
+    """Route every request of a browser context through `policy` and count the traffic.
+
+    Loaded bytes come from `Content-Length` response headers, so chunked
+    responses are not counted. The size of aborted requests is unknown because
+    they are never downloaded; blocked requests are counted per resource type.
+    """
+    stats = RequestBlockingStats()
+    if not policy.enabled:
+        return stats
+
+    def handle_route(route, request):
+        if _count_request(stats, policy, request):
+            route.abort("blockedbyclient")
+            return
+        route.continue_()
+
+    context.route("**/*", handle_route)
+    context.on("response", _response_counter(stats))
+    _log_policy(policy)
+    return stats
+
+
+async def install_request_blocking_async(context, policy: RequestBlockingPolicy) -> RequestBlockingStats:
+    """Async Playwright API counterpart of `install_request_blocking`."""
+    stats = RequestBlockingStats()
+    if not policy.enabled:
+        return stats
+
+    async def handle_route(route, request):
+        if _count_request(stats, policy, request):
+            await route.abort("blockedbyclient")
+            return
+        await route.continue_()
+
+    await context.route("**/*", handle_route)
+    context.on("response", _response_counter(stats))
+    _log_policy(policy)
+    return stats
+
+
+def _count_request(stats: RequestBlockingStats, policy: RequestBlockingPolicy, request) -> bool:
+    """Count a routed request and return whether `policy` blocks it."""
+    stats.requests += 1
+    if policy.blocks(request.resource_type, request.url):
+        stats.blocked_by_type[request.resource_type] += 1
+        return True
+    return False
+
+
+def _response_counter(stats: RequestBlockingStats):
+    """Return a response listener adding `Content-Length` bytes to `stats`."""
+
+    def handle_response(response):
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdecimal():
+            stats.loaded_bytes += int(content_length)
+
+    return handle_response
+
+
+def _log_policy(policy: RequestBlockingPolicy) -> None:
+    """Log the installed blocking policy."""
+    logger.debug(
+        "Blocking resource types {} and {} URL patterns",
+        ", ".join(sorted(policy.resource_types)) or "(none)",
+        len(policy.url_patterns),
+    )
+
+
+_active_policy: RequestBlockingPolicy | None = None
+
+
+def set_request_blocking(policy: RequestBlockingPolicy | None) -> None:
+    """Set the blocking policy used by scenario runs in this process, or reset it with `None`."""
+    global _active_policy
+    _active_policy = policy
+
+
+def get_request_blocking() -> RequestBlockingPolicy:
+    """Return the active blocking policy, falling back to the environment."""
+    if _active_policy is not None:
+        return _active_policy
+    return RequestBlockingPolicy.from_environment()
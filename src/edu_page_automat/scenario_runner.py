@@ -1,14 +1,20 @@
 """Playwright lifecycle helpers for running EduPage scenarios."""
 
-from typing import Any, Optional
+from dataclasses import dataclass
+from pathlib import Path
+import queue
+import threading
+from typing import Any, Callable, Optional
 
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import FrameLocator, Locator, Page, sync_playwright
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-from edu_page_automat.auth_manager import AuthManager
+from edu_page_automat.auth_manager import AuthManager, SessionExpiredError
+from edu_page_automat.execution_profile import ExecutionProfile, get_execution_profile
 from edu_page_automat.logging_config import setup_logging
 from edu_page_automat.playwright_browsers import is_missing_browser_error, missing_browser_message
+from edu_page_automat.request_blocking import RequestBlockingPolicy, get_request_blocking, install_request_blocking
+from edu_page_automat.tracing import SpanRecorder, get_trace_output
 
 DEFAULT_WAIT_TIMEOUT = 10_000
 _AUTO_WAIT_ACTION_STATES = {
@@ -27,6 +33,7 @@ _AUTO_WAIT_ACTION_STATES = {
     "uncheck": "visible",
 }
 _PLAYWRIGHT_AUTO_WAIT_ACTIONS = {"check", "click", "dblclick", "fill", "hover", "tap", "uncheck"}
+_NAVIGATION_METHODS = {"goto"}
 
 logger = setup_logging()
 
@@ -35,6 +42,20 @@ class ScenarioRunnerError(RuntimeError):
     """User-facing scenario runner error that should be rendered by the CLI."""
 
 
+@dataclass(frozen=True)
+class ScenarioJobResult:
+    """Outcome of one scenario job run by `run_scenarios`."""
+
+    index: int
+    scenario: Any = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the scenario finished without an error."""
+        return self.error is None
+
+
 def _wrap_result(result: Any, timeout: Optional[float]):
     """Wrap Playwright locator-like return values with auto-wait proxies."""
     if isinstance(result, Locator):
@@ -44,54 +65,72 @@ def _wrap_result(result: Any, timeout: Optional[float]):
     return result
 
 
+def _delegate(proxy, target, item: str, timeout: Optional[float]):
+    """Return `target.item`, caching a result-wrapping method wrapper on the proxy instance.
+
+    The cached wrapper is found by normal attribute lookup afterwards, so
+    `__getattr__` runs only on the first access of each method.
+    """
+    attr = getattr(target, item)
+    if not callable(attr):
+        return attr
+
+    def wrapper(*args, **kwargs):
+        return _wrap_result(attr(*args, **kwargs), timeout)
+
+    proxy.__dict__[item] = wrapper
+    return wrapper
+
+
+def _locator_action(name: str, state: str):
+    """Build the proxy method for a locator action.
+
+    Actions in `_PLAYWRIGHT_AUTO_WAIT_ACTIONS` call Playwright directly, which
+    already waits for actionability; the others first wait for `state`.
+    """
+    if name in _PLAYWRIGHT_AUTO_WAIT_ACTIONS:
+        def action(self, *args, **kwargs):
+            return _wrap_result(getattr(self._locator, name)(*args, **kwargs), self._timeout)
+    else:
+        def action(self, *args, **kwargs):
+            locator = self._locator
+            logger.debug("Waiting for locator {} before {}", locator, name)
+            locator.wait_for(state=state, timeout=self._timeout)
+            return _wrap_result(getattr(locator, name)(*args, **kwargs), self._timeout)
+
+    action.__name__ = action.__qualname__ = name
+    action.__doc__ = f"Run `Locator.{name}` on the wrapped locator."
+    return action
+
+
 class AutoWaitLocator:
-    """Locator proxy that waits for element readiness before key actions."""
+    """Locator proxy that waits for element readiness before actions Playwright does not auto-wait for."""
 
     def __init__(self, locator: Locator, timeout: Optional[float]):
         """Store the wrapped locator and default wait timeout."""
         self._locator = locator
         self._timeout = timeout
 
-    def __getattribute__(self, item):
+    @property
+    def __class__(self):
         """Preserve Playwright class identity for wrapped locators."""
-        if item == "__class__":
-            locator = object.__getattribute__(self, "_locator")
-            return locator.__class__
-        return object.__getattribute__(self, item)
+        return self._locator.__class__
 
     def __getattr__(self, item):
         """Delegate locator attributes and wrap methods that return locators."""
-        locator = object.__getattribute__(self, "_locator")
-        attr = getattr(locator, item)
-        if callable(attr):
-            def wrapper(*args, **kwargs):
-                state = _AUTO_WAIT_ACTION_STATES.get(item)
-                if state:
-                    logger.debug("Waiting for locator {} before {}", locator, item)
-                    try:
-                        locator.wait_for(state=state, timeout=object.__getattribute__(self, "_timeout"))
-                    except PlaywrightTimeoutError:
-                        if item not in _PLAYWRIGHT_AUTO_WAIT_ACTIONS:
-                            raise
-                        logger.debug(
-                            "Locator {} did not satisfy explicit {} wait before {}; using Playwright action auto-wait",
-                            locator,
-                            state,
-                            item,
-                        )
-                result = attr(*args, **kwargs)
-                return _wrap_result(result, object.__getattribute__(self, "_timeout"))
-            return wrapper
-        return attr
+        return _delegate(self, self._locator, item, self._timeout)
 
     def unwrap(self) -> Locator:
         """Return the underlying Playwright locator."""
-        return object.__getattribute__(self, "_locator")
+        return self._locator
 
     def __repr__(self) -> str:
         """Return a debug representation of the wrapped locator."""
-        locator = object.__getattribute__(self, "_locator")
-        return f"AutoWaitLocator({locator!r})"
+        return f"AutoWaitLocator({self._locator!r})"
+
+
+for _name, _state in _AUTO_WAIT_ACTION_STATES.items():
+    setattr(AutoWaitLocator, _name, _locator_action(_name, _state))
 
 
 class AutoWaitFrameLocator:
@@ -102,96 +141,292 @@ class AutoWaitFrameLocator:
         self._frame_locator = frame_locator
         self._timeout = timeout
 
-    def __getattribute__(self, item):
+    @property
+    def __class__(self):
         """Preserve Playwright class identity for wrapped frame locators."""
-        if item == "__class__":
-            frame_locator = object.__getattribute__(self, "_frame_locator")
-            return frame_locator.__class__
-        return object.__getattribute__(self, item)
+        return self._frame_locator.__class__
 
     def __getattr__(self, item):
         """Delegate frame locator attributes and wrap returned locators."""
-        frame_locator = object.__getattribute__(self, "_frame_locator")
-        attr = getattr(frame_locator, item)
-        if callable(attr):
-            def wrapper(*args, **kwargs):
-                result = attr(*args, **kwargs)
-                return _wrap_result(result, object.__getattribute__(self, "_timeout"))
-            return wrapper
-        return attr
+        return _delegate(self, self._frame_locator, item, self._timeout)
 
     def unwrap(self) -> FrameLocator:
         """Return the underlying Playwright frame locator."""
-        return object.__getattribute__(self, "_frame_locator")
+        return self._frame_locator
 
     def __repr__(self) -> str:
         """Return a debug representation of the wrapped frame locator."""
-        frame_locator = object.__getattribute__(self, "_frame_locator")
-        return f"AutoWaitFrameLocator({frame_locator!r})"
+        return f"AutoWaitFrameLocator({self._frame_locator!r})"
+
+
+def _navigation_method(name: str):
+    """Build the page proxy method that runs the first-navigation hook after a navigation."""
+
+    def navigate(self, *args, **kwargs):
+        page = self._page
+        result = getattr(page, name)(*args, **kwargs)
+        on_first_navigation = self._on_first_navigation
+        if on_first_navigation is not None:
+            self._on_first_navigation = None
+            on_first_navigation(page)
+        return _wrap_result(result, self._timeout)
+
+    navigate.__name__ = navigate.__qualname__ = name
+    navigate.__doc__ = f"Run `Page.{name}` and the first-navigation hook once."
+    return navigate
 
 
 class AutoWaitPage:
     """Page proxy that ensures locators wait for readiness before interactions."""
 
-    def __init__(self, page: Page, timeout: Optional[float]):
-        """Store the wrapped page and default wait timeout."""
+    def __init__(self, page: Page, timeout: Optional[float], on_first_navigation=None):
+        """Store the wrapped page, default wait timeout, and optional first-navigation hook."""
         self._page = page
         self._timeout = timeout
+        self._on_first_navigation = on_first_navigation
 
-    def __getattribute__(self, item):
+    @property
+    def __class__(self):
         """Preserve Playwright class identity for wrapped pages."""
-        if item == "__class__":
-            page = object.__getattribute__(self, "_page")
-            return page.__class__
-        return object.__getattribute__(self, item)
+        return self._page.__class__
 
     def __getattr__(self, item):
         """Delegate page attributes and wrap returned locators."""
-        page = object.__getattribute__(self, "_page")
-        attr = getattr(page, item)
-        if callable(attr):
-            def wrapper(*args, **kwargs):
-                result = attr(*args, **kwargs)
-                return _wrap_result(result, object.__getattribute__(self, "_timeout"))
-            return wrapper
-        return attr
+        return _delegate(self, self._page, item, self._timeout)
 
     def unwrap(self) -> Page:
         """Return the underlying Playwright page."""
-        return object.__getattribute__(self, "_page")
+        return self._page
 
     def __repr__(self) -> str:
         """Return a debug representation of the wrapped page."""
-        page = object.__getattribute__(self, "_page")
-        return f"AutoWaitPage({page!r})"
-
-
-def run_scenario(scenario_factory, *, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
-    """Run a scenario in Playwright with authenticated auto-waiting page access."""
-    with sync_playwright() as playwright:
-        auth = AuthManager(playwright)
-        try:
-            browser, context = auth.new_context()
-        except PlaywrightError as exc:
-            if is_missing_browser_error(exc):
-                raise ScenarioRunnerError(missing_browser_message()) from exc
-            raise
-        page = context.pages[0] if context.pages else context.new_page()
-
-        page.set_default_timeout(wait_timeout)
-        page.set_default_navigation_timeout(wait_timeout)
-
-        scenario = scenario_factory()
-        scenario_name = scenario.__class__.__name__
-        logger.info("Running scenario {}", scenario_name)
-
-        try:
-            scenario.run(AutoWaitPage(page, wait_timeout))
-        except Exception:
-            logger.exception("Scenario {} failed", scenario_name)
-            raise
-        else:
-            logger.info("Scenario {} completed", scenario_name)
-        finally:
+        return f"AutoWaitPage({self._page!r})"
+
+
+for _name in _NAVIGATION_METHODS:
+    setattr(AutoWaitPage, _name, _navigation_method(_name))
+
+
+def run_scenario(
+    scenario_factory,
+    *,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    profile: ExecutionProfile | None = None,
+    trace_out: Path | None = None,
+    request_blocking: RequestBlockingPolicy | None = None,
+):
+    """Run a scenario in Playwright with authenticated auto-waiting page access.
+
+    Session setup and scenario steps are recorded as timed spans; their summary
+    is logged when the run ends and, with `trace_out` (or the CLI `--trace-out`
+    option), written as Chrome trace-event JSON. Requests matching
+    `request_blocking` (by default the active policy) are aborted.
+    """
+    profile = profile or get_execution_profile()
+    request_blocking = request_blocking or get_request_blocking()
+    trace_out = trace_out or get_trace_output()
+    recorder = SpanRecorder()
+    logger.debug(
+        "Using execution profile {} (headless={}, slow_mo={})",
+        profile.name,
+        profile.headless,
+        profile.slow_mo,
+    )
+    try:
+        with sync_playwright() as playwright:
+            auth = AuthManager(playwright, profile)
+            try:
+                with recorder.span("open_session", category="runner"):
+                    browser, context = auth.new_context()
+            except PlaywrightError as exc:
+                if is_missing_browser_error(exc):
+                    raise ScenarioRunnerError(missing_browser_message()) from exc
+                raise
+
+            try:
+                _run_in_context(scenario_factory, auth, browser, context, wait_timeout, recorder, request_blocking)
+            except SessionExpiredError:
+                logger.info("Cached EduPage session expired during the first navigation")
+                with recorder.span("login", category="runner"):
+                    browser, context = auth.login()
+                _run_in_context(scenario_factory, auth, browser, context, wait_timeout, recorder, request_blocking)
+    finally:
+        _report_spans(recorder, trace_out)
+
+
+def _run_in_context(
+    scenario_factory,
+    auth: AuthManager,
+    browser,
+    context,
+    wait_timeout: float,
+    recorder: SpanRecorder,
+    request_blocking: RequestBlockingPolicy,
+):
+    """Run one scenario instance on the context page and close the browser afterwards."""
+    request_stats = install_request_blocking(context, request_blocking)
+    page = context.pages[0] if context.pages else context.new_page()
+
+    page.set_default_timeout(wait_timeout)
+    page.set_default_navigation_timeout(wait_timeout)
+
+    scenario = scenario_factory()
+    scenario.span_recorder = recorder
+    scenario_name = scenario.__class__.__name__
+    logger.info("Running scenario {}", scenario_name)
+
+    on_first_navigation = auth.confirm_session if auth.session_probe_pending else None
+    try:
+        with recorder.span("run", category="runner", scenario=scenario_name):
+            scenario.run(AutoWaitPage(page, wait_timeout, on_first_navigation))
+    except SessionExpiredError:
+        raise
+    except Exception:
+        logger.exception("Scenario {} failed", scenario_name)
+        raise
+    else:
+        logger.info("Scenario {} completed", scenario_name)
+    finally:
+        with recorder.span("close", category="runner"):
             context.close()
             browser.close()
+        if request_blocking.enabled:
+            logger.info("Request blocking: {}", request_stats.format_summary())
+
+
+def run_scenarios(
+    scenario_factories: list[Callable[[], Any]],
+    *,
+    workers: int = 1,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    profile: ExecutionProfile | None = None,
+    trace_out: Path | None = None,
+    request_blocking: RequestBlockingPolicy | None = None,
+) -> list[ScenarioJobResult]:
+    """Run independent scenarios on a pool of browser contexts sharing one stored session.
+
+    The session is validated (or a login performed) once up front; each worker
+    then opens its own browser context from the stored session and runs queued
+    scenarios one page at a time. The sync Playwright API is bound to the thread
+    that started it, so every worker thread drives its own Playwright instance.
+    A failing scenario does not stop the others; results are returned in job
+    order with the error of each failed job.
+    """
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    profile = profile or get_execution_profile()
+    request_blocking = request_blocking or get_request_blocking()
+    trace_out = trace_out or get_trace_output()
+    recorder = SpanRecorder()
+    results: list[ScenarioJobResult | None] = [None] * len(scenario_factories)
+    worker_errors: list[BaseException] = []
+    try:
+        with sync_playwright() as playwright:
+            try:
+                with recorder.span("open_session", category="runner"):
+                    AuthManager(playwright, profile).ensure_session()
+            except PlaywrightError as exc:
+                if is_missing_browser_error(exc):
+                    raise ScenarioRunnerError(missing_browser_message()) from exc
+                raise
+
+        jobs: queue.SimpleQueue = queue.SimpleQueue()
+        for index, factory in enumerate(scenario_factories):
+            jobs.put((index, factory))
+        worker_count = min(workers, len(scenario_factories))
+        logger.info("Running {} scenarios on {} browser contexts", len(scenario_factories), worker_count)
+        threads = [
+            threading.Thread(
+                target=_run_worker,
+                args=(jobs, results, worker_errors, profile, wait_timeout, recorder, request_blocking),
+                name=f"edupage-worker-{number}",
+                daemon=True,
+            )
+            for number in range(1, worker_count + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        _report_spans(recorder, trace_out)
+
+    # Jobs left in the queue when every worker failed report the error that stopped the last worker.
+    unfinished = ScenarioRunnerError("No browser context was available to run the scenario")
+    if worker_errors:
+        unfinished = worker_errors[-1]
+    return [result or ScenarioJobResult(index, error=unfinished) for index, result in enumerate(results)]
+
+
+def _run_worker(
+    jobs: queue.SimpleQueue,
+    results: list,
+    worker_errors: list,
+    profile: ExecutionProfile,
+    wait_timeout: float,
+    recorder: SpanRecorder,
+    request_blocking: RequestBlockingPolicy,
+) -> None:
+    """Open one browser context and run queued scenario jobs on it until the queue is empty.
+
+    An error that stops the worker itself, such as a browser that cannot be
+    opened, is logged and appended to `worker_errors` so jobs no worker ran can
+    report it.
+    """
+    try:
+        with sync_playwright() as playwright:
+            with recorder.span("launch_worker", category="runner"):
+                browser, context = AuthManager(playwright, profile).open_stored_context()
+            request_stats = install_request_blocking(context, request_blocking)
+            try:
+                while True:
+                    try:
+                        index, factory = jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    results[index] = _run_job(index, factory, context, wait_timeout, recorder)
+            finally:
+                with recorder.span("close", category="runner"):
+                    context.close()
+                    browser.close()
+                if request_blocking.enabled:
+                    logger.info("Request blocking: {}", request_stats.format_summary())
+    except Exception as exc:
+        if isinstance(exc, PlaywrightError) and is_missing_browser_error(exc):
+            logger.error(missing_browser_message())
+            worker_errors.append(ScenarioRunnerError(missing_browser_message()))
+        else:
+            logger.exception("Browser worker failed")
+            worker_errors.append(exc)
+
+
+def _run_job(index: int, factory, context, wait_timeout: float, recorder: SpanRecorder) -> ScenarioJobResult:
+    """Run one scenario on a fresh page of a worker context and capture its outcome."""
+    scenario = None
+    page = context.new_page()
+    page.set_default_timeout(wait_timeout)
+    page.set_default_navigation_timeout(wait_timeout)
+    try:
+        scenario = factory()
+        scenario.span_recorder = recorder
+        scenario_name = scenario.__class__.__name__
+        logger.info("Running scenario {} (job {})", scenario_name, index + 1)
+        with recorder.span("run", category="runner", scenario=scenario_name, job=index + 1):
+            scenario.run(AutoWaitPage(page, wait_timeout))
+    except Exception as exc:
+        logger.exception("Scenario job {} failed", index + 1)
+        return ScenarioJobResult(index, scenario, exc)
+    finally:
+        page.close()
+    logger.info("Scenario {} completed (job {})", scenario_name, index + 1)
+    return ScenarioJobResult(index, scenario)
+
+
+def _report_spans(recorder: SpanRecorder, trace_out: Path | None) -> None:
+    """Log the span summary and write the Chrome trace when requested."""
+    if not recorder.spans:
+        return
+    logger.info("Scenario timing summary:\n{}", recorder.format_summary())
+    if trace_out is not None:
+        recorder.write_chrome_trace(trace_out)
+        logger.info("Trace written to {}", trace_out)
@@ -1,13 +1,108 @@
 """Base abstractions for EduPage automation scenarios."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Generator
+from contextlib import AbstractContextManager, nullcontext
+import inspect
+from typing import Any, Callable, TypeAlias
 
 from playwright.sync_api import Page
 import typer
 
+from edu_page_automat.tracing import SpanRecorder
+
+# A scenario flow written once for both Playwright APIs: every page call is
+# yielded (`value = yield page.evaluate(...)`) and the driver sends its result
+# back, awaiting it first on the async API.
+Steps: TypeAlias = Generator[Any, Any, Any]
+
+
+class PageStep(ABC):
+    """A yielded page operation whose sync and async Playwright forms differ beyond `await`."""
+
+    @abstractmethod
+    def run_sync(self) -> Any:
+        """Run the operation on a sync Playwright page."""
+
+    @abstractmethod
+    async def run_async(self) -> Any:
+        """Run the operation on an async Playwright page."""
+
+
+class ExpectResponse(PageStep):
+    """Run `action` steps while waiting for a page response matching `predicate`; yields the response."""
+
+    def __init__(self, page, predicate: Callable[[Any], bool], timeout: float, action: Steps):
+        """Keep the page, response predicate, timeout in milliseconds, and the triggering steps."""
+        self.page = page
+        self.predicate = predicate
+        self.timeout = timeout
+        self.action = action
+
+    def run_sync(self) -> Any:
+        """Wait for the response around the action with `Page.expect_response`."""
+        with self.page.expect_response(self.predicate, timeout=self.timeout) as response_info:
+            run_steps(self.action)
+        return response_info.value
+
+    async def run_async(self) -> Any:
+        """Wait for the response around the action with the async `Page.expect_response`."""
+        async with self.page.expect_response(self.predicate, timeout=self.timeout) as response_info:
+            await run_steps_async(self.action)
+        return await response_info.value
+
+
+def run_steps(steps: Steps) -> Any:
+    """Drive scenario steps on a sync Playwright page and return the flow's result."""
+    value = error = None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value = error = None
+        if inspect.isawaitable(step):
+            if inspect.iscoroutine(step):
+                step.close()
+            raise TypeError("Scenario step is awaitable; run async Playwright pages through the Async scenario")
+        if isinstance(step, PageStep):
+            try:
+                value = step.run_sync()
+            except BaseException as exc:
+                error = exc
+        else:
+            value = step
+
+
+async def run_steps_async(steps: Steps) -> Any:
+    """Drive scenario steps on an async Playwright page and return the flow's result.
+
+    A failing page call is thrown back into the flow, so its `try` blocks
+    handle async errors exactly like sync ones.
+    """
+    value = error = None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value = error = None
+        try:
+            if isinstance(step, PageStep):
+                value = await step.run_async()
+            elif inspect.isawaitable(step):
+                value = await step
+            else:
+                value = step
+        except BaseException as exc:
+            error = exc
+
+
 class Scenario(ABC):
     """Base class for all scenarios."""
 
+    span_recorder: SpanRecorder | None = None
+
     @classmethod
     @abstractmethod
     def register_cli(cls, cli_group: typer.Typer):
@@ -15,6 +110,27 @@ class Scenario(ABC):
         pass
 
     @abstractmethod
+    def steps(self, page) -> Steps:
+        """Yield the scenario's page calls; shared by the sync and async engines."""
+        pass
+
     def run(self, page: Page):
         """Execute scenario steps."""
-        pass
+        return run_steps(self.steps(page))
+
+    def span(self, name: str, **args) -> AbstractContextManager:
+        """Time a named scenario step when the runner attached a span recorder."""
+        if self.span_recorder is None:
+            return nullcontext()
+        return self.span_recorder.span(name, **args)
+
+
+class AsyncScenario:
+    """Mixin running a scenario's shared steps on an async Playwright page for `async_runner`.
+
+    List it before the sync scenario class: `class AsyncX(AsyncScenario, XScenario)`.
+    """
+
+    async def run(self, page):
+        """Execute scenario steps."""
+        return await run_steps_async(self.steps(page))
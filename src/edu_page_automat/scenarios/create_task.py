@@ -1,20 +1,46 @@
 """Scenario for creating EduPage tests or assignments from CLI task data."""
 
-import csv
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, Iterable, List
 
 import typer
 
+from edu_page_automat.course_catalogue import get_course_catalogue_path
+from edu_page_automat.csv_input import open_csv
+from edu_page_automat.edupage_site import get_user_page_url
+from edu_page_automat.job_file import ScenarioJob
 from edu_page_automat.logging_config import setup_logging
 from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenario
-from edu_page_automat.scenarios.base import Scenario
+from edu_page_automat.scenarios.base import AsyncScenario, Scenario, Steps
+from edu_page_automat.scenarios.navigation import (
+    open_course_deep_link,
+    open_grades_module,
+    remember_course_url,
+    select_course,
+)
 
 logger = setup_logging()
 
 TASK_ROW_LOCATOR = ".znamkyUdalostHeader"
-_CSV_SAMPLE_SIZE = 2048
+# Present on the Známky page even before the course has any task.
+_NEW_TASK_LINK_SELECTOR = 'a:has-text("Nová písemka/ zkoušení")'
+_SELECT_CATEGORY_BY_LABEL_SCRIPT = """(labelText) => {
+    const select = document.querySelector('select[name="kategoriaid"]');
+    if (!select) return;
+    const option = Array.from(select.options).find(opt => opt.text.trim() === labelText);
+    if (option) {
+        select.value = option.value;
+        select.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}"""
+_SELECT_FIRST_CATEGORY_SCRIPT = """() => {
+    const select = document.querySelector('select[name="kategoriaid"]');
+    if (select && select.options.length > 0) {
+        select.selectedIndex = 0;
+        select.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}"""
 
 
 @dataclass(frozen=True)
@@ -32,35 +58,17 @@ def _load_tasks_from_csv(csv_path: Path) -> List[TaskDefinition]:
 
     logger.debug("Loading tasks from CSV {}", csv_path)
 
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        sample = handle.read(_CSV_SAMPLE_SIZE)
-        handle.seek(0)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=",;	")
-        except (csv.Error, TypeError):
-            dialect = csv.excel
-
-        reader = csv.DictReader(handle, dialect=dialect)
+    with open_csv(csv_path) as reader:
         if not reader.fieldnames:
             raise ValueError("CSV must include a header with columns 'name' (or 'task') and 'points'")
 
-        headers = [header.strip().lower() for header in reader.fieldnames]
-        name_header = None
-        points_header = None
-        for original, header in zip(reader.fieldnames, headers):
-            if header in {"name", "task", "nazev"} and name_header is None:
-                name_header = original
-            if header in {"points", "point", "score", "body"} and points_header is None:
-                points_header = original
-
-        if not name_header or not points_header:
+        name_column = reader.find_column({"name", "task", "nazev"})
+        points_column = reader.find_column({"points", "point", "score", "body"})
+        if name_column is None or points_column is None:
             raise ValueError("CSV header must contain columns 'name' (or 'task') and 'points'")
 
         tasks: List[TaskDefinition] = []
-        for row_index, row in enumerate(reader, start=2):
-            name_value = (row.get(name_header) or "").strip()
-            points_value = (row.get(points_header) or "").strip()
-
+        for row_index, (name_value, points_value) in reader.records(name_column, points_column):
             if not name_value:
                 raise ValueError(f"Row {row_index}: missing task name")
 
@@ -77,33 +85,53 @@ def _load_tasks_from_csv(csv_path: Path) -> List[TaskDefinition]:
     return tasks
 
 
+def _parse_task_definition(definition: str) -> TaskDefinition:
+    """Parse a `name:points` task definition."""
+    try:
+        name_part, points_part = definition.split(":", 1)
+        return TaskDefinition(name=name_part.strip(), points=int(points_part.strip()))
+    except ValueError as exc:
+        raise ValueError(f"Task definition '{definition}' must be in format 'name:points' with integer points") from exc
+
+
 class CreateTaskScenario(Scenario):
     """Create one or more EduPage test or assignment records."""
 
-    def __init__(self, class_: str, tasks: Iterable[TaskDefinition], subject: str = "Informatika", category: str | None = None):
-        """Initialize the target class, subject, category, and task list."""
+    def __init__(
+        self,
+        class_: str,
+        tasks: Iterable[TaskDefinition],
+        subject: str = "Informatika",
+        category: str | None = None,
+        course_catalogue_path: Path | None = None,
+    ):
+        """Initialize the target class, subject, category, task list, and optional course catalogue."""
         self.class_ = class_
         self.subject = subject
         self.category = category
+        self.course_catalogue_path = course_catalogue_path
         self.tasks: List[TaskDefinition] = list(tasks)
         if not self.tasks:
             raise ValueError("At least one task must be provided")
 
-    def run(self, page):
+    def steps(self, page) -> Steps:
         """Select the target course and create every missing task."""
-        page.goto("https://1itg.edupage.org/user/", wait_until="domcontentloaded")
-
-        page.locator(".edubarCourseListBtn").click()
-        locator = page.locator("div.ecourse-standards-subject-title").filter(
-            has=page.locator("div.className", has_text=self.class_)
-        ).filter(
-            has=page.locator("div.subjectName", has_text=self.subject)
-        )
+        with self.span("deep_link", class_=self.class_, subject=self.subject):
+            deep_linked = yield from open_course_deep_link(
+                page, self.course_catalogue_path, self.class_, self.subject, _NEW_TASK_LINK_SELECTOR
+            )
+        if not deep_linked:
+            with self.span("navigate"):
+                yield page.goto(get_user_page_url(), wait_until="domcontentloaded")
 
-        locator.click()
-        logger.debug(f"Selected subject {self.subject} for class {self.class_}")
+            with self.span("select_course", class_=self.class_, subject=self.subject):
+                yield from select_course(page, self.class_, self.subject)
 
-        page.locator("a.edubarCourseModuleLink", has_text="Známky").click()
+            with self.span("load_table"):
+                yield from open_grades_module(page)
+                if self.course_catalogue_path is not None:
+                    yield page.wait_for_selector(_NEW_TASK_LINK_SELECTOR, state="attached", timeout=15000)
+                    remember_course_url(page, self.course_catalogue_path, self.class_, self.subject)
 
         locator_configured = "TODO" not in TASK_ROW_LOCATOR
         if not locator_configured:
@@ -111,12 +139,20 @@ class CreateTaskScenario(Scenario):
 
         created = 0
         for task in self.tasks:
-            if locator_configured and not self._task_missing(page, task):
-                continue
-
-            self._create_task(page, task)
+            if locator_configured:
+                with self.span("check_task", task=task.name):
+                    task_missing = yield from self._task_missing(page, task)
+                if not task_missing:
+                    continue
+
+            with self.span("create_task", task=task.name):
+                yield from self._create_task(page, task)
             created += 1
 
+        self._log_finished(created)
+
+    def _log_finished(self, created: int) -> None:
+        """Log how many tasks were created and skipped."""
         logger.info(
             "Task creation finished for class {}, subject {} (created={}, skipped={})",
             self.class_,
@@ -125,10 +161,14 @@ class CreateTaskScenario(Scenario):
             len(self.tasks) - created,
         )
 
-    def _task_missing(self, page, task: TaskDefinition) -> bool:
+    def _task_missing(self, page, task: TaskDefinition) -> Steps:
         """Return whether the task does not already appear in the grade table."""
         existing_task = page.locator(TASK_ROW_LOCATOR).filter(has_text=task.name)
-        existing_count = existing_task.count()
+        existing_count = yield existing_task.count()
+        return self._report_existing_task(task, existing_count)
+
+    def _report_existing_task(self, task: TaskDefinition, existing_count: int) -> bool:
+        """Log the duplicate check and return whether the task still has to be created."""
         logger.debug("Found {} existing tasks matching {}", existing_count, task.name)
         if existing_count > 0:
             logger.info(
@@ -140,57 +180,42 @@ class CreateTaskScenario(Scenario):
             return False
         return True
 
-    def _create_task(self, page, task: TaskDefinition):
+    def _create_task(self, page, task: TaskDefinition) -> Steps:
         """Fill and submit the EduPage new-task form."""
         logger.info("Creating new task: {}", task.name)
 
         new_task_button = page.locator("a").filter(has_text="Nová písemka/ zkoušení")
-        new_task_button.wait_for(state="visible", timeout=10000)
-        new_task_button.click()
+        yield new_task_button.wait_for(state="visible", timeout=10000)
+        yield new_task_button.click()
 
-        page.wait_for_selector('input[name="p_meno"]', state="visible", timeout=15000)
-        page.locator('input[name="p_meno"]').fill(task.name)
+        yield page.wait_for_selector('input[name="p_meno"]', state="visible", timeout=15000)
+        yield page.locator('input[name="p_meno"]').fill(task.name)
 
         dropdown = page.locator('select[name="kategoriaid"]')
-        dropdown.wait_for(state="attached", timeout=15000)
+        yield dropdown.wait_for(state="attached", timeout=15000)
 
         if self.category:
             try:
                 logger.debug("Selecting category by label: {}", self.category)
-                dropdown.select_option(label=self.category)
+                yield dropdown.select_option(label=self.category)
             except Exception as e:
                 logger.warning("Selecting by label failed ({}), trying JS fallback", e)
-                page.evaluate(
-                    """(labelText) => {
-                        const select = document.querySelector('select[name="kategoriaid"]');
-                        if (!select) return;
-                        const option = Array.from(select.options).find(opt => opt.text.trim() === labelText);
-                        if (option) {
-                            select.value = option.value;
-                            select.dispatchEvent(new Event('change', { bubbles: true }));
-                        }
-                    }""",
-                    self.category,
-                )
+                yield page.evaluate(_SELECT_CATEGORY_BY_LABEL_SCRIPT, self.category)
         else:
             logger.warning("No category specified, selecting first available option")
-            page.evaluate("""
-                () => {
-                    const select = document.querySelector('select[name="kategoriaid"]');
-                    if (select && select.options.length > 0) {
-                        select.selectedIndex = 0;
-                        select.dispatchEvent(new Event('change', { bubbles: true }));
-                    }
-                }
-            """)
-
-        page.get_by_role("spinbutton").wait_for(state="visible", timeout=10000)
-        page.get_by_role("spinbutton").fill(str(task.points))
+            yield page.evaluate(_SELECT_FIRST_CATEGORY_SCRIPT)
+
+        yield page.get_by_role("spinbutton").wait_for(state="visible", timeout=10000)
+        yield page.get_by_role("spinbutton").fill(str(task.points))
 
         save_button = page.get_by_role("button", name="Uložit")
-        save_button.wait_for(state="visible", timeout=10000)
-        save_button.click()
+        yield save_button.wait_for(state="visible", timeout=10000)
+        yield save_button.click()
+
+        self._log_created_task(task)
 
+    def _log_created_task(self, task: TaskDefinition) -> None:
+        """Log a submitted new-task form."""
         logger.info(
             "Created task {} for class {} with {} points (subject {}, category {})",
             task.name,
@@ -200,6 +225,29 @@ class CreateTaskScenario(Scenario):
             self.category or "(default)",
         )
 
+    @classmethod
+    def from_job(cls, job: ScenarioJob) -> "CreateTaskScenario":
+        """Build the scenario from a `run-jobs` job with `create-task` options."""
+        job.check_options({"class", "subject", "category", "task-csv", "task", "name", "points", "deep-link"})
+        task_csv = job.path("task-csv")
+        tasks = _load_tasks_from_csv(task_csv) if task_csv else []
+        tasks.extend(_parse_task_definition(definition) for definition in job.text_list("task"))
+        task_name, task_points = job.text("name"), job.text("points")
+        if task_name is not None or task_points is not None:
+            if task_name is None or task_points is None:
+                raise ValueError("Options 'name' and 'points' must be given together")
+            try:
+                tasks.append(TaskDefinition(name=task_name, points=int(task_points)))
+            except ValueError as exc:
+                raise ValueError(f"Option 'points' must be an integer, got '{task_points}'") from exc
+        return cls(
+            job.text("class", required=True),
+            tasks,
+            subject=job.text("subject", "Informatika"),
+            category=job.text("category"),
+            course_catalogue_path=get_course_catalogue_path() if job.flag("deep-link", True) else None,
+        )
+
     @classmethod
     def register_cli(cls, cli_group):
         """Register the `create-task` command on the provided Typer app."""
@@ -233,6 +281,14 @@ class CreateTaskScenario(Scenario):
                     help="Dropdown label for task category (e.g., 'Dan - Linux' or 'Písemka')",
                 ),
             ] = None,
+            deep_link: Annotated[
+                bool,
+                typer.Option(
+                    "--deep-link/--no-deep-link",
+                    help="Open the recorded Známky URL directly instead of navigating through the course switcher.",
+                    show_default=True,
+                ),
+            ] = True,
         ):
             """Create a new test/task in EduPage."""
             tasks: List[TaskDefinition] = []
@@ -246,13 +302,11 @@ class CreateTaskScenario(Scenario):
             if task_defs:
                 for definition in task_defs:
                     try:
-                        name_part, points_part = definition.split(":", 1)
-                        task = TaskDefinition(name=name_part.strip(), points=int(points_part.strip()))
+                        tasks.append(_parse_task_definition(definition))
                     except ValueError as exc:
                         raise typer.BadParameter(
                             "Each --task must be in format 'name:points' with integer points."
                         ) from exc
-                    tasks.append(task)
 
             if not tasks:
                 if not task_name or task_points is None:
@@ -262,11 +316,28 @@ class CreateTaskScenario(Scenario):
                 tasks.append(TaskDefinition(name=task_name, points=task_points))
 
             try:
-                run_scenario(lambda: cls(class_, tasks, subject=subject, category=category))
+                run_scenario(
+                    lambda: cls(
+                        class_,
+                        tasks,
+                        subject=subject,
+                        category=category,
+                        course_catalogue_path=get_course_catalogue_path() if deep_link else None,
+                    )
+                )
             except ScenarioRunnerError as exc:
                 typer.echo(str(exc), err=True)
                 raise typer.Exit(code=1) from exc
 
+
+class AsyncCreateTaskScenario(AsyncScenario, CreateTaskScenario):
+    """Async Playwright variant of `CreateTaskScenario` for `async_runner`.
+
+    Runs the same steps as the sync scenario; the CLI keeps registering the
+    sync `create-task` command.
+    """
+
+
 if __name__ == "__main__":
     # jednoduchý test bez CLI
     run_scenario(lambda: CreateTaskScenario(
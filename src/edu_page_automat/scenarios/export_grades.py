@@ -1,27 +1,101 @@
-"""Scenario for exporting EduPage class grades to a CSV file."""
+"""Scenario for exporting EduPage class grades to CSV files."""
 
 import csv
 from dataclasses import dataclass
 from pathlib import Path
 import re
-from typing import Annotated, List
+from typing import Annotated, Iterable, List
 
+from playwright.sync_api import Error as PlaywrightError
 import typer
 
+from edu_page_automat.course_catalogue import get_course_catalogue_path
+from edu_page_automat.csv_input import open_csv
+from edu_page_automat.edupage_site import get_user_page_url
+from edu_page_automat.job_file import ScenarioJob
 from edu_page_automat.logging_config import setup_logging
-from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenario
-from edu_page_automat.scenarios.base import Scenario
+from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenario, run_scenarios
+from edu_page_automat.scenarios.base import AsyncScenario, Scenario, Steps
+from edu_page_automat.scenarios.navigation import (
+    open_course_deep_link,
+    open_grades_module,
+    remember_course_url,
+    select_course,
+)
 
 logger = setup_logging()
 
-_GRADE_PAGE_URL = "https://1itg.edupage.org/user/"
 _TASK_HEADER_LOCATOR = ".znamkyUdalostHeader"
 _STUDENT_LINK_SELECTOR = 'a[href*="studentid="]'
 _CSV_HEADERS = ["first_name", "last_name", "task_category", "task_name", "points"]
+_COMBINED_CSV_HEADERS = ["class", "subject", *_CSV_HEADERS]
+_COURSE_CLASS_HEADERS = {"class", "class_name", "trida"}
+_COURSE_SUBJECT_HEADERS = {"subject", "predmet"}
+_FILE_NAME_UNSAFE_PATTERN = re.compile(r"[^\w.-]+")
 _POINTS_WITH_MAX_PATTERN = re.compile(r"^(?P<value>m|\d+)\s*[·•]\s*\d+$", re.IGNORECASE)
-
-
-@dataclass(frozen=True)
+# Walks every student row once, indexing its grade cells by `data-pid`/`data-uid`,
+# and returns compact arrays: `tasks` as `[name, category]`, `students` as
+# display names, and `points[student][task]` with `null` where a row has no cell.
+_GRADE_EXPORT_SCRIPT = """() => {
+    const normalize = (value) => value.replace(/\\s+/g, " ").trim();
+    const gradeValueFromCell = (cell) => {
+        for (const input of cell.querySelectorAll('input[name^="zn_"]')) {
+            if (input.name !== "znamky[]") {
+                if (input.value) {
+                    return input.value;
+                }
+                break;
+            }
+        }
+
+        const editableInput = cell.querySelector('input[name^="nzn_"]');
+        if (editableInput && editableInput.value) {
+            return editableInput.value;
+        }
+
+        return normalize(cell.textContent || "");
+    };
+
+    const tasks = [];
+    const taskKeys = [];
+    for (const header of document.querySelectorAll(".znamkyUdalostHeader")) {
+        const name = normalize(header.querySelector(".znHeaderUdalost")?.textContent || "");
+        const subjectId = header.getAttribute("data-pid");
+        const taskUid = header.getAttribute("data-uid");
+        if (name && subjectId && taskUid) {
+            tasks.push([name, normalize(header.querySelector(".znHeaderKategoria")?.textContent || "")]);
+            taskKeys.push(`${subjectId}|${taskUid}`);
+        }
+    }
+
+    const students = [];
+    const points = [];
+    for (const studentLink of document.querySelectorAll('a[href*="studentid="]')) {
+        const tableRow = studentLink.closest("tr");
+        if (!tableRow) {
+            continue;
+        }
+
+        const cellsByKey = new Map();
+        for (const cell of tableRow.querySelectorAll(".znEditTd")) {
+            const key = `${cell.getAttribute("data-pid")}|${cell.getAttribute("data-uid")}`;
+            if (!cellsByKey.has(key)) {
+                cellsByKey.set(key, cell);
+            }
+        }
+
+        students.push(normalize(studentLink.textContent || ""));
+        points.push(taskKeys.map((key) => {
+            const cell = cellsByKey.get(key);
+            return cell ? gradeValueFromCell(cell) : null;
+        }));
+    }
+
+    return { tasks, students, points };
+}"""
+
+
+@dataclass(frozen=True, slots=True)
 class GradeExportRow:
     """Single exported EduPage grade-table cell."""
 
@@ -32,6 +106,43 @@ class GradeExportRow:
     points: str
 
 
+@dataclass(frozen=True)
+class ExportCourse:
+    """One EduPage class/subject course selected for export."""
+
+    class_: str
+    subject: str
+
+    @property
+    def label(self) -> str:
+        """Return a short human-readable course label."""
+        return f"{self.class_} / {self.subject}"
+
+    @property
+    def file_name(self) -> str:
+        """Return the per-course CSV file name used with `--output-dir`."""
+        return f"{_FILE_NAME_UNSAFE_PATTERN.sub('_', f'{self.class_}_{self.subject}').strip('_')}.csv"
+
+
+def _load_courses_from_csv(csv_path: Path, default_subject: str) -> List[ExportCourse]:
+    """Load export courses from a CSV file with a `class` and optional `subject` column."""
+    with open_csv(csv_path) as reader:
+        class_column = reader.find_column(_COURSE_CLASS_HEADERS)
+        subject_column = reader.find_column(_COURSE_SUBJECT_HEADERS)
+        if class_column is None:
+            raise ValueError("Course list CSV header must contain a 'class' column and may contain 'subject'")
+
+        courses: List[ExportCourse] = []
+        for row_index, (class_name, subject) in reader.records(class_column, subject_column):
+            if not class_name:
+                raise ValueError(f"Row {row_index}: missing class name")
+            courses.append(ExportCourse(class_name, subject or default_subject))
+
+    if not courses:
+        raise ValueError(f"Course list {csv_path} did not contain any courses")
+    return courses
+
+
 def _split_student_display_name(display_name: str) -> tuple[str, str]:
     """Split an EduPage student label from `Last, First` into first and last names."""
     last_name, separator, first_name = display_name.partition(",")
@@ -57,6 +168,57 @@ def _write_grade_rows_to_csv(csv_path: Path, rows: list[GradeExportRow]) -> None
             )
 
 
+def _write_combined_grade_rows_to_csv(
+    csv_path: Path,
+    course_rows: list[tuple[ExportCourse, list[GradeExportRow]]],
+) -> None:
+    """Write rows of several courses to one UTF-8 CSV file with class and subject columns."""
+    with csv_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=_COMBINED_CSV_HEADERS)
+        writer.writeheader()
+        for course, rows in course_rows:
+            for row in rows:
+                writer.writerow(
+                    {
+                        "class": course.class_,
+                        "subject": course.subject,
+                        "first_name": row.first_name,
+                        "last_name": row.last_name,
+                        "task_category": row.task_category,
+                        "task_name": row.task_name,
+                        "points": row.points,
+                    }
+                )
+
+
+def write_export_output(
+    course_rows: list[tuple[ExportCourse, list[GradeExportRow]]],
+    *,
+    output_csv: Path | None = None,
+    output_dir: Path | None = None,
+    combined: bool = False,
+) -> None:
+    """Write exported course rows to one CSV file or to one file per course in `output_dir`.
+
+    With `output_csv`, a single course uses the `fill-grades`-compatible layout
+    unless `combined` asks for the class and subject columns.
+    """
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for course, rows in course_rows:
+            _write_grade_rows_to_csv(output_dir / course.file_name, rows)
+        logger.info("Wrote {} course CSV files to {}", len(course_rows), output_dir)
+        return
+    if output_csv is None:
+        raise ValueError("Provide an output CSV file or an output directory")
+
+    if combined:
+        _write_combined_grade_rows_to_csv(output_csv, course_rows)
+    else:
+        _write_grade_rows_to_csv(output_csv, course_rows[0][1] if course_rows else [])
+    logger.info("Wrote grade export to {}", output_csv)
+
+
 def _normalize_exported_points(points: str) -> str:
     """Normalize EduPage grade-cell text into `fill-grades`-compatible values."""
     normalized_points = " ".join(points.split())
@@ -72,124 +234,156 @@ def _normalize_exported_points(points: str) -> str:
     return normalized_points
 
 
+def _grade_rows_from_payload(payload: dict) -> List[GradeExportRow]:
+    """Expand the compact extraction payload into export rows in student, then task order."""
+    tasks = [(name, category) for name, category in payload.get("tasks", [])]
+    rows: List[GradeExportRow] = []
+    for student_name, student_points in zip(payload.get("students", []), payload.get("points", [])):
+        first_name, last_name = _split_student_display_name(student_name)
+        for (task_name, task_category), points in zip(tasks, student_points):
+            if points is None:
+                continue
+            rows.append(
+                GradeExportRow(
+                    first_name=first_name,
+                    last_name=last_name,
+                    task_category=task_category,
+                    task_name=task_name,
+                    points=_normalize_exported_points(points),
+                )
+            )
+    return rows
+
+
 class ExportGradesScenario(Scenario):
-    """Export all visible class grade-table cells for one EduPage course."""
+    """Export all visible grade-table cells for one or more EduPage courses."""
 
     def __init__(
         self,
-        class_: str,
-        output_csv: Path,
+        class_: str | None,
+        output_csv: Path | None,
         subject: str = "Informatika",
         task_category: str | None = None,
+        *,
+        courses: Iterable[ExportCourse] | None = None,
+        output_dir: Path | None = None,
+        course_catalogue_path: Path | None = None,
     ):
-        """Initialize the target class, subject, and output CSV path."""
-        self.class_ = class_
-        self.subject = subject
+        """Initialize the target courses and the output CSV file or per-course directory.
+
+        `courses` replaces the single `class_`/`subject` pair. A single course is
+        written to `output_csv` in the `fill-grades`-compatible layout; several
+        courses go to one combined CSV with `class` and `subject` columns, or to
+        one file per course in `output_dir`. Without either output the rows are
+        only kept in `exported` for the caller. With `course_catalogue_path`,
+        recorded Známky URLs replace the course switcher navigation.
+        """
+        self.courses: List[ExportCourse] = list(courses) if courses is not None else [ExportCourse(class_, subject)]
+        if not self.courses:
+            raise ValueError("At least one course must be provided")
+        if output_csv is not None and output_dir is not None:
+            raise ValueError("Provide at most one of an output CSV file or an output directory")
+        self.class_ = self.courses[0].class_
+        self.subject = self.courses[0].subject
         self.output_csv = output_csv
+        self.output_dir = output_dir
+        self.course_catalogue_path = course_catalogue_path
         self.task_category = task_category.strip() if task_category else None
+        self.exported: list[tuple[ExportCourse, list[GradeExportRow]]] = []
+
+    def steps(self, page) -> Steps:
+        """Export every course in the current session and write the CSV output."""
+        exported = self.exported = []
+        failures: list[str] = []
+        for course in self.courses:
+            try:
+                exported.append((course, (yield from self._export_course(page, course))))
+            except (ValueError, PlaywrightError) as exc:
+                self._record_course_failure(course, exc, failures)
 
-    def run(self, page):
-        """Select the target course, extract visible grade rows, and write the CSV file."""
-        page.goto(_GRADE_PAGE_URL, wait_until="domcontentloaded")
-        self._select_course(page)
-        page.locator("a.edubarCourseModuleLink", has_text="Známky").click()
-        page.wait_for_selector(_TASK_HEADER_LOCATOR, state="attached", timeout=15000)
+        self._finish_export(exported, failures)
 
-        rows = self._extract_grade_rows(page)
-        _write_grade_rows_to_csv(self.output_csv, rows)
+    def _record_course_failure(
+        self,
+        course: ExportCourse,
+        exc: ValueError | PlaywrightError,
+        failures: list[str],
+    ) -> None:
+        """Re-raise a single-course failure, or log and collect it when exporting several courses.
+
+        Playwright errors count as course failures too: a misspelled course
+        times out in the course switcher, and the remaining courses still run.
+        """
+        if len(self.courses) == 1:
+            raise exc
+        logger.error("Grade export failed for {}: {}", course.label, exc)
+        failures.append(f"{course.label}: {exc}")
+
+    def _finish_export(self, exported: list[tuple[ExportCourse, list[GradeExportRow]]], failures: list[str]) -> None:
+        """Write the collected output and report courses that failed."""
+        if self.output_csv is not None or self.output_dir is not None:
+            with self.span("write_csv", rows=sum(len(rows) for _, rows in exported)):
+                self._write_output(exported)
+
+        if failures:
+            raise ValueError(
+                f"Grade export failed for {len(failures)} of {len(self.courses)} courses: " + "; ".join(failures)
+            )
 
+    def _export_course(self, page, course: ExportCourse) -> Steps:
+        """Open one course's grade table and extract its rows."""
+        with self.span("deep_link", class_=course.class_, subject=course.subject):
+            deep_linked = yield from open_course_deep_link(
+                page, self.course_catalogue_path, course.class_, course.subject, _TASK_HEADER_LOCATOR
+            )
+        if not deep_linked:
+            with self.span("navigate"):
+                yield page.goto(get_user_page_url(), wait_until="domcontentloaded")
+            with self.span("select_course", class_=course.class_, subject=course.subject):
+                yield from self._select_course(page, course)
+            with self.span("load_table"):
+                yield from open_grades_module(page)
+                yield page.wait_for_selector(_TASK_HEADER_LOCATOR, state="attached", timeout=15000)
+            remember_course_url(page, self.course_catalogue_path, course.class_, course.subject)
+
+        with self.span("extract_rows"):
+            rows = yield from self._extract_grade_rows(page)
+
+        self._log_course_exported(course, rows)
+        return rows
+
+    @staticmethod
+    def _log_course_exported(course: ExportCourse, rows: List[GradeExportRow]) -> None:
+        """Log the number of rows exported for one course."""
         logger.info(
-            "Grade export finished for class {}, subject {} (rows={}, output={})",
-            self.class_,
-            self.subject,
+            "Grade export finished for class {}, subject {} (rows={})",
+            course.class_,
+            course.subject,
             len(rows),
-            self.output_csv,
         )
 
-    def _select_course(self, page):
-        """Select the target class and subject in the EduPage course switcher."""
-        page.locator(".edubarCourseListBtn").click()
-        course = page.locator("div.ecourse-standards-subject-title").filter(
-            has=page.locator("div.className", has_text=self.class_)
-        ).filter(
-            has=page.locator("div.subjectName", has_text=self.subject)
+    def _write_output(self, exported: list[tuple[ExportCourse, list[GradeExportRow]]]) -> None:
+        """Write exported rows to the configured CSV file or per-course files."""
+        write_export_output(
+            exported,
+            output_csv=self.output_csv,
+            output_dir=self.output_dir,
+            combined=len(self.courses) > 1,
         )
-        course.click()
-        logger.debug("Selected subject {} for class {}", self.subject, self.class_)
-
-    def _extract_grade_rows(self, page) -> List[GradeExportRow]:
-        """Read all visible student/task grade cells from the EduPage grade table."""
-        page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
-        raw_rows = page.evaluate(
-            """() => {
-                const normalize = (value) => value.replace(/\\s+/g, " ").trim();
-                const gradeValueFromCell = (cell) => {
-                    const storedInput = Array.from(cell.querySelectorAll('input[name^="zn_"]'))
-                        .find((input) => input.name !== "znamky[]");
-                    if (storedInput && storedInput.value) {
-                        return storedInput.value;
-                    }
-
-                    const editableInput = cell.querySelector('input[name^="nzn_"]');
-                    if (editableInput && editableInput.value) {
-                        return editableInput.value;
-                    }
 
-                    return normalize(cell.textContent || "");
-                };
-
-                const tasks = Array.from(document.querySelectorAll(".znamkyUdalostHeader"))
-                    .map((header) => ({
-                        name: normalize(header.querySelector(".znHeaderUdalost")?.textContent || ""),
-                        category: normalize(header.querySelector(".znHeaderKategoria")?.textContent || ""),
-                        subjectId: header.getAttribute("data-pid"),
-                        taskUid: header.getAttribute("data-uid"),
-                    }))
-                    .filter((task) => task.name && task.subjectId && task.taskUid);
-
-                const rows = [];
-                for (const studentLink of document.querySelectorAll('a[href*="studentid="]')) {
-                    const tableRow = studentLink.closest("tr");
-                    if (!tableRow) {
-                        continue;
-                    }
+    def _select_course(self, page, course: ExportCourse) -> Steps:
+        """Select the target class and subject in the EduPage course switcher."""
+        yield from select_course(page, course.class_, course.subject)
 
-                    const studentName = normalize(studentLink.textContent || "");
-                    for (const task of tasks) {
-                        const gradeCell = Array.from(tableRow.querySelectorAll(".znEditTd"))
-                            .find((cell) => (
-                                cell.getAttribute("data-pid") === task.subjectId
-                                && cell.getAttribute("data-uid") === task.taskUid
-                            ));
-                        if (!gradeCell) {
-                            continue;
-                        }
-
-                        rows.push({
-                            studentName,
-                            taskCategory: task.category,
-                            taskName: task.name,
-                            points: gradeValueFromCell(gradeCell),
-                        });
-                    }
-                }
+    def _extract_grade_rows(self, page) -> Steps:
+        """Read all visible student/task grade cells from the EduPage grade table."""
+        yield page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
+        payload = yield page.evaluate(_GRADE_EXPORT_SCRIPT)
+        return self._rows_from_payload(payload)
 
-                return rows;
-            }"""
-        )
-
-        rows: List[GradeExportRow] = []
-        for raw_row in raw_rows:
-            first_name, last_name = _split_student_display_name(raw_row["studentName"])
-            rows.append(
-                GradeExportRow(
-                    first_name=first_name,
-                    last_name=last_name,
-                    task_category=raw_row["taskCategory"],
-                    task_name=raw_row["taskName"],
-                    points=_normalize_exported_points(raw_row["points"]),
-                )
-            )
+    def _rows_from_payload(self, payload: dict) -> List[GradeExportRow]:
+        """Expand the extraction payload and apply the task-category filter."""
+        rows = _grade_rows_from_payload(payload)
 
         if not rows:
             raise ValueError("No grade rows were found in the current EduPage grade table")
@@ -203,35 +397,177 @@ class ExportGradesScenario(Scenario):
 
         return filtered_rows
 
+    @classmethod
+    def from_job(cls, job: ScenarioJob) -> "ExportGradesScenario":
+        """Build the scenario from a `run-jobs` job with `export-grades` options.
+
+        `class` may list several classes; `courses-file` adds CSV course rows.
+        """
+        job.check_options({"class", "courses-file", "output-csv", "output-dir", "subject", "task-category", "deep-link"})
+        subject = job.text("subject", "Informatika")
+        courses = [ExportCourse(class_name, subject) for class_name in job.text_list("class")]
+        courses_file = job.path("courses-file")
+        if courses_file:
+            courses.extend(_load_courses_from_csv(courses_file, subject))
+        if not courses:
+            raise ValueError("Provide at least one class or a courses-file")
+        output_csv = job.path("output-csv")
+        output_dir = job.path("output-dir")
+        if (output_csv is None) == (output_dir is None):
+            raise ValueError("Provide exactly one of output-csv or output-dir")
+        return cls(
+            None,
+            output_csv,
+            task_category=job.text("task-category"),
+            courses=courses,
+            output_dir=output_dir,
+            course_catalogue_path=get_course_catalogue_path() if job.flag("deep-link", True) else None,
+        )
+
     @classmethod
     def register_cli(cls, cli_group):
         """Register the `export-grades` command on the provided Typer app."""
 
         @cli_group.command("export-grades")
         def run_export_grades(
-            class_: Annotated[str, typer.Option(..., "--class", help="Class name (e.g., 2.png)")],
+            classes: Annotated[
+                list[str] | None,
+                typer.Option("--class", help="Class name (e.g., 2.png). Repeat to export several classes."),
+            ] = None,
+            courses_file: Annotated[
+                Path | None,
+                typer.Option(
+                    "--courses-file",
+                    exists=True,
+                    file_okay=True,
+                    dir_okay=False,
+                    help="CSV file with a 'class' column and an optional 'subject' column.",
+                ),
+            ] = None,
             output_csv: Annotated[
-                Path,
+                Path | None,
                 typer.Option(
-                    ...,
                     "--output-csv",
                     file_okay=True,
                     dir_okay=False,
-                    help="Path where the exported grade CSV should be written.",
+                    help="Path where the exported grade CSV should be written. Several courses add class/subject columns.",
                 ),
-            ],
+            ] = None,
+            output_dir: Annotated[
+                Path | None,
+                typer.Option(
+                    "--output-dir",
+                    file_okay=False,
+                    dir_okay=True,
+                    help="Directory for one exported grade CSV per course.",
+                ),
+            ] = None,
             subject: Annotated[
                 str,
-                typer.Option("--subject", help="Subject name in EduPage course list", show_default=True),
+                typer.Option(
+                    "--subject",
+                    help="Subject name in EduPage course list, used for --class and course rows without a subject",
+                    show_default=True,
+                ),
             ] = "Informatika",
             task_category: Annotated[
                 str | None,
                 typer.Option("--task-category", help="Only export tasks from this EduPage task category."),
             ] = None,
+            workers: Annotated[
+                int,
+                typer.Option(
+                    "--workers",
+                    min=1,
+                    help="Number of browser contexts exporting courses in parallel.",
+                    show_default=True,
+                ),
+            ] = 1,
+            deep_link: Annotated[
+                bool,
+                typer.Option(
+                    "--deep-link/--no-deep-link",
+                    help="Open recorded Známky URLs directly instead of navigating through the course switcher.",
+                    show_default=True,
+                ),
+            ] = True,
         ):
-            """Export visible EduPage class grades to a CSV file."""
+            """Export visible EduPage class grades to CSV, for one or many courses in one browser session."""
+            courses = [ExportCourse(class_name, subject) for class_name in classes or []]
+            if courses_file:
+                try:
+                    courses.extend(_load_courses_from_csv(courses_file, subject))
+                except ValueError as exc:
+                    raise typer.BadParameter(str(exc)) from exc
+            if not courses:
+                raise typer.BadParameter("Provide at least one --class or a --courses-file.")
+            if (output_csv is None) == (output_dir is None):
+                raise typer.BadParameter("Provide exactly one of --output-csv or --output-dir.")
+
+            course_catalogue_path = get_course_catalogue_path() if deep_link else None
+            if workers > 1 and len(courses) > 1:
+                cls._run_parallel(courses, task_category, workers, output_csv, output_dir, course_catalogue_path)
+                return
+
             try:
-                run_scenario(lambda: cls(class_, output_csv, subject=subject, task_category=task_category))
+                run_scenario(
+                    lambda: cls(
+                        None,
+                        output_csv,
+                        task_category=task_category,
+                        courses=courses,
+                        output_dir=output_dir,
+                        course_catalogue_path=course_catalogue_path,
+                    )
+                )
             except ScenarioRunnerError as exc:
                 typer.echo(str(exc), err=True)
                 raise typer.Exit(code=1) from exc
+
+    @classmethod
+    def _run_parallel(
+        cls,
+        courses: List[ExportCourse],
+        task_category: str | None,
+        workers: int,
+        output_csv: Path | None,
+        output_dir: Path | None,
+        course_catalogue_path: Path | None = None,
+    ) -> None:
+        """Export each course as its own job on a pool of browser contexts and write the output."""
+        try:
+            results = run_scenarios(
+                [
+                    lambda course=course: cls(
+                        None,
+                        None,
+                        task_category=task_category,
+                        courses=[course],
+                        course_catalogue_path=course_catalogue_path,
+                    )
+                    for course in courses
+                ],
+                workers=workers,
+            )
+        except ScenarioRunnerError as exc:
+            typer.echo(str(exc), err=True)
+            raise typer.Exit(code=1) from exc
+
+        exported = [course_rows for result in results if result.ok for course_rows in result.scenario.exported]
+        write_export_output(exported, output_csv=output_csv, output_dir=output_dir, combined=True)
+
+        failures = [f"{courses[result.index].label}: {result.error}" for result in results if not result.ok]
+        if failures:
+            typer.echo(
+                f"Grade export failed for {len(failures)} of {len(courses)} courses: " + "; ".join(failures),
+                err=True,
+            )
+            raise typer.Exit(code=1)
+
+
+class AsyncExportGradesScenario(AsyncScenario, ExportGradesScenario):
+    """Async Playwright variant of `ExportGradesScenario` for `async_runner`.
+
+    Runs the same steps as the sync scenario; the CLI keeps registering the
+    sync `export-grades` command.
+    """
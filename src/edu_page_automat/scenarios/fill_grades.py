@@ -1,52 +1,319 @@
 """Scenario for filling EduPage grade points from CSV rows."""
 
 import csv
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+import sys
+import time
 from typing import Annotated, Iterable, List, TypeAlias
+from urllib.parse import urlsplit
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 import typer
 
+from edu_page_automat.course_catalogue import get_course_catalogue_path
+from edu_page_automat.csv_input import (
+    FIRST_NAME_HEADERS,
+    LAST_NAME_HEADERS,
+    POINTS_HEADERS,
+    TASK_NAME_HEADERS,
+    open_csv,
+)
+from edu_page_automat.edupage_site import get_user_page_url
+from edu_page_automat.fill_journal import (
+    SavedCell,
+    clear_saved_cells,
+    get_fill_journal_path,
+    read_saved_cells,
+    record_saved_cells,
+)
+from edu_page_automat.id_cache import (
+    CourseIds,
+    get_id_cache_path,
+    invalidate_course_ids,
+    new_course_ids,
+    read_course_ids,
+    record_course_ids,
+)
+from edu_page_automat.job_file import ScenarioJob
 from edu_page_automat.logging_config import setup_logging
 from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenario
-from edu_page_automat.scenarios.base import Scenario
+from edu_page_automat.scenarios.base import AsyncScenario, ExpectResponse, Scenario, Steps
+from edu_page_automat.scenarios.navigation import (
+    open_course_deep_link,
+    open_grades_module,
+    remember_course_url,
+    select_course,
+)
 
 logger = setup_logging()
 
-_CSV_SAMPLE_SIZE = 2048
-_GRADE_PAGE_URL = "https://1itg.edupage.org/user/"
 _TASK_HEADER_LOCATOR = ".znamkyUdalostHeader"
 _SAVE_BUTTON_LOCATOR = "a.ulozitBtn"
+_SAVE_CONFIRM_BUTTON_NAME = "Uložit"
+_SAVE_REQUEST_PATH_PREFIX = "/znamky/"
+_SAVE_TIMEOUT = 15000
 _STUDENT_LINK_SELECTOR = 'a[href*="studentid="]'
+_AVAILABLE_NAMES_SAMPLE_SIZE = 10
+_VERIFY_REPORT_HEADERS = ["jmeno", "prijmeni", "jmeno_ulohy", "pozadovany_pocet_bodu", "ulozeny_pocet_bodu"]
+_GRADE_TABLE_INDEX_SCRIPT = """() => {
+    const normalize = (value) => value.replace(/\\s+/g, " ").trim();
+    const students = {};
+    for (const link of document.querySelectorAll('a[href*="studentid="]')) {
+        const name = normalize(link.textContent || "");
+        if (name) {
+            (students[name] ||= []).push(link.getAttribute("href") || "");
+        }
+    }
+
+    const tasks = {};
+    for (const header of document.querySelectorAll(".znamkyUdalostHeader")) {
+        const name = normalize(header.querySelector(".znHeaderUdalost")?.textContent || "");
+        if (name) {
+            (tasks[name] ||= []).push([header.getAttribute("data-pid") || "", header.getAttribute("data-uid") || ""]);
+        }
+    }
+
+    const storedValues = {};
+    for (const field of document.querySelectorAll('input[name^="zn_"]')) {
+        if (field.value) {
+            storedValues[field.name] = field.value;
+        }
+    }
+
+    return { url: window.location.href, students, tasks, storedValues };
+}"""
+# Used with cached ids: reads only the stored values of the target cells, lists
+# target cells whose stored or editor input is absent, and counts students and
+# tasks, so a changed table shape or a recreated task or student invalidates the cache.
+_GRADE_TABLE_SHAPE_SCRIPT = """(storedInputNames) => {
+    const hasText = (element) => (element?.textContent || "").trim() !== "";
+    const storedValues = {};
+    const missingInputs = [];
+    for (const name of storedInputNames) {
+        const field = document.getElementsByName(name)[0];
+        if (!field || !document.getElementsByName(`n${name}`)[0]) {
+            missingInputs.push(name);
+        } else if (field.value) {
+            storedValues[name] = field.value;
+        }
+    }
+
+    return {
+        url: window.location.href,
+        students: Array.from(document.querySelectorAll('a[href*="studentid="]')).filter(hasText).length,
+        tasks: Array.from(document.querySelectorAll(".znamkyUdalostHeader"))
+            .filter((header) => hasText(header.querySelector(".znHeaderUdalost"))).length,
+        storedValues,
+        missingInputs,
+    };
+}"""
+# Counts finished POST fetch/XHR requests to the Známky module from now on, the
+# requests `_is_grade_save_response` accepts, so an unrelated GET finishing
+# before the confirmation dialog renders is not taken for the save. The
+# `fetch` and `XMLHttpRequest` hooks are installed once per page; later calls
+# only reset the count.
+_WATCH_SAVE_REQUESTS_SCRIPT = """(pathPrefix) => {
+    const installed = window.__edupageSaveWatch;
+    const watch = installed || { finished: 0, pathPrefix };
+    watch.finished = 0;
+    watch.pathPrefix = pathPrefix;
+    if (installed) {
+        return;
+    }
+    window.__edupageSaveWatch = watch;
+    const isSaveRequest = (method, url) => {
+        try {
+            return String(method || "GET").toUpperCase() === "POST"
+                && new URL(String(url), window.location.href).pathname.startsWith(watch.pathPrefix);
+        } catch {
+            return false;
+        }
+    };
+    const countFinished = () => {
+        watch.finished += 1;
+    };
+
+    const originalFetch = window.fetch;
+    window.fetch = function (input, init) {
+        const request = input instanceof Request ? input : null;
+        const isSave = isSaveRequest(init?.method || request?.method, request ? request.url : input);
+        const result = originalFetch.apply(this, arguments);
+        if (isSave) {
+            result.then(countFinished, countFinished);
+        }
+        return result;
+    };
+
+    const originalOpen = XMLHttpRequest.prototype.open;
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__edupageSaveRequest = isSaveRequest(method, url);
+        return originalOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        if (this.__edupageSaveRequest) {
+            this.addEventListener("loadend", countFinished, { once: true });
+        }
+        return originalSend.apply(this, arguments);
+    };
+}"""
+# Resolves once the optional save confirmation dialog is visible or a watched
+# save request has finished, so neither case waits for a fixed timeout.
+_SAVE_PROMPT_SCRIPT = """(confirmName) => {
+    for (const button of document.querySelectorAll('button, [role="button"]')) {
+        if ((button.textContent || "").trim() === confirmName && button.getClientRects().length > 0) {
+            return "confirm";
+        }
+    }
+    return window.__edupageSaveWatch?.finished ? "saved" : false;
+}"""
+_STORED_GRADE_VALUES_SCRIPT = """() => Object.fromEntries(
+    Array.from(document.querySelectorAll('input[name^="zn_"]'), (field) => [field.name, field.value])
+        .filter(([, value]) => value)
+)"""
+_BATCH_FILL_SCRIPT = """(cells) => cells.map(({ name, value }) => {
+    const field = document.getElementsByName(name)[0];
+    if (!field) {
+        return { name, found: false, value: "" };
+    }
+
+    field.focus();
+    field.value = value;
+    field.dispatchEvent(new Event("input", { bubbles: true }));
+    field.dispatchEvent(new Event("change", { bubbles: true }));
+    field.blur();
+    return { name, found: true, value: field.value };
+})"""
+_EDITED_GRADE_VALUES_SCRIPT = """({ storedInputName, editorInputName }) => {
+    const storedField = document.querySelector(`input[name="${storedInputName}"]`);
+    const editorField = document.querySelector(`input[name="${editorInputName}"]`);
+    return {
+        stored: storedField ? storedField.value : "",
+        editor: editorField ? editorField.value : "",
+    };
+}"""
 GradeValue: TypeAlias = int | str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GradeEntry:
-    """Single student grade entry parsed from CSV input."""
+    """Single student grade entry parsed from CSV input.
+
+    Like `GradeRow`, entries intern their names and build the EduPage
+    grade-table student label, `student_display_name`, once.
+    """
 
     first_name: str
     last_name: str
     task_name: str
     points: GradeValue
+    student_display_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Intern the student and task names and store the grade-table student label."""
+        object.__setattr__(self, "first_name", sys.intern(self.first_name))
+        object.__setattr__(self, "last_name", sys.intern(self.last_name))
+        object.__setattr__(self, "task_name", sys.intern(self.task_name))
+        object.__setattr__(self, "student_display_name", sys.intern(f"{self.last_name}, {self.first_name}"))
+
+    @property
+    def journal_cell(self) -> SavedCell:
+        """Return the `(student, task, points)` cell recorded in the fill journal once saved."""
+        return (self.student_display_name, self.task_name, str(self.points))
+
+
+@dataclass(frozen=True)
+class GradeFillTarget:
+    """Grade entry resolved to its EduPage grade-table cell."""
+
+    entry: GradeEntry
+    grade_key: str
+    current_value: str
 
     @property
-    def student_display_name(self) -> str:
-        """Return the EduPage grade-table student label."""
-        return f"{self.last_name}, {self.first_name}"
+    def stored_input_name(self) -> str:
+        """Return the hidden input name holding the stored EduPage grade."""
+        return f"zn_{self.grade_key}"
 
+    @property
+    def editor_input_name(self) -> str:
+        """Return the visible editor input name used to enter a grade."""
+        return f"nzn_{self.grade_key}"
 
-def _normalize_header(header: str) -> str:
-    """Normalize CSV header text for flexible column matching."""
-    return header.strip().casefold().replace(" ", "_").replace("-", "_")
 
+@dataclass(frozen=True)
+class GradeTableIndex:
+    """Snapshot of grade-table student ids, task identifiers, and stored grade values."""
 
-def _find_header(fieldnames: list[str], accepted_names: set[str], label: str) -> str:
-    """Find a required CSV header by accepted normalized names."""
-    for fieldname in fieldnames:
-        if _normalize_header(fieldname) in accepted_names:
-            return fieldname
-    raise ValueError(f"CSV header must contain a column for {label}")
+    url: str
+    student_links: dict[str, list[str]]
+    task_identifiers: dict[str, list[tuple[str, str]]]
+    stored_values: dict[str, str]
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "GradeTableIndex":
+        """Build an index from the browser-side grade-table snapshot payload."""
+        return cls(
+            url=payload.get("url", ""),
+            student_links={name: list(hrefs) for name, hrefs in payload.get("students", {}).items()},
+            task_identifiers={
+                name: [(subject_id, task_uid) for subject_id, task_uid in identifiers]
+                for name, identifiers in payload.get("tasks", {}).items()
+            },
+            stored_values=dict(payload.get("storedValues", {})),
+        )
+
+    @classmethod
+    def from_course_ids(cls, url: str, course_ids: CourseIds, stored_values: dict[str, str]) -> "GradeTableIndex":
+        """Build an index from cached course ids and the stored values read from the page."""
+        return cls(
+            url=url,
+            student_links={name: [f"?studentid={student_id}"] for name, student_id in course_ids.students.items()},
+            task_identifiers={name: [identifiers] for name, identifiers in course_ids.tasks.items()},
+            stored_values=dict(stored_values),
+        )
+
+    def student_id(self, entry: GradeEntry) -> str:
+        """Return the EduPage student id for a CSV grade entry."""
+        matches = self.student_links.get(entry.student_display_name, [])
+        if len(matches) != 1:
+            raise ValueError(
+                f"Expected one student named {entry.student_display_name}, found {len(matches)}. "
+                f"Current URL: {self.url}. Available students include: {self._sample(self.student_links)}"
+            )
+
+        href = matches[0]
+        marker = "studentid="
+        if marker not in href:
+            raise ValueError(f"Could not read student id for {entry.student_display_name}")
+
+        return href.split(marker, 1)[1].split("&", 1)[0]
+
+    def task_ids(self, task_name: str) -> tuple[str, str]:
+        """Return subject id and task uid for an existing grade-table task."""
+        matches = self.task_identifiers.get(task_name, [])
+        if len(matches) != 1:
+            raise ValueError(
+                f"Expected one task named {task_name}, found {len(matches)}. "
+                f"Current URL: {self.url}. Available tasks include: {self._sample(self.task_identifiers)}"
+            )
+
+        subject_id, task_uid = matches[0]
+        if not subject_id or not task_uid:
+            raise ValueError(f"Could not read identifiers for task {task_name}")
+
+        return subject_id, task_uid
+
+    def stored_value(self, input_name: str) -> str:
+        """Return the current stored EduPage grade value for an existing grade field."""
+        return self.stored_values.get(input_name, "")
+
+    @staticmethod
+    def _sample(names: dict) -> str:
+        """Return a short sample of indexed names for diagnostics."""
+        sample = list(names)[:_AVAILABLE_NAMES_SAMPLE_SIZE]
+        return ", ".join(sample) if sample else "(none)"
 
 
 def _parse_grade_value(value: str, row_index: int) -> GradeValue:
@@ -68,34 +335,19 @@ def _load_grade_entries_from_csv(csv_path: Path) -> List[GradeEntry]:
 
     logger.debug("Loading grades from CSV {}", csv_path)
 
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        sample = handle.read(_CSV_SAMPLE_SIZE)
-        handle.seek(0)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
-        except (csv.Error, TypeError):
-            dialect = csv.excel
-
-        reader = csv.DictReader(handle, dialect=dialect)
+    with open_csv(csv_path) as reader:
         if not reader.fieldnames:
             raise ValueError("CSV must include a header")
 
-        first_name_header = _find_header(reader.fieldnames, {"first_name", "jmeno", "name"}, "first name")
-        last_name_header = _find_header(reader.fieldnames, {"last_name", "prijmeni", "surname"}, "last name")
-        task_name_header = _find_header(
-            reader.fieldnames,
-            {"task_name", "task", "uloha", "jmeno_ulohy", "nazev_ulohy"},
-            "task name",
+        columns = (
+            reader.column(FIRST_NAME_HEADERS, "first name"),
+            reader.column(LAST_NAME_HEADERS, "last name"),
+            reader.column(TASK_NAME_HEADERS, "task name"),
+            reader.column(POINTS_HEADERS, "points"),
         )
-        points_header = _find_header(reader.fieldnames, {"points", "point", "score", "body", "pocet_bodu"}, "points")
 
         entries: List[GradeEntry] = []
-        for row_index, row in enumerate(reader, start=2):
-            first_name = (row.get(first_name_header) or "").strip()
-            last_name = (row.get(last_name_header) or "").strip()
-            task_name = (row.get(task_name_header) or "").strip()
-            points_value = (row.get(points_header) or "").strip()
-
+        for row_index, (first_name, last_name, task_name, points_value) in reader.records(*columns):
             if not first_name:
                 raise ValueError(f"Row {row_index}: missing first name")
             if not last_name:
@@ -123,6 +375,48 @@ def _load_grade_entries_from_csv(csv_path: Path) -> List[GradeEntry]:
     return entries
 
 
+def _is_grade_save_response(response) -> bool:
+    """Return whether a response answers the POST request that saves the grade table."""
+    request = response.request
+    return request.method == "POST" and urlsplit(response.url).path.startswith(_SAVE_REQUEST_PATH_PREFIX)
+
+
+def _save_timeout_error() -> ValueError:
+    """Return the error raised when EduPage neither asked for confirmation nor answered the save."""
+    return ValueError(f"EduPage did not confirm the grade save within {_SAVE_TIMEOUT / 1000:.0f} s")
+
+
+def _check_save_response(response, started: float) -> None:
+    """Fail when EduPage rejected the grade save, otherwise log how long the save took."""
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not response.ok:
+        raise ValueError(f"EduPage rejected the grade save with HTTP {response.status} from {response.url}")
+    logger.info("EduPage confirmed the grade save in {:.0f} ms", elapsed_ms)
+
+
+def _default_verify_report_path(grades_csv: Path) -> Path:
+    """Return the default mismatch report path written next to the grades CSV."""
+    return grades_csv.with_name(f"{grades_csv.stem}-verify-mismatches{grades_csv.suffix}")
+
+
+def _write_verify_report(report_path: Path, mismatches: list[tuple[GradeEntry, str]]) -> None:
+    """Write grade cells whose stored value differs from the fill plan to a CSV report."""
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with report_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=_VERIFY_REPORT_HEADERS, lineterminator="\n")
+        writer.writeheader()
+        for entry, stored_value in mismatches:
+            writer.writerow(
+                {
+                    "jmeno": entry.first_name,
+                    "prijmeni": entry.last_name,
+                    "jmeno_ulohy": entry.task_name,
+                    "pozadovany_pocet_bodu": entry.points,
+                    "ulozeny_pocet_bodu": stored_value,
+                }
+            )
+
+
 class FillGradesScenario(Scenario):
     """Fill grade-table point inputs for existing EduPage tasks."""
 
@@ -134,32 +428,203 @@ class FillGradesScenario(Scenario):
         period: str = "P2",
         save: bool = True,
         overwrite_existing: bool = False,
+        batch_fill: bool = False,
+        id_cache_path: Path | None = None,
+        course_catalogue_path: Path | None = None,
+        save_every: int | None = None,
+        journal_path: Path | None = None,
+        resume: bool = False,
+        verify: bool = False,
+        verify_report_csv: Path | None = None,
     ):
-        """Initialize the target course, grading period, overwrite mode, and grade entries."""
+        """Initialize the target course, grading period, fill modes, and grade entries.
+
+        With `id_cache_path`, student ids and task identifiers are read from and
+        recorded in the course id cache instead of indexing the whole table.
+        With `course_catalogue_path`, a recorded Známky URL replaces the course
+        switcher navigation. `save_every` saves after each chunk of that many
+        cells; with `journal_path`, every saved chunk is journalled and `resume`
+        skips entries an interrupted earlier run already saved. `verify` reloads
+        the table after saving, compares every stored value with the fill plan
+        in one snapshot, and writes mismatches to `verify_report_csv`.
+        """
+        self._init_fill_options(
+            class_,
+            subject,
+            period,
+            save=save,
+            overwrite_existing=overwrite_existing,
+            batch_fill=batch_fill,
+            id_cache_path=id_cache_path,
+            course_catalogue_path=course_catalogue_path,
+            save_every=save_every,
+            journal_path=journal_path,
+            resume=resume,
+            verify=verify,
+            verify_report_csv=verify_report_csv,
+        )
+        self.entries: List[GradeEntry] = list(entries)
+        if not self.entries:
+            raise ValueError("At least one grade entry must be provided")
+
+    def _init_fill_options(
+        self,
+        class_: str,
+        subject: str,
+        period: str,
+        *,
+        save: bool,
+        overwrite_existing: bool,
+        batch_fill: bool,
+        id_cache_path: Path | None,
+        course_catalogue_path: Path | None,
+        save_every: int | None = None,
+        journal_path: Path | None = None,
+        resume: bool = False,
+        verify: bool = False,
+        verify_report_csv: Path | None = None,
+    ) -> None:
+        """Set the target course and every fill option read by the shared fill helpers.
+
+        Subclasses that build their entries later call this instead of
+        `__init__`, so no helper meets a missing attribute.
+        """
+        if save_every is not None and save_every < 1:
+            raise ValueError("Save interval must be at least 1 cell")
         self.class_ = class_
         self.subject = subject
         self.period = period
         self.save = save
         self.overwrite_existing = overwrite_existing
-        self.entries: List[GradeEntry] = list(entries)
-        if not self.entries:
-            raise ValueError("At least one grade entry must be provided")
+        self.batch_fill = batch_fill
+        self.id_cache_path = id_cache_path
+        self.course_catalogue_path = course_catalogue_path
+        self.save_every = save_every
+        self.journal_path = journal_path
+        self.resume = resume
+        self.verify = verify
+        self.verify_report_csv = verify_report_csv
 
-    def run(self, page):
+    def steps(self, page) -> Steps:
         """Select the target course, fill grade cells, and save changes."""
-        page.goto(_GRADE_PAGE_URL, wait_until="domcontentloaded")
-        self._select_course(page)
-        page.locator("a.edubarCourseModuleLink", has_text="Známky").click()
-        page.wait_for_selector(_TASK_HEADER_LOCATOR, state="attached", timeout=15000)
+        if not self._start_journal():
+            return
+        yield from self._open_grade_table(page)
+        with self.span("index_table"):
+            index = yield from self._read_grade_table_index(page)
 
         filled = 0
+        for chunk in self._entry_chunks():
+            filled += yield from self._fill_entries(page, index, chunk)
+            if self.save:
+                with self.span("save", cells=len(chunk)):
+                    yield from self._save_changes(page)
+                self._journal_saved_chunk(chunk, filled)
+
+        self._finish_journal()
+        if self.verify and self.save:
+            with self.span("verify", cells=len(self.entries)):
+                yield page.reload(wait_until="domcontentloaded")
+                yield page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
+                stored_values = yield page.evaluate(_STORED_GRADE_VALUES_SCRIPT)
+                self._check_saved_values(index, stored_values)
+        self._log_finished(filled)
+
+    def _check_saved_values(self, index: GradeTableIndex, stored_values: dict[str, str]) -> None:
+        """Compare stored grade values with the fill plan and report mismatching cells."""
+        mismatches = []
         for entry in self.entries:
-            self._fill_grade_entry(page, entry)
-            filled += 1
+            stored_value = stored_values.get(f"zn_{self._grade_key(index, entry)}", "")
+            if stored_value.strip().casefold() != str(entry.points).casefold():
+                mismatches.append((entry, stored_value))
 
-        if self.save:
-            self._save_changes(page)
+        if not mismatches:
+            logger.info("Verified {} saved grade cells", len(self.entries))
+            return
+        if self.verify_report_csv is not None:
+            _write_verify_report(self.verify_report_csv, mismatches)
+        raise ValueError(
+            f"{len(mismatches)} of {len(self.entries)} grade cells did not keep the filled value after saving"
+            + (f"; see {self.verify_report_csv}" if self.verify_report_csv is not None else "")
+        )
 
+    def _start_journal(self) -> bool:
+        """Skip journalled entries when resuming, or drop a stale journal, and return whether work is left."""
+        if self.journal_path is None:
+            return True
+        if not self.resume:
+            clear_saved_cells(self.journal_path, self.class_, self.subject, self.period)
+            return True
+
+        saved_cells = read_saved_cells(self.journal_path, self.class_, self.subject, self.period)
+        pending = [entry for entry in self.entries if entry.journal_cell not in saved_cells]
+        logger.info(
+            "Resuming grade fill: skipping {} journalled entries, {} left",
+            len(self.entries) - len(pending),
+            len(pending),
+        )
+        self.entries = pending
+        if pending:
+            return True
+        clear_saved_cells(self.journal_path, self.class_, self.subject, self.period)
+        logger.info("Every grade entry was saved by an earlier run; nothing left to fill")
+        return False
+
+    def _entry_chunks(self) -> list[List[GradeEntry]]:
+        """Split entries into the chunks filled and saved together."""
+        size = self.save_every or len(self.entries)
+        return [self.entries[start:start + size] for start in range(0, len(self.entries), size)]
+
+    def _journal_saved_chunk(self, chunk: List[GradeEntry], saved: int) -> None:
+        """Record a saved chunk in the journal and log the save progress."""
+        if self.journal_path is not None:
+            record_saved_cells(
+                self.journal_path,
+                self.class_,
+                self.subject,
+                self.period,
+                (entry.journal_cell for entry in chunk),
+            )
+        if self.save_every:
+            logger.info("Saved {} of {} grade cells", saved, len(self.entries))
+
+    def _finish_journal(self) -> None:
+        """Forget the journal of a fill whose every chunk was saved."""
+        if self.save and self.journal_path is not None:
+            clear_saved_cells(self.journal_path, self.class_, self.subject, self.period)
+
+    def _open_grade_table(self, page) -> Steps:
+        """Open the course's Známky grade table through a recorded deep link or the course switcher."""
+        with self.span("deep_link", class_=self.class_, subject=self.subject):
+            deep_linked = yield from open_course_deep_link(
+                page, self.course_catalogue_path, self.class_, self.subject, _TASK_HEADER_LOCATOR
+            )
+        if deep_linked:
+            return
+        with self.span("navigate"):
+            yield page.goto(get_user_page_url(), wait_until="domcontentloaded")
+        with self.span("select_course", class_=self.class_, subject=self.subject):
+            yield from self._select_course(page)
+        with self.span("load_table"):
+            yield from open_grades_module(page)
+            yield page.wait_for_selector(_TASK_HEADER_LOCATOR, state="attached", timeout=15000)
+        remember_course_url(page, self.course_catalogue_path, self.class_, self.subject)
+
+    def _fill_entries(self, page, index: GradeTableIndex, entries: List[GradeEntry]) -> Steps:
+        """Fill entries in one batch call or cell by cell and return the number of filled cells."""
+        if self.batch_fill:
+            targets = [self._resolve_fill_target(index, entry) for entry in entries]
+            with self.span("batch_fill", cells=len(targets)):
+                yield from self._batch_fill_targets(page, targets)
+            return len(targets)
+
+        for entry in entries:
+            with self.span("fill_entry", student=entry.student_display_name, task=entry.task_name):
+                yield from self._fill_grade_entry(page, index, entry)
+        return len(entries)
+
+    def _log_finished(self, filled: int) -> None:
+        """Log the number of filled cells once the run is done."""
         logger.info(
             "Grade fill finished for class {}, subject {}, period {} (filled={}, saved={})",
             self.class_,
@@ -169,58 +634,175 @@ class FillGradesScenario(Scenario):
             self.save,
         )
 
-    def _select_course(self, page):
+    def _select_course(self, page) -> Steps:
         """Select the target class and subject in the EduPage course switcher."""
-        page.locator(".edubarCourseListBtn").click()
-        course = page.locator("div.ecourse-standards-subject-title").filter(
-            has=page.locator("div.className", has_text=self.class_)
-        ).filter(
-            has=page.locator("div.subjectName", has_text=self.subject)
-        )
-        course.click()
-        logger.debug("Selected subject {} for class {}", self.subject, self.class_)
+        yield from select_course(page, self.class_, self.subject)
 
-    def _save_changes(self, page):
-        """Click EduPage save controls and confirm the save dialog when shown."""
+    def _save_changes(self, page) -> Steps:
+        """Click EduPage save controls, confirm the save dialog when shown, and wait for the save response."""
         save_button = page.locator(_SAVE_BUTTON_LOCATOR)
-        save_button.wait_for(state="visible", timeout=10000)
-        save_button.click()
+        yield save_button.wait_for(state="visible", timeout=10000)
+        yield page.evaluate(_WATCH_SAVE_REQUESTS_SCRIPT, _SAVE_REQUEST_PATH_PREFIX)
 
-        confirm_button = page.get_by_role("button", name="Uložit").first
+        started = time.perf_counter()
         try:
-            confirm_button.wait_for(state="visible", timeout=3000)
-        except Exception:
+            response = yield ExpectResponse(
+                page, _is_grade_save_response, _SAVE_TIMEOUT, self._click_save(page, save_button)
+            )
+        except PlaywrightTimeoutError as exc:
+            raise _save_timeout_error() from exc
+        _check_save_response(response, started)
+
+    @staticmethod
+    def _click_save(page, save_button) -> Steps:
+        """Click the save button and confirm the save dialog when EduPage shows one."""
+        yield save_button.click()
+        prompt = yield page.wait_for_function(_SAVE_PROMPT_SCRIPT, arg=_SAVE_CONFIRM_BUTTON_NAME, timeout=_SAVE_TIMEOUT)
+        prompt_kind = yield prompt.json_value()
+        if prompt_kind == "confirm":
+            yield page.get_by_role("button", name=_SAVE_CONFIRM_BUTTON_NAME).first.click()
+
+    def _read_grade_table_index(self, page) -> Steps:
+        """Snapshot student ids, task identifiers, and stored values in one browser call."""
+        yield page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
+        cached = self._cached_course_ids()
+        if cached is not None:
+            snapshot = yield page.evaluate(_GRADE_TABLE_SHAPE_SCRIPT, self._cached_stored_input_names(cached))
+            index = self._index_from_shape_snapshot(cached, snapshot)
+            if index is not None:
+                return index
+
+        payload = yield page.evaluate(_GRADE_TABLE_INDEX_SCRIPT)
+        index = self._index_from_payload(payload)
+        self._remember_course_ids(index)
+        return index
+
+    def _cached_course_ids(self) -> CourseIds | None:
+        """Return cached ids covering every entry, invalidating the course when a lookup misses."""
+        if self.id_cache_path is None:
+            return None
+        cached = read_course_ids(self.id_cache_path, self.class_, self.subject, self.period)
+        if cached is None:
+            logger.debug("No cached ids for class {}, subject {}, period {}", self.class_, self.subject, self.period)
+            return None
+
+        missing = cached.missing_names(
+            (entry.student_display_name for entry in self.entries),
+            (entry.task_name for entry in self.entries),
+        )
+        if missing:
+            logger.info(
+                "Course id cache has no entry for {}; indexing the grade table again",
+                ", ".join(missing[:_AVAILABLE_NAMES_SAMPLE_SIZE]),
+            )
+            invalidate_course_ids(self.id_cache_path, self.class_, self.subject, self.period)
+            return None
+        return cached
+
+    def _cached_stored_input_names(self, cached: CourseIds) -> list[str]:
+        """Return the stored-grade input names of every entry resolved through cached ids."""
+        names = []
+        for entry in self.entries:
+            subject_id, task_uid = cached.tasks[entry.task_name]
+            names.append(f"zn_{cached.students[entry.student_display_name]}_{subject_id}_{task_uid}_{self.period}_1")
+        return list(dict.fromkeys(names))
+
+    def _index_from_shape_snapshot(self, cached: CourseIds, snapshot: dict) -> GradeTableIndex | None:
+        """Return an index from cached ids, or `None` after invalidating them when the table changed.
+
+        Besides a different student or task count, a target cell without its
+        `zn_` or `nzn_` input means a cached id is stale, for example after a
+        task was deleted and recreated under the same name.
+        """
+        missing_inputs = snapshot.get("missingInputs") or []
+        if missing_inputs:
+            logger.info(
+                "Grade table has no input for cached cell(s) {}; indexing the grade table again",
+                ", ".join(missing_inputs[:_AVAILABLE_NAMES_SAMPLE_SIZE]),
+            )
+            invalidate_course_ids(self.id_cache_path, self.class_, self.subject, self.period)
+            return None
+
+        if not cached.matches_shape(snapshot.get("students", -1), snapshot.get("tasks", -1)):
+            logger.info(
+                "Grade table shape changed (students {} -> {}, tasks {} -> {}); indexing the grade table again",
+                cached.student_count,
+                snapshot.get("students"),
+                cached.task_count,
+                snapshot.get("tasks"),
+            )
+            invalidate_course_ids(self.id_cache_path, self.class_, self.subject, self.period)
+            return None
+
+        logger.debug("Resolved grade cells from the course id cache")
+        return GradeTableIndex.from_course_ids(snapshot.get("url", ""), cached, snapshot.get("storedValues", {}))
+
+    def _remember_course_ids(self, index: GradeTableIndex) -> None:
+        """Record the indexed student and task ids in the course id cache."""
+        if self.id_cache_path is None:
             return
-        confirm_button.click()
+        record_course_ids(
+            self.id_cache_path,
+            new_course_ids(self.class_, self.subject, self.period, index.student_links, index.task_identifiers),
+        )
+
+    def _index_from_payload(self, payload: dict) -> GradeTableIndex:
+        """Build and log the grade-table index from the browser snapshot."""
+        index = GradeTableIndex.from_payload(payload)
+        logger.debug(
+            "Indexed grade table (students={}, tasks={}, stored values={})",
+            len(index.student_links),
+            len(index.task_identifiers),
+            len(index.stored_values),
+        )
+        return index
+
+    def _grade_key(self, index: GradeTableIndex, entry: GradeEntry) -> str:
+        """Return the `{student_id}_{subject_id}_{task_uid}_{period}_1` key of an entry's grade cell."""
+        student_id = index.student_id(entry)
+        subject_id, task_uid = index.task_ids(entry.task_name)
+        return f"{student_id}_{subject_id}_{task_uid}_{self.period}_1"
 
-    def _fill_grade_entry(self, page, entry: GradeEntry):
+    def _resolve_fill_target(self, index: GradeTableIndex, entry: GradeEntry) -> GradeFillTarget:
+        """Resolve a CSV entry to its grade cell and enforce existing-grade protection."""
+        grade_key = self._grade_key(index, entry)
+        current_value = index.stored_value(f"zn_{grade_key}")
+
+        if current_value and not self.overwrite_existing:
+            raise ValueError(
+                f"Grade for {entry.student_display_name} in task {entry.task_name} already has value "
+                f"'{current_value}'. Use --overwrite-existing to replace it."
+            )
+
+        return GradeFillTarget(entry=entry, grade_key=grade_key, current_value=current_value)
+
+    def _fill_grade_entry(self, page, index: GradeTableIndex, entry: GradeEntry) -> Steps:
         """Fill one grade-table input identified by student and task names."""
-        student_id = self._student_id_for_entry(page, entry)
-        subject_id, task_uid = self._task_identifiers(page, entry.task_name)
-        grade_key = f"{student_id}_{subject_id}_{task_uid}_{self.period}_1"
-        existing_input_name = f"zn_{grade_key}"
-        current_value = self._current_grade_value(page, existing_input_name)
-
-        if current_value:
-            if not self.overwrite_existing:
-                raise ValueError(
-                    f"Grade for {entry.student_display_name} in task {entry.task_name} already has value "
-                    f"'{current_value}'. Use --overwrite-existing to replace it."
-                )
-            self._overwrite_grade_value(page, existing_input_name, entry.points)
+        target = self._resolve_fill_target(index, entry)
+
+        if target.current_value:
+            yield from self._overwrite_grade_value(page, target.stored_input_name, entry.points)
+            self._log_filled_target(target)
+            return
+
+        grade_input = page.locator(f'input[name="{target.editor_input_name}"]')
+        yield grade_input.wait_for(state="visible", timeout=10000)
+        yield grade_input.fill(str(entry.points))
+        self._log_filled_target(target)
+
+    @staticmethod
+    def _log_filled_target(target: GradeFillTarget) -> None:
+        """Log one filled or overwritten grade cell."""
+        entry = target.entry
+        if target.current_value:
             logger.info(
                 "Overwrote {} with {} for {} in task {}",
-                current_value,
+                target.current_value,
                 entry.points,
                 entry.student_display_name,
                 entry.task_name,
             )
             return
-
-        input_name = f"nzn_{grade_key}"
-        grade_input = page.locator(f'input[name="{input_name}"]')
-        grade_input.wait_for(state="visible", timeout=10000)
-        grade_input.fill(str(entry.points))
         logger.info(
             "Filled {} points for {} in task {}",
             entry.points,
@@ -228,124 +810,103 @@ class FillGradesScenario(Scenario):
             entry.task_name,
         )
 
-    def _current_grade_value(self, page, input_name: str) -> str:
-        """Return the current stored EduPage grade value for an existing grade field."""
-        return page.evaluate(
-            """(inputName) => {
-                const field = document.querySelector(`input[name="${inputName}"]`);
-                return field ? field.value : "";
-            }""",
-            input_name,
-        )
+    def _batch_fill_targets(self, page, targets: List[GradeFillTarget]) -> Steps:
+        """Set every resolved grade cell in one browser call and validate per-cell results."""
+        results = yield page.evaluate(_BATCH_FILL_SCRIPT, self._batch_fill_cells(targets))
+        self._check_batch_fill_results(targets, results)
 
-    def _overwrite_grade_value(self, page, input_name: str, value: GradeValue):
-        """Replace an existing grade through the visible EduPage cell editor."""
-        editor_input_name = input_name.replace("zn_", "nzn_", 1)
-        grade_input = page.locator(f'input[name="{editor_input_name}"]')
-        grade_input.wait_for(state="attached", timeout=10000)
-        grade_input.click()
-        grade_input.fill(str(value))
-
-        updated_value = page.evaluate(
-            """({ storedInputName, editorInputName }) => {
-                const storedField = document.querySelector(`input[name="${storedInputName}"]`);
-                const editorField = document.querySelector(`input[name="${editorInputName}"]`);
-                return {
-                    stored: storedField ? storedField.value : "",
-                    editor: editorField ? editorField.value : "",
-                };
-            }""",
-            {"storedInputName": input_name, "editorInputName": editor_input_name},
-        )
-        if str(updated_value.get("editor", "")).strip() != str(value):
-            raise ValueError(f"EduPage editor did not keep overwritten value for {input_name}")
+    @staticmethod
+    def _batch_fill_cells(targets: List[GradeFillTarget]) -> list[dict[str, str]]:
+        """Return the `{name, value}` cells sent to the batch fill script."""
+        return [{"name": target.editor_input_name, "value": str(target.entry.points)} for target in targets]
 
-    def _student_id_for_entry(self, page, entry: GradeEntry) -> str:
-        """Return the EduPage student id for a CSV grade entry."""
-        page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
-        matches = page.evaluate(
-            """(expectedName) => {
-                const normalize = (value) => value.replace(/\\s+/g, " ").trim();
-                return Array.from(document.querySelectorAll('a[href*="studentid="]'))
-                    .map((link) => ({
-                        text: normalize(link.textContent || ""),
-                        href: link.getAttribute("href") || "",
-                    }))
-                    .filter((link) => link.text === expectedName);
-            }""",
-            entry.student_display_name,
-        )
+    @staticmethod
+    def _check_batch_fill_results(targets: List[GradeFillTarget], results: list[dict]) -> None:
+        """Validate the per-cell results returned by the batch fill script."""
+        results_by_name = {result["name"]: result for result in results}
 
-        if len(matches) != 1:
-            available = self._available_student_names(page)
-            raise ValueError(
-                f"Expected one student named {entry.student_display_name}, found {len(matches)}. "
-                f"Current URL: {page.url}. Available students include: {available}"
+        failures: list[str] = []
+        for target in targets:
+            entry = target.entry
+            result = results_by_name.get(target.editor_input_name, {})
+            if not result.get("found"):
+                failures.append(f"{entry.student_display_name} / {entry.task_name}: input not found")
+                continue
+            if str(result.get("value", "")).strip() != str(entry.points):
+                failures.append(
+                    f"{entry.student_display_name} / {entry.task_name}: EduPage kept '{result.get('value', '')}'"
+                )
+                continue
+            logger.debug(
+                "Batch filled {} points for {} in task {} (previous={})",
+                entry.points,
+                entry.student_display_name,
+                entry.task_name,
+                target.current_value or "(empty)",
             )
 
-        href = matches[0]["href"]
-        marker = "studentid="
-        if marker not in href:
-            raise ValueError(f"Could not read student id for {entry.student_display_name}")
+        if failures:
+            raise ValueError(f"Batch fill failed for {len(failures)} grade cells: " + "; ".join(failures))
 
-        return href.split(marker, 1)[1].split("&", 1)[0]
+        logger.info("Batch filled {} grade cells", len(targets))
 
-    def _available_student_names(self, page) -> str:
-        """Return a short sample of student names currently visible in the grade table."""
-        names = page.evaluate(
-            """() => {
-                const normalize = (value) => value.replace(/\\s+/g, " ").trim();
-                return Array.from(document.querySelectorAll('a[href*="studentid="]'))
-                    .map((link) => normalize(link.textContent || ""))
-                    .filter((name) => name.length > 0)
-                    .slice(0, 10);
-            }"""
-        )
-        return ", ".join(names) if names else "(none)"
+    def _overwrite_grade_value(self, page, input_name: str, value: GradeValue) -> Steps:
+        """Replace an existing grade through the visible EduPage cell editor."""
+        editor_input_name = input_name.replace("zn_", "nzn_", 1)
+        grade_input = page.locator(f'input[name="{editor_input_name}"]')
+        yield grade_input.wait_for(state="attached", timeout=10000)
+        yield grade_input.click()
+        yield grade_input.fill(str(value))
+        if self.verify:
+            # The post-save verification snapshot checks this cell instead.
+            return
 
-    def _task_identifiers(self, page, task_name: str) -> tuple[str, str]:
-        """Return subject id and task uid for an existing grade-table task."""
-        page.wait_for_selector(_TASK_HEADER_LOCATOR, state="attached", timeout=10000)
-        matches = page.evaluate(
-            """(expectedTaskName) => {
-                const normalize = (value) => value.replace(/\\s+/g, " ").trim();
-                return Array.from(document.querySelectorAll(".znamkyUdalostHeader"))
-                    .map((header) => ({
-                        text: normalize(header.querySelector(".znHeaderUdalost")?.textContent || ""),
-                        subjectId: header.getAttribute("data-pid"),
-                        taskUid: header.getAttribute("data-uid"),
-                    }))
-                    .filter((header) => header.text === expectedTaskName);
-            }""",
-            task_name,
+        updated_value = yield page.evaluate(
+            _EDITED_GRADE_VALUES_SCRIPT,
+            {"storedInputName": input_name, "editorInputName": editor_input_name},
         )
+        if str(updated_value.get("editor", "")).strip() != str(value):
+            raise ValueError(f"EduPage editor did not keep overwritten value for {input_name}")
 
-        if len(matches) != 1:
-            available = self._available_task_names(page)
-            raise ValueError(
-                f"Expected one task named {task_name}, found {len(matches)}. "
-                f"Current URL: {page.url}. Available tasks include: {available}"
-            )
-
-        subject_id = matches[0]["subjectId"]
-        task_uid = matches[0]["taskUid"]
-        if not subject_id or not task_uid:
-            raise ValueError(f"Could not read identifiers for task {task_name}")
-
-        return subject_id, task_uid
+    @classmethod
+    def from_job(cls, job: ScenarioJob) -> "FillGradesScenario":
+        """Build the scenario from a `run-jobs` job with `fill-grades` options.
 
-    def _available_task_names(self, page) -> str:
-        """Return a short sample of task names currently visible in the grade table."""
-        names = page.evaluate(
-            """() => {
-                const normalize = (value) => value.replace(/\\s+/g, " ").trim();
-                return Array.from(document.querySelectorAll(".znamkyUdalostHeader .znHeaderUdalost"))
-                    .map((header) => normalize(header.textContent || ""))
-                    .filter((name) => name.length > 0)
-                    .slice(0, 10);
-            }"""
+        Chunked saves and `--resume` stay CLI-only, since concurrent jobs would
+        share one fill journal.
+        """
+        job.check_options(
+            {
+                "class",
+                "grades-csv",
+                "subject",
+                "period",
+                "dry-run",
+                "overwrite-existing",
+                "batch-fill",
+                "id-cache",
+                "deep-link",
+                "verify",
+                "verify-report",
+            }
+        )
+        grades_csv = job.path("grades-csv", required=True)
+        verify = job.flag("verify")
+        if verify and job.flag("dry-run"):
+            raise ValueError("verify needs saved grades and cannot be used with dry-run")
+        return cls(
+            job.text("class", required=True),
+            _load_grade_entries_from_csv(grades_csv),
+            subject=job.text("subject", "Informatika"),
+            period=job.text("period", "P2"),
+            save=not job.flag("dry-run"),
+            overwrite_existing=job.flag("overwrite-existing"),
+            batch_fill=job.flag("batch-fill"),
+            id_cache_path=get_id_cache_path() if job.flag("id-cache", True) else None,
+            course_catalogue_path=get_course_catalogue_path() if job.flag("deep-link", True) else None,
+            verify=verify,
+            verify_report_csv=(job.path("verify-report") or _default_verify_report_path(grades_csv)) if verify else None,
         )
-        return ", ".join(names) if names else "(none)"
 
     @classmethod
     def register_cli(cls, cli_group):
@@ -384,8 +945,66 @@ class FillGradesScenario(Scenario):
                     help="Replace existing grade values instead of failing when a grade is already present.",
                 ),
             ] = False,
+            batch_fill: Annotated[
+                bool,
+                typer.Option(
+                    "--batch-fill",
+                    help="Set all grade cells in one browser call instead of typing into each cell.",
+                ),
+            ] = False,
+            id_cache: Annotated[
+                bool,
+                typer.Option(
+                    "--id-cache/--no-id-cache",
+                    help="Resolve students and tasks from the cached course ids instead of indexing the grade table.",
+                    show_default=True,
+                ),
+            ] = True,
+            deep_link: Annotated[
+                bool,
+                typer.Option(
+                    "--deep-link/--no-deep-link",
+                    help="Open the recorded Známky URL directly instead of navigating through the course switcher.",
+                    show_default=True,
+                ),
+            ] = True,
+            save_every: Annotated[
+                int | None,
+                typer.Option(
+                    "--save-every",
+                    min=1,
+                    help="Save after every N filled cells and journal each saved chunk so --resume can skip it.",
+                ),
+            ] = None,
+            resume: Annotated[
+                bool,
+                typer.Option(
+                    "--resume",
+                    help="Skip entries that an interrupted --save-every run already saved.",
+                ),
+            ] = False,
+            verify: Annotated[
+                bool,
+                typer.Option(
+                    "--verify",
+                    help="Reload the grade table after saving and check every filled cell in one snapshot.",
+                ),
+            ] = False,
+            verify_report: Annotated[
+                Path | None,
+                typer.Option(
+                    "--verify-report",
+                    file_okay=True,
+                    dir_okay=False,
+                    help="CSV for cells that did not keep their value. Defaults to *-verify-mismatches.csv next to --grades-csv.",
+                ),
+            ] = None,
         ):
             """Fill EduPage grade points from CSV rows."""
+            if dry_run and (save_every or resume or verify):
+                raise typer.BadParameter(
+                    "--save-every, --resume, and --verify need saved grades and cannot be used with --dry-run."
+                )
             try:
                 entries = _load_grade_entries_from_csv(grades_csv)
             except ValueError as exc:
@@ -400,8 +1019,24 @@ class FillGradesScenario(Scenario):
                         period=period,
                         save=not dry_run,
                         overwrite_existing=overwrite_existing,
+                        batch_fill=batch_fill,
+                        id_cache_path=get_id_cache_path() if id_cache else None,
+                        course_catalogue_path=get_course_catalogue_path() if deep_link else None,
+                        save_every=save_every,
+                        journal_path=get_fill_journal_path() if save_every or resume else None,
+                        resume=resume,
+                        verify=verify,
+                        verify_report_csv=(verify_report or _default_verify_report_path(grades_csv)) if verify else None,
                     )
                 )
             except ScenarioRunnerError as exc:
                 typer.echo(str(exc), err=True)
                 raise typer.Exit(code=1) from exc
+
+
+class AsyncFillGradesScenario(AsyncScenario, FillGradesScenario):
+    """Async Playwright variant of `FillGradesScenario` for `async_runner`.
+
+    Runs the same steps as the sync scenario; the CLI keeps registering the
+    sync `fill-grades` command.
+    """
@@ -0,0 +1,68 @@
+"""Shared navigation from the EduPage dashboard to a course's Známky module.
+
+The navigation helpers are scenario steps: drive them with `yield from`.
+"""
+
+from pathlib import Path
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from edu_page_automat.course_catalogue import forget_course_url, lookup_course_url, record_course_url
+from edu_page_automat.logging_config import setup_logging
+from edu_page_automat.scenarios.base import Steps
+
+DEEP_LINK_READY_TIMEOUT = 5000
+GRADES_MODULE_LINK_SELECTOR = "a.edubarCourseModuleLink"
+GRADES_MODULE_LINK_TEXT = "Známky"
+
+logger = setup_logging()
+
+
+def _course_title(page, class_: str, subject: str):
+    """Return the course switcher entry matching a class and subject."""
+    return page.locator("div.ecourse-standards-subject-title").filter(
+        has=page.locator("div.className", has_text=class_)
+    ).filter(
+        has=page.locator("div.subjectName", has_text=subject)
+    )
+
+
+def select_course(page, class_: str, subject: str) -> Steps:
+    """Select the target class and subject in the EduPage course switcher."""
+    yield page.locator(".edubarCourseListBtn").click()
+    yield _course_title(page, class_, subject).click()
+    logger.debug("Selected subject {} for class {}", subject, class_)
+
+
+def open_grades_module(page) -> Steps:
+    """Open the Známky module of the selected course."""
+    yield page.locator(GRADES_MODULE_LINK_SELECTOR, has_text=GRADES_MODULE_LINK_TEXT).click()
+
+
+def open_course_deep_link(page, catalogue_path: Path | None, class_: str, subject: str, ready_selector: str) -> Steps:
+    """Go straight to a course's recorded Známky URL and return whether the page became ready.
+
+    A recorded URL that no longer shows `ready_selector` is forgotten, so the
+    caller falls back to the course switcher and records the new URL.
+    """
+    if catalogue_path is None:
+        return False
+    url = lookup_course_url(catalogue_path, class_, subject)
+    if url is None:
+        return False
+
+    yield page.goto(url, wait_until="domcontentloaded")
+    try:
+        yield page.wait_for_selector(ready_selector, state="attached", timeout=DEEP_LINK_READY_TIMEOUT)
+    except PlaywrightTimeoutError:
+        logger.info("Recorded Známky URL for {} / {} is stale; using the course switcher", class_, subject)
+        forget_course_url(catalogue_path, class_, subject)
+        return False
+    logger.debug("Opened Známky for {} / {} through the recorded URL", class_, subject)
+    return True
+
+
+def remember_course_url(page, catalogue_path: Path | None, class_: str, subject: str) -> None:
+    """Record the current Známky URL of a course for later deep links."""
+    if catalogue_path is not None:
+        record_course_url(catalogue_path, class_, subject, page.url)
@@ -0,0 +1,244 @@
+"""Scenario that exports, diffs, and fills EduPage grades in one browser session."""
+
+from pathlib import Path
+from typing import Annotated, Iterable, List
+
+import typer
+
+from edu_page_automat.course_catalogue import get_course_catalogue_path
+from edu_page_automat.grade_diff import (
+    GradeDiffSummary,
+    GradeRow,
+    diff_grade_rows,
+    load_grade_rows,
+    write_kept_current_report,
+)
+from edu_page_automat.id_cache import get_id_cache_path
+from edu_page_automat.logging_config import setup_logging
+from edu_page_automat.scenario_runner import ScenarioRunnerError, run_scenario
+from edu_page_automat.scenarios.base import AsyncScenario, Steps
+from edu_page_automat.scenarios.export_grades import (
+    _GRADE_EXPORT_SCRIPT,
+    _STUDENT_LINK_SELECTOR,
+    _grade_rows_from_payload,
+)
+from edu_page_automat.scenarios.fill_grades import FillGradesScenario, GradeEntry
+
+logger = setup_logging()
+
+
+def _grade_entry_from_row(row: GradeRow) -> GradeEntry:
+    """Return the fill entry for a normalized source-of-truth grade row."""
+    return GradeEntry(
+        first_name=row.first_name,
+        last_name=row.last_name,
+        task_name=row.task_name,
+        points="m" if row.points == "m" else int(row.points),
+    )
+
+
+class SyncGradesScenario(FillGradesScenario):
+    """Bring one course's EduPage grades in line with a source-of-truth CSV.
+
+    The live grade table is read in memory, compared with the truth rows like
+    `diff-grades`, and only changed cells are filled before one save.
+    """
+
+    def __init__(
+        self,
+        class_: str,
+        truth_rows: Iterable[GradeRow],
+        subject: str = "Informatika",
+        period: str = "P2",
+        save: bool = True,
+        keep_better_current: bool = False,
+        kept_current_report_csv: Path | None = None,
+        batch_fill: bool = False,
+        id_cache_path: Path | None = None,
+        course_catalogue_path: Path | None = None,
+    ):
+        """Initialize the target course, truth rows, and diff and fill modes.
+
+        Changed cells always replace the current value, so existing grades are
+        overwritten. With `keep_better_current`, higher current grades are kept
+        and listed in `kept_current_report_csv` when it is given.
+        """
+        self._init_fill_options(
+            class_,
+            subject,
+            period,
+            save=save,
+            overwrite_existing=True,
+            batch_fill=batch_fill,
+            id_cache_path=id_cache_path,
+            course_catalogue_path=course_catalogue_path,
+        )
+        self.keep_better_current = keep_better_current
+        self.kept_current_report_csv = kept_current_report_csv
+        self.truth_rows: List[GradeRow] = list(truth_rows)
+        if not self.truth_rows:
+            raise ValueError("At least one truth grade row must be provided")
+        self.entries: List[GradeEntry] = []
+        self.summary: GradeDiffSummary | None = None
+
+    def steps(self, page) -> Steps:
+        """Read the live grade table, fill the changed cells, and save once."""
+        yield from self._open_grade_table(page)
+        with self.span("extract_rows"):
+            current_rows = yield from self._read_current_rows(page)
+
+        with self.span("diff", truth_rows=len(self.truth_rows), current_rows=len(current_rows)):
+            diff = diff_grade_rows(current_rows, self.truth_rows, keep_better_current=self.keep_better_current)
+        self.summary = diff.summary
+        self.entries = [_grade_entry_from_row(row) for row in diff.rows]
+        if self.keep_better_current and self.kept_current_report_csv is not None:
+            write_kept_current_report(self.kept_current_report_csv, diff.kept_current_rows)
+        self._log_summary()
+
+        if not self.entries:
+            logger.info("Grades of class {}, subject {} already match the truth CSV", self.class_, self.subject)
+            return
+
+        with self.span("index_table"):
+            index = yield from self._read_grade_table_index(page)
+
+        filled = yield from self._fill_entries(page, index, self.entries)
+
+        if self.save:
+            with self.span("save"):
+                yield from self._save_changes(page)
+
+        self._log_finished(filled)
+
+    def _read_current_rows(self, page) -> Steps:
+        """Read every visible grade cell of the open grade table as current grade rows."""
+        yield page.wait_for_selector(_STUDENT_LINK_SELECTOR, state="attached", timeout=10000)
+        payload = yield page.evaluate(_GRADE_EXPORT_SCRIPT)
+        return [
+            GradeRow(
+                first_name=row.first_name,
+                last_name=row.last_name,
+                task_name=row.task_name,
+                points=row.points,
+            )
+            for row in _grade_rows_from_payload(payload)
+        ]
+
+    def _log_summary(self) -> None:
+        """Log the in-memory diff summary in the `diff-grades` layout."""
+        summary = self.summary
+        logger.info(
+            "Grade diff for class {}, subject {}: changed={}, equal={}, empty-target={}, "
+            "kept-better-current={}, missing-current={}, extra-current={}",
+            self.class_,
+            self.subject,
+            summary.written_rows,
+            summary.equal_rows,
+            summary.skipped_empty_target_rows,
+            summary.kept_better_current_rows,
+            summary.missing_current_rows,
+            summary.extra_current_rows,
+        )
+
+    @classmethod
+    def register_cli(cls, cli_group):
+        """Register the `sync-grades` command on the provided Typer app."""
+
+        @cli_group.command("sync-grades")
+        def run_sync_grades(
+            class_: Annotated[str, typer.Option(..., "--class", help="Class name (e.g., 2.png)")],
+            truth_csv: Annotated[
+                Path,
+                typer.Option(
+                    ...,
+                    "--truth-csv",
+                    exists=True,
+                    file_okay=True,
+                    dir_okay=False,
+                    help="Path to the source-of-truth grade CSV (EduPage-style or Google Classroom export).",
+                ),
+            ],
+            subject: Annotated[
+                str,
+                typer.Option("--subject", help="Subject name in EduPage course list", show_default=True),
+            ] = "Informatika",
+            period: Annotated[
+                str,
+                typer.Option("--period", help="EduPage grading period used in grade input names", show_default=True),
+            ] = "P2",
+            keep_better_current: Annotated[
+                bool,
+                typer.Option(
+                    "--keep-better-current",
+                    help="Keep the current EduPage grade when it is higher than the source-of-truth grade. `m` counts as 0.",
+                ),
+            ] = False,
+            kept_current_report: Annotated[
+                Path | None,
+                typer.Option(
+                    "--kept-current-report",
+                    file_okay=True,
+                    dir_okay=False,
+                    help="Write grades kept by --keep-better-current to this CSV.",
+                ),
+            ] = None,
+            dry_run: Annotated[
+                bool,
+                typer.Option("--dry-run", help="Fill changed fields but do not click the save button"),
+            ] = False,
+            batch_fill: Annotated[
+                bool,
+                typer.Option(
+                    "--batch-fill",
+                    help="Set all changed grade cells in one browser call instead of typing into each cell.",
+                ),
+            ] = False,
+            id_cache: Annotated[
+                bool,
+                typer.Option(
+                    "--id-cache/--no-id-cache",
+                    help="Resolve students and tasks from the cached course ids instead of indexing the grade table.",
+                    show_default=True,
+                ),
+            ] = True,
+            deep_link: Annotated[
+                bool,
+                typer.Option(
+                    "--deep-link/--no-deep-link",
+                    help="Open the recorded Známky URL directly instead of navigating through the course switcher.",
+                    show_default=True,
+                ),
+            ] = True,
+        ):
+            """Fill only the EduPage grades that differ from a source-of-truth CSV, in one browser session."""
+            try:
+                truth_rows = load_grade_rows(truth_csv)
+            except ValueError as exc:
+                raise typer.BadParameter(str(exc)) from exc
+
+            try:
+                run_scenario(
+                    lambda: cls(
+                        class_,
+                        truth_rows,
+                        subject=subject,
+                        period=period,
+                        save=not dry_run,
+                        keep_better_current=keep_better_current,
+                        kept_current_report_csv=kept_current_report,
+                        batch_fill=batch_fill,
+                        id_cache_path=get_id_cache_path() if id_cache else None,
+                        course_catalogue_path=get_course_catalogue_path() if deep_link else None,
+                    )
+                )
+            except ScenarioRunnerError as exc:
+                typer.echo(str(exc), err=True)
+                raise typer.Exit(code=1) from exc
+
+
+class AsyncSyncGradesScenario(AsyncScenario, SyncGradesScenario):
+    """Async Playwright variant of `SyncGradesScenario` for `async_runner`.
+
+    Runs the same steps as the sync scenario; the CLI keeps registering the
+    sync `sync-grades` command.
+    """
@@ -0,0 +1,115 @@
+"""TTL cache recording when the stored EduPage session was last confirmed valid."""
+
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import time
+
+from edu_page_automat.auth_storage import get_state_file_path
+
+SESSION_CACHE_FILE_NAME = "session-cache.json"
+SESSION_TTL_ENV_VAR = "EDUPAGE_SESSION_TTL"
+DEFAULT_SESSION_TTL = 15 * 60
+
+
+@dataclass(frozen=True)
+class SessionValidation:
+    """Last confirmed validation of one stored Playwright storage state."""
+
+    validated_at: float
+    auth_mtime: float
+    cookies_expire_at: float | None
+
+    def is_fresh(self, auth_file: Path, ttl: float, now: float) -> bool:
+        """Return whether this validation still vouches for the current auth file."""
+        try:
+            auth_mtime = auth_file.stat().st_mtime
+        except OSError:
+            return False
+        if auth_mtime != self.auth_mtime:
+            return False
+        if now - self.validated_at >= ttl:
+            return False
+        return self.cookies_expire_at is None or self.cookies_expire_at > now
+
+
+def get_session_cache_path() -> Path:
+    """Return the validation cache path stored next to the auth file."""
+    return get_state_file_path(SESSION_CACHE_FILE_NAME)
+
+
+def get_session_ttl() -> float:
+    """Return the validation cache TTL in seconds; `0` disables the cache."""
+    value = os.environ.get(SESSION_TTL_ENV_VAR)
+    if value is None or not value.strip():
+        return DEFAULT_SESSION_TTL
+    try:
+        ttl = float(value)
+    except ValueError as exc:
+        raise ValueError(f"{SESSION_TTL_ENV_VAR} must be a number of seconds") from exc
+    return max(ttl, 0)
+
+
+def read_cookies_expiry(auth_file: Path) -> float | None:
+    """Return the earliest persistent cookie expiry in a Playwright storage state."""
+    try:
+        state = json.loads(auth_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    expiries = [
+        float(cookie["expires"])
+        for cookie in state.get("cookies", [])
+        if isinstance(cookie.get("expires"), (int, float)) and cookie["expires"] > 0
+    ]
+    return min(expiries) if expiries else None
+
+
+def read_session_validation(cache_path: Path) -> SessionValidation | None:
+    """Return the cached validation record, ignoring missing or malformed files."""
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        return SessionValidation(
+            validated_at=float(payload["validated_at"]),
+            auth_mtime=float(payload["auth_mtime"]),
+            cookies_expire_at=(
+                float(payload["cookies_expire_at"]) if payload.get("cookies_expire_at") is not None else None
+            ),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def record_session_validation(cache_path: Path, auth_file: Path, now: float | None = None) -> None:
+    """Record that the stored session was confirmed valid."""
+    try:
+        auth_mtime = auth_file.stat().st_mtime
+    except OSError:
+        return
+    validation = SessionValidation(
+        validated_at=time.time() if now is None else now,
+        auth_mtime=auth_mtime,
+        cookies_expire_at=read_cookies_expiry(auth_file),
+    )
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(asdict(validation)), encoding="utf-8")
+
+
+def invalidate_session_validation(cache_path: Path) -> None:
+    """Forget the cached validation so the next run validates again."""
+    cache_path.unlink(missing_ok=True)
+
+
+def is_session_recently_validated(
+    cache_path: Path,
+    auth_file: Path,
+    ttl: float,
+    now: float | None = None,
+) -> bool:
+    """Return whether the stored session was confirmed within the TTL."""
+    if ttl <= 0:
+        return False
+    validation = read_session_validation(cache_path)
+    if validation is None:
+        return False
+    return validation.is_fresh(auth_file, ttl, time.time() if now is None else now)
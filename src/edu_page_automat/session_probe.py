@@ -0,0 +1,94 @@
+"""Lightweight HTTP check of a stored EduPage session without rendering pages."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+from pathlib import Path
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+from edu_page_automat.logging_config import setup_logging
+
+DEFAULT_PROBE_TIMEOUT = 10
+_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+logger = setup_logging()
+
+
+class _NoRedirectHandler(HTTPRedirectHandler):
+    """Surface redirects as responses so the probe can classify their target."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        """Decline to follow redirects."""
+        return None
+
+
+def _cookie_matches(cookie: dict, host: str, path: str, secure: bool, now: float) -> bool:
+    """Return whether a storage-state cookie would be sent with the probe request."""
+    domain = str(cookie.get("domain", "")).lstrip(".").casefold()
+    if not domain or (host != domain and not host.endswith(f".{domain}")):
+        return False
+    if not path.startswith(str(cookie.get("path") or "/")):
+        return False
+    if cookie.get("secure") and not secure:
+        return False
+    expires = cookie.get("expires", -1)
+    return not (isinstance(expires, (int, float)) and 0 < expires <= now)
+
+
+def cookie_header_for_url(auth_file: Path, url: str, now: float | None = None) -> str:
+    """Build a `Cookie` header for `url` from a Playwright storage-state file."""
+    state = json.loads(auth_file.read_text(encoding="utf-8"))
+    parts = urlsplit(url)
+    host = (parts.hostname or "").casefold()
+    path = parts.path or "/"
+    secure = parts.scheme == "https"
+    current_time = time.time() if now is None else now
+    return "; ".join(
+        f"{cookie['name']}={cookie['value']}"
+        for cookie in state.get("cookies", [])
+        if _cookie_matches(cookie, host, path, secure, current_time)
+    )
+
+
+def classify_probe_response(status: int, location: str) -> bool | None:
+    """Classify a probe response as logged in, logged out, or inconclusive."""
+    if 200 <= status < 400:
+        return "login" not in location
+    return None
+
+
+def probe_session(auth_file: Path, url: str, timeout: float = DEFAULT_PROBE_TIMEOUT) -> bool | None:
+    """Send one HTTP request with stored cookies and report whether the session is logged in.
+
+    Returns `None` when the probe cannot decide, so callers can fall back to a
+    browser navigation.
+    """
+    try:
+        cookie_header = cookie_header_for_url(auth_file, url)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.debug("Could not read cookies for session probe: {}", exc)
+        return None
+    if not cookie_header:
+        return False
+
+    request = Request(url, headers={"Cookie": cookie_header, "User-Agent": _USER_AGENT})
+    opener = build_opener(_NoRedirectHandler)
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            return classify_probe_response(response.status, response.url)
+    except HTTPError as exc:
+        return classify_probe_response(exc.code, exc.headers.get("Location", ""))
+    except (URLError, OSError, ValueError) as exc:
+        logger.debug("Session probe request failed: {}", exc)
+        return None
+
+
+def start_session_probe(auth_file: Path, url: str, timeout: float = DEFAULT_PROBE_TIMEOUT) -> Future:
+    """Run `probe_session` in a background thread so it overlaps with browser launch."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="edupage-session-probe")
+    try:
+        return executor.submit(probe_session, auth_file, url, timeout)
+    finally:
+        executor.shutdown(wait=False)
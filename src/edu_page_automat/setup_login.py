@@ -7,16 +7,23 @@ from pathlib import Path
 from playwright.sync_api import Playwright, expect
 
 from edu_page_automat.auth_storage import get_auth_file_path
+from edu_page_automat.edupage_site import get_base_url
+from edu_page_automat.execution_profile import ExecutionProfile, get_execution_profile
 from edu_page_automat.logging_config import setup_logging
 
 AUTH_FILE = get_auth_file_path()
 logger = setup_logging()
 
 
-def run(playwright: Playwright, browser=None, auth_file: Path | None = None):
+def run(
+    playwright: Playwright,
+    browser=None,
+    auth_file: Path | None = None,
+    profile: ExecutionProfile | None = None,
+):
     """Perform login and return an authenticated `(browser, context)` pair."""
     storage_state_path = auth_file or AUTH_FILE
-    base_url = os.environ.get("EDUPAGE_URL", "https://1itg.edupage.org/")
+    base_url = get_base_url()
     username_value = os.environ.get("EDUPAGE_USERNAME")
     password_value = os.environ.get("EDUPAGE_PASSWORD")
 
@@ -31,7 +38,7 @@ def run(playwright: Playwright, browser=None, auth_file: Path | None = None):
 
     own_browser = False
     if browser is None:
-        browser = playwright.firefox.launch(headless=False, slow_mo=200)
+        browser = playwright.firefox.launch(**(profile or get_execution_profile()).launch_options())
         own_browser = True
 
     context = browser.new_context()
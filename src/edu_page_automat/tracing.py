@@ -0,0 +1,187 @@
+"""Named timed spans for scenario runs, with Chrome trace export and summaries."""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import math
+import os
+from pathlib import Path
+import statistics
+import threading
+import time
+from typing import Callable, Iterator
+
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_HISTOGRAM_BAR_WIDTH = 30
+
+_active_trace_output: Path | None = None
+
+
+@dataclass(frozen=True)
+class Span:
+    """One completed timed step of a scenario run."""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: dict = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        """Return the span duration in milliseconds."""
+        return self.duration * 1000
+
+
+@dataclass(frozen=True)
+class SpanStats:
+    """Aggregated timings of all spans sharing one name."""
+
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Return a nearest-rank percentile from already sorted values."""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class SpanRecorder:
+    """Collect named spans for one scenario run.
+
+    Spans may nest; each one is recorded when it finishes, so a failing step
+    still shows up with the time spent before the error.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Start the recorder clock."""
+        self._clock = clock
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self.spans: list[Span] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = "scenario", **args) -> Iterator[None]:
+        """Time the enclosed block as a span named `name`."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            span = Span(
+                name=name,
+                category=category,
+                start=start - self._origin,
+                duration=self._clock() - start,
+                thread_id=threading.get_ident(),
+                args={key: str(value) for key, value in args.items()},
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def durations_ms(self, name: str) -> list[float]:
+        """Return the durations of every span named `name` in milliseconds."""
+        return [span.duration_ms for span in self.spans if span.name == name]
+
+    def summary(self) -> list[SpanStats]:
+        """Return per-name span statistics in order of first appearance."""
+        durations: dict[str, list[float]] = {}
+        for span in sorted(self.spans, key=lambda span: span.start):
+            durations.setdefault(span.name, []).append(span.duration_ms)
+
+        stats = []
+        for name, values in durations.items():
+            sorted_values = sorted(values)
+            stats.append(
+                SpanStats(
+                    name=name,
+                    count=len(values),
+                    total_ms=sum(values),
+                    mean_ms=statistics.fmean(values),
+                    p50_ms=_percentile(sorted_values, 0.5),
+                    p95_ms=_percentile(sorted_values, 0.95),
+                    max_ms=sorted_values[-1],
+                )
+            )
+        return stats
+
+    def histogram(self, name: str, buckets_ms: tuple[float, ...] = HISTOGRAM_BUCKETS_MS) -> list[tuple[str, int]]:
+        """Return `(bucket label, count)` pairs for the durations of spans named `name`."""
+        counts = [0] * (len(buckets_ms) + 1)
+        for duration in self.durations_ms(name):
+            counts[bisect_left(buckets_ms, duration)] += 1
+
+        labels = [f"<= {bound:g} ms" for bound in buckets_ms] + [f"> {buckets_ms[-1]:g} ms"]
+        return list(zip(labels, counts))
+
+    def format_summary(self) -> str:
+        """Render the span summary, plus histograms for repeated spans, as a text table."""
+        stats = self.summary()
+        if not stats:
+            return "No spans recorded"
+
+        name_width = max(len("span"), *(len(stat.name) for stat in stats))
+        lines = [
+            f"{'span':<{name_width}}  {'count':>5}  {'total ms':>10}  {'mean ms':>9}  "
+            f"{'p50 ms':>9}  {'p95 ms':>9}  {'max ms':>9}"
+        ]
+        for stat in stats:
+            lines.append(
+                f"{stat.name:<{name_width}}  {stat.count:>5}  {stat.total_ms:>10.1f}  {stat.mean_ms:>9.1f}  "
+                f"{stat.p50_ms:>9.1f}  {stat.p95_ms:>9.1f}  {stat.max_ms:>9.1f}"
+            )
+
+        for stat in stats:
+            if stat.count < 2:
+                continue
+            histogram = [(label, count) for label, count in self.histogram(stat.name) if count]
+            peak = max(count for _, count in histogram)
+            lines.append("")
+            lines.append(f"{stat.name} latency histogram ({stat.count} spans)")
+            for label, count in histogram:
+                bar = "#" * max(1, round(count / peak * _HISTOGRAM_BAR_WIDTH))
+                lines.append(f"  {label:>12}  {count:>5}  {bar}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict:
+        """Return the spans as Chrome trace-event JSON (`chrome://tracing`, Perfetto)."""
+        process_id = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000, 3),
+                    "dur": round(span.duration * 1_000_000, 3),
+                    "pid": process_id,
+                    "tid": span.thread_id,
+                    "args": span.args,
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, trace_path: Path) -> None:
+        """Write the spans to `trace_path` as Chrome trace-event JSON."""
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace_path.write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False), encoding="utf-8")
+
+
+def set_trace_output(trace_path: Path | None) -> None:
+    """Set where scenario runs in this process write their trace, or disable it with `None`."""
+    global _active_trace_output
+    _active_trace_output = trace_path
+
+
+def get_trace_output() -> Path | None:
+    """Return the trace output path configured for this process."""
+    return _active_trace_output
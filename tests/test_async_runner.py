@@ -0,0 +1,243 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from edu_page_automat import async_runner as ar
+from edu_page_automat import request_blocking
+from edu_page_automat.auth_manager import SessionRequiredError
+from edu_page_automat.scenario_runner import ScenarioRunnerError
+
+
+@pytest.fixture(autouse=True)
+def no_request_blocking():
+    """Let async runner tests use context fakes without routing support."""
+    request_blocking.set_request_blocking(request_blocking.RequestBlockingPolicy.disabled())
+    yield
+    request_blocking.set_request_blocking(None)
+
+
+class DummyAsyncLocator:
+    def __init__(self):
+        self.wait_calls = []
+        self.click_calls = 0
+
+    async def wait_for(self, **kwargs):
+        self.wait_calls.append(kwargs)
+
+    async def click(self):
+        self.click_calls += 1
+
+    async def count(self):
+        return 2
+
+    def filter(self, **kwargs):
+        return DummyAsyncLocator()
+
+
+class DummyAsyncPage:
+    def __init__(self):
+        self.url = "https://1itg.edupage.org/user/"
+        self.goto_calls = []
+
+    async def goto(self, url, **kwargs):
+        self.goto_calls.append(url)
+
+    def locator(self, selector):
+        return DummyAsyncLocator()
+
+
+def test_async_auto_wait_locator_leaves_playwright_auto_wait_actions_to_playwright(monkeypatch):
+    monkeypatch.setattr(ar, "Locator", DummyAsyncLocator)
+    locator = DummyAsyncLocator()
+    auto = ar.AsyncAutoWaitLocator(locator, timeout=123)
+
+    asyncio.run(auto.click())
+
+    assert locator.wait_calls == []
+    assert locator.click_calls == 1
+
+
+def test_async_auto_wait_locator_waits_before_actions_without_playwright_auto_wait(monkeypatch):
+    monkeypatch.setattr(ar, "Locator", DummyAsyncLocator)
+
+    class TimeoutLocator(DummyAsyncLocator):
+        async def wait_for(self, **kwargs):
+            self.wait_calls.append(kwargs)
+            raise PlaywrightTimeoutError("not attached yet")
+
+        async def press(self, key):
+            raise AssertionError("press must not run after a failed wait")
+
+    locator = TimeoutLocator()
+
+    with pytest.raises(PlaywrightTimeoutError):
+        asyncio.run(ar.AsyncAutoWaitLocator(locator, timeout=123).press("Enter"))
+
+    assert locator.wait_calls == [{"state": "attached", "timeout": 123}]
+
+
+def test_async_auto_wait_locator_wraps_sync_locator_methods(monkeypatch):
+    monkeypatch.setattr(ar, "Locator", DummyAsyncLocator)
+    locator = DummyAsyncLocator()
+    auto = ar.AsyncAutoWaitLocator(locator, timeout=50)
+
+    filtered = auto.filter(has_text="Test")
+
+    assert isinstance(filtered, ar.AsyncAutoWaitLocator)
+    assert asyncio.run(auto.count()) == 2
+    assert locator.wait_calls == []
+    assert auto.count is auto.count
+
+
+def test_async_auto_wait_page_runs_first_navigation_hook_once(monkeypatch):
+    monkeypatch.setattr(ar, "Locator", DummyAsyncLocator)
+    page = DummyAsyncPage()
+    confirmed = []
+    auto_page = ar.AsyncAutoWaitPage(page, timeout=75, on_first_navigation=confirmed.append)
+
+    async def navigate_twice():
+        await auto_page.goto("https://1itg.edupage.org/user/")
+        await auto_page.goto("https://1itg.edupage.org/znamky/")
+
+    asyncio.run(navigate_twice())
+
+    assert confirmed == [page]
+    assert isinstance(auto_page.locator("div"), ar.AsyncAutoWaitLocator)
+
+
+class FakeAsyncPage(DummyAsyncPage):
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+
+class FakeAsyncContext:
+    def __init__(self, log):
+        self.log = log
+
+    async def new_page(self):
+        return FakeAsyncPage()
+
+    async def close(self):
+        self.log.append("context closed")
+
+
+class FakeAsyncBrowser:
+    def __init__(self, log):
+        self.log = log
+
+    async def close(self):
+        self.log.append("browser closed")
+
+
+class FakeAsyncAuthManager:
+    log = []
+    fail_session = False
+    failing_context = None
+
+    def __init__(self, playwright, profile):
+        self.session_probe_pending = False
+
+    async def ensure_session(self):
+        if FakeAsyncAuthManager.fail_session:
+            raise SessionRequiredError("No stored EduPage session. Run `edupage login` first.")
+        self.log.append("session")
+
+    async def launch_browser(self):
+        return FakeAsyncBrowser(self.log)
+
+    async def new_context(self, browser):
+        self.log.append("context")
+        if self.log.count("context") == FakeAsyncAuthManager.failing_context:
+            raise RuntimeError("Browser has been closed")
+        return FakeAsyncContext(self.log)
+
+
+class FakeAsyncPlaywright:
+    async def __aenter__(self):
+        return "playwright"
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+
+class SleepingScenario:
+    running = 0
+    peak = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    async def run(self, page):
+        SleepingScenario.running += 1
+        SleepingScenario.peak = max(SleepingScenario.peak, SleepingScenario.running)
+        await asyncio.sleep(0.01)
+        SleepingScenario.running -= 1
+        if self.name == "broken":
+            raise ValueError("course missing")
+
+
+def _install_fakes(monkeypatch):
+    FakeAsyncAuthManager.log = []
+    FakeAsyncAuthManager.fail_session = False
+    FakeAsyncAuthManager.failing_context = None
+    SleepingScenario.running = 0
+    SleepingScenario.peak = 0
+    monkeypatch.setattr(ar, "async_playwright", lambda: FakeAsyncPlaywright())
+    monkeypatch.setattr(ar, "AsyncAuthManager", FakeAsyncAuthManager)
+
+
+def test_run_scenarios_async_limits_concurrency_and_collects_errors(monkeypatch):
+    _install_fakes(monkeypatch)
+
+    results = asyncio.run(
+        ar.run_scenarios_async(
+            [lambda name=name: SleepingScenario(name) for name in ("2.png", "broken", "3.cpu", "4.B")],
+            concurrency=2,
+        )
+    )
+
+    assert [result.ok for result in results] == [True, False, True, True]
+    assert str(results[1].error) == "course missing"
+    assert SleepingScenario.peak == 2
+    assert FakeAsyncAuthManager.log.count("session") == 1
+    assert FakeAsyncAuthManager.log.count("context") == 4
+    assert FakeAsyncAuthManager.log.count("context closed") == 4
+    assert FakeAsyncAuthManager.log[-1] == "browser closed"
+
+
+def test_run_scenarios_async_reports_context_creation_failure_on_its_job(monkeypatch):
+    _install_fakes(monkeypatch)
+    FakeAsyncAuthManager.failing_context = 2
+
+    results = asyncio.run(
+        ar.run_scenarios_async(
+            [lambda name=name: SleepingScenario(name) for name in ("2.png", "3.cpu", "4.B")],
+            concurrency=1,
+        )
+    )
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert str(results[1].error) == "Browser has been closed"
+    assert FakeAsyncAuthManager.log.count("context closed") == 2
+
+
+def test_run_scenario_async_returns_scenario_and_reraises_errors(monkeypatch):
+    _install_fakes(monkeypatch)
+
+    scenario = asyncio.run(ar.run_scenario_async(lambda: SleepingScenario("2.png")))
+
+    assert scenario.name == "2.png"
+    with pytest.raises(ValueError, match="course missing"):
+        asyncio.run(ar.run_scenario_async(lambda: SleepingScenario("broken")))
+
+
+def test_run_scenario_async_requires_stored_session(monkeypatch):
+    _install_fakes(monkeypatch)
+    FakeAsyncAuthManager.fail_session = True
+
+    with pytest.raises(ScenarioRunnerError, match="edupage login"):
+        asyncio.run(ar.run_scenario_async(lambda: SleepingScenario("2.png")))
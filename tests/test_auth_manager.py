@@ -1,18 +1,24 @@
+import asyncio
+from concurrent.futures import Future
 from types import SimpleNamespace
 
 import pytest
 
 from edu_page_automat import auth_manager as auth_module
 from edu_page_automat import auth_storage
-from edu_page_automat.auth_manager import AuthManager
+from edu_page_automat.auth_manager import AsyncAuthManager, AuthManager, SessionRequiredError
+from edu_page_automat.execution_profile import ExecutionProfile
+from edu_page_automat.session_cache import SESSION_TTL_ENV_VAR
 
 
 class DummyPage:
     def __init__(self, final_url: str):
         self._final_url = final_url
         self.url = ""
+        self.goto_calls = 0
 
     def goto(self, unused_url: str):
+        self.goto_calls += 1
         self.url = self._final_url
 
 
@@ -26,7 +32,8 @@ class DummyContext:
         return []
 
     def new_page(self):
-        return DummyPage(self._final_url)
+        self.page = DummyPage(self._final_url)
+        return self.page
 
     def close(self):
         self.closed = True
@@ -54,11 +61,28 @@ class DummyPlaywright:
         self.firefox = SimpleNamespace(launch=self._launch)
 
     def _launch(self, headless=False, slow_mo=None):
+        self.launch_options = {"headless": headless, "slow_mo": slow_mo}
         browser = DummyBrowser(self._final_url)
         self.latest_browser = browser
         return browser
 
 
+@pytest.fixture(autouse=True)
+def isolated_daemon_state(tmp_path, monkeypatch):
+    """Keep tests from attaching to a browser daemon running on the developer machine."""
+    monkeypatch.setattr(auth_module, "DAEMON_STATE_FILE", tmp_path / "browser-daemon.json")
+    monkeypatch.setattr(auth_module, "SESSION_CACHE_FILE", tmp_path / "session-cache.json")
+    monkeypatch.setattr(auth_module, "start_session_probe", lambda unused_auth_file, unused_url: probe_result(None))
+    monkeypatch.setattr(auth_module, "probe_session", lambda unused_auth_file, unused_url: None)
+
+
+def probe_result(value):
+    """Return a completed HTTP session probe future."""
+    future = Future()
+    future.set_result(value)
+    return future
+
+
 def test_has_session(tmp_path, monkeypatch):
     auth_file = tmp_path / "auth.json"
     monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
@@ -105,9 +129,110 @@ def test_try_open_session_invalid(tmp_path, monkeypatch):
 
     valid, browser, context = manager.try_open_session()
 
-    assert (valid, browser, context) == (False, None, None)
-    assert playwright.latest_browser.closed is True
-    assert playwright.latest_browser.context.closed is True
+    assert (valid, browser, context) == (False, playwright.latest_browser, None)
+    assert browser.closed is False
+    assert browser.context.closed is True
+
+
+def test_try_open_session_trusts_http_probe_without_navigation(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/login")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    probed = []
+
+    def fake_start_session_probe(received_auth_file, url):
+        probed.append((received_auth_file, url))
+        return probe_result(True)
+
+    monkeypatch.setattr(auth_module, "start_session_probe", fake_start_session_probe)
+    manager = AuthManager(playwright)
+
+    valid, browser, context = manager.try_open_session()
+
+    assert valid is True
+    assert probed == [(auth_file, "https://1itg.edupage.org/user/")]
+    assert context is browser.context
+    assert not hasattr(context, "page")
+
+
+def test_try_open_session_discards_session_rejected_by_http_probe(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/dashboard")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "start_session_probe", lambda unused_auth_file, unused_url: probe_result(False))
+    manager = AuthManager(playwright)
+
+    valid, browser, context = manager.try_open_session()
+
+    assert (valid, browser, context) == (False, playwright.latest_browser, None)
+    assert browser.closed is False
+    assert not hasattr(browser.context, "page")
+
+
+def test_try_open_session_uses_execution_profile(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/dashboard")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    manager = AuthManager(playwright, ExecutionProfile(name="fast", headless=True, slow_mo=0))
+
+    valid, unused_browser, unused_context = manager.try_open_session()
+
+    assert valid is True
+    assert playwright.launch_options == {"headless": True, "slow_mo": 0}
+
+
+def test_try_open_session_records_validation_and_skips_navigation_within_ttl(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/dashboard")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.delenv(SESSION_TTL_ENV_VAR, raising=False)
+
+    first_manager = AuthManager(playwright)
+    first_valid, first_browser, unused_context = first_manager.try_open_session()
+    second_manager = AuthManager(playwright)
+    second_valid, second_browser, second_context = second_manager.try_open_session()
+
+    assert first_valid is True and second_valid is True
+    assert first_browser.context.page.goto_calls == 1
+    assert first_manager.session_probe_pending is False
+    assert second_context is second_browser.context
+    assert not hasattr(second_context, "page")
+    assert second_manager.session_probe_pending is True
+
+
+def test_confirm_session_invalidates_cache_when_first_navigation_hits_login(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    cache_file = tmp_path / "session-cache.json"
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "SESSION_CACHE_FILE", cache_file)
+    manager = AuthManager(DummyPlaywright("https://example.com"))
+    manager.session_probe_pending = True
+    cache_file.write_text("{}", encoding="utf-8")
+
+    with pytest.raises(auth_module.SessionExpiredError):
+        manager.confirm_session(SimpleNamespace(url="https://1itg.edupage.org/login/"))
+
+    assert manager.session_probe_pending is False
+    assert not cache_file.exists()
+
+
+def test_confirm_session_refreshes_cache_after_successful_navigation(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    cache_file = tmp_path / "session-cache.json"
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "SESSION_CACHE_FILE", cache_file)
+    manager = AuthManager(DummyPlaywright("https://example.com"))
+    manager.session_probe_pending = True
+
+    manager.confirm_session(SimpleNamespace(url="https://1itg.edupage.org/user/"))
+
+    assert cache_file.exists()
 
 
 def test_new_context_reuses_valid(monkeypatch):
@@ -115,7 +240,7 @@ def test_new_context_reuses_valid(monkeypatch):
     monkeypatch.setattr(
         manager,
         "try_open_session",
-        lambda headless=False, slow_mo=200: (True, "browser", "context"),
+        lambda headless=None, slow_mo=None: (True, "browser", "context"),
     )
 
     browser, context = manager.new_context()
@@ -131,14 +256,16 @@ def test_new_context_triggers_login(monkeypatch, tmp_path):
     monkeypatch.setattr(
         manager,
         "try_open_session",
-        lambda headless=False, slow_mo=200: (False, None, None),
+        lambda headless=None, slow_mo=None: (False, None, None),
     )
 
     captured = {}
 
-    def fake_setup_login(received_playwright, auth_file=None):
+    def fake_setup_login(received_playwright, browser=None, auth_file=None, profile=None):
         captured["playwright"] = received_playwright
+        captured["browser"] = browser
         captured["auth_file"] = auth_file
+        captured["profile"] = profile
         return "browser2", "context2"
 
     monkeypatch.setattr(auth_module, "setup_login", fake_setup_login)
@@ -146,10 +273,42 @@ def test_new_context_triggers_login(monkeypatch, tmp_path):
     browser, context = manager.new_context()
 
     assert captured["playwright"] is playwright
+    assert captured["browser"] is None
     assert captured["auth_file"] == auth_file
+    assert captured["profile"] is manager.profile
     assert (browser, context) == ("browser2", "context2")
 
 
+def test_new_context_logs_in_on_the_browser_launched_for_a_rejected_session(monkeypatch, tmp_path):
+    """A session rejected by the HTTP probe does not launch a second browser for the login."""
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "start_session_probe", lambda unused_auth_file, unused_url: probe_result(False))
+    launched = []
+
+    def counting_launch(**options):
+        launched.append(playwright._launch(**options))
+        return launched[-1]
+
+    monkeypatch.setattr(playwright.firefox, "launch", counting_launch)
+    login_browsers = []
+
+    def fake_setup_login(unused_playwright, browser=None, auth_file=None, profile=None):
+        login_browsers.append(browser)
+        return browser, "login-context"
+
+    monkeypatch.setattr(auth_module, "setup_login", fake_setup_login)
+
+    browser, context = AuthManager(playwright).new_context()
+
+    assert len(launched) == 1
+    assert login_browsers == [launched[0]]
+    assert (browser, context) == (launched[0], "login-context")
+    assert browser.closed is False
+
+
 def test_get_auth_file_path_uses_env_override(monkeypatch, tmp_path):
     auth_file = tmp_path / "custom-auth.json"
     monkeypatch.setenv(auth_storage.AUTH_FILE_ENV_VAR, str(auth_file))
@@ -164,3 +323,117 @@ def test_get_auth_file_path_uses_xdg_state_home(monkeypatch, tmp_path):
     monkeypatch.setattr(auth_storage.sys, "platform", "linux")
 
     assert auth_storage.get_auth_file_path() == tmp_path / "edu_page_automat" / "auth.json"
+
+
+def test_ensure_session_trusts_http_probe_without_launching_browser(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/login")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "probe_session", lambda unused_auth_file, unused_url: True)
+
+    AuthManager(playwright).ensure_session()
+
+    assert playwright.latest_browser is None
+    assert (tmp_path / "session-cache.json").exists()
+
+
+def test_ensure_session_logs_in_when_probe_rejects_session(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "probe_session", lambda unused_auth_file, unused_url: False)
+    login_browser = DummyBrowser("https://1itg.edupage.org/user/")
+    login_context = login_browser.new_context(storage_state=str(auth_file))
+    monkeypatch.setattr(
+        auth_module,
+        "setup_login",
+        lambda playwright, browser, auth_file, profile: (login_browser, login_context),
+    )
+
+    AuthManager(DummyPlaywright("https://1itg.edupage.org/user/")).ensure_session()
+
+    assert login_context.closed is True
+    assert login_browser.closed is True
+
+
+
+def test_ensure_session_probes_despite_recent_validation(tmp_path, monkeypatch):
+    """Pool contexts cannot re-login on their first navigation, so a cached validation is not trusted."""
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.delenv(SESSION_TTL_ENV_VAR, raising=False)
+    auth_module.record_session_validation(tmp_path / "session-cache.json", auth_file)
+    monkeypatch.setattr(auth_module, "probe_session", lambda unused_auth_file, unused_url: False)
+    login_browser = DummyBrowser("https://1itg.edupage.org/user/")
+    login_context = login_browser.new_context(storage_state=str(auth_file))
+    logins = []
+
+    def fake_setup_login(playwright, browser, auth_file, profile):
+        logins.append(auth_file)
+        return login_browser, login_context
+
+    monkeypatch.setattr(auth_module, "setup_login", fake_setup_login)
+
+    AuthManager(DummyPlaywright("https://1itg.edupage.org/user/")).ensure_session()
+
+    assert logins == [auth_file]
+    assert login_context.closed is True
+
+
+def test_ensure_session_validates_with_navigation_when_probe_is_inconclusive(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.delenv(SESSION_TTL_ENV_VAR, raising=False)
+    auth_module.record_session_validation(tmp_path / "session-cache.json", auth_file)
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/")
+
+    AuthManager(playwright).ensure_session()
+
+    assert playwright.latest_browser.context.page.goto_calls == 1
+    assert playwright.latest_browser.closed is True
+
+def test_open_stored_context_uses_auth_file_without_validation(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    playwright = DummyPlaywright("https://1itg.edupage.org/user/login")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+
+    browser, context = AuthManager(playwright).open_stored_context()
+
+    assert browser.storage_state == str(auth_file)
+    assert context is browser.context
+    assert not hasattr(context, "page")
+
+
+def test_async_auth_manager_raises_instead_of_interactive_login(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_module, "AUTH_FILE", tmp_path / "missing.json")
+
+    with pytest.raises(SessionRequiredError, match="edupage login"):
+        asyncio.run(AsyncAuthManager(object()).ensure_session())
+
+
+def test_async_auth_manager_rejects_logged_out_session(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    monkeypatch.setattr(auth_module, "probe_session", lambda unused_auth_file, unused_url: False)
+
+    with pytest.raises(SessionRequiredError, match="expired"):
+        asyncio.run(AsyncAuthManager(object()).ensure_session())
+
+
+def test_async_auth_manager_defers_inconclusive_probe_to_first_navigation(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(auth_module, "AUTH_FILE", auth_file)
+    auth = AsyncAuthManager(object())
+
+    asyncio.run(auth.ensure_session())
+
+    assert auth.session_probe_pending is True
+    with pytest.raises(SessionRequiredError):
+        auth.confirm_session(SimpleNamespace(url="https://1itg.edupage.org/login/"))
+    assert auth.session_probe_pending is False
@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from edu_page_automat.scenarios.base import ExpectResponse, run_steps, run_steps_async
+
+
+def guarded_steps(page):
+    """Yield two page calls and report a timeout of the first one instead of raising it."""
+    try:
+        yield page.wait_for_selector("table")
+    except PlaywrightTimeoutError:
+        return "timed out"
+    value = yield page.evaluate("() => 1")
+    return value
+
+
+def test_run_steps_returns_flow_result_on_sync_page() -> None:
+    """Sync page results are sent straight back into the flow."""
+    page = MagicMock()
+    page.evaluate.return_value = 1
+
+    assert run_steps(guarded_steps(page)) == 1
+
+
+def test_run_steps_async_awaits_calls_and_throws_errors_into_the_flow() -> None:
+    """Awaited results reach the flow, and a failing call is handled by the flow's own `try`."""
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(return_value=1)
+
+    assert asyncio.run(run_steps_async(guarded_steps(page))) == 1
+
+    page.wait_for_selector = AsyncMock(side_effect=PlaywrightTimeoutError("no table"))
+    assert asyncio.run(run_steps_async(guarded_steps(page))) == "timed out"
+
+
+def test_run_steps_rejects_async_page_calls() -> None:
+    """An async page given to the sync driver fails instead of passing coroutines around."""
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock()
+
+    with pytest.raises(TypeError, match="Async scenario"):
+        run_steps(guarded_steps(page))
+
+
+def test_expect_response_wraps_the_action_on_both_apis() -> None:
+    """The response wait opens before the action steps run and yields the matching response."""
+    def save(page):
+        response = yield ExpectResponse(page, bool, 1000, click(page))
+        return response
+
+    def click(page):
+        yield page.click("a.save")
+
+    page = MagicMock()
+    page.expect_response.return_value.__enter__.return_value.value = "response"
+    assert run_steps(save(page)) == "response"
+    page.expect_response.assert_called_once_with(bool, timeout=1000)
+    page.click.assert_called_once_with("a.save")
+
+    page = MagicMock()
+    page.click = AsyncMock()
+    page.expect_response.return_value.__aenter__.return_value.value = asyncio.sleep(0, result="response")
+    assert asyncio.run(run_steps_async(save(page))) == "response"
+    page.click.assert_awaited_once_with("a.save")
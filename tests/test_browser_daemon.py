@@ -0,0 +1,134 @@
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from edu_page_automat import browser_daemon
+from edu_page_automat.browser_daemon import BrowserDaemonError, connect_or_launch, read_daemon_endpoint
+from edu_page_automat.execution_profile import ExecutionProfile
+
+FAST_PROFILE = ExecutionProfile(name="fast", headless=True, slow_mo=0)
+
+
+class DummyFirefox:
+    def __init__(self, connect_error: Exception | None = None):
+        self.connect_error = connect_error
+        self.calls = []
+
+    def connect(self, ws_endpoint, timeout=None, slow_mo=None):
+        self.calls.append(("connect", ws_endpoint, slow_mo))
+        if self.connect_error:
+            raise self.connect_error
+        return "connected-browser"
+
+    def launch(self, headless=False, slow_mo=None):
+        self.calls.append(("launch", headless, slow_mo))
+        return "launched-browser"
+
+
+def test_read_daemon_endpoint_handles_missing_and_invalid_state(tmp_path):
+    state_path = tmp_path / "browser-daemon.json"
+
+    assert read_daemon_endpoint(state_path) is None
+
+    state_path.write_text("not json", encoding="utf-8")
+    assert read_daemon_endpoint(state_path) is None
+
+    state_path.write_text(json.dumps({"ws_endpoint": "ws://127.0.0.1:9000/abc", "pid": 1}), encoding="utf-8")
+    assert read_daemon_endpoint(state_path) == "ws://127.0.0.1:9000/abc"
+
+
+def test_connect_or_launch_attaches_to_running_daemon(tmp_path):
+    state_path = tmp_path / "browser-daemon.json"
+    state_path.write_text(json.dumps({"ws_endpoint": "ws://127.0.0.1:9000/abc"}), encoding="utf-8")
+    firefox = DummyFirefox()
+
+    browser = connect_or_launch(SimpleNamespace(firefox=firefox), FAST_PROFILE, state_path)
+
+    assert browser == "connected-browser"
+    assert firefox.calls == [("connect", "ws://127.0.0.1:9000/abc", 0)]
+
+
+def test_connect_or_launch_falls_back_when_daemon_is_gone(tmp_path):
+    state_path = tmp_path / "browser-daemon.json"
+    state_path.write_text(json.dumps({"ws_endpoint": "ws://127.0.0.1:9000/abc"}), encoding="utf-8")
+    firefox = DummyFirefox(connect_error=RuntimeError("connection refused"))
+
+    browser = connect_or_launch(SimpleNamespace(firefox=firefox), FAST_PROFILE, state_path)
+
+    assert browser == "launched-browser"
+    assert firefox.calls[-1] == ("launch", True, 0)
+
+
+def test_connect_or_launch_launches_without_daemon(tmp_path):
+    firefox = DummyFirefox()
+
+    browser = connect_or_launch(SimpleNamespace(firefox=firefox), FAST_PROFILE, tmp_path / "missing.json")
+
+    assert browser == "launched-browser"
+    assert firefox.calls == [("launch", True, 0)]
+
+
+def test_run_browser_daemon_advertises_endpoint_until_exit(tmp_path, monkeypatch):
+    state_path = tmp_path / "browser-daemon.json"
+    advertised = {}
+
+    class FakeProcess:
+        pid = 4242
+
+        def __init__(self, command, **unused_kwargs):
+            self.command = command
+            self.stdout = io.StringIO("ws://127.0.0.1:9000/abc\n")
+
+        def wait(self):
+            advertised["state"] = json.loads(state_path.read_text(encoding="utf-8"))
+            return 0
+
+    monkeypatch.setattr(browser_daemon.subprocess, "Popen", FakeProcess)
+
+    browser_daemon.run_browser_daemon(FAST_PROFILE, state_path=state_path)
+
+    assert advertised["state"] == {"ws_endpoint": "ws://127.0.0.1:9000/abc", "pid": 4242, "headless": True}
+    assert not state_path.exists()
+
+
+def test_run_browser_daemon_drains_server_output_after_endpoint(tmp_path, monkeypatch):
+    """Output written after the endpoint line is read and logged instead of filling the pipe."""
+    class FakeProcess:
+        pid = 4242
+
+        def __init__(self, unused_command, **unused_kwargs):
+            self.stdout = io.StringIO("ws://127.0.0.1:9000/abc\n(node:1) Warning: deprecated\n\ncrash trace\n")
+
+        def wait(self):
+            return 0
+
+    logger = MagicMock()
+    monkeypatch.setattr(browser_daemon.subprocess, "Popen", FakeProcess)
+    monkeypatch.setattr(browser_daemon, "logger", logger)
+
+    browser_daemon.run_browser_daemon(FAST_PROFILE, state_path=tmp_path / "browser-daemon.json")
+
+    assert [call.args[1] for call in logger.warning.call_args_list] == ["(node:1) Warning: deprecated", "crash trace"]
+
+
+def test_run_browser_daemon_reports_missing_browser(tmp_path, monkeypatch):
+    class FakeProcess:
+        pid = 4242
+
+        def __init__(self, unused_command, **unused_kwargs):
+            output = iter(["Executable doesn't exist at /tmp/firefox\n"])
+            self.stdout = SimpleNamespace(
+                readline=lambda: next(output),
+                read=lambda: "Please run the following command: playwright install\n",
+            )
+
+        def wait(self):
+            return 1
+
+    monkeypatch.setattr(browser_daemon.subprocess, "Popen", FakeProcess)
+
+    with pytest.raises(BrowserDaemonError, match="edupage install-browsers"):
+        browser_daemon.run_browser_daemon(FAST_PROFILE, state_path=tmp_path / "browser-daemon.json")
@@ -1,12 +1,22 @@
+import json
+
+from playwright import sync_api as playwright_sync_api
 from playwright.sync_api import Error as PlaywrightError
+import pytest
+from typer.main import get_command
 from typer.testing import CliRunner
 
 from edu_page_automat import cli as cli_module
+from edu_page_automat import edupage_site, execution_profile, id_cache, request_blocking, tracing
+from edu_page_automat import scenario_runner as scenario_runner_module
+from edu_page_automat import setup_login as setup_login_module
 from edu_page_automat.cli import cli as main_cli
-from edu_page_automat.grade_diff import GradeDiffSummary
+from edu_page_automat.grade_diff import DEFAULT_STREAMING_CHUNK_ROWS, GradeDiffSummary
+from edu_page_automat.job_file import ScenarioJob
 from edu_page_automat.scenarios import create_task as create_task_module
 from edu_page_automat.scenarios import export_grades as export_grades_module
 from edu_page_automat.scenarios import fill_grades as fill_grades_module
+from edu_page_automat.scenarios import sync_grades as sync_grades_module
 
 
 def test_cli_list_outputs_available_commands():
@@ -19,6 +29,18 @@ def test_cli_list_outputs_available_commands():
     assert "createtask" in result.output
 
 
+def test_cli_shell_completion_lists_scenario_commands_without_loading_them():
+    """Command-name completion does not need to register scenario commands."""
+    group = get_command(main_cli)
+    ctx = group.make_context("edupage", [], resilient_parsing=True)
+    group.commands.pop("fill-grades", None)
+
+    completions = [item.value for item in group.shell_complete(ctx, "fi")]
+
+    assert completions == ["fill-grades"]
+    assert "fill-grades" not in group.commands
+
+
 def test_cli_help_exposes_completion_commands():
     """The Typer root app exposes shell completion management options."""
     runner = CliRunner()
@@ -30,6 +52,86 @@ def test_cli_help_exposes_completion_commands():
     assert "--show-completion" in result.output
 
 
+def test_cli_global_options_configure_execution_profile(monkeypatch):
+    """Global browser options set the execution profile used by browser commands."""
+    runner = CliRunner()
+    monkeypatch.delenv(execution_profile.PROFILE_ENV_VAR, raising=False)
+    monkeypatch.delenv(execution_profile.HEADLESS_ENV_VAR, raising=False)
+    monkeypatch.delenv(execution_profile.SLOW_MO_ENV_VAR, raising=False)
+
+    try:
+        result = runner.invoke(main_cli, ["--profile", "debug", "--headless", "--slow-mo", "0", "list"])
+        profile = execution_profile.get_execution_profile()
+    finally:
+        execution_profile.set_execution_profile(None)
+
+    assert result.exit_code == 0
+    assert profile.launch_options() == {"headless": True, "slow_mo": 0}
+
+
+def test_cli_base_url_option_sets_edupage_site(monkeypatch):
+    """`--base-url` points browser commands at another EduPage site, such as a local stand-in."""
+    runner = CliRunner()
+    monkeypatch.delenv(edupage_site.BASE_URL_ENV_VAR, raising=False)
+
+    try:
+        result = runner.invoke(main_cli, ["--base-url", "http://127.0.0.1:8765", "list"])
+        user_page_url = edupage_site.get_user_page_url()
+    finally:
+        edupage_site.set_base_url(None)
+        execution_profile.set_execution_profile(None)
+
+    assert result.exit_code == 0
+    assert user_page_url == "http://127.0.0.1:8765/user/"
+
+
+def test_cli_trace_out_option_sets_trace_output(tmp_path):
+    """`--trace-out` makes scenario runs in this process write a Chrome trace."""
+    runner = CliRunner()
+    trace_path = tmp_path / "trace.json"
+
+    try:
+        result = runner.invoke(main_cli, ["--trace-out", str(trace_path), "list"])
+        configured_path = tracing.get_trace_output()
+    finally:
+        tracing.set_trace_output(None)
+        execution_profile.set_execution_profile(None)
+
+    assert result.exit_code == 0
+    assert configured_path == trace_path
+
+
+def test_cli_block_options_configure_request_blocking(monkeypatch):
+    """Global blocking options replace resource types and add URL patterns."""
+    runner = CliRunner()
+    monkeypatch.delenv(request_blocking.BLOCK_RESOURCES_ENV_VAR, raising=False)
+    monkeypatch.delenv(request_blocking.BLOCK_URLS_ENV_VAR, raising=False)
+
+    try:
+        result = runner.invoke(
+            main_cli,
+            ["--block-resources", "image,stylesheet", "--block-url", "*/rss/*", "list"],
+        )
+        policy = request_blocking.get_request_blocking()
+    finally:
+        request_blocking.set_request_blocking(None)
+        execution_profile.set_execution_profile(None)
+
+    assert result.exit_code == 0
+    assert policy.resource_types == {"image", "stylesheet"}
+    assert policy.url_patterns[-1] == "*/rss/*"
+
+
+def test_cli_rejects_blocking_documents():
+    """Document requests cannot be blocked because scenarios navigate with them."""
+    runner = CliRunner()
+
+    result = runner.invoke(main_cli, ["--block-resources", "document", "list"])
+
+    assert result.exit_code != 0
+    assert "document" in result.output
+
+
 def test_cli_install_browsers_invokes_playwright_install(monkeypatch):
     """The browser installer command runs inside the active Python environment."""
     runner = CliRunner()
@@ -65,8 +167,8 @@ def test_cli_login_reports_missing_playwright_browser(monkeypatch):
             "    playwright install"
         )
 
-    monkeypatch.setattr(cli_module, "sync_playwright", lambda: DummySyncPlaywright())
-    monkeypatch.setattr(cli_module.setup_login, "run", fake_setup_login)
+    monkeypatch.setattr(playwright_sync_api, "sync_playwright", lambda: DummySyncPlaywright())
+    monkeypatch.setattr(setup_login_module, "run", fake_setup_login)
 
     result = runner.invoke(main_cli, ["login"])
 
@@ -136,17 +238,23 @@ def test_cli_fill_grades_invokes_run_scenario(monkeypatch, tmp_path):
             "P2",
             "--dry-run",
             "--overwrite-existing",
+            "--batch-fill",
+            "--no-id-cache",
+            "--no-deep-link",
         ],
     )
 
     assert result.exit_code == 0
     scenario = captured["scenario"]
     assert isinstance(scenario, fill_grades_module.FillGradesScenario)
+    assert scenario.id_cache_path is None
+    assert scenario.course_catalogue_path is None
     assert scenario.class_ == "2.png"
     assert scenario.subject == "Informatika"
     assert scenario.period == "P2"
     assert scenario.save is False
     assert scenario.overwrite_existing is True
+    assert scenario.batch_fill is True
     assert scenario.entries == [
         fill_grades_module.GradeEntry(
             first_name="Žofie",
@@ -157,6 +265,91 @@ def test_cli_fill_grades_invokes_run_scenario(monkeypatch, tmp_path):
     ]
 
 
+def test_cli_fill_grades_save_every_uses_journal(monkeypatch, tmp_path):
+    """Chunked saving passes the journal next to the auth file and rejects --dry-run."""
+    runner = CliRunner()
+    captured = {}
+    csv_path = tmp_path / "grades.csv"
+    csv_path.write_text("jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nŽofie,Žužlavá,Task,100\n", encoding="utf-8")
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+
+    def fake_run_scenario(factory):
+        captured["scenario"] = factory()
+
+    monkeypatch.setattr(fill_grades_module, "run_scenario", fake_run_scenario)
+    arguments = ["fill-grades", "--class", "2.png", "--grades-csv", str(csv_path), "--save-every", "50", "--resume"]
+
+    result = runner.invoke(main_cli, arguments)
+    dry_run = runner.invoke(main_cli, [*arguments, "--dry-run"])
+
+    assert result.exit_code == 0
+    scenario = captured["scenario"]
+    assert scenario.save_every == 50
+    assert scenario.resume is True
+    assert scenario.journal_path == tmp_path / "fill-journal.jsonl"
+    assert scenario.verify is False
+    assert scenario.verify_report_csv is None
+    assert dry_run.exit_code != 0
+    assert "--dry-run" in dry_run.output
+
+
+def test_cli_fill_grades_verify_defaults_report_next_to_grades_csv(monkeypatch, tmp_path):
+    """--verify enables the post-save check with a mismatch report beside the grades CSV."""
+    runner = CliRunner()
+    captured = {}
+    csv_path = tmp_path / "grades.csv"
+    csv_path.write_text("jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nŽofie,Žužlavá,Task,100\n", encoding="utf-8")
+
+    def fake_run_scenario(factory):
+        captured["scenario"] = factory()
+
+    monkeypatch.setattr(fill_grades_module, "run_scenario", fake_run_scenario)
+
+    result = runner.invoke(main_cli, ["fill-grades", "--class", "2.png", "--grades-csv", str(csv_path), "--verify"])
+
+    assert result.exit_code == 0
+    assert captured["scenario"].verify is True
+    assert captured["scenario"].verify_report_csv == tmp_path / "grades-verify-mismatches.csv"
+
+
+def test_cli_sync_grades_invokes_run_scenario(monkeypatch, tmp_path):
+    """The sync-grades command builds one fused scenario from the truth CSV."""
+    runner = CliRunner()
+    captured = {}
+    truth_csv = tmp_path / "truth.csv"
+    truth_csv.write_text("jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nŽofie,Žužlavá,Task,100\n", encoding="utf-8")
+
+    def fake_run_scenario(factory):
+        captured["scenario"] = factory()
+
+    monkeypatch.setattr(sync_grades_module, "run_scenario", fake_run_scenario)
+
+    result = runner.invoke(
+        main_cli,
+        [
+            "sync-grades",
+            "--class",
+            "2.png",
+            "--truth-csv",
+            str(truth_csv),
+            "--keep-better-current",
+            "--dry-run",
+            "--no-id-cache",
+            "--no-deep-link",
+        ],
+    )
+
+    assert result.exit_code == 0
+    scenario = captured["scenario"]
+    assert isinstance(scenario, sync_grades_module.SyncGradesScenario)
+    assert [row.key for row in scenario.truth_rows] == [("Žofie", "Žužlavá", "Task")]
+    assert scenario.keep_better_current is True
+    assert scenario.overwrite_existing is True
+    assert scenario.save is False
+    assert scenario.id_cache_path is None
+    assert scenario.course_catalogue_path is None
+
+
 def test_cli_list_outputs_export_grades_command():
     """The scenario registry includes the grade-export scenario."""
     runner = CliRunner()
@@ -200,6 +393,68 @@ def test_cli_export_grades_invokes_run_scenario(monkeypatch, tmp_path):
     assert scenario.task_category is None
 
 
+def test_cli_export_grades_accepts_repeated_classes_and_course_file(monkeypatch, tmp_path):
+    """Repeated --class options and a course list file are exported in one scenario run."""
+    runner = CliRunner()
+    captured = {}
+    courses_file = tmp_path / "courses.csv"
+    courses_file.write_text("class,subject\n4.B,Programování\n", encoding="utf-8")
+
+    def fake_run_scenario(factory):
+        captured.setdefault("scenarios", []).append(factory())
+
+    monkeypatch.setattr(export_grades_module, "run_scenario", fake_run_scenario)
+
+    result = runner.invoke(
+        main_cli,
+        [
+            "export-grades",
+            "--class",
+            "2.png",
+            "--class",
+            "3.cpu",
+            "--courses-file",
+            str(courses_file),
+            "--output-dir",
+            str(tmp_path / "exports"),
+        ],
+    )
+
+    assert result.exit_code == 0
+    (scenario,) = captured["scenarios"]
+    assert scenario.courses == [
+        export_grades_module.ExportCourse("2.png", "Informatika"),
+        export_grades_module.ExportCourse("3.cpu", "Informatika"),
+        export_grades_module.ExportCourse("4.B", "Programování"),
+    ]
+    assert scenario.output_dir == tmp_path / "exports"
+    assert scenario.output_csv is None
+
+
+def test_cli_export_grades_requires_a_course_and_one_output(tmp_path):
+    """Export needs at least one course and exactly one output destination."""
+    runner = CliRunner()
+
+    no_course = runner.invoke(main_cli, ["export-grades", "--output-csv", str(tmp_path / "grades.csv")])
+    two_outputs = runner.invoke(
+        main_cli,
+        [
+            "export-grades",
+            "--class",
+            "2.png",
+            "--output-csv",
+            str(tmp_path / "grades.csv"),
+            "--output-dir",
+            str(tmp_path / "exports"),
+        ],
+    )
+
+    assert no_course.exit_code != 0
+    assert "--class" in no_course.output
+    assert two_outputs.exit_code != 0
+    assert "exactly one" in two_outputs.output
+
+
 def test_cli_export_grades_forwards_task_category(monkeypatch, tmp_path):
     """The export-grades command can limit the export to one task category."""
     runner = CliRunner()
@@ -232,6 +487,163 @@ def test_cli_export_grades_forwards_task_category(monkeypatch, tmp_path):
     assert scenario.task_category == "Dan - Frontend"
 
 
+def test_cli_export_grades_runs_courses_on_parallel_workers(monkeypatch, tmp_path):
+    """With --workers, each course becomes its own job and the results are combined."""
+    runner = CliRunner()
+    captured = {}
+    output_csv = tmp_path / "grades.csv"
+
+    def fake_run_scenarios(factories, *, workers):
+        captured["workers"] = workers
+        results = []
+        for index, factory in enumerate(factories):
+            scenario = factory()
+            course = scenario.courses[0]
+            if course.class_ == "4.B":
+                results.append(scenario_runner_module.ScenarioJobResult(index, scenario, ValueError("no grades")))
+                continue
+            row = export_grades_module.GradeExportRow("Ada", "Lovelace", "", "Test", "1")
+            scenario.exported = [(course, [row])]
+            results.append(scenario_runner_module.ScenarioJobResult(index, scenario))
+        return results
+
+    monkeypatch.setattr(export_grades_module, "run_scenarios", fake_run_scenarios)
+
+    result = runner.invoke(
+        main_cli,
+        [
+            "export-grades",
+            "--class",
+            "2.png",
+            "--class",
+            "3.cpu",
+            "--class",
+            "4.B",
+            "--output-csv",
+            str(output_csv),
+            "--workers",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert captured["workers"] == 2
+    assert "4.B / Informatika: no grades" in result.output
+    assert output_csv.read_text(encoding="utf-8").splitlines() == [
+        "class,subject,first_name,last_name,task_category,task_name,points",
+        "2.png,Informatika,Ada,Lovelace,,Test,1",
+        "3.cpu,Informatika,Ada,Lovelace,,Test,1",
+    ]
+
+
+def test_cli_run_jobs_builds_every_job_and_runs_them_in_one_session(monkeypatch, tmp_path):
+    """Job-file jobs become scenarios that run together, and failed jobs are reported."""
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+    (tmp_path / "grades.csv").write_text(
+        "first_name,last_name,task_name,points\nAda,Lovelace,Test 1,10\n", encoding="utf-8"
+    )
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(
+        json.dumps(
+            {
+                "defaults": {"subject": "Matematika"},
+                "jobs": [
+                    {"command": "create-task", "class": "3.gpu", "task": ["Test 1:10"], "deep-link": False},
+                    {"command": "fill-grades", "class": "2.png", "grades-csv": "grades.csv", "overwrite-existing": True},
+                    {"command": "export-grades", "class": "4.B", "output-csv": "out/4b.csv"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    captured = {}
+
+    def fake_run_scenarios(factories, *, workers):
+        captured["workers"] = workers
+        captured["scenarios"] = [factory() for factory in factories]
+        return [
+            scenario_runner_module.ScenarioJobResult(index, scenario, ValueError("no grades") if index == 2 else None)
+            for index, scenario in enumerate(captured["scenarios"])
+        ]
+
+    monkeypatch.setattr(scenario_runner_module, "run_scenarios", fake_run_scenarios)
+
+    result = CliRunner().invoke(main_cli, ["run-jobs", str(job_file), "--workers", "2"])
+
+    assert result.exit_code == 1
+    assert "Finished 2 of 3 jobs" in result.output
+    assert "Job 3 (export-grades): no grades" in result.output
+    assert captured["workers"] == 2
+    create, fill, export = captured["scenarios"]
+    assert isinstance(create, create_task_module.CreateTaskScenario)
+    assert (create.class_, create.subject, create.course_catalogue_path) == ("3.gpu", "Matematika", None)
+    assert create.tasks == [create_task_module.TaskDefinition("Test 1", 10)]
+    assert isinstance(fill, fill_grades_module.FillGradesScenario)
+    assert (fill.class_, fill.subject, fill.period, fill.save) == ("2.png", "Matematika", "P2", True)
+    assert fill.overwrite_existing is True
+    assert fill.id_cache_path == tmp_path / "course-ids.json"
+    assert [entry.task_name for entry in fill.entries] == ["Test 1"]
+    assert isinstance(export, export_grades_module.ExportGradesScenario)
+    assert export.output_csv == tmp_path / "out" / "4b.csv"
+    assert [course.label for course in export.courses] == ["4.B / Matematika"]
+
+
+def test_create_task_from_job_maps_name_and_points(tmp_path):
+    """A job's `name` and `points` add one task, like `create-task --name --points`."""
+    job = ScenarioJob(1, "create-task", {"class": "3.gpu", "name": "Test: Linux", "points": 15}, tmp_path)
+
+    scenario = create_task_module.CreateTaskScenario.from_job(job)
+
+    assert scenario.tasks == [create_task_module.TaskDefinition("Test: Linux", 15)]
+
+    with pytest.raises(ValueError, match="'name' and 'points' must be given together"):
+        create_task_module.CreateTaskScenario.from_job(
+            ScenarioJob(1, "create-task", {"class": "3.gpu", "name": "Test"}, tmp_path)
+        )
+    with pytest.raises(ValueError, match="'points' must be an integer"):
+        create_task_module.CreateTaskScenario.from_job(
+            ScenarioJob(1, "create-task", {"class": "3.gpu", "name": "Test", "points": "many"}, tmp_path)
+        )
+
+
+def test_cli_run_jobs_rejects_invalid_job_before_starting_browser(monkeypatch, tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text('[{"command": "fill-grades", "class": "2.png", "save-every": 5}]', encoding="utf-8")
+
+    def fail_run_scenarios(*args, **kwargs):
+        raise AssertionError("run_scenarios must not be called")
+
+    monkeypatch.setattr(scenario_runner_module, "run_scenarios", fail_run_scenarios)
+
+    result = CliRunner().invoke(main_cli, ["run-jobs", str(job_file)])
+
+    assert result.exit_code == 2
+    assert "Job 1 (fill-grades)" in result.output
+    assert "save-every" in result.output
+
+
+def test_cli_cache_show_and_clear_course_ids(monkeypatch, tmp_path):
+    """The cache command lists cached courses and clears them by class."""
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+    cache_path = tmp_path / "course-ids.json"
+    for class_name in ("2.png", "3.cpu"):
+        id_cache.record_course_ids(
+            cache_path,
+            id_cache.new_course_ids(class_name, "Informatika", "P2", {"Lovelace, Ada": ["?studentid=-1"]}, {}),
+        )
+    runner = CliRunner()
+
+    shown = runner.invoke(main_cli, ["cache", "show"])
+    cleared = runner.invoke(main_cli, ["cache", "clear", "--class", "2.png"])
+
+    assert shown.exit_code == 0
+    assert "2.png / Informatika / P2: 1 students, 0 tasks" in shown.output
+    assert "3.cpu / Informatika / P2" in shown.output
+    assert cleared.exit_code == 0
+    assert "Removed 1 cached courses." in cleared.output
+    assert list(id_cache.read_id_cache(cache_path)) == ["3.cpu|Informatika|P2"]
+
+
 def test_cli_convert_classroom_grades_invokes_converter(monkeypatch, tmp_path):
     """The Classroom conversion command runs outside the Playwright scenario registry."""
     runner = CliRunner()
@@ -288,12 +700,23 @@ def test_cli_diff_grades_invokes_diff_writer(monkeypatch, tmp_path):
     current_csv.write_text("first_name,last_name,task_name,points\nAda,Lovelace,Task,m\n", encoding="utf-8")
     truth_csv.write_text("jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nAda,Lovelace,Task,100\n", encoding="utf-8")
 
-    def fake_write_grade_diff_csv(current_path, truth_path, output_path, *, keep_better_current=False, kept_current_report_csv=None):
+    def fake_write_grade_diff_csv(
+        current_path,
+        truth_path,
+        output_path,
+        *,
+        keep_better_current=False,
+        kept_current_report_csv=None,
+        streaming=False,
+        chunk_rows=None,
+    ):
         captured["current_path"] = current_path
         captured["truth_path"] = truth_path
         captured["output_path"] = output_path
         captured["keep_better_current"] = keep_better_current
         captured["kept_current_report_csv"] = kept_current_report_csv
+        captured["streaming"] = streaming
+        captured["chunk_rows"] = chunk_rows
         return GradeDiffSummary(
             written_rows=1,
             equal_rows=2,
@@ -325,6 +748,8 @@ def test_cli_diff_grades_invokes_diff_writer(monkeypatch, tmp_path):
         "output_path": output_csv,
         "keep_better_current": False,
         "kept_current_report_csv": None,
+        "streaming": False,
+        "chunk_rows": DEFAULT_STREAMING_CHUNK_ROWS,
     }
     assert f"Wrote 1 grade rows to {output_csv}" in result.output
     assert "equal=2" in result.output
@@ -344,12 +769,23 @@ def test_cli_diff_grades_enables_keep_better_current_and_reports_path(monkeypatc
     current_csv.write_text("first_name,last_name,task_name,points\nAda,Lovelace,Task,m\n", encoding="utf-8")
     truth_csv.write_text("jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nAda,Lovelace,Task,100\n", encoding="utf-8")
 
-    def fake_write_grade_diff_csv(current_path, truth_path, output_path, *, keep_better_current=False, kept_current_report_csv=None):
+    def fake_write_grade_diff_csv(
+        current_path,
+        truth_path,
+        output_path,
+        *,
+        keep_better_current=False,
+        kept_current_report_csv=None,
+        streaming=False,
+        chunk_rows=None,
+    ):
         captured["current_path"] = current_path
         captured["truth_path"] = truth_path
         captured["output_path"] = output_path
         captured["keep_better_current"] = keep_better_current
         captured["kept_current_report_csv"] = kept_current_report_csv
+        captured["streaming"] = streaming
+        captured["chunk_rows"] = chunk_rows
         return GradeDiffSummary(
             written_rows=1,
             equal_rows=0,
@@ -382,6 +818,48 @@ def test_cli_diff_grades_enables_keep_better_current_and_reports_path(monkeypatc
         "output_path": output_csv,
         "keep_better_current": True,
         "kept_current_report_csv": None,
+        "streaming": False,
+        "chunk_rows": DEFAULT_STREAMING_CHUNK_ROWS,
     }
     assert "kept-better-current=2" in result.output
     assert f"kept-current-report={output_csv.with_name('diff-kept-current.csv')}" in result.output
+
+
+def test_cli_diff_grades_streaming_writes_rows_in_key_order(tmp_path):
+    """The streaming diff sorts unsorted inputs in small runs and writes rows in student-task order."""
+    runner = CliRunner()
+    current_csv = tmp_path / "current.csv"
+    truth_csv = tmp_path / "truth.csv"
+    output_csv = tmp_path / "diff.csv"
+    current_csv.write_text(
+        "first_name,last_name,task_name,points\nGrace,Hopper,Task,m\nAda,Lovelace,Task,10\nAlan,Turing,Task,5\n",
+        encoding="utf-8",
+    )
+    truth_csv.write_text(
+        "jmeno,prijmeni,jmeno_ulohy,pocet_bodu\nGrace,Hopper,Task,80\nAlan,Turing,Task,5\nAda,Lovelace,Task,100\n",
+        encoding="utf-8",
+    )
+
+    result = runner.invoke(
+        main_cli,
+        [
+            "diff-grades",
+            "--current-csv",
+            str(current_csv),
+            "--truth-csv",
+            str(truth_csv),
+            "--output-csv",
+            str(output_csv),
+            "--streaming",
+            "--chunk-rows",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"Wrote 2 grade rows to {output_csv}" in result.output
+    assert "equal=1" in result.output
+    assert output_csv.read_text(encoding="utf-8").splitlines()[1:] == [
+        "Ada,Lovelace,Task,100",
+        "Grace,Hopper,Task,80",
+    ]
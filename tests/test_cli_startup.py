@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+IMPORT_BUDGET_SECONDS = 1.5
+_STARTUP_SCRIPT = textwrap.dedent(
+    """
+    import json
+    import sys
+    import time
+
+    started = time.perf_counter()
+    from edu_page_automat.cli import cli
+    import_seconds = time.perf_counter() - started
+
+    exit_code = 0
+    try:
+        cli(sys.argv[1:], prog_name="edupage")
+    except SystemExit as exc:
+        exit_code = exc.code or 0
+
+    heavy_modules = sorted(
+        name for name in sys.modules
+        if name == "playwright" or name.startswith("edu_page_automat.scenarios")
+    )
+    print(json.dumps({"exit_code": exit_code, "import_seconds": import_seconds, "heavy_modules": heavy_modules}))
+    """
+)
+
+
+def run_offline_command(*args: str) -> dict:
+    """Run an offline CLI command in a fresh interpreter and report its startup profile."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT, *args],
+        capture_output=True,
+        check=True,
+        cwd=SRC,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_list_command_stays_within_import_budget():
+    """`edupage list` does not import Playwright or scenario modules."""
+    profile = run_offline_command("list")
+
+    assert profile["exit_code"] == 0
+    assert profile["heavy_modules"] == []
+    assert profile["import_seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_offline_csv_commands_do_not_import_playwright(tmp_path):
+    """CSV conversion and diff commands run without loading browser automation."""
+    classroom_csv = tmp_path / "classroom.csv"
+    classroom_csv.write_text("Student,Task,Topic,Points earned\nAda Lovelace,Task,Topic,42\n", encoding="utf-8")
+    current_csv = tmp_path / "current.csv"
+    current_csv.write_text("first_name,last_name,task_name,points\nAda,Lovelace,Task,m\n", encoding="utf-8")
+
+    convert_profile = run_offline_command(
+        "convert-classroom-grades",
+        "--input-csv",
+        str(classroom_csv),
+        "--output-csv",
+        str(tmp_path / "edupage.csv"),
+    )
+    diff_profile = run_offline_command(
+        "diff-grades",
+        "--current-csv",
+        str(current_csv),
+        "--truth-csv",
+        str(tmp_path / "edupage.csv"),
+        "--output-csv",
+        str(tmp_path / "diff.csv"),
+    )
+
+    assert convert_profile["exit_code"] == 0
+    assert diff_profile["exit_code"] == 0
+    assert convert_profile["heavy_modules"] == []
+    assert diff_profile["heavy_modules"] == []
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from edu_page_automat import edupage_site
+from edu_page_automat.course_catalogue import (
+    forget_course_url,
+    get_course_catalogue_path,
+    lookup_course_url,
+    read_course_catalogue,
+    record_course_url,
+)
+
+ZNAMKY_URL = "https://1itg.edupage.org/znamky/?what=studentsList&eqa=abc"
+
+
+@pytest.fixture(autouse=True)
+def default_base_url(monkeypatch):
+    monkeypatch.delenv(edupage_site.BASE_URL_ENV_VAR, raising=False)
+    edupage_site.set_base_url(None)
+    yield
+    edupage_site.set_base_url(None)
+
+
+def test_record_and_lookup_course_url(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+
+    record_course_url(catalogue_path, "2.png", "Informatika", ZNAMKY_URL, now=1_000)
+
+    assert lookup_course_url(catalogue_path, "2.png", "Informatika") == ZNAMKY_URL
+    assert lookup_course_url(catalogue_path, "3.cpu", "Informatika") is None
+    assert read_course_catalogue(catalogue_path)["2.png|Informatika"]["recorded_at"] == 1_000
+
+
+
+def test_concurrent_records_keep_every_course(tmp_path):
+    """Worker threads recording different courses at once never drop each other's URLs."""
+    catalogue_path = tmp_path / "course-urls.json"
+    classes = [f"{number}.png" for number in range(24)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda class_: record_course_url(catalogue_path, class_, "Informatika", ZNAMKY_URL), classes))
+
+    assert sorted(entry["class"] for entry in read_course_catalogue(catalogue_path).values()) == sorted(classes)
+    assert [path.name for path in tmp_path.iterdir()] == ["course-urls.json"]
+
+def test_record_course_url_skips_login_and_foreign_site_urls(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+
+    record_course_url(catalogue_path, "2.png", "Informatika", "https://1itg.edupage.org/login/?next=znamky")
+    record_course_url(catalogue_path, "3.cpu", "Informatika", "http://127.0.0.1:8000/znamky/?course=1")
+
+    assert not catalogue_path.exists()
+
+
+def test_lookup_ignores_urls_of_another_base_url(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+    record_course_url(catalogue_path, "2.png", "Informatika", ZNAMKY_URL)
+
+    edupage_site.set_base_url("http://127.0.0.1:8000/")
+
+    assert lookup_course_url(catalogue_path, "2.png", "Informatika") is None
+
+
+def test_forget_course_url_and_malformed_file(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+    record_course_url(catalogue_path, "2.png", "Informatika", ZNAMKY_URL)
+
+    forget_course_url(catalogue_path, "2.png", "Informatika")
+
+    assert lookup_course_url(catalogue_path, "2.png", "Informatika") is None
+    catalogue_path.write_text("[]", encoding="utf-8")
+    assert read_course_catalogue(catalogue_path) == {}
+
+
+def test_course_catalogue_path_is_stored_next_to_auth_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+
+    assert get_course_catalogue_path() == tmp_path / "course-urls.json"
@@ -1,10 +1,13 @@
+import asyncio
 from pathlib import Path
 from typing import List
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from edu_page_automat.scenarios.base import run_steps
 from edu_page_automat.scenarios.create_task import (
+    AsyncCreateTaskScenario,
     CreateTaskScenario,
     TASK_ROW_LOCATOR,
     TaskDefinition,
@@ -109,7 +112,7 @@ class TestTaskMissing:
         locator.filter.return_value = filtered
         page.locator.return_value = locator
 
-        missing = scenario._task_missing(page, TaskDefinition(name="Existing", points=1))
+        missing = run_steps(scenario._task_missing(page, TaskDefinition(name="Existing", points=1)))
 
         page.locator.assert_called_once_with(TASK_ROW_LOCATOR)
         locator.filter.assert_called_once_with(has_text="Existing")
@@ -125,7 +128,7 @@ class TestTaskMissing:
         locator.filter.return_value = filtered
         page.locator.return_value = locator
 
-        missing = scenario._task_missing(page, TaskDefinition(name="New Task", points=2))
+        missing = run_steps(scenario._task_missing(page, TaskDefinition(name="New Task", points=2)))
 
         page.locator.assert_called_once_with(TASK_ROW_LOCATOR)
         locator.filter.assert_called_once_with(has_text="New Task")
@@ -172,7 +175,7 @@ def test_create_task_fills_form_and_selects_category() -> None:
     page.locator.side_effect = locator_side_effect
     page.get_by_role.side_effect = get_by_role_side_effect
 
-    scenario._create_task(page, task)
+    run_steps(scenario._create_task(page, task))
 
     page.locator.assert_any_call("a")
     new_task_locator.filter.assert_called_once_with(has_text="Nová písemka/ zkoušení")
@@ -232,7 +235,7 @@ def test_create_task_without_category_uses_fallback() -> None:
     page.locator.side_effect = locator_side_effect
     page.get_by_role.side_effect = get_by_role_side_effect
 
-    scenario._create_task(page, task)
+    run_steps(scenario._create_task(page, task))
 
     dropdown.wait_for.assert_called_once_with(state="attached", timeout=15000)
     dropdown.select_option.assert_not_called()
@@ -280,10 +283,12 @@ def test_run_creates_only_missing_tasks(monkeypatch):
 
     def fake_task_missing(unused_page, task):
         missing_results.append(task.name)
+        yield
         return next(missing_iter)
 
     def fake_create_task(unused_page, task):
         created_results.append(task.name)
+        yield
 
     monkeypatch.setattr(scenario, "_task_missing", fake_task_missing)
     monkeypatch.setattr(scenario, "_create_task", fake_create_task)
@@ -292,3 +297,39 @@ def test_run_creates_only_missing_tasks(monkeypatch):
 
     assert missing_results == ["Úloha 1", "Úloha 2"]
     assert created_results == ["Úloha 1"]
+
+
+def async_page(evaluate_results=()) -> MagicMock:
+    """Return an async Playwright page fake whose locators share awaitable actions."""
+    locator = MagicMock()
+    locator.filter.return_value = locator
+    locator.first = locator
+    for action in ("click", "fill", "wait_for", "select_option"):
+        setattr(locator, action, AsyncMock())
+    locator.count = AsyncMock(return_value=0)
+    page = MagicMock()
+    page.locator.return_value = locator
+    page.get_by_role.return_value = locator
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=list(evaluate_results))
+    return page
+
+
+def test_async_create_task_scenario_skips_existing_and_creates_missing_tasks() -> None:
+    """The async variant keeps the duplicate check and submits the new-task form."""
+    scenario = AsyncCreateTaskScenario(
+        "3.cpu",
+        [TaskDefinition(name="Existing", points=5), TaskDefinition(name="New", points=10)],
+        category="Písemka",
+    )
+    page = async_page()
+    locator = page.locator.return_value
+    locator.count.side_effect = [1, 0]
+
+    asyncio.run(scenario.run(page))
+
+    locator.fill.assert_any_await("New")
+    locator.fill.assert_any_await("10")
+    locator.select_option.assert_awaited_once_with(label="Písemka")
+    assert all(call.args != ("Existing",) for call in locator.fill.await_args_list)
@@ -0,0 +1,54 @@
+import csv
+
+import pytest
+
+from edu_page_automat import csv_input
+from edu_page_automat.csv_input import csv_dialect, open_csv
+
+
+def test_open_csv_resolves_columns_and_yields_stripped_records(tmp_path):
+    csv_path = tmp_path / "grades.csv"
+    csv_path.write_text(
+        "Jmeno,Task Name,Pocet-Bodu,Pocet-Bodu\n Ada , Test 1 ,5,7\n\nGrace,Test 2\n",
+        encoding="utf-8",
+    )
+
+    with open_csv(csv_path) as reader:
+        name = reader.column({"jmeno"}, "first name")
+        task = reader.column({"task_name"}, "task name")
+        points = reader.column({"pocet_bodu"}, "points")
+        records = list(reader.records(name, task, points, reader.find_column({"missing"})))
+
+    assert (name, task, points) == (0, 1, 3)
+    assert records == [(2, ("Ada", "Test 1", "7", "")), (3, ("Grace", "Test 2", "", ""))]
+
+
+def test_column_reports_missing_header(tmp_path):
+    csv_path = tmp_path / "grades.csv"
+    csv_path.write_text("first_name,last_name\nAda,Lovelace\n", encoding="utf-8")
+
+    with open_csv(csv_path) as reader, pytest.raises(ValueError, match="CSV header must contain a column for points"):
+        reader.column({"points"}, "points")
+
+
+def test_csv_dialect_is_sniffed_once_per_file_version(tmp_path, monkeypatch):
+    csv_path = tmp_path / "grades.csv"
+    csv_path.write_text("a;b\n1;2\n", encoding="utf-8")
+    sniffed = []
+    sniff_dialect = csv_input.sniff_dialect
+    monkeypatch.setattr(csv_input, "sniff_dialect", lambda sample: sniffed.append(sample) or sniff_dialect(sample))
+    csv_input._cached_dialect.cache_clear()
+
+    first = csv_dialect(csv_path)
+    second = csv_dialect(csv_path)
+    csv_path.write_text("a,b,c\n1,2,3\n", encoding="utf-8")
+    changed = csv_dialect(csv_path)
+
+    assert first is second
+    assert first.delimiter == ";"
+    assert changed.delimiter == ","
+    assert len(sniffed) == 2
+
+
+def test_sniff_dialect_falls_back_to_excel():
+    assert csv_input.sniff_dialect("") is csv.excel
@@ -0,0 +1,41 @@
+import pytest
+
+from edu_page_automat import edupage_site
+
+
+@pytest.fixture(autouse=True)
+def reset_active_base_url(monkeypatch):
+    """Keep each test independent of the process-wide base URL and environment."""
+    monkeypatch.delenv(edupage_site.BASE_URL_ENV_VAR, raising=False)
+    edupage_site.set_base_url(None)
+    yield
+    edupage_site.set_base_url(None)
+
+
+def test_default_base_url_points_to_school_edupage():
+    """Without configuration scenarios keep using the school EduPage site."""
+    assert edupage_site.get_base_url() == "https://1itg.edupage.org/"
+    assert edupage_site.get_user_page_url() == "https://1itg.edupage.org/user/"
+
+
+def test_environment_base_url_is_normalized(monkeypatch):
+    """`EDUPAGE_URL` may omit the trailing slash, for example for a local stand-in server."""
+    monkeypatch.setenv(edupage_site.BASE_URL_ENV_VAR, "http://127.0.0.1:8765")
+
+    assert edupage_site.get_user_page_url() == "http://127.0.0.1:8765/user/"
+    assert edupage_site.edupage_url("/znamky/") == "http://127.0.0.1:8765/znamky/"
+
+
+def test_active_base_url_overrides_environment(monkeypatch):
+    """The CLI option wins over the environment for the current process."""
+    monkeypatch.setenv(edupage_site.BASE_URL_ENV_VAR, "https://other.edupage.org/")
+
+    edupage_site.set_base_url("http://localhost:9000/")
+
+    assert edupage_site.get_base_url() == "http://localhost:9000/"
+
+
+def test_relative_base_url_is_rejected():
+    """Base URLs must be absolute so Playwright and the session probe can use them."""
+    with pytest.raises(ValueError, match="absolute"):
+        edupage_site.set_base_url("1itg.edupage.org")
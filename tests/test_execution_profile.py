@@ -0,0 +1,74 @@
+import pytest
+
+from edu_page_automat import execution_profile
+from edu_page_automat.execution_profile import ExecutionProfile
+
+
+@pytest.fixture(autouse=True)
+def reset_active_profile(monkeypatch):
+    """Keep each test independent of the process-wide active profile and environment."""
+    for env_var in (
+        execution_profile.PROFILE_ENV_VAR,
+        execution_profile.HEADLESS_ENV_VAR,
+        execution_profile.SLOW_MO_ENV_VAR,
+    ):
+        monkeypatch.delenv(env_var, raising=False)
+    execution_profile.set_execution_profile(None)
+    yield
+    execution_profile.set_execution_profile(None)
+
+
+def test_default_profile_keeps_headed_debug_mode():
+    """Without configuration the CLI keeps the historical headed, slow-motion browser."""
+    profile = ExecutionProfile.from_environment()
+
+    assert profile.name == "debug"
+    assert profile.launch_options() == {"headless": False, "slow_mo": 200}
+
+
+def test_environment_selects_fast_profile(monkeypatch):
+    """Batch hosts can select the headless profile without artificial delay."""
+    monkeypatch.setenv(execution_profile.PROFILE_ENV_VAR, "fast")
+
+    assert execution_profile.get_execution_profile().launch_options() == {"headless": True, "slow_mo": 0}
+
+
+def test_environment_overrides_profile_settings(monkeypatch):
+    """Individual launch settings override the selected profile."""
+    monkeypatch.setenv(execution_profile.PROFILE_ENV_VAR, "fast")
+    monkeypatch.setenv(execution_profile.HEADLESS_ENV_VAR, "false")
+    monkeypatch.setenv(execution_profile.SLOW_MO_ENV_VAR, "50")
+
+    profile = ExecutionProfile.from_environment()
+
+    assert profile.launch_options() == {"headless": False, "slow_mo": 50}
+
+
+def test_explicit_profile_name_replaces_environment_profile(monkeypatch):
+    """CLI profile selection wins over EDUPAGE_PROFILE."""
+    monkeypatch.setenv(execution_profile.PROFILE_ENV_VAR, "fast")
+
+    assert ExecutionProfile.from_environment("debug").name == "debug"
+
+
+def test_invalid_environment_values_are_rejected(monkeypatch):
+    """Invalid environment configuration fails with the variable name."""
+    monkeypatch.setenv(execution_profile.HEADLESS_ENV_VAR, "sometimes")
+
+    with pytest.raises(ValueError, match="EDUPAGE_HEADLESS"):
+        ExecutionProfile.from_environment()
+
+
+def test_unknown_profile_name_is_rejected():
+    """Unknown profile names list the available profiles."""
+    with pytest.raises(ValueError, match="Available profiles: debug, fast"):
+        ExecutionProfile.named("turbo")
+
+
+def test_active_profile_takes_precedence_over_environment(monkeypatch):
+    """The CLI-configured profile is used by runner and login code."""
+    monkeypatch.setenv(execution_profile.PROFILE_ENV_VAR, "debug")
+    active = ExecutionProfile(name="fast", headless=True, slow_mo=0)
+    execution_profile.set_execution_profile(active)
+
+    assert execution_profile.get_execution_profile() is active
@@ -1,11 +1,18 @@
+import asyncio
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from edu_page_automat.scenarios import export_grades as export_grades_module
+from edu_page_automat.scenarios.base import run_steps
 from edu_page_automat.scenarios.export_grades import (
+    AsyncExportGradesScenario,
+    ExportCourse,
     ExportGradesScenario,
     GradeExportRow,
+    _load_courses_from_csv,
     _normalize_exported_points,
     _split_student_display_name,
     _write_grade_rows_to_csv,
@@ -49,27 +56,19 @@ def test_extract_grade_rows_maps_page_payload() -> None:
     """Browser-extracted student/task grade cells become typed export rows."""
     scenario = ExportGradesScenario(class_="2.png", output_csv=Path("grades.csv"))
     page = MagicMock()
-    page.evaluate.return_value = [
-        {
-            "studentName": "Žužlavá, Žofie",
-            "taskCategory": "Dan - Frontend",
-            "taskName": "Build an App",
-            "points": "100",
-        },
-        {
-            "studentName": "Lovelace, Ada",
-            "taskCategory": "Dan - Frontend",
-            "taskName": "Build an App",
-            "points": "m · 20",
-        },
-    ]
+    page.evaluate.return_value = {
+        "tasks": [["Build an App", "Dan - Frontend"], ["Build a Game", "Dan - Frontend"]],
+        "students": ["Žužlavá, Žofie", "Lovelace, Ada"],
+        "points": [["100", None], ["m · 20", ""]],
+    }
 
-    rows = scenario._extract_grade_rows(page)
+    rows = run_steps(scenario._extract_grade_rows(page))
 
     page.wait_for_selector.assert_called_once_with('a[href*="studentid="]', state="attached", timeout=10000)
     assert rows == [
         GradeExportRow("Žofie", "Žužlavá", "Dan - Frontend", "Build an App", "100"),
         GradeExportRow("Ada", "Lovelace", "Dan - Frontend", "Build an App", "m"),
+        GradeExportRow("Ada", "Lovelace", "Dan - Frontend", "Build a Game", ""),
     ]
 
 
@@ -81,22 +80,13 @@ def test_extract_grade_rows_filters_requested_task_category() -> None:
         task_category="Dan - Frontend",
     )
     page = MagicMock()
-    page.evaluate.return_value = [
-        {
-            "studentName": "Žužlavá, Žofie",
-            "taskCategory": "Dan - Frontend",
-            "taskName": "Build an App",
-            "points": "100",
-        },
-        {
-            "studentName": "Lovelace, Ada",
-            "taskCategory": "Dan - Backend",
-            "taskName": "Build an API",
-            "points": "80",
-        },
-    ]
+    page.evaluate.return_value = {
+        "tasks": [["Build an App", "Dan - Frontend"], ["Build an API", "Dan - Backend"]],
+        "students": ["Žužlavá, Žofie", "Lovelace, Ada"],
+        "points": [["100", None], [None, "80"]],
+    }
 
-    rows = scenario._extract_grade_rows(page)
+    rows = run_steps(scenario._extract_grade_rows(page))
 
     assert rows == [
         GradeExportRow("Žofie", "Žužlavá", "Dan - Frontend", "Build an App", "100"),
@@ -111,27 +101,29 @@ def test_extract_grade_rows_requires_matching_task_category() -> None:
         task_category="Dan - Frontend",
     )
     page = MagicMock()
-    page.evaluate.return_value = [
-        {
-            "studentName": "Lovelace, Ada",
-            "taskCategory": "Dan - Backend",
-            "taskName": "Build an API",
-            "points": "80",
-        },
-    ]
+    page.evaluate.return_value = {
+        "tasks": [["Build an API", "Dan - Backend"]],
+        "students": ["Lovelace, Ada"],
+        "points": [["80"]],
+    }
 
     with pytest.raises(ValueError, match="No grade rows were found for task category Dan - Frontend"):
-        scenario._extract_grade_rows(page)
+        run_steps(scenario._extract_grade_rows(page))
 
 
 def test_extract_grade_rows_requires_visible_grades() -> None:
     """An empty grade-table extraction fails before writing an empty CSV."""
     scenario = ExportGradesScenario(class_="2.png", output_csv=Path("grades.csv"))
     page = MagicMock()
-    page.evaluate.return_value = []
+    page.evaluate.return_value = {"tasks": [["Build an App", "Dan - Frontend"]], "students": ["Lovelace, Ada"], "points": [[None]]}
 
     with pytest.raises(ValueError, match="No grade rows were found"):
-        scenario._extract_grade_rows(page)
+        run_steps(scenario._extract_grade_rows(page))
+
+
+def skip_course_selection(unused_page, unused_course):
+    """Stand in for the course switcher steps."""
+    yield
 
 
 def test_run_exports_rows(monkeypatch, tmp_path: Path) -> None:
@@ -142,12 +134,12 @@ def test_run_exports_rows(monkeypatch, tmp_path: Path) -> None:
     grades_link = MagicMock()
     page.locator.return_value = grades_link
 
-    monkeypatch.setattr(scenario, "_select_course", lambda unused_page: None)
-    monkeypatch.setattr(
-        scenario,
-        "_extract_grade_rows",
-        lambda unused_page: [GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")],
-    )
+    def fake_extract(unused_page):
+        yield
+        return [GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")]
+
+    monkeypatch.setattr(scenario, "_select_course", skip_course_selection)
+    monkeypatch.setattr(scenario, "_extract_grade_rows", fake_extract)
 
     scenario.run(page)
 
@@ -157,3 +149,168 @@ def test_run_exports_rows(monkeypatch, tmp_path: Path) -> None:
         "first_name,last_name,task_category,task_name,points\n"
         "Ada,Lovelace,Programming,Algorithms,42\n"
     )
+
+
+def test_run_exports_several_courses_to_combined_csv(monkeypatch, tmp_path: Path) -> None:
+    """Several courses are exported in one session into one CSV with class and subject columns."""
+    output_csv = tmp_path / "grades.csv"
+    courses = [ExportCourse("2.png", "Informatika"), ExportCourse("3.cpu", "Programování")]
+    scenario = ExportGradesScenario(None, output_csv, courses=courses)
+    page = MagicMock()
+    selected = []
+    rows_by_class = {
+        "2.png": [GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")],
+        "3.cpu": [GradeExportRow("Alan", "Turing", "Theory", "Machines", "m")],
+    }
+
+    def fake_select(unused_page, course):
+        selected.append(course)
+        yield
+
+    def fake_extract(unused_page):
+        yield
+        return rows_by_class[selected[-1].class_]
+
+    monkeypatch.setattr(scenario, "_select_course", fake_select)
+    monkeypatch.setattr(scenario, "_extract_grade_rows", fake_extract)
+
+    scenario.run(page)
+
+    assert selected == courses
+    assert page.goto.call_count == 2
+    assert output_csv.read_text(encoding="utf-8") == (
+        "class,subject,first_name,last_name,task_category,task_name,points\n"
+        "2.png,Informatika,Ada,Lovelace,Programming,Algorithms,42\n"
+        "3.cpu,Programování,Alan,Turing,Theory,Machines,m\n"
+    )
+
+
+def test_run_writes_one_file_per_course_and_reports_failed_courses(monkeypatch, tmp_path: Path) -> None:
+    """With an output directory each course gets its own CSV; a failing course does not stop the others."""
+    courses = [ExportCourse("2.png", "Informatika"), ExportCourse("3.cpu", "Informatika")]
+    scenario = ExportGradesScenario(None, None, courses=courses, output_dir=tmp_path / "exports")
+    selected = []
+
+    def fake_select(unused_page, course):
+        selected.append(course)
+        yield
+
+    def fake_extract(unused_page):
+        yield
+        if selected[-1].class_ == "3.cpu":
+            raise ValueError("No grade rows were found in the current EduPage grade table")
+        return [GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")]
+
+    monkeypatch.setattr(scenario, "_select_course", fake_select)
+    monkeypatch.setattr(scenario, "_extract_grade_rows", fake_extract)
+
+    with pytest.raises(ValueError, match="failed for 1 of 2 courses: 3.cpu / Informatika"):
+        scenario.run(MagicMock())
+
+    assert [path.name for path in (tmp_path / "exports").iterdir()] == ["2.png_Informatika.csv"]
+
+
+def test_run_keeps_exported_courses_when_a_course_times_out(monkeypatch, tmp_path: Path) -> None:
+    """A Playwright timeout in one course's navigation is recorded and the other courses are still written."""
+    output_csv = tmp_path / "grades.csv"
+    courses = [ExportCourse("2.png", "Informatika"), ExportCourse("9.zzz", "Informatika")]
+    scenario = ExportGradesScenario(None, output_csv, courses=courses)
+
+    def fake_select(unused_page, course):
+        yield
+        if course.class_ == "9.zzz":
+            raise PlaywrightTimeoutError("Timeout 30000ms exceeded")
+
+    def fake_extract(unused_page):
+        yield
+        return [GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")]
+
+    monkeypatch.setattr(scenario, "_select_course", fake_select)
+    monkeypatch.setattr(scenario, "_extract_grade_rows", fake_extract)
+
+    with pytest.raises(ValueError, match="failed for 1 of 2 courses: 9.zzz / Informatika: Timeout 30000ms"):
+        scenario.run(MagicMock())
+
+    assert output_csv.read_text(encoding="utf-8") == (
+        "class,subject,first_name,last_name,task_category,task_name,points\n"
+        "2.png,Informatika,Ada,Lovelace,Programming,Algorithms,42\n"
+    )
+
+
+def test_run_without_output_keeps_rows_in_memory(monkeypatch) -> None:
+    """A scenario without an output destination only stores the exported rows."""
+    scenario = ExportGradesScenario(class_="3.A", output_csv=None)
+    row = GradeExportRow("Ada", "Lovelace", "Programming", "Algorithms", "42")
+    def fake_extract(unused_page):
+        yield
+        return [row]
+
+    monkeypatch.setattr(scenario, "_select_course", skip_course_selection)
+    monkeypatch.setattr(scenario, "_extract_grade_rows", fake_extract)
+
+    scenario.run(MagicMock())
+
+    assert scenario.exported == [(ExportCourse("3.A", "Informatika"), [row])]
+
+
+def test_export_scenario_accepts_at_most_one_output() -> None:
+    """The combined CSV and per-course directory outputs are mutually exclusive."""
+    with pytest.raises(ValueError, match="at most one"):
+        ExportGradesScenario("2.png", Path("grades.csv"), output_dir=Path("exports"))
+
+
+def test_load_courses_from_csv_defaults_missing_subjects(tmp_path: Path) -> None:
+    """Course list rows without a subject use the CLI default subject."""
+    courses_csv = tmp_path / "courses.csv"
+    courses_csv.write_text("class;subject\n2.png;Informatika\n3.cpu;\n", encoding="utf-8")
+
+    courses = _load_courses_from_csv(courses_csv, default_subject="Programování")
+
+    assert courses == [ExportCourse("2.png", "Informatika"), ExportCourse("3.cpu", "Programování")]
+
+
+def test_load_courses_from_csv_requires_class_column(tmp_path: Path) -> None:
+    """A course list without a class column is rejected."""
+    courses_csv = tmp_path / "courses.csv"
+    courses_csv.write_text("subject\nInformatika\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="'class' column"):
+        _load_courses_from_csv(courses_csv, default_subject="Informatika")
+
+
+def async_page(evaluate_results=()) -> MagicMock:
+    """Return an async Playwright page fake whose locators share awaitable actions."""
+    locator = MagicMock()
+    locator.filter.return_value = locator
+    locator.first = locator
+    for action in ("click", "fill", "wait_for", "select_option"):
+        setattr(locator, action, AsyncMock())
+    locator.count = AsyncMock(return_value=0)
+    page = MagicMock()
+    page.locator.return_value = locator
+    page.get_by_role.return_value = locator
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=list(evaluate_results))
+    return page
+
+
+def test_async_export_scenario_extracts_rows_with_shared_script() -> None:
+    """The async variant evaluates the same extraction script and parses its payload."""
+    scenario = AsyncExportGradesScenario("2.png", None, task_category="Projekt")
+    page = async_page(
+        [
+            {
+                "tasks": [["Web", "Projekt"], ["Quiz", "Test"]],
+                "students": ["Lovelace, Ada"],
+                "points": [["15 · 20", "3"]],
+            }
+        ]
+    )
+
+    asyncio.run(scenario.run(page))
+
+    assert page.evaluate.await_args.args[0] == export_grades_module._GRADE_EXPORT_SCRIPT
+    assert scenario.exported == [
+        (ExportCourse("2.png", "Informatika"), [GradeExportRow("Ada", "Lovelace", "Projekt", "Web", "15")])
+    ]
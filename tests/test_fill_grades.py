@@ -1,12 +1,20 @@
+import asyncio
 from pathlib import Path
 from typing import List
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from edu_page_automat.fill_journal import read_saved_cells, record_saved_cells
+from edu_page_automat.id_cache import new_course_ids, read_course_ids, record_course_ids
+from edu_page_automat.scenarios import fill_grades as fill_grades_module
+from edu_page_automat.scenarios.base import run_steps
 from edu_page_automat.scenarios.fill_grades import (
+    AsyncFillGradesScenario,
     FillGradesScenario,
     GradeEntry,
+    GradeTableIndex,
     _load_grade_entries_from_csv,
     _parse_grade_value,
 )
@@ -17,6 +25,20 @@ def write_csv(path: Path, rows: List[str]) -> None:
     path.write_text("\n".join(rows) + "\n", encoding="utf-8")
 
 
+def no_steps(*unused_args):
+    """Stand in for scenario steps that are skipped in a test."""
+    yield
+
+
+def returning_steps(value):
+    """Return a stand-in for scenario steps that only produce `value`."""
+    def steps(*unused_args):
+        yield
+        return value
+
+    return steps
+
+
 class TestLoadGradeEntriesFromCsv:
     """Tests for grade CSV parsing and validation."""
 
@@ -139,6 +161,8 @@ def test_grade_entry_student_display_name() -> None:
     )
 
     assert entry.student_display_name == "Žužlavá, Žofie"
+    assert entry == GradeEntry("Žofie", "Žužlavá", "Task", 100)
+    assert not hasattr(entry, "__dict__")
 
 
 def test_fill_grades_scenario_requires_entries() -> None:
@@ -147,51 +171,164 @@ def test_fill_grades_scenario_requires_entries() -> None:
         FillGradesScenario(class_="2.png", entries=[], subject="Informatika")
 
 
-def test_student_id_for_entry_reads_student_link_query() -> None:
-    """Student ids are extracted from EduPage student links."""
+def grade_table_index(stored_values: dict[str, str] | None = None) -> GradeTableIndex:
+    """Return a grade-table index with one student and one task."""
+    return GradeTableIndex(
+        url="https://1itg.edupage.org/znamky/",
+        student_links={"Žužlavá, Žofie": ["?what=zobraztriedu&studentid=-440&p=-91"]},
+        task_identifiers={"Task": [("-91", "132812")]},
+        stored_values=stored_values or {},
+    )
+
+
+def test_read_grade_table_index_uses_one_browser_snapshot() -> None:
+    """Student ids, task identifiers, and stored values come from one evaluate call."""
     scenario = FillGradesScenario(
         class_="2.png",
         subject="Informatika",
         entries=[GradeEntry("Žofie", "Žužlavá", "Task", 100)],
     )
     page = MagicMock()
-    page.evaluate.return_value = [
+    page.evaluate.return_value = {
+        "url": "https://1itg.edupage.org/znamky/",
+        "students": {"Žužlavá, Žofie": ["?what=zobraztriedu&studentid=-440&p=-91"]},
+        "tasks": {"Task": [["-91", "132812"]]},
+        "storedValues": {"zn_-440_-91_132812_P2_1": "90"},
+    }
+
+    index = run_steps(scenario._read_grade_table_index(page))
+
+    page.wait_for_selector.assert_called_once_with('a[href*="studentid="]', state="attached", timeout=10000)
+    page.evaluate.assert_called_once()
+    assert index.student_id(scenario.entries[0]) == "-440"
+    assert index.task_ids("Task") == ("-91", "132812")
+    assert index.stored_value("zn_-440_-91_132812_P2_1") == "90"
+    assert index.stored_value("zn_-440_-91_132810_P2_1") == ""
+
+
+def cached_fill_scenario(cache_path: Path, entries: List[GradeEntry] | None = None) -> FillGradesScenario:
+    """Return a fill scenario using a course id cache that knows Žofie and Task."""
+    record_course_ids(
+        cache_path,
+        new_course_ids(
+            "2.png",
+            "Informatika",
+            "P2",
+            {"Žužlavá, Žofie": ["?what=zobraztriedu&studentid=-440&p=-91"]},
+            {"Task": [("-91", "132812")]},
+        ),
+    )
+    return FillGradesScenario(
+        class_="2.png",
+        entries=entries or [GradeEntry("Žofie", "Žužlavá", "Task", 100)],
+        id_cache_path=cache_path,
+    )
+
+
+def test_read_grade_table_index_resolves_targets_from_id_cache(tmp_path: Path) -> None:
+    """Cached ids skip the full table index; only the target stored values and table shape are read."""
+    scenario = cached_fill_scenario(tmp_path / "course-ids.json")
+    page = MagicMock()
+    page.evaluate.return_value = {
+        "url": "https://1itg.edupage.org/znamky/",
+        "students": 1,
+        "tasks": 1,
+        "storedValues": {"zn_-440_-91_132812_P2_1": "90"},
+    }
+
+    index = run_steps(scenario._read_grade_table_index(page))
+
+    script, names = page.evaluate.call_args.args
+    assert "storedInputNames" in script
+    assert names == ["zn_-440_-91_132812_P2_1"]
+    assert index.student_id(scenario.entries[0]) == "-440"
+    assert index.stored_value("zn_-440_-91_132812_P2_1") == "90"
+
+
+def test_read_grade_table_index_rescans_and_refreshes_cache_when_lookup_misses(tmp_path: Path) -> None:
+    """An entry missing from the cache invalidates it, and the full snapshot records fresh ids."""
+    cache_path = tmp_path / "course-ids.json"
+    scenario = cached_fill_scenario(cache_path, [GradeEntry("Ada", "Lovelace", "Task", 1)])
+    page = MagicMock()
+    page.evaluate.return_value = {
+        "url": "https://1itg.edupage.org/znamky/",
+        "students": {"Lovelace, Ada": ["?studentid=-7"]},
+        "tasks": {"Task": [["-91", "132812"]]},
+        "storedValues": {},
+    }
+
+    run_steps(scenario._read_grade_table_index(page))
+
+    page.evaluate.assert_called_once()
+    assert read_course_ids(cache_path, "2.png", "Informatika", "P2").students == {"Lovelace, Ada": "-7"}
+
+
+def test_read_grade_table_index_invalidates_cache_when_table_shape_changes(tmp_path: Path) -> None:
+    """A different student or task count falls back to the full snapshot."""
+    cache_path = tmp_path / "course-ids.json"
+    scenario = cached_fill_scenario(cache_path)
+    page = MagicMock()
+    page.evaluate.side_effect = [
+        {"url": "", "students": 2, "tasks": 1, "storedValues": {}},
         {
-            "text": "Žužlavá, Žofie",
-            "href": "?what=zobraztriedu&studentid=-440&p=-91",
-        }
+            "url": "",
+            "students": {"Žužlavá, Žofie": ["?studentid=-440"], "Nová, Eva": ["?studentid=-441"]},
+            "tasks": {"Task": [["-91", "132812"]]},
+            "storedValues": {},
+        },
     ]
 
-    student_id = scenario._student_id_for_entry(page, scenario.entries[0])
+    index = run_steps(scenario._read_grade_table_index(page))
 
-    page.wait_for_selector.assert_called_once_with('a[href*="studentid="]', state="attached", timeout=10000)
-    assert student_id == "-440"
+    assert page.evaluate.call_count == 2
+    assert index.student_id(scenario.entries[0]) == "-440"
+    assert read_course_ids(cache_path, "2.png", "Informatika", "P2").student_count == 2
 
 
-def test_task_identifiers_read_task_header_attributes() -> None:
-    """Task identifiers are read from the existing grade-table task header."""
-    scenario = FillGradesScenario(
-        class_="2.png",
-        subject="Informatika",
-        entries=[GradeEntry("Žofie", "Žužlavá", "Task", 100)],
-    )
+
+def test_read_grade_table_index_invalidates_cache_when_cached_cell_input_is_missing(tmp_path: Path) -> None:
+    """A task recreated under the same name keeps the table shape but drops the cached cell inputs."""
+    cache_path = tmp_path / "course-ids.json"
+    scenario = cached_fill_scenario(cache_path)
     page = MagicMock()
-    page.evaluate.return_value = [
+    page.evaluate.side_effect = [
+        {"url": "", "students": 1, "tasks": 1, "storedValues": {}, "missingInputs": ["zn_-440_-91_132812_P2_1"]},
         {
-            "text": "Task",
-            "subjectId": "-91",
-            "taskUid": "132812",
-        }
+            "url": "",
+            "students": {"Žužlavá, Žofie": ["?studentid=-440"]},
+            "tasks": {"Task": [["-91", "140000"]]},
+            "storedValues": {},
+        },
     ]
 
-    subject_id, task_uid = scenario._task_identifiers(page, "Task")
+    index = run_steps(scenario._read_grade_table_index(page))
+
+    assert page.evaluate.call_count == 2
+    assert index.task_ids("Task") == ("-91", "140000")
+    assert read_course_ids(cache_path, "2.png", "Informatika", "P2").tasks == {"Task": ("-91", "140000")}
 
-    assert subject_id == "-91"
-    assert task_uid == "132812"
-    page.wait_for_selector.assert_called_once_with(".znamkyUdalostHeader", state="attached", timeout=10000)
+def test_grade_table_index_reports_missing_student() -> None:
+    """Unknown students fail with a sample of indexed names."""
+    index = grade_table_index()
 
+    with pytest.raises(ValueError, match=r"found 0\..*Available students include: Žužlavá, Žofie"):
+        index.student_id(GradeEntry("Ada", "Lovelace", "Task", 100))
 
-def test_fill_grade_entry_fills_expected_input(monkeypatch) -> None:
+
+def test_grade_table_index_reports_duplicate_task() -> None:
+    """Ambiguous task names are rejected instead of filling an arbitrary column."""
+    index = GradeTableIndex(
+        url="",
+        student_links={},
+        task_identifiers={"Task": [("-91", "1"), ("-91", "2")]},
+        stored_values={},
+    )
+
+    with pytest.raises(ValueError, match="Expected one task named Task, found 2"):
+        index.task_ids("Task")
+
+
+def test_fill_grade_entry_fills_expected_input() -> None:
     """Grade entries fill the composed EduPage input name."""
     entry = GradeEntry("Žofie", "Žužlavá", "Task", 100)
     scenario = FillGradesScenario(class_="2.png", entries=[entry], subject="Informatika")
@@ -199,29 +336,23 @@ def test_fill_grade_entry_fills_expected_input(monkeypatch) -> None:
     grade_input = MagicMock()
     page.locator.return_value = grade_input
 
-    monkeypatch.setattr(scenario, "_student_id_for_entry", lambda unused_page, unused_entry: "-440")
-    monkeypatch.setattr(scenario, "_task_identifiers", lambda unused_page, unused_task_name: ("-91", "132812"))
-    monkeypatch.setattr(scenario, "_current_grade_value", lambda unused_page, unused_input_name: "")
-
-    scenario._fill_grade_entry(page, entry)
+    run_steps(scenario._fill_grade_entry(page, grade_table_index(), entry))
 
     page.locator.assert_called_once_with('input[name="nzn_-440_-91_132812_P2_1"]')
+    page.evaluate.assert_not_called()
     grade_input.wait_for.assert_called_once_with(state="visible", timeout=10000)
     grade_input.fill.assert_called_once_with("100")
 
 
-def test_fill_grade_entry_rejects_existing_grade_without_overwrite(monkeypatch) -> None:
+def test_fill_grade_entry_rejects_existing_grade_without_overwrite() -> None:
     """Existing grades are protected unless overwrite mode is enabled."""
     entry = GradeEntry("Žofie", "Žužlavá", "Task", 80)
     scenario = FillGradesScenario(class_="2.png", entries=[entry], subject="Informatika")
     page = MagicMock()
-
-    monkeypatch.setattr(scenario, "_student_id_for_entry", lambda unused_page, unused_entry: "-440")
-    monkeypatch.setattr(scenario, "_task_identifiers", lambda unused_page, unused_task_name: ("-91", "132810"))
-    monkeypatch.setattr(scenario, "_current_grade_value", lambda unused_page, unused_input_name: "100")
+    index = grade_table_index({"zn_-440_-91_132812_P2_1": "100"})
 
     with pytest.raises(ValueError, match="Use --overwrite-existing"):
-        scenario._fill_grade_entry(page, entry)
+        run_steps(scenario._fill_grade_entry(page, index, entry))
 
 
 def test_fill_grade_entry_overwrites_existing_grade(monkeypatch) -> None:
@@ -235,17 +366,15 @@ def test_fill_grade_entry_overwrites_existing_grade(monkeypatch) -> None:
     )
     page = MagicMock()
     overwritten: list[tuple[str, str]] = []
+    index = grade_table_index({"zn_-440_-91_132812_P2_1": "90"})
 
-    monkeypatch.setattr(scenario, "_student_id_for_entry", lambda unused_page, unused_entry: "-440")
-    monkeypatch.setattr(scenario, "_task_identifiers", lambda unused_page, unused_task_name: ("-91", "132812"))
-    monkeypatch.setattr(scenario, "_current_grade_value", lambda unused_page, unused_input_name: "90")
-    monkeypatch.setattr(
-        scenario,
-        "_overwrite_grade_value",
-        lambda unused_page, input_name, value: overwritten.append((input_name, value)),
-    )
+    def overwrite_grade_value(unused_page, input_name, value):
+        overwritten.append((input_name, value))
+        yield
 
-    scenario._fill_grade_entry(page, entry)
+    monkeypatch.setattr(scenario, "_overwrite_grade_value", overwrite_grade_value)
+
+    run_steps(scenario._fill_grade_entry(page, index, entry))
 
     assert overwritten == [("zn_-440_-91_132812_P2_1", "m")]
     page.locator.assert_not_called()
@@ -264,7 +393,7 @@ def test_overwrite_grade_value_updates_hidden_field() -> None:
     page.locator.return_value = grade_input
     page.evaluate.return_value = {"stored": "90", "editor": "80"}
 
-    scenario._overwrite_grade_value(page, "zn_-440_-91_132810_P2_1", 80)
+    run_steps(scenario._overwrite_grade_value(page, "zn_-440_-91_132810_P2_1", 80))
 
     page.locator.assert_called_once_with('input[name="nzn_-440_-91_132810_P2_1"]')
     grade_input.wait_for.assert_called_once_with(state="attached", timeout=10000)
@@ -289,7 +418,7 @@ def test_overwrite_grade_value_requires_editor_to_keep_value() -> None:
     page.evaluate.return_value = {"stored": "90", "editor": "90"}
 
     with pytest.raises(ValueError, match="did not keep overwritten value"):
-        scenario._overwrite_grade_value(page, "zn_-440_-91_132810_P2_1", 80)
+        run_steps(scenario._overwrite_grade_value(page, "zn_-440_-91_132810_P2_1", 80))
 
 
 def test_run_fills_entries_and_saves(monkeypatch) -> None:
@@ -301,31 +430,351 @@ def test_run_fills_entries_and_saves(monkeypatch) -> None:
     scenario = FillGradesScenario(class_="3.A", entries=entries, subject="Informatika")
     page = MagicMock()
     grades_link = MagicMock()
-    save_button = MagicMock()
-    confirm_group = MagicMock()
-    confirm_button = MagicMock()
-    confirm_group.first = confirm_button
     filled: list[str] = []
+    saved: list[object] = []
 
     def locator_side_effect(selector, *args, **kwargs):
         if selector == "a.edubarCourseModuleLink":
             return grades_link
-        if selector == "a.ulozitBtn":
-            return save_button
         return MagicMock()
 
+    def fill_grade_entry(unused_page, index, entry):
+        filled.append((index, entry.task_name))
+        yield
+
+    def save_changes(page):
+        saved.append(page)
+        yield
+
     page.locator.side_effect = locator_side_effect
-    page.get_by_role.return_value = confirm_group
-    monkeypatch.setattr(scenario, "_select_course", lambda unused_page: None)
-    monkeypatch.setattr(scenario, "_fill_grade_entry", lambda unused_page, entry: filled.append(entry.task_name))
+    monkeypatch.setattr(scenario, "_select_course", no_steps)
+    monkeypatch.setattr(scenario, "_read_grade_table_index", returning_steps("index"))
+    monkeypatch.setattr(scenario, "_fill_grade_entry", fill_grade_entry)
+    monkeypatch.setattr(scenario, "_save_changes", save_changes)
 
     scenario.run(page)
 
-    assert filled == ["Algorithms", "Compilers"]
+    assert filled == [("index", "Algorithms"), ("index", "Compilers")]
     grades_link.click.assert_called_once_with()
     page.wait_for_selector.assert_called_once_with(".znamkyUdalostHeader", state="attached", timeout=15000)
-    save_button.wait_for.assert_called_once_with(state="visible", timeout=10000)
-    save_button.click.assert_called_once_with()
+    assert saved == [page]
+
+
+def save_page(prompt: str, status: int = 200) -> MagicMock:
+    """Return a page fake whose save prompt check resolves to `prompt` and whose save response has `status`."""
+    page = MagicMock()
+    page.wait_for_function.return_value.json_value.return_value = prompt
+    response = MagicMock(ok=status < 400, status=status, url="https://1itg.edupage.org/znamky/?akcia=save")
+    page.expect_response.return_value.__enter__.return_value.value = response
+    return page
+
+
+def test_save_changes_confirms_dialog_and_waits_for_save_response() -> None:
+    """A visible confirmation dialog is clicked inside the save-response wait."""
+    scenario = FillGradesScenario(class_="2.png", entries=[GradeEntry("Ada", "Lovelace", "Task", 1)])
+    page = save_page("confirm")
+
+    run_steps(scenario._save_changes(page))
+
+    page.evaluate.assert_called_once_with(fill_grades_module._WATCH_SAVE_REQUESTS_SCRIPT, "/znamky/")
+    page.locator.return_value.click.assert_called_once_with()
+    page.expect_response.assert_called_once_with(fill_grades_module._is_grade_save_response, timeout=15000)
     page.get_by_role.assert_called_once_with("button", name="Uložit")
-    confirm_button.wait_for.assert_called_once_with(state="visible", timeout=3000)
-    confirm_button.click.assert_called_once_with()
+    page.get_by_role.return_value.first.click.assert_called_once_with()
+
+
+def test_save_changes_without_dialog_does_not_wait_for_confirm_button() -> None:
+    """When the save request finishes without a dialog, no confirm button is looked up."""
+    scenario = FillGradesScenario(class_="2.png", entries=[GradeEntry("Ada", "Lovelace", "Task", 1)])
+    page = save_page("saved")
+
+    run_steps(scenario._save_changes(page))
+
+    page.get_by_role.assert_not_called()
+
+
+def test_save_changes_reports_rejected_or_missing_save_response() -> None:
+    """An error response or no save signal at all fails the run."""
+    scenario = FillGradesScenario(class_="2.png", entries=[GradeEntry("Ada", "Lovelace", "Task", 1)])
+
+    with pytest.raises(ValueError, match="HTTP 500"):
+        run_steps(scenario._save_changes(save_page("saved", status=500)))
+
+    page = save_page("saved")
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("no save")
+    with pytest.raises(ValueError, match="did not confirm the grade save"):
+        run_steps(scenario._save_changes(page))
+
+
+def test_is_grade_save_response_matches_posts_to_grade_module() -> None:
+    """Only POST responses under the Známky module count as the grade save."""
+    def response(method: str, url: str) -> MagicMock:
+        return MagicMock(url=url, request=MagicMock(method=method))
+
+    assert fill_grades_module._is_grade_save_response(response("POST", "https://1itg.edupage.org/znamky/?akcia=x"))
+    assert not fill_grades_module._is_grade_save_response(response("GET", "https://1itg.edupage.org/znamky/"))
+    assert not fill_grades_module._is_grade_save_response(response("POST", "https://1itg.edupage.org/user/"))
+
+
+def test_batch_fill_targets_sets_all_cells_in_one_call() -> None:
+    """Batch mode sends every resolved editor input to the page in one evaluate call."""
+    entries = [
+        GradeEntry("Žofie", "Žužlavá", "Task", 100),
+        GradeEntry("Žofie", "Žužlavá", "Other", "m"),
+    ]
+    scenario = FillGradesScenario(class_="2.png", entries=entries, subject="Informatika", batch_fill=True)
+    index = GradeTableIndex(
+        url="",
+        student_links={"Žužlavá, Žofie": ["?studentid=-440"]},
+        task_identifiers={"Task": [("-91", "1")], "Other": [("-91", "2")]},
+        stored_values={},
+    )
+    targets = [scenario._resolve_fill_target(index, entry) for entry in entries]
+    page = MagicMock()
+    page.evaluate.return_value = [
+        {"name": "nzn_-440_-91_1_P2_1", "found": True, "value": "100"},
+        {"name": "nzn_-440_-91_2_P2_1", "found": True, "value": "m"},
+    ]
+
+    run_steps(scenario._batch_fill_targets(page, targets))
+
+    page.evaluate.assert_called_once()
+    _, cells = page.evaluate.call_args.args
+    assert cells == [
+        {"name": "nzn_-440_-91_1_P2_1", "value": "100"},
+        {"name": "nzn_-440_-91_2_P2_1", "value": "m"},
+    ]
+    page.locator.assert_not_called()
+
+
+def test_batch_fill_targets_reports_failed_cells() -> None:
+    """Batch mode fails before saving when a cell is missing or rejects its value."""
+    entries = [
+        GradeEntry("Žofie", "Žužlavá", "Task", 100),
+        GradeEntry("Žofie", "Žužlavá", "Other", 50),
+    ]
+    scenario = FillGradesScenario(class_="2.png", entries=entries, subject="Informatika", batch_fill=True)
+    index = GradeTableIndex(
+        url="",
+        student_links={"Žužlavá, Žofie": ["?studentid=-440"]},
+        task_identifiers={"Task": [("-91", "1")], "Other": [("-91", "2")]},
+        stored_values={},
+    )
+    targets = [scenario._resolve_fill_target(index, entry) for entry in entries]
+    page = MagicMock()
+    page.evaluate.return_value = [
+        {"name": "nzn_-440_-91_1_P2_1", "found": False, "value": ""},
+        {"name": "nzn_-440_-91_2_P2_1", "found": True, "value": ""},
+    ]
+
+    with pytest.raises(ValueError, match="Batch fill failed for 2 grade cells"):
+        run_steps(scenario._batch_fill_targets(page, targets))
+
+
+def test_run_batch_fill_resolves_all_entries_before_filling(monkeypatch) -> None:
+    """Batch mode resolves the full fill plan and fills it in one step."""
+    entries = [GradeEntry("Žofie", "Žužlavá", "Task", 100)]
+    scenario = FillGradesScenario(class_="2.png", entries=entries, subject="Informatika", save=False, batch_fill=True)
+    page = MagicMock()
+    batches: list[list[str]] = []
+
+    def batch_fill_targets(unused_page, targets):
+        batches.append([target.editor_input_name for target in targets])
+        yield
+
+    monkeypatch.setattr(scenario, "_select_course", no_steps)
+    monkeypatch.setattr(scenario, "_read_grade_table_index", returning_steps(grade_table_index()))
+    monkeypatch.setattr(scenario, "_batch_fill_targets", batch_fill_targets)
+
+    scenario.run(page)
+
+    assert batches == [["nzn_-440_-91_132812_P2_1"]]
+
+
+def chunked_fill_scenario(journal_path: Path, monkeypatch, *, resume: bool = False, fail_on_save: int = 0):
+    """Return a chunked fill of five entries whose fills and saves are recorded in a log."""
+    entries = [GradeEntry("Ada", "Lovelace", f"Task {number}", number) for number in range(1, 6)]
+    scenario = FillGradesScenario(
+        class_="2.png",
+        entries=entries,
+        save_every=2,
+        journal_path=journal_path,
+        resume=resume,
+    )
+    log: list[object] = []
+
+    def fill_grade_entry(unused_page, index, entry):
+        log.append(entry.task_name)
+        yield
+
+    def save_changes(unused_page):
+        log.append("save")
+        yield
+        if log.count("save") == fail_on_save:
+            raise ValueError("EduPage did not confirm the grade save within 15 s")
+
+    monkeypatch.setattr(scenario, "_open_grade_table", no_steps)
+    monkeypatch.setattr(scenario, "_read_grade_table_index", returning_steps("index"))
+    monkeypatch.setattr(scenario, "_fill_grade_entry", fill_grade_entry)
+    monkeypatch.setattr(scenario, "_save_changes", save_changes)
+    return scenario, log
+
+
+def test_run_saves_every_chunk_and_resumes_after_failed_save(tmp_path: Path, monkeypatch) -> None:
+    """Saved chunks are journalled, and a resumed run only fills the entries left after the failure."""
+    journal_path = tmp_path / "fill-journal.jsonl"
+    scenario, log = chunked_fill_scenario(journal_path, monkeypatch, fail_on_save=2)
+
+    with pytest.raises(ValueError, match="did not confirm"):
+        scenario.run(MagicMock())
+
+    assert log == ["Task 1", "Task 2", "save", "Task 3", "Task 4", "save"]
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P2") == {
+        ("Lovelace, Ada", "Task 1", "1"),
+        ("Lovelace, Ada", "Task 2", "2"),
+    }
+
+    resumed, log = chunked_fill_scenario(journal_path, monkeypatch, resume=True)
+    resumed.run(MagicMock())
+
+    assert log == ["Task 3", "Task 4", "save", "Task 5", "save"]
+    assert not journal_path.exists()
+
+
+def test_run_without_resume_starts_a_fresh_journal(tmp_path: Path, monkeypatch) -> None:
+    """A new chunked run ignores and replaces the journal of an earlier interrupted run."""
+    journal_path = tmp_path / "fill-journal.jsonl"
+    record_saved_cells(journal_path, "2.png", "Informatika", "P2", [("Lovelace, Ada", "Task 1", "1")])
+    scenario, log = chunked_fill_scenario(journal_path, monkeypatch, fail_on_save=1)
+
+    with pytest.raises(ValueError):
+        scenario.run(MagicMock())
+
+    assert log[0] == "Task 1"
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P2") == set()
+
+
+def test_resume_with_everything_journalled_skips_the_browser(tmp_path: Path, monkeypatch) -> None:
+    """When every entry was saved before, the resumed run neither navigates nor saves."""
+    journal_path = tmp_path / "fill-journal.jsonl"
+    record_saved_cells(
+        journal_path,
+        "2.png",
+        "Informatika",
+        "P2",
+        [("Lovelace, Ada", f"Task {number}", str(number)) for number in range(1, 6)],
+    )
+    scenario, log = chunked_fill_scenario(journal_path, monkeypatch, resume=True)
+    page = MagicMock()
+
+    scenario.run(page)
+
+    assert log == []
+    page.goto.assert_not_called()
+    assert not journal_path.exists()
+
+
+def verify_scenario(report_csv: Path, monkeypatch) -> FillGradesScenario:
+    """Return a verifying batch fill of one cell whose navigation, fill, and save are skipped."""
+    scenario = FillGradesScenario(
+        class_="2.png",
+        entries=[GradeEntry("Žofie", "Žužlavá", "Task", 100)],
+        batch_fill=True,
+        verify=True,
+        verify_report_csv=report_csv,
+    )
+    monkeypatch.setattr(scenario, "_open_grade_table", no_steps)
+    monkeypatch.setattr(scenario, "_read_grade_table_index", returning_steps(grade_table_index()))
+    monkeypatch.setattr(scenario, "_batch_fill_targets", no_steps)
+    monkeypatch.setattr(scenario, "_save_changes", no_steps)
+    return scenario
+
+
+def test_run_verify_reloads_table_once_and_accepts_saved_values(tmp_path: Path, monkeypatch) -> None:
+    """Verification reads every stored value in one evaluate after reloading the table."""
+    report_csv = tmp_path / "mismatches.csv"
+    scenario = verify_scenario(report_csv, monkeypatch)
+    page = MagicMock()
+    page.evaluate.return_value = {"zn_-440_-91_132812_P2_1": "100"}
+
+    scenario.run(page)
+
+    page.reload.assert_called_once_with(wait_until="domcontentloaded")
+    page.evaluate.assert_called_once_with(fill_grades_module._STORED_GRADE_VALUES_SCRIPT)
+    assert not report_csv.exists()
+
+
+def test_run_verify_writes_mismatch_report(tmp_path: Path, monkeypatch) -> None:
+    """Cells that did not keep the planned value are written to the report and fail the run."""
+    report_csv = tmp_path / "mismatches.csv"
+    scenario = verify_scenario(report_csv, monkeypatch)
+    page = MagicMock()
+    page.evaluate.return_value = {"zn_-440_-91_132812_P2_1": "90"}
+
+    with pytest.raises(ValueError, match="1 of 1 grade cells did not keep"):
+        scenario.run(page)
+
+    assert report_csv.read_text(encoding="utf-8").splitlines() == [
+        "jmeno,prijmeni,jmeno_ulohy,pozadovany_pocet_bodu,ulozeny_pocet_bodu",
+        "Žofie,Žužlavá,Task,100,90",
+    ]
+
+
+def test_overwrite_grade_value_skips_editor_read_back_when_verifying() -> None:
+    """Verification replaces the per-cell editor read-back with the post-save snapshot."""
+    scenario = FillGradesScenario(class_="2.png", entries=[GradeEntry("Ada", "Lovelace", "Task", 1)], verify=True)
+    page = MagicMock()
+
+    run_steps(scenario._overwrite_grade_value(page, "zn_-440_-91_1_P2_1", 1))
+
+    page.locator.return_value.fill.assert_called_once_with("1")
+    page.evaluate.assert_not_called()
+
+
+def async_page(evaluate_results=()) -> MagicMock:
+    """Return an async Playwright page fake whose locators share awaitable actions."""
+    locator = MagicMock()
+    locator.filter.return_value = locator
+    locator.first = locator
+    for action in ("click", "fill", "wait_for", "select_option"):
+        setattr(locator, action, AsyncMock())
+    locator.count = AsyncMock(return_value=0)
+    page = MagicMock()
+    page.locator.return_value = locator
+    page.get_by_role.return_value = locator
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=list(evaluate_results))
+    page.wait_for_function = AsyncMock()
+    page.wait_for_function.return_value.json_value = AsyncMock(return_value="saved")
+    return page
+
+
+def test_async_fill_scenario_batch_fills_and_saves() -> None:
+    """The async variant resolves targets from one snapshot and fills them in one call."""
+    scenario = AsyncFillGradesScenario(
+        class_="2.png",
+        entries=[GradeEntry("Žofie", "Žužlavá", "Task", 100)],
+        batch_fill=True,
+    )
+    page = async_page(
+        [
+            {
+                "url": "https://1itg.edupage.org/znamky/",
+                "students": {"Žužlavá, Žofie": ["?what=zobraztriedu&studentid=-440&p=-91"]},
+                "tasks": {"Task": [["-91", "132812"]]},
+                "storedValues": {},
+            },
+            [{"name": "nzn_-440_-91_132812_P2_1", "found": True, "value": "100"}],
+            None,
+        ]
+    )
+    save_response = MagicMock(ok=True)
+    page.expect_response.return_value.__aenter__.return_value.value = asyncio.sleep(0, result=save_response)
+
+    asyncio.run(scenario.run(page))
+
+    assert page.evaluate.await_args_list[1].args[1] == [{"name": "nzn_-440_-91_132812_P2_1", "value": "100"}]
+    page.locator.assert_any_call("a.ulozitBtn")
+    page.wait_for_function.assert_awaited_once()
+    page.get_by_role.assert_not_called()
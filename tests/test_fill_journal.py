@@ -0,0 +1,48 @@
+from edu_page_automat.fill_journal import (
+    clear_saved_cells,
+    get_fill_journal_path,
+    read_saved_cells,
+    record_saved_cells,
+)
+
+
+def test_record_and_read_saved_cells_per_course(tmp_path):
+    journal_path = tmp_path / "fill-journal.jsonl"
+
+    record_saved_cells(journal_path, "2.png", "Informatika", "P2", [("Žužlavá, Žofie", "Task", "100")])
+    record_saved_cells(journal_path, "2.png", "Informatika", "P2", [("Hopper, Grace", "Task", "m")])
+    record_saved_cells(journal_path, "3.cpu", "Informatika", "P2", [("Lovelace, Ada", "Task", "1")])
+
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P2") == {
+        ("Žužlavá, Žofie", "Task", "100"),
+        ("Hopper, Grace", "Task", "m"),
+    }
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P1") == set()
+
+
+def test_record_saved_cells_recovers_from_torn_last_record(tmp_path):
+    journal_path = tmp_path / "fill-journal.jsonl"
+    journal_path.write_text('{"course": "2.png|Informatika|P2", "stud', encoding="utf-8")
+
+    record_saved_cells(journal_path, "2.png", "Informatika", "P2", [("Hopper, Grace", "Task", "5")])
+
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P2") == {("Hopper, Grace", "Task", "5")}
+
+
+def test_clear_saved_cells_keeps_other_courses_and_removes_empty_journal(tmp_path):
+    journal_path = tmp_path / "fill-journal.jsonl"
+    record_saved_cells(journal_path, "2.png", "Informatika", "P2", [("Hopper, Grace", "Task", "5")])
+    record_saved_cells(journal_path, "3.cpu", "Informatika", "P2", [("Lovelace, Ada", "Task", "1")])
+
+    clear_saved_cells(journal_path, "2.png", "Informatika", "P2")
+
+    assert read_saved_cells(journal_path, "2.png", "Informatika", "P2") == set()
+    assert read_saved_cells(journal_path, "3.cpu", "Informatika", "P2") == {("Lovelace, Ada", "Task", "1")}
+    clear_saved_cells(journal_path, "3.cpu", "Informatika", "P2")
+    assert not journal_path.exists()
+
+
+def test_fill_journal_path_is_stored_next_to_auth_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+
+    assert get_fill_journal_path() == tmp_path / "fill-journal.jsonl"
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from edu_page_automat.grade_diff import GradeDiffSummary, write_grade_diff_csv
+from edu_page_automat.grade_diff import GradeDiffSummary, GradeRow, diff_grade_rows, load_grade_rows, write_grade_diff_csv
 
 
 def read_rows(path: Path) -> list[dict[str, str]]:
@@ -242,3 +242,118 @@ def test_write_grade_diff_rejects_duplicate_keys(tmp_path: Path) -> None:
 
     with pytest.raises(ValueError, match="duplicate grade"):
         write_grade_diff_csv(current_csv, truth_csv, output_csv)
+
+
+def test_diff_grade_rows_compares_in_memory_rows() -> None:
+    """The in-memory diff returns truth rows to save and the same summary as the CSV diff."""
+    current_rows = [
+        GradeRow("Ada", "Lovelace", "Task A", ""),
+        GradeRow("Ada", "Lovelace", "Task B", "100"),
+        GradeRow("Grace", "Hopper", "Task A", "80"),
+    ]
+    truth_rows = [
+        GradeRow("Ada", "Lovelace", "Task A", "90"),
+        GradeRow("Ada", "Lovelace", "Task B", "100"),
+        GradeRow("Grace", "Hopper", "Task A", "70"),
+    ]
+
+    diff = diff_grade_rows(current_rows, truth_rows, keep_better_current=True)
+
+    assert diff.rows == [GradeRow("Ada", "Lovelace", "Task A", "90")]
+    assert [(row.current_points, row.truth_points) for row in diff.kept_current_rows] == [("80", "70")]
+    assert diff.summary == GradeDiffSummary(
+        written_rows=1,
+        equal_rows=1,
+        skipped_empty_target_rows=0,
+        kept_better_current_rows=1,
+        missing_current_rows=0,
+        extra_current_rows=0,
+    )
+
+
+
+def test_loaded_grade_rows_are_slotted_and_share_interned_names(tmp_path: Path) -> None:
+    """Rows of one file share one string per student and task and build their key once."""
+    grades_csv = tmp_path / "grades.csv"
+    grades_csv.write_text(
+        "first_name,last_name,task_name,points\nAda,Lovelace,Task A,10\nAda,Lovelace,Task B,20\n"
+        "Grace,Hopper,Task A,30\n",
+        encoding="utf-8",
+    )
+
+    first, second, third = load_grade_rows(grades_csv)
+
+    assert not hasattr(first, "__dict__")
+    assert first.key == ("Ada", "Lovelace", "Task A")
+    assert first.key is first.key
+    assert first.first_name is second.first_name and first.last_name is second.last_name
+    assert first.task_name is third.task_name
+    assert first == GradeRow("Ada", "Lovelace", "Task A", "10")
+    assert hash(first) == hash(GradeRow("Ada", "Lovelace", "Task A", "10"))
+
+def write_grade_csv(path: Path, rows: list[tuple[str, str, str, str]]) -> None:
+    """Write an EduPage-style grade CSV."""
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(["first_name", "last_name", "task_name", "points"])
+        writer.writerows(rows)
+
+
+@pytest.mark.parametrize("sort_inputs", [False, True])
+def test_streaming_grade_diff_matches_in_memory_diff(tmp_path: Path, sort_inputs: bool) -> None:
+    """Streaming merge-join keeps the in-memory summary and rows, in key order, with spilled sort runs."""
+    students = [("Ada", "Lovelace"), ("Grace", "Hopper"), ("Alan", "Turing"), ("Émilie", "du Châtelet")]
+    tasks = ["Task C", "Task A", "Task B"]
+    cells = [(first, last, task) for first, last in students for task in tasks]
+    def current_points(index: int) -> str:
+        return str(index * 7 % 5 * 10) if index % 6 else "m"
+
+    current = [(*cell, current_points(index)) for index, cell in enumerate(cells) if index % 5 != 1] + [("Extra", "Student", "Task A", "10")]
+    truth = [
+        (*cell, "" if index % 7 == 3 else current_points(index) if index % 4 == 0 else str(index * 3 % 4 * 10))
+        for index, cell in reversed(list(enumerate(cells)))
+    ] + [("Missing", "Student", "Task A", "10")]
+    if sort_inputs:
+        current.sort(key=lambda row: row[:3])
+        truth.sort(key=lambda row: row[:3])
+    current_csv = tmp_path / "current.csv"
+    truth_csv = tmp_path / "truth.csv"
+    write_grade_csv(current_csv, current)
+    write_grade_csv(truth_csv, truth)
+
+    expected = write_grade_diff_csv(current_csv, truth_csv, tmp_path / "diff.csv", keep_better_current=True)
+    summary = write_grade_diff_csv(
+        current_csv,
+        truth_csv,
+        tmp_path / "streamed.csv",
+        keep_better_current=True,
+        streaming=True,
+        chunk_rows=3,
+    )
+
+    def by_key(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+        return sorted(rows, key=lambda row: (row["jmeno"], row["prijmeni"], row["jmeno_ulohy"]))
+
+    assert summary == expected
+    assert min(summary.__dict__.values()) > 0
+    assert read_rows(tmp_path / "streamed.csv") == by_key(read_rows(tmp_path / "diff.csv"))
+    assert read_rows(tmp_path / "streamed-kept-current.csv") == by_key(read_rows(tmp_path / "diff-kept-current.csv"))
+    assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith(".")) == []
+
+
+def test_streaming_grade_diff_rejects_duplicate_keys_without_replacing_output(tmp_path: Path) -> None:
+    current_csv = tmp_path / "current.csv"
+    truth_csv = tmp_path / "truth.csv"
+    output_csv = tmp_path / "diff.csv"
+    output_csv.write_text("previous\n", encoding="utf-8")
+    write_grade_csv(current_csv, [("Grace", "Hopper", "Task", "1"), ("Ada", "Lovelace", "Task", "1")])
+    write_grade_csv(
+        truth_csv,
+        [("Grace", "Hopper", "Task", "2"), ("Ada", "Lovelace", "Task", "2"), ("Grace", "Hopper", "Task", "3")],
+    )
+
+    with pytest.raises(ValueError, match="Row 4: duplicate grade for Grace Hopper in task Task"):
+        write_grade_diff_csv(current_csv, truth_csv, output_csv, streaming=True, chunk_rows=2)
+
+    assert output_csv.read_text(encoding="utf-8") == "previous\n"
+    assert not (tmp_path / ".diff.csv.partial").exists()
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from edu_page_automat.id_cache import (
+    clear_id_cache,
+    get_id_cache_path,
+    invalidate_course_ids,
+    new_course_ids,
+    read_course_ids,
+    read_id_cache,
+    record_course_ids,
+)
+
+
+def course_ids(class_="2.png", subject="Informatika", period="P2"):
+    return new_course_ids(
+        class_,
+        subject,
+        period,
+        {
+            "Lovelace, Ada": ["?what=zobraztriedu&studentid=-440&p=-91"],
+            "Twin, A": ["?studentid=-1", "?studentid=-2"],
+        },
+        {"Quiz": [("-91", "132812")], "Duplicate": [("-91", "1"), ("-91", "2")]},
+        now=1_000,
+    )
+
+
+def test_new_course_ids_skips_ambiguous_names_but_keeps_table_shape():
+    ids = course_ids()
+
+    assert ids.students == {"Lovelace, Ada": "-440"}
+    assert ids.tasks == {"Quiz": ("-91", "132812")}
+    assert (ids.student_count, ids.task_count) == (3, 3)
+    assert ids.missing_names(["Lovelace, Ada", "Twin, A"], ["Quiz"]) == ["Twin, A"]
+    assert ids.matches_shape(3, 3)
+    assert not ids.matches_shape(4, 3)
+
+
+def test_record_and_read_course_ids_round_trip(tmp_path):
+    cache_path = tmp_path / "course-ids.json"
+
+    record_course_ids(cache_path, course_ids())
+    record_course_ids(cache_path, course_ids(period="P1"))
+
+    assert read_course_ids(cache_path, "2.png", "Informatika", "P2") == course_ids()
+    assert read_course_ids(cache_path, "3.cpu", "Informatika", "P2") is None
+    assert len(read_id_cache(cache_path)) == 2
+
+
+
+def test_concurrent_records_keep_every_course(tmp_path):
+    """Worker threads recording different courses at once never drop each other's entries."""
+    cache_path = tmp_path / "course-ids.json"
+    classes = [f"{number}.png" for number in range(24)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda class_: record_course_ids(cache_path, course_ids(class_=class_)), classes))
+
+    assert sorted(ids.class_ for ids in read_id_cache(cache_path).values()) == sorted(classes)
+    assert [path.name for path in tmp_path.iterdir()] == ["course-ids.json"]
+
+def test_invalidate_course_ids_keeps_other_courses(tmp_path):
+    cache_path = tmp_path / "course-ids.json"
+    record_course_ids(cache_path, course_ids())
+    record_course_ids(cache_path, course_ids(class_="3.cpu"))
+
+    invalidate_course_ids(cache_path, "2.png", "Informatika", "P2")
+
+    assert list(read_id_cache(cache_path)) == ["3.cpu|Informatika|P2"]
+
+
+def test_clear_id_cache_filters_by_class_and_removes_empty_file(tmp_path):
+    cache_path = tmp_path / "course-ids.json"
+    record_course_ids(cache_path, course_ids())
+    record_course_ids(cache_path, course_ids(period="P1"))
+    record_course_ids(cache_path, course_ids(class_="3.cpu"))
+
+    assert clear_id_cache(cache_path, class_="2.png") == 2
+    assert list(read_id_cache(cache_path)) == ["3.cpu|Informatika|P2"]
+    assert clear_id_cache(cache_path) == 1
+    assert not cache_path.exists()
+
+
+def test_read_id_cache_ignores_malformed_files_and_entries(tmp_path):
+    cache_path = tmp_path / "course-ids.json"
+    cache_path.write_text("not json", encoding="utf-8")
+    assert read_id_cache(cache_path) == {}
+
+    record_course_ids(cache_path, course_ids())
+    cache_path.write_text(
+        cache_path.read_text(encoding="utf-8").replace('"courses": {', '"courses": {"broken": {"class": "x"}, '),
+        encoding="utf-8",
+    )
+    assert list(read_id_cache(cache_path)) == ["2.png|Informatika|P2"]
+
+
+def test_id_cache_path_is_stored_next_to_auth_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDUPAGE_AUTH_FILE", str(tmp_path / "auth.json"))
+
+    assert get_id_cache_path() == tmp_path / "course-ids.json"
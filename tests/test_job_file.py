@@ -0,0 +1,91 @@
+import json
+import re
+import sys
+
+import pytest
+
+from edu_page_automat.job_file import load_job_file
+
+
+def test_load_job_file_reads_json_jobs_with_defaults(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(
+        json.dumps(
+            {
+                "defaults": {"subject": "Matematika", "deep_link": False},
+                "jobs": [
+                    {"command": "fill-grades", "class": "2.png", "grades_csv": "grades/2png.csv", "dry-run": True},
+                    {"command": "export-grades", "class": ["3.cpu", 4], "subject": "Fyzika"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    fill_job, export_job = load_job_file(job_file)
+
+    assert fill_job.label == "Job 1 (fill-grades)"
+    assert set(fill_job.options) == {"class", "grades-csv", "dry-run"}
+    assert fill_job.text("subject") == "Matematika"
+    assert fill_job.flag("deep-link", True) is False
+    assert fill_job.flag("dry-run") is True
+    assert fill_job.path("grades-csv") == tmp_path / "grades" / "2png.csv"
+    assert export_job.text_list("class") == ["3.cpu", "4"]
+    assert export_job.text("subject") == "Fyzika"
+
+
+def test_load_job_file_reads_yaml_job_list(tmp_path):
+    pytest.importorskip("yaml")
+    job_file = tmp_path / "jobs.yaml"
+    job_file.write_text(
+        "- command: create-task\n  class: 3.gpu\n  task: ['Test 1:10', 'Test 2:20']\n",
+        encoding="utf-8",
+    )
+
+    [job] = load_job_file(job_file)
+
+    assert job.command == "create-task"
+    assert job.text("class", required=True) == "3.gpu"
+    assert job.text_list("task") == ["Test 1:10", "Test 2:20"]
+
+
+
+def test_load_job_file_points_yaml_users_at_the_extra_without_pyyaml(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    job_file = tmp_path / "jobs.yml"
+    job_file.write_text("- command: create-task\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=re.escape("poetry install --extras yaml")):
+        load_job_file(job_file)
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("[]", "non-empty list of jobs"),
+        ('{"jobs": [{"class": "2.png"}]}', "Job 1: command must be one of"),
+        ('{"jobs": [{"command": "login"}]}', "got 'login'"),
+        ('{"jobs": [], "workers": 2}', "Unknown top-level key(s) in job file: workers"),
+        ("{not json", "not valid JSON"),
+    ],
+)
+def test_load_job_file_rejects_malformed_files(tmp_path, content, message):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=re.escape(message)):
+        load_job_file(job_file)
+
+
+def test_scenario_job_validates_options(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text('[{"command": "fill-grades", "class": true, "colour": "red", "verify": "yes"}]', encoding="utf-8")
+    [job] = load_job_file(job_file)
+
+    with pytest.raises(ValueError, match=re.escape("Unknown option(s) for fill-grades: colour")):
+        job.check_options({"class", "verify"})
+    with pytest.raises(ValueError, match="Option 'class' must be a string"):
+        job.text("class")
+    with pytest.raises(ValueError, match="Option 'verify' must be true or false"):
+        job.flag("verify")
+    with pytest.raises(ValueError, match="Missing required option 'grades-csv'"):
+        job.path("grades-csv", required=True)
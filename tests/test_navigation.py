@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from edu_page_automat import edupage_site
+from edu_page_automat.course_catalogue import lookup_course_url, record_course_url
+from edu_page_automat.scenarios.base import run_steps
+from edu_page_automat.scenarios.navigation import open_course_deep_link, remember_course_url
+
+ZNAMKY_URL = "https://1itg.edupage.org/znamky/?what=studentsList&eqa=abc"
+
+
+@pytest.fixture(autouse=True)
+def default_base_url(monkeypatch):
+    monkeypatch.delenv(edupage_site.BASE_URL_ENV_VAR, raising=False)
+    edupage_site.set_base_url(None)
+    yield
+    edupage_site.set_base_url(None)
+
+
+def test_open_course_deep_link_goes_straight_to_recorded_url(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+    record_course_url(catalogue_path, "2.png", "Informatika", ZNAMKY_URL)
+    page = MagicMock()
+
+    deep_linked = run_steps(open_course_deep_link(page, catalogue_path, "2.png", "Informatika", ".znamkyUdalostHeader"))
+
+    assert deep_linked is True
+
+    page.goto.assert_called_once_with(ZNAMKY_URL, wait_until="domcontentloaded")
+    page.wait_for_selector.assert_called_once_with(".znamkyUdalostHeader", state="attached", timeout=5000)
+    page.locator.assert_not_called()
+
+
+def test_open_course_deep_link_forgets_stale_url(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+    record_course_url(catalogue_path, "2.png", "Informatika", ZNAMKY_URL)
+    page = MagicMock()
+    page.wait_for_selector.side_effect = PlaywrightTimeoutError("no grade table")
+
+    deep_linked = run_steps(open_course_deep_link(page, catalogue_path, "2.png", "Informatika", ".znamkyUdalostHeader"))
+
+    assert deep_linked is False
+
+    assert lookup_course_url(catalogue_path, "2.png", "Informatika") is None
+
+
+def test_open_course_deep_link_without_catalogue_entry_does_not_navigate(tmp_path):
+    page = MagicMock()
+
+    assert run_steps(open_course_deep_link(page, None, "2.png", "Informatika", ".znamkyUdalostHeader")) is False
+    assert run_steps(open_course_deep_link(page, tmp_path / "missing.json", "2.png", "Informatika", "x")) is False
+    page.goto.assert_not_called()
+
+
+def test_remember_course_url_records_current_page(tmp_path):
+    catalogue_path = tmp_path / "course-urls.json"
+    page = MagicMock(url=ZNAMKY_URL)
+
+    remember_course_url(page, catalogue_path, "2.png", "Informatika")
+    remember_course_url(page, None, "3.cpu", "Informatika")
+
+    assert lookup_course_url(catalogue_path, "2.png", "Informatika") == ZNAMKY_URL
+    assert lookup_course_url(catalogue_path, "3.cpu", "Informatika") is None
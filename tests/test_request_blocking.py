@@ -0,0 +1,154 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from edu_page_automat import request_blocking
+from edu_page_automat.request_blocking import (
+    RequestBlockingPolicy,
+    install_request_blocking,
+    install_request_blocking_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_active_policy(monkeypatch):
+    """Keep each test independent of the process-wide policy and environment."""
+    monkeypatch.delenv(request_blocking.BLOCK_RESOURCES_ENV_VAR, raising=False)
+    monkeypatch.delenv(request_blocking.BLOCK_URLS_ENV_VAR, raising=False)
+    request_blocking.set_request_blocking(None)
+    yield
+    request_blocking.set_request_blocking(None)
+
+
+class FakeContext:
+    def __init__(self):
+        self.route_handler = None
+        self.listeners = {}
+
+    def route(self, pattern, handler):
+        self.route_handler = handler
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+
+class FakeRoute:
+    def __init__(self):
+        self.outcome = None
+
+    def abort(self, error_code):
+        self.outcome = "abort"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+
+def send(context, resource_type, url):
+    route = FakeRoute()
+    context.route_handler(route, SimpleNamespace(resource_type=resource_type, url=url))
+    return route.outcome
+
+
+def test_default_policy_blocks_static_assets_and_analytics():
+    """Images, fonts, media, and analytics are aborted while pages, scripts, and XHR load."""
+    policy = RequestBlockingPolicy()
+
+    assert policy.blocks("image", "https://static.edupage.org/global/pics/ui/save.svg")
+    assert policy.blocks("font", "https://1itg.edupage.org/global/fonts/roboto.woff2")
+    assert policy.blocks("script", "https://www.googletagmanager.com/gtag/js?id=1")
+    assert not policy.blocks("document", "https://1itg.edupage.org/znamky/")
+    assert not policy.blocks("script", "https://1itg.edupage.org/global/pics/js/edubarUtils.js")
+    assert not policy.blocks("xhr", "https://1itg.edupage.org/znamky/?akcia=save")
+
+
+def test_environment_replaces_types_and_adds_url_patterns(monkeypatch):
+    """`EDUPAGE_BLOCK_RESOURCES` replaces types; `EDUPAGE_BLOCK_URLS` extends the pattern list."""
+    monkeypatch.setenv(request_blocking.BLOCK_RESOURCES_ENV_VAR, "image, stylesheet")
+    monkeypatch.setenv(request_blocking.BLOCK_URLS_ENV_VAR, "*/rss/*")
+
+    policy = request_blocking.get_request_blocking()
+
+    assert policy.resource_types == {"image", "stylesheet"}
+    assert policy.url_patterns[-1] == "*/rss/*"
+    assert policy.blocks("xhr", "https://1itg.edupage.org/rss/news")
+    assert not policy.blocks("font", "https://1itg.edupage.org/font.woff2")
+
+
+def test_none_disables_resource_type_blocking():
+    """`none` keeps only URL pattern blocking."""
+    policy = RequestBlockingPolicy().with_overrides(resource_types=request_blocking.parse_resource_types("none"))
+
+    assert not policy.blocks("image", "https://static.edupage.org/logo.png")
+    assert policy.enabled
+
+
+def test_document_requests_cannot_be_blocked():
+    """Blocking documents would abort the navigations scenarios depend on."""
+    with pytest.raises(ValueError, match="document"):
+        request_blocking.parse_resource_types("image,document")
+
+
+def test_install_request_blocking_counts_blocked_and_loaded_traffic():
+    """The routing handler aborts matches and the response listener sums loaded bytes."""
+    context = FakeContext()
+
+    stats = install_request_blocking(context, RequestBlockingPolicy())
+    outcomes = [
+        send(context, "document", "https://1itg.edupage.org/znamky/"),
+        send(context, "image", "https://static.edupage.org/a.png"),
+        send(context, "image", "https://static.edupage.org/b.png"),
+        send(context, "font", "https://static.edupage.org/c.woff2"),
+    ]
+    context.listeners["response"](SimpleNamespace(headers={"content-length": "2048"}))
+    context.listeners["response"](SimpleNamespace(headers={"transfer-encoding": "chunked"}))
+
+    assert outcomes == ["continue", "abort", "abort", "abort"]
+    assert stats.requests == 4
+    assert stats.blocked == 3
+    assert stats.loaded_bytes == 2048
+    assert stats.format_summary() == "blocked 3 of 4 requests (font=1, image=2), loaded 2.0 KiB"
+
+
+def test_disabled_policy_does_not_route_requests():
+    """Without anything to block, requests skip the Python routing round trip entirely."""
+    context = FakeContext()
+
+    install_request_blocking(context, RequestBlockingPolicy.disabled())
+
+    assert context.route_handler is None
+    assert context.listeners == {}
+
+
+def test_install_request_blocking_async_awaits_route_decisions():
+    """The async API handler awaits abort and continue on the route."""
+    outcomes = []
+    routes = []
+
+    class AsyncContext:
+        def __init__(self):
+            self.listeners = {}
+
+        async def route(self, pattern, handler):
+            routes.append(handler)
+
+        def on(self, event, handler):
+            self.listeners[event] = handler
+
+    class AsyncRoute:
+        async def abort(self, error_code):
+            outcomes.append("abort")
+
+        async def continue_(self):
+            outcomes.append("continue")
+
+    async def scenario():
+        stats = await install_request_blocking_async(AsyncContext(), RequestBlockingPolicy())
+        for resource_type in ("document", "image"):
+            await routes[0](AsyncRoute(), SimpleNamespace(resource_type=resource_type, url="https://1itg.edupage.org/"))
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert outcomes == ["continue", "abort"]
+    assert stats.blocked_by_type == {"image": 1}
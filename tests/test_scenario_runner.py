@@ -1,10 +1,22 @@
+import json
+import threading
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from edu_page_automat import request_blocking
 from edu_page_automat import scenario_runner as sr
+from edu_page_automat.scenarios.base import Scenario
+
+
+@pytest.fixture(autouse=True)
+def no_request_blocking():
+    """Let runner tests use context fakes without routing support unless a test opts in."""
+    request_blocking.set_request_blocking(request_blocking.RequestBlockingPolicy.disabled())
+    yield
+    request_blocking.set_request_blocking(None)
 
 
 class DummyLocator:
@@ -41,34 +53,53 @@ class DummyPage:
         return DummyLocator()
 
 
-def test_auto_wait_locator_waits_and_wraps(monkeypatch):
+def test_auto_wait_locator_leaves_playwright_auto_wait_actions_to_playwright(monkeypatch):
     monkeypatch.setattr(sr, "Locator", DummyLocator)
     locator = DummyLocator()
     auto = sr.AutoWaitLocator(locator, timeout=123)
 
     result = auto.click()
 
-    assert locator.wait_calls == [{"state": "visible", "timeout": 123}]
+    assert locator.wait_calls == []
     assert locator.click_calls == [((), {})]
     assert isinstance(result, sr.AutoWaitLocator)
 
 
-def test_auto_wait_locator_falls_back_to_playwright_action_auto_wait(monkeypatch):
+def test_auto_wait_locator_waits_before_actions_without_playwright_auto_wait(monkeypatch):
+    monkeypatch.setattr(sr, "Locator", DummyLocator)
+
+    class PressLocator(DummyLocator):
+        def __init__(self):
+            super().__init__()
+            self.press_calls = []
+
+        def press(self, key):
+            self.press_calls.append(key)
+
+    locator = PressLocator()
+    auto = sr.AutoWaitLocator(locator, timeout=123)
+
+    auto.press("Enter")
+
+    assert locator.wait_calls == [{"state": "attached", "timeout": 123}]
+    assert locator.press_calls == ["Enter"]
+
+
+def test_auto_wait_locator_raises_when_explicit_wait_times_out(monkeypatch):
     monkeypatch.setattr(sr, "Locator", DummyLocator)
 
     class TimeoutLocator(DummyLocator):
         def wait_for(self, **kwargs):
             self.wait_calls.append(kwargs)
-            raise PlaywrightTimeoutError("not visible yet")
+            raise PlaywrightTimeoutError("not attached yet")
 
-    locator = TimeoutLocator()
-    auto = sr.AutoWaitLocator(locator, timeout=123)
+        def press(self, key):
+            raise AssertionError("press must not run after a failed wait")
 
-    result = auto.click()
+    auto = sr.AutoWaitLocator(TimeoutLocator(), timeout=123)
 
-    assert locator.wait_calls == [{"state": "visible", "timeout": 123}]
-    assert locator.click_calls == [((), {})]
-    assert isinstance(result, sr.AutoWaitLocator)
+    with pytest.raises(PlaywrightTimeoutError):
+        auto.press("Enter")
 
 
 def test_auto_wait_locator_passthrough(monkeypatch):
@@ -78,6 +109,8 @@ def test_auto_wait_locator_passthrough(monkeypatch):
 
     assert auto.bounding_box() == {"width": 10}
     assert locator.wait_calls == []
+    assert auto.bounding_box is auto.bounding_box
+    assert isinstance(auto, DummyLocator)
 
 
 def test_auto_wait_frame_locator_wraps(monkeypatch):
@@ -134,7 +167,9 @@ def test_run_scenario_happy_path(monkeypatch):
             events.append("browser.close")
 
     class FakeAuthManager:
-        def __init__(self, playwright):
+        session_probe_pending = False
+
+        def __init__(self, playwright, profile):
             events.append(("auth.init", playwright))
 
         def new_context(self):
@@ -192,7 +227,9 @@ def test_run_scenario_propagates_error(monkeypatch):
             events.append("browser.close")
 
     class FakeAuthManager:
-        def __init__(self, playwright):
+        session_probe_pending = False
+
+        def __init__(self, playwright, profile):
             events.append(("auth.init", playwright))
 
         def new_context(self):
@@ -226,3 +263,317 @@ def test_run_scenario_propagates_error(monkeypatch):
         "browser.close",
         ("playwright.exit", RuntimeError),
     ]
+
+
+def test_auto_wait_page_runs_first_navigation_hook_once():
+    navigations = []
+
+    class NavigatingPage:
+        url = "https://1itg.edupage.org/user/"
+
+        def goto(self, url, **kwargs):
+            return None
+
+    page = NavigatingPage()
+    auto_page = sr.AutoWaitPage(page, timeout=75, on_first_navigation=navigations.append)
+
+    auto_page.goto("https://1itg.edupage.org/user/")
+    auto_page.goto("https://1itg.edupage.org/znamky/")
+
+    assert navigations == [page]
+
+
+def test_run_scenario_logs_in_again_when_cached_session_expired(monkeypatch):
+    events = []
+
+    class FakePage:
+        def __init__(self, url):
+            self.url = url
+
+        def set_default_timeout(self, value):
+            pass
+
+        def set_default_navigation_timeout(self, value):
+            pass
+
+        def goto(self, unused_url, **kwargs):
+            events.append(("goto", self.url))
+
+    class FakeContext:
+        def __init__(self, name, url):
+            self.name = name
+            self.pages = [FakePage(url)]
+
+        def close(self):
+            events.append(f"{self.name}.close")
+
+    class FakeBrowser:
+        def __init__(self, name):
+            self.name = name
+
+        def close(self):
+            events.append(f"{self.name}.close")
+
+    class FakeAuthManager:
+        def __init__(self, playwright, profile):
+            self.session_probe_pending = False
+
+        def new_context(self):
+            self.session_probe_pending = True
+            return FakeBrowser("cached-browser"), FakeContext("cached-context", "https://1itg.edupage.org/login/")
+
+        def confirm_session(self, page):
+            self.session_probe_pending = False
+            if "login" in page.url:
+                raise sr.SessionExpiredError("expired")
+
+        def login(self):
+            events.append("login")
+            return FakeBrowser("login-browser"), FakeContext("login-context", "https://1itg.edupage.org/user/")
+
+    class DummyCM:
+        def __enter__(self):
+            return "playwright"
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(sr, "sync_playwright", lambda: DummyCM())
+    monkeypatch.setattr(sr, "AuthManager", FakeAuthManager)
+
+    class NavigatingScenario:
+        def run(self, page):
+            page.goto("https://1itg.edupage.org/user/")
+            events.append("scenario.done")
+
+    sr.run_scenario(lambda: NavigatingScenario())
+
+    assert events == [
+        ("goto", "https://1itg.edupage.org/login/"),
+        "cached-context.close",
+        "cached-browser.close",
+        "login",
+        ("goto", "https://1itg.edupage.org/user/"),
+        "scenario.done",
+        "login-context.close",
+        "login-browser.close",
+    ]
+
+
+def test_run_scenario_records_spans_and_writes_trace(monkeypatch, tmp_path):
+    class FakeContext:
+        def __init__(self):
+            self.pages = [SimpleNamespace(set_default_timeout=lambda *a: None, set_default_navigation_timeout=lambda *a: None)]
+
+        def close(self):
+            pass
+
+    class FakeBrowser:
+        def close(self):
+            pass
+
+    class FakeAuthManager:
+        session_probe_pending = False
+
+        def __init__(self, playwright, profile):
+            pass
+
+        def new_context(self):
+            return FakeBrowser(), FakeContext()
+
+    class DummyCM:
+        def __enter__(self):
+            return "playwright"
+
+        def __exit__(self, exc_type, exc, tb):
+            return None
+
+    class SteppedScenario(Scenario):
+        @classmethod
+        def register_cli(cls, cli_group):
+            pass
+
+        def steps(self, page):
+            for index in range(3):
+                with self.span("fill_entry", index=index):
+                    yield
+
+    monkeypatch.setattr(sr, "sync_playwright", lambda: DummyCM())
+    monkeypatch.setattr(sr, "AuthManager", FakeAuthManager)
+    trace_path = tmp_path / "trace.json"
+
+    sr.run_scenario(lambda: SteppedScenario(), trace_out=trace_path)
+
+    events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+    names = [event["name"] for event in events]
+    assert names.count("fill_entry") == 3
+    assert {"open_session", "run", "close"} <= set(names)
+    assert [event["args"]["index"] for event in events if event["name"] == "fill_entry"] == ["0", "1", "2"]
+
+
+def test_run_scenario_routes_context_requests_through_blocking_policy(monkeypatch):
+    routes = []
+
+    class FakeContext:
+        def __init__(self):
+            self.pages = [SimpleNamespace(set_default_timeout=lambda *a: None, set_default_navigation_timeout=lambda *a: None)]
+            self.listeners = {}
+
+        def route(self, pattern, handler):
+            routes.append((pattern, handler))
+
+        def on(self, event, handler):
+            self.listeners[event] = handler
+
+        def close(self):
+            pass
+
+    class FakeBrowser:
+        def close(self):
+            pass
+
+    class FakeAuthManager:
+        session_probe_pending = False
+
+        def __init__(self, playwright, profile):
+            pass
+
+        def new_context(self):
+            return FakeBrowser(), FakeContext()
+
+    class DummyCM:
+        def __enter__(self):
+            return "playwright"
+
+        def __exit__(self, exc_type, exc, tb):
+            return None
+
+    class FakeRoute:
+        def __init__(self):
+            self.outcome = None
+
+        def abort(self, error_code):
+            self.outcome = ("abort", error_code)
+
+        def continue_(self):
+            self.outcome = ("continue",)
+
+    handled = []
+
+    class RequestingScenario:
+        def run(self, page):
+            (_, handler) = routes[0]
+            for resource_type, url in (
+                ("document", "https://1itg.edupage.org/znamky/"),
+                ("image", "https://static.edupage.org/pics/logo.svg"),
+                ("script", "https://www.google-analytics.com/analytics.js"),
+            ):
+                route = FakeRoute()
+                handler(route, SimpleNamespace(resource_type=resource_type, url=url))
+                handled.append(route.outcome)
+
+    monkeypatch.setattr(sr, "sync_playwright", lambda: DummyCM())
+    monkeypatch.setattr(sr, "AuthManager", FakeAuthManager)
+
+    sr.run_scenario(lambda: RequestingScenario(), request_blocking=request_blocking.RequestBlockingPolicy())
+
+    assert routes[0][0] == "**/*"
+    assert handled == [("continue",), ("abort", "blockedbyclient"), ("abort", "blockedbyclient")]
+
+
+class PoolContext:
+    def __init__(self, opened):
+        self.opened = opened
+        self.closed = False
+
+    def new_page(self):
+        return MagicMock()
+
+    def close(self):
+        self.closed = True
+
+
+class PoolAuthManager:
+    ensured = 0
+    contexts = []
+
+    def __init__(self, playwright, profile):
+        pass
+
+    def ensure_session(self):
+        PoolAuthManager.ensured += 1
+
+    def open_stored_context(self):
+        context = PoolContext(len(PoolAuthManager.contexts))
+        PoolAuthManager.contexts.append(context)
+        return MagicMock(), context
+
+
+class PoolCM:
+    def __enter__(self):
+        return "playwright"
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+class CourseScenario:
+    def __init__(self, name, seen):
+        self.name = name
+        self.seen = seen
+
+    def run(self, page):
+        if self.name == "broken":
+            raise ValueError("course missing")
+        self.seen.append((self.name, threading.current_thread().name))
+
+
+def test_run_scenarios_spreads_jobs_over_worker_contexts(monkeypatch):
+    PoolAuthManager.ensured = 0
+    PoolAuthManager.contexts = []
+    monkeypatch.setattr(sr, "sync_playwright", lambda: PoolCM())
+    monkeypatch.setattr(sr, "AuthManager", PoolAuthManager)
+    seen = []
+
+    results = sr.run_scenarios(
+        [lambda name=name: CourseScenario(name, seen) for name in ("2.png", "broken", "3.cpu", "4.B")],
+        workers=2,
+    )
+
+    assert PoolAuthManager.ensured == 1
+    assert len(PoolAuthManager.contexts) == 2
+    assert all(context.closed for context in PoolAuthManager.contexts)
+    assert [result.ok for result in results] == [True, False, True, True]
+    assert str(results[1].error) == "course missing"
+    assert sorted(name for name, _ in seen) == ["2.png", "3.cpu", "4.B"]
+    assert {thread for _, thread in seen} <= {"edupage-worker-1", "edupage-worker-2"}
+
+
+def test_run_scenarios_never_starts_more_workers_than_jobs(monkeypatch):
+    PoolAuthManager.contexts = []
+    monkeypatch.setattr(sr, "sync_playwright", lambda: PoolCM())
+    monkeypatch.setattr(sr, "AuthManager", PoolAuthManager)
+
+    results = sr.run_scenarios([lambda: CourseScenario("2.png", [])], workers=4)
+
+    assert len(PoolAuthManager.contexts) == 1
+    assert results[0].ok
+
+
+
+def test_run_scenarios_reports_worker_setup_error_on_jobs_it_could_not_run(monkeypatch):
+    class BrokenAuthManager(PoolAuthManager):
+        def open_stored_context(self):
+            raise OSError("storage state unreadable")
+
+    monkeypatch.setattr(sr, "sync_playwright", lambda: PoolCM())
+    monkeypatch.setattr(sr, "AuthManager", BrokenAuthManager)
+
+    results = sr.run_scenarios([lambda: CourseScenario("2.png", []), lambda: CourseScenario("3.cpu", [])], workers=2)
+
+    assert [result.ok for result in results] == [False, False]
+    assert all(str(result.error) == "storage state unreadable" for result in results)
+
+def test_run_scenarios_rejects_zero_workers():
+    with pytest.raises(ValueError, match="at least 1"):
+        sr.run_scenarios([], workers=0)
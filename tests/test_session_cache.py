@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from edu_page_automat import session_cache
+from edu_page_automat.session_cache import (
+    get_session_ttl,
+    invalidate_session_validation,
+    is_session_recently_validated,
+    read_cookies_expiry,
+    record_session_validation,
+)
+
+
+def write_storage_state(path, cookies):
+    path.write_text(json.dumps({"cookies": cookies, "origins": []}), encoding="utf-8")
+
+
+def test_read_cookies_expiry_ignores_session_cookies(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    write_storage_state(
+        auth_file,
+        [
+            {"name": "PHPSESSID", "expires": -1},
+            {"name": "edid", "expires": 2_000},
+            {"name": "remember", "expires": 1_500},
+        ],
+    )
+
+    assert read_cookies_expiry(auth_file) == 1_500
+
+
+def test_recent_validation_is_trusted_within_ttl(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    cache_path = tmp_path / "session-cache.json"
+    write_storage_state(auth_file, [{"name": "edid", "expires": 10_000}])
+
+    record_session_validation(cache_path, auth_file, now=1_000)
+
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_599) is True
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_600) is False
+    assert is_session_recently_validated(cache_path, auth_file, ttl=0, now=1_001) is False
+
+
+def test_validation_is_not_trusted_after_cookie_expiry(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    cache_path = tmp_path / "session-cache.json"
+    write_storage_state(auth_file, [{"name": "edid", "expires": 1_100}])
+
+    record_session_validation(cache_path, auth_file, now=1_000)
+
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_050) is True
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_100) is False
+
+
+def test_validation_is_not_trusted_after_auth_file_changes(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    cache_path = tmp_path / "session-cache.json"
+    write_storage_state(auth_file, [])
+    record_session_validation(cache_path, auth_file, now=1_000)
+
+    cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    cache["auth_mtime"] -= 10
+    cache_path.write_text(json.dumps(cache), encoding="utf-8")
+
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_001) is False
+
+
+def test_invalidate_session_validation_removes_cache(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    cache_path = tmp_path / "session-cache.json"
+    write_storage_state(auth_file, [])
+    record_session_validation(cache_path, auth_file, now=1_000)
+
+    invalidate_session_validation(cache_path)
+
+    assert is_session_recently_validated(cache_path, auth_file, ttl=600, now=1_001) is False
+
+
+def test_get_session_ttl_reads_environment(monkeypatch):
+    monkeypatch.setenv(session_cache.SESSION_TTL_ENV_VAR, "30")
+    assert get_session_ttl() == 30
+
+    monkeypatch.setenv(session_cache.SESSION_TTL_ENV_VAR, "soon")
+    with pytest.raises(ValueError, match="EDUPAGE_SESSION_TTL"):
+        get_session_ttl()
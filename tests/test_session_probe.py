@@ -0,0 +1,70 @@
+import json
+
+from edu_page_automat import session_probe
+from edu_page_automat.session_probe import classify_probe_response, cookie_header_for_url, probe_session
+
+
+def write_storage_state(path, cookies):
+    path.write_text(json.dumps({"cookies": cookies, "origins": []}), encoding="utf-8")
+
+
+def cookie(name, value, domain, path="/", expires=-1, secure=False):
+    return {"name": name, "value": value, "domain": domain, "path": path, "expires": expires, "secure": secure}
+
+
+def test_cookie_header_selects_matching_unexpired_cookies(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    write_storage_state(
+        auth_file,
+        [
+            cookie("PHPSESSID", "abc", "1itg.edupage.org"),
+            cookie("edid", "xyz", ".edupage.org", secure=True, expires=2_000),
+            cookie("old", "1", ".edupage.org", expires=500),
+            cookie("other", "1", "example.com"),
+            cookie("scoped", "1", "1itg.edupage.org", path="/znamky/"),
+        ],
+    )
+
+    header = cookie_header_for_url(auth_file, "https://1itg.edupage.org/user/", now=1_000)
+
+    assert header == "PHPSESSID=abc; edid=xyz"
+
+
+def test_classify_probe_response_reads_redirect_target():
+    assert classify_probe_response(302, "https://1itg.edupage.org/login/?next=/user/") is False
+    assert classify_probe_response(302, "https://1itg.edupage.org/user/?eqa=1") is True
+    assert classify_probe_response(200, "https://1itg.edupage.org/user/") is True
+    assert classify_probe_response(503, "") is None
+
+
+def test_probe_session_without_cookies_reports_logged_out(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    write_storage_state(auth_file, [])
+
+    assert probe_session(auth_file, "https://1itg.edupage.org/user/") is False
+
+
+def test_probe_session_is_inconclusive_for_unreadable_state(tmp_path):
+    assert probe_session(tmp_path / "missing.json", "https://1itg.edupage.org/user/") is None
+
+
+def test_probe_session_is_inconclusive_on_network_error(tmp_path, monkeypatch):
+    auth_file = tmp_path / "auth.json"
+    write_storage_state(auth_file, [cookie("PHPSESSID", "abc", "1itg.edupage.org")])
+
+    class FailingOpener:
+        def open(self, request, timeout):
+            raise OSError("network unreachable")
+
+    monkeypatch.setattr(session_probe, "build_opener", lambda *handlers: FailingOpener())
+
+    assert probe_session(auth_file, "https://1itg.edupage.org/user/") is None
+
+
+def test_start_session_probe_returns_future(tmp_path):
+    auth_file = tmp_path / "auth.json"
+    write_storage_state(auth_file, [])
+
+    future = session_probe.start_session_probe(auth_file, "https://1itg.edupage.org/user/")
+
+    assert future.result(timeout=5) is False
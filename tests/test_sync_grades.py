@@ -0,0 +1,131 @@
+import csv
+from pathlib import Path
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from edu_page_automat.grade_diff import GradeRow
+from edu_page_automat.scenarios.fill_grades import GradeEntry, GradeTableIndex
+from edu_page_automat.scenarios.sync_grades import AsyncSyncGradesScenario, SyncGradesScenario
+
+EXPORT_PAYLOAD = {
+    "tasks": [["Task", "Homework"], ["Other", "Homework"]],
+    "students": ["Žužlavá, Žofie"],
+    "points": [["80", ""]],
+}
+
+
+def grade_table_index() -> GradeTableIndex:
+    """Return a grade-table index with one student and two tasks."""
+    return GradeTableIndex(
+        url="https://1itg.edupage.org/znamky/",
+        student_links={"Žužlavá, Žofie": ["?studentid=-440"]},
+        task_identifiers={"Task": [("-91", "1")], "Other": [("-91", "2")]},
+        stored_values={"zn_-440_-91_1_P2_1": "80"},
+    )
+
+
+def sync_scenario(truth_rows: list[GradeRow], scenario_class=SyncGradesScenario, **kwargs) -> SyncGradesScenario:
+    """Return a batch-filling sync scenario whose navigation is skipped."""
+    def open_grade_table(unused_page):
+        yield
+
+    def read_grade_table_index(unused_page):
+        yield
+        return grade_table_index()
+
+    scenario = scenario_class(class_="2.png", truth_rows=truth_rows, batch_fill=True, **kwargs)
+    scenario._open_grade_table = open_grade_table
+    scenario._read_grade_table_index = read_grade_table_index
+    scenario._save_changes = MagicMock(side_effect=lambda unused_page: iter(()))
+    return scenario
+
+
+def test_sync_grades_fills_only_changed_cells_and_saves_once() -> None:
+    """Current values come from the live table; only differing truth rows are filled."""
+    scenario = sync_scenario(
+        [
+            GradeRow("Žofie", "Žužlavá", "Task", "80"),
+            GradeRow("Žofie", "Žužlavá", "Other", "m"),
+        ]
+    )
+    page = MagicMock()
+    page.evaluate.side_effect = [
+        EXPORT_PAYLOAD,
+        [{"name": "nzn_-440_-91_2_P2_1", "found": True, "value": "m"}],
+    ]
+
+    scenario.run(page)
+
+    assert scenario.entries == [GradeEntry("Žofie", "Žužlavá", "Other", "m")]
+    assert scenario.summary.written_rows == 1
+    assert scenario.summary.equal_rows == 1
+    _, cells = page.evaluate.call_args.args
+    assert cells == [{"name": "nzn_-440_-91_2_P2_1", "value": "m"}]
+    scenario._save_changes.assert_called_once_with(page)
+
+
+def test_sync_grades_overwrites_lower_current_grade_unless_kept(tmp_path: Path) -> None:
+    """Changed cells replace existing grades; `keep_better_current` reports higher ones instead."""
+    report_csv = tmp_path / "kept.csv"
+    scenario = sync_scenario(
+        [GradeRow("Žofie", "Žužlavá", "Task", "70")],
+        keep_better_current=True,
+        kept_current_report_csv=report_csv,
+    )
+    page = MagicMock()
+    page.evaluate.return_value = EXPORT_PAYLOAD
+
+    scenario.run(page)
+
+    assert scenario.entries == []
+    assert scenario.summary.kept_better_current_rows == 1
+    scenario._save_changes.assert_not_called()
+    with report_csv.open(encoding="utf-8", newline="") as handle:
+        assert [row["soucasny_pocet_bodu"] for row in csv.DictReader(handle)] == ["80"]
+
+    overwrite = sync_scenario([GradeRow("Žofie", "Žužlavá", "Task", "70")], save=False)
+    page = MagicMock()
+    page.evaluate.side_effect = [EXPORT_PAYLOAD, [{"name": "nzn_-440_-91_1_P2_1", "found": True, "value": "70"}]]
+
+    overwrite.run(page)
+
+    assert overwrite.entries == [GradeEntry("Žofie", "Žužlavá", "Task", 70)]
+    overwrite._save_changes.assert_not_called()
+
+
+def test_async_sync_grades_scenario_runs_the_same_steps() -> None:
+    """The async variant awaits the same page calls and fills only the changed cell."""
+    scenario = sync_scenario(
+        [GradeRow("Žofie", "Žužlavá", "Task", "80"), GradeRow("Žofie", "Žužlavá", "Other", "m")],
+        scenario_class=AsyncSyncGradesScenario,
+    )
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock()
+    page.evaluate = AsyncMock(
+        side_effect=[EXPORT_PAYLOAD, [{"name": "nzn_-440_-91_2_P2_1", "found": True, "value": "m"}]]
+    )
+
+    asyncio.run(scenario.run(page))
+
+    assert scenario.entries == [GradeEntry("Žofie", "Žužlavá", "Other", "m")]
+    assert page.evaluate.await_args.args[1] == [{"name": "nzn_-440_-91_2_P2_1", "value": "m"}]
+    scenario._save_changes.assert_called_once_with(page)
+
+
+def test_sync_grades_sets_every_inherited_fill_option() -> None:
+    """The shared fill helpers work on a sync scenario without chunking, journal, or verification."""
+    scenario = SyncGradesScenario(class_="2.png", truth_rows=[GradeRow("Žofie", "Žužlavá", "Task", "70")])
+    scenario.entries = [GradeEntry("Žofie", "Žužlavá", "Task", 70)]
+
+    assert (scenario.save_every, scenario.journal_path, scenario.resume) == (None, None, False)
+    assert (scenario.overwrite_existing, scenario.verify, scenario.verify_report_csv) == (True, False, None)
+    assert scenario._entry_chunks() == [scenario.entries]
+    scenario._finish_journal()
+
+
+def test_sync_grades_requires_truth_rows() -> None:
+    """A sync without source-of-truth rows is rejected."""
+    with pytest.raises(ValueError, match="At least one truth grade row"):
+        SyncGradesScenario(class_="2.png", truth_rows=[])
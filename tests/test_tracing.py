@@ -0,0 +1,93 @@
+import json
+
+from edu_page_automat.tracing import SpanRecorder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def record(recorder, clock, name, seconds, **args):
+    with recorder.span(name, **args):
+        clock.advance(seconds)
+
+
+def test_span_recorder_records_nested_spans_relative_to_start():
+    """Spans are timed relative to recorder creation and recorded when they finish."""
+    clock = FakeClock()
+    recorder = SpanRecorder(clock=clock)
+
+    clock.advance(0.5)
+    with recorder.span("run", category="runner"):
+        record(recorder, clock, "select_course", 0.25, class_="2.png")
+
+    inner, outer = recorder.spans
+    assert (inner.name, inner.start, inner.duration, inner.args) == ("select_course", 0.5, 0.25, {"class_": "2.png"})
+    assert (outer.name, outer.category, outer.start, outer.duration) == ("run", "runner", 0.5, 0.25)
+
+
+def test_span_recorder_keeps_span_of_failing_step():
+    """A step that raises is still recorded with the time spent before the error."""
+    clock = FakeClock()
+    recorder = SpanRecorder(clock=clock)
+
+    try:
+        with recorder.span("save"):
+            clock.advance(3)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert [(span.name, span.duration) for span in recorder.spans] == [("save", 3)]
+
+
+def test_span_summary_and_histogram_aggregate_repeated_spans():
+    """Per-entry spans are summarized with percentiles and bucketed into a histogram."""
+    clock = FakeClock()
+    recorder = SpanRecorder(clock=clock)
+    record(recorder, clock, "load_table", 1.2)
+    for seconds in (0.02, 0.03, 0.04, 0.2, 0.9):
+        record(recorder, clock, "fill_entry", seconds)
+
+    stats = {stat.name: stat for stat in recorder.summary()}
+    histogram = dict(recorder.histogram("fill_entry"))
+    summary_text = recorder.format_summary()
+
+    assert list(stats) == ["load_table", "fill_entry"]
+    assert stats["fill_entry"].count == 5
+    assert round(stats["fill_entry"].p50_ms) == 40
+    assert round(stats["fill_entry"].p95_ms) == 900
+    assert round(stats["fill_entry"].total_ms) == 1190
+    assert histogram["<= 25 ms"] == 1
+    assert histogram["<= 50 ms"] == 2
+    assert histogram["<= 250 ms"] == 1
+    assert histogram["<= 1000 ms"] == 1
+    assert "fill_entry latency histogram (5 spans)" in summary_text
+    assert "load_table latency histogram" not in summary_text
+
+
+def test_chrome_trace_uses_complete_events_in_microseconds(tmp_path):
+    """The trace file loads in chrome://tracing and Perfetto as complete (`X`) events."""
+    clock = FakeClock()
+    recorder = SpanRecorder(clock=clock)
+    clock.advance(0.001)
+    record(recorder, clock, "fill_entry", 0.0025, student="Boura, Adam", task="Task 1")
+    trace_path = tmp_path / "traces" / "run.json"
+
+    recorder.write_chrome_trace(trace_path)
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    (event,) = trace["traceEvents"]
+    assert event["name"] == "fill_entry"
+    assert event["ph"] == "X"
+    assert event["ts"] == 1000
+    assert event["dur"] == 2500
+    assert event["args"] == {"student": "Boura, Adam", "task": "Task 1"}
+    assert trace["displayTimeUnit"] == "ms"
@@ -0,0 +1,118 @@
+"""Benchmark the per-call overhead of the sync auto-wait locator proxy.
+
+Wraps a stub locator in the previous `AutoWaitLocator` (closure built on every
+attribute access, explicit `wait_for` before every action) and in the current
+one, then times `click`, `press`, and a pass-through method through both and
+counts the locator calls each `click` makes:
+
+    poetry run python tools/benchmarks/auto_wait_proxy.py --repeat 5
+
+No browser, network access, or EduPage credentials are needed; the stub
+locator isolates the Python proxy cost from Playwright round trips, so each
+saved `wait_for` call is a browser round trip saved in real runs.
+"""
+
+import argparse
+import statistics
+import timeit
+
+from edu_page_automat import scenario_runner
+from edu_page_automat.scenario_runner import (
+    _AUTO_WAIT_ACTION_STATES,
+    _PLAYWRIGHT_AUTO_WAIT_ACTIONS,
+    AutoWaitLocator,
+)
+
+
+class StubLocator:
+    """Locator stand-in that records calls and returns immediately."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def wait_for(self, **kwargs):
+        self.calls += 1
+
+    def click(self, *args, **kwargs):
+        self.calls += 1
+
+    def press(self, *args, **kwargs):
+        self.calls += 1
+
+    def is_visible(self):
+        self.calls += 1
+        return True
+
+
+# The proxy as it was before wrappers were cached: every attribute access runs
+# the `__getattribute__` override and `__getattr__` builds a new closure, and
+# every action first waits explicitly, even when Playwright waits again.
+class LegacyAutoWaitLocator:
+    def __init__(self, locator, timeout):
+        self._locator = locator
+        self._timeout = timeout
+
+    def __getattribute__(self, item):
+        if item == "__class__":
+            locator = object.__getattribute__(self, "_locator")
+            return locator.__class__
+        return object.__getattribute__(self, item)
+
+    def __getattr__(self, item):
+        locator = object.__getattribute__(self, "_locator")
+        attr = getattr(locator, item)
+        if callable(attr):
+            def wrapper(*args, **kwargs):
+                state = _AUTO_WAIT_ACTION_STATES.get(item)
+                if state:
+                    try:
+                        locator.wait_for(state=state, timeout=object.__getattribute__(self, "_timeout"))
+                    except TimeoutError:
+                        if item not in _PLAYWRIGHT_AUTO_WAIT_ACTIONS:
+                            raise
+                result = attr(*args, **kwargs)
+                return scenario_runner._wrap_result(result, object.__getattribute__(self, "_timeout"))
+            return wrapper
+        return attr
+
+
+def _calls_per_click(proxy_class) -> int:
+    locator = StubLocator()
+    proxy_class(locator, 1000).click()
+    return locator.calls
+
+
+def _time_call(proxy, method: str, number: int, repeat: int) -> float:
+    timings = timeit.repeat(lambda: getattr(proxy, method)(), number=number, repeat=repeat)
+    return statistics.median(timings) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000, help="Calls per timing run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per method.")
+    args = parser.parse_args()
+
+    # Keep debug logging out of the timed path.
+    scenario_runner.logger.remove()
+
+    proxies = {
+        "legacy": LegacyAutoWaitLocator(StubLocator(), 1000),
+        "cached": AutoWaitLocator(StubLocator(), 1000),
+    }
+    print(f"{args.number} calls per run, median of {args.repeat} runs")
+    for method in ("click", "press", "is_visible"):
+        timings = {label: _time_call(proxy, method, args.number, args.repeat) for label, proxy in proxies.items()}
+        print(
+            f"{method:<10} legacy {timings['legacy'] * 1e9:7.0f} ns  "
+            f"cached {timings['cached'] * 1e9:7.0f} ns  "
+            f"speedup {timings['legacy'] / timings['cached']:.1f}x"
+        )
+    print(
+        f"locator calls per click: legacy {_calls_per_click(LegacyAutoWaitLocator)}, "
+        f"cached {_calls_per_click(AutoWaitLocator)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark grade CSV ingestion on the captured Google Classroom exports.
+
+Loads every `data/classroom_grades_*.csv` file with the previous
+`csv.DictReader` loader (a dict per row, dialect sniffed on every read) and
+with the current `grade_diff.load_grade_rows` (columns resolved to indices,
+`csv.reader` records, cached dialect), checks that both return the same rows,
+and prints timings:
+
+    poetry run python tools/benchmarks/csv_ingestion.py --repeat 20
+
+No browser, network access, or EduPage credentials are needed.
+"""
+
+import argparse
+import csv
+from pathlib import Path
+import statistics
+import time
+
+from edu_page_automat.grade_diff import (
+    GradeRow,
+    _normalize_points,
+    _split_student_name,
+    _validate_unique_row,
+    load_grade_rows,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+# The Classroom loader as it was before the shared CSV input module: the
+# dialect is sniffed on every read and every record becomes a dict.
+def legacy_load_classroom_rows(csv_path: Path) -> list[GradeRow]:
+    def normalize_header(header: str) -> str:
+        return header.strip().casefold().replace(" ", "_").replace("-", "_")
+
+    def find_header(fieldnames, accepted_names: set[str]) -> str:
+        return next(fieldname for fieldname in fieldnames if normalize_header(fieldname) in accepted_names)
+
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        sample = handle.read(2048)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except (csv.Error, TypeError):
+            dialect = csv.excel
+        reader = csv.DictReader(handle, dialect=dialect)
+        student_header = find_header(reader.fieldnames, {"student"})
+        task_name_header = find_header(reader.fieldnames, {"task"})
+        points_header = find_header(reader.fieldnames, {"points_earned", "points"})
+
+        rows = []
+        seen_keys: set[tuple[str, str, str]] = set()
+        for row_index, row in enumerate(reader, start=2):
+            first_name, last_name = _split_student_name((row.get(student_header) or "").strip(), row_index)
+            grade_row = GradeRow(
+                first_name=first_name,
+                last_name=last_name,
+                task_name=(row.get(task_name_header) or "").strip(),
+                points=_normalize_points(row.get(points_header) or "", row_index, empty_value="m"),
+            )
+            _validate_unique_row(grade_row, row_index, seen_keys)
+            rows.append(grade_row)
+    return rows
+
+
+def _time_loader(loader, csv_path: Path, repeat: int) -> tuple[list[float], list[GradeRow]]:
+    timings = []
+    rows: list[GradeRow] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = loader(csv_path)
+        timings.append(time.perf_counter() - started)
+    return timings, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "data")
+    parser.add_argument("--repeat", type=int, default=10, help="Loads per file and loader.")
+    args = parser.parse_args()
+
+    csv_paths = sorted(args.data_dir.glob("classroom_grades_*.csv"))
+    if not csv_paths:
+        raise SystemExit(f"No classroom_grades_*.csv files in {args.data_dir}")
+
+    for csv_path in csv_paths:
+        legacy_timings, legacy_rows = _time_loader(legacy_load_classroom_rows, csv_path, args.repeat)
+        current_timings, current_rows = _time_loader(load_grade_rows, csv_path, args.repeat)
+        if legacy_rows != current_rows:
+            raise SystemExit(f"{csv_path.name}: loaders returned different rows")
+
+        print(f"{csv_path.name}: {csv_path.stat().st_size / 1024:.0f} KiB, {len(current_rows)} rows")
+        for label, timings in (("dict-reader", legacy_timings), ("indexed", current_timings)):
+            print(f"  {label:<12} median {statistics.median(timings) * 1000:7.2f} ms  min {min(timings) * 1000:7.2f} ms")
+        speedup = statistics.median(legacy_timings) / statistics.median(current_timings)
+        print(f"  speedup      {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
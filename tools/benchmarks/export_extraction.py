@@ -0,0 +1,150 @@
+"""Benchmark the export-grades extraction script against the captured grade page.
+
+Loads `data/znamky.html` (scripts and external resources stripped) into a
+headless Firefox page, runs the previous per-(student, task) lookup script and
+the current single-pass script, checks that both produce the same rows, and
+prints timings and payload sizes:
+
+    poetry run python tools/benchmarks/export_extraction.py --repeat 20
+
+Firefox must be installed (`edupage install-browsers`). No network access is
+needed.
+"""
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "tools" / "fake_edupage"))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+from server import sanitize_captured_page  # noqa: E402
+
+from edu_page_automat.scenarios.export_grades import _GRADE_EXPORT_SCRIPT  # noqa: E402
+
+# The extraction script as it was before the single-pass rewrite: every
+# (student, task) pair scans all grade cells of the student's row.
+LEGACY_EXPORT_SCRIPT = """() => {
+    const normalize = (value) => value.replace(/\\\\s+/g, " ").trim();
+    const gradeValueFromCell = (cell) => {
+        const storedInput = Array.from(cell.querySelectorAll('input[name^="zn_"]'))
+            .find((input) => input.name !== "znamky[]");
+        if (storedInput && storedInput.value) {
+            return storedInput.value;
+        }
+
+        const editableInput = cell.querySelector('input[name^="nzn_"]');
+        if (editableInput && editableInput.value) {
+            return editableInput.value;
+        }
+
+        return normalize(cell.textContent || "");
+    };
+
+    const tasks = Array.from(document.querySelectorAll(".znamkyUdalostHeader"))
+        .map((header) => ({
+            name: normalize(header.querySelector(".znHeaderUdalost")?.textContent || ""),
+            category: normalize(header.querySelector(".znHeaderKategoria")?.textContent || ""),
+            subjectId: header.getAttribute("data-pid"),
+            taskUid: header.getAttribute("data-uid"),
+        }))
+        .filter((task) => task.name && task.subjectId && task.taskUid);
+
+    const rows = [];
+    for (const studentLink of document.querySelectorAll('a[href*="studentid="]')) {
+        const tableRow = studentLink.closest("tr");
+        if (!tableRow) {
+            continue;
+        }
+
+        const studentName = normalize(studentLink.textContent || "");
+        for (const task of tasks) {
+            const gradeCell = Array.from(tableRow.querySelectorAll(".znEditTd"))
+                .find((cell) => (
+                    cell.getAttribute("data-pid") === task.subjectId
+                    && cell.getAttribute("data-uid") === task.taskUid
+                ));
+            if (!gradeCell) {
+                continue;
+            }
+
+            rows.push({
+                studentName,
+                taskCategory: task.category,
+                taskName: task.name,
+                points: gradeValueFromCell(gradeCell),
+            });
+        }
+    }
+
+    return rows;
+}"""
+
+
+def _legacy_rows(payload: list[dict]) -> list[tuple[str, str, str, str]]:
+    """Flatten the legacy per-cell objects into comparable tuples."""
+    return [(row["studentName"], row["taskCategory"], row["taskName"], row["points"]) for row in payload]
+
+
+def _compact_rows(payload: dict) -> list[tuple[str, str, str, str]]:
+    """Expand the compact arrays into the same tuples as `_legacy_rows`."""
+    return [
+        (student, category, name, points)
+        for student, student_points in zip(payload["students"], payload["points"])
+        for (name, category), points in zip(payload["tasks"], student_points)
+        if points is not None
+    ]
+
+
+def _time_script(page, script: str, repeat: int) -> tuple[list[float], object]:
+    """Evaluate `script` `repeat` times and return per-call seconds and the last payload."""
+    timings = []
+    payload = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = page.evaluate(script)
+        timings.append(time.perf_counter() - started)
+    return timings, payload
+
+
+def main() -> None:
+    """Run both extraction scripts and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=Path, default=REPO_ROOT / "data" / "znamky.html")
+    parser.add_argument("--repeat", type=int, default=10, help="Evaluations per script.")
+    args = parser.parse_args()
+
+    html = sanitize_captured_page(args.page.read_text(encoding="utf-8"))
+    with sync_playwright() as playwright:
+        browser = playwright.firefox.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(html, wait_until="domcontentloaded")
+
+        results = {}
+        for label, script, to_rows in (
+            ("legacy", LEGACY_EXPORT_SCRIPT, _legacy_rows),
+            ("single-pass", _GRADE_EXPORT_SCRIPT, _compact_rows),
+        ):
+            timings, payload = _time_script(page, script, args.repeat)
+            results[label] = (timings, len(json.dumps(payload, ensure_ascii=False)), to_rows(payload))
+        browser.close()
+
+    if results["legacy"][2] != results["single-pass"][2]:
+        raise SystemExit("Extraction scripts returned different rows")
+
+    print(f"{args.page.name}: {len(results['legacy'][2])} grade cells, {args.repeat} evaluations per script")
+    for label, (timings, payload_bytes, _) in results.items():
+        print(
+            f"{label:<12} median {statistics.median(timings) * 1000:8.1f} ms  "
+            f"min {min(timings) * 1000:8.1f} ms  payload {payload_bytes / 1024:7.1f} KiB"
+        )
+    speedup = statistics.median(results["legacy"][0]) / statistics.median(results["single-pass"][0])
+    print(f"speedup      {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark the memory and key cost of grade rows on a large synthetic export.
+
+Writes a current and a truth EduPage-style grade CSV with `--students` times
+`--tasks` rows to a temporary directory, loads both with the previous row type
+(a dict-backed frozen dataclass whose `key` property builds a new tuple on
+every access, names kept as separate strings per row) and with the current
+slotted `GradeRow` (interned names, key built once), then prints the memory
+held by the loaded rows and the time of the key lookups `diff_grade_rows` makes:
+
+    poetry run python tools/benchmarks/grade_rows.py --students 2000 --tasks 50
+
+No browser, network access, or EduPage credentials are needed.
+"""
+
+import argparse
+import csv
+from dataclasses import dataclass
+import gc
+from pathlib import Path
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from edu_page_automat.csv_input import (
+    FIRST_NAME_HEADERS,
+    LAST_NAME_HEADERS,
+    POINTS_HEADERS,
+    TASK_NAME_HEADERS,
+    open_csv,
+)
+from edu_page_automat.grade_diff import EDUPAGE_DIFF_HEADERS, GradeRow
+
+
+# The row type as it was before slots and interning.
+@dataclass(frozen=True)
+class LegacyGradeRow:
+    first_name: str
+    last_name: str
+    task_name: str
+    points: str
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return (self.first_name, self.last_name, self.task_name)
+
+
+def _write_export(csv_path: Path, students: int, tasks: int, offset: int) -> None:
+    with csv_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(EDUPAGE_DIFF_HEADERS)
+        for student in range(students):
+            for task in range(tasks):
+                points = (student * 7 + task * 3 + offset) % 11 * 10
+                writer.writerow([f"Student{student}", f"Surname{student}", f"Task {task:03d}", points])
+
+
+def _load_rows(csv_path: Path, row_type) -> list:
+    with open_csv(csv_path) as reader:
+        columns = (
+            reader.column(FIRST_NAME_HEADERS, "first name"),
+            reader.column(LAST_NAME_HEADERS, "last name"),
+            reader.column(TASK_NAME_HEADERS, "task name"),
+            reader.column(POINTS_HEADERS, "points"),
+        )
+        return [row_type(*values) for _, values in reader.records(*columns)]
+
+
+def _loaded_size(csv_path: Path, row_type) -> tuple[int, list]:
+    """Return the bytes still allocated by the loaded rows and the rows themselves."""
+    gc.collect()
+    tracemalloc.start()
+    rows = _load_rows(csv_path, row_type)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, rows
+
+
+def _diff_keys(current_rows: list, truth_rows: list) -> int:
+    """Run the key work of `diff_grade_rows`: index, key set, and one lookup per truth row."""
+    current_by_key = {row.key: row for row in current_rows}
+    truth_keys = {row.key for row in truth_rows}
+    matched = sum(current_by_key.get(row.key) is not None for row in truth_rows)
+    return matched + len(truth_keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per row type.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="grade-rows-benchmark-") as tmp_dir:
+        current_csv = Path(tmp_dir) / "current.csv"
+        truth_csv = Path(tmp_dir) / "truth.csv"
+        _write_export(current_csv, args.students, args.tasks, offset=0)
+        _write_export(truth_csv, args.students, args.tasks, offset=1)
+        print(f"{args.students * args.tasks} rows per file")
+
+        results = {}
+        for label, row_type in (("legacy", LegacyGradeRow), ("slotted", GradeRow)):
+            size, current_rows = _loaded_size(current_csv, row_type)
+            truth_rows = _load_rows(truth_csv, row_type)
+            load_timings = []
+            diff_timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                _load_rows(truth_csv, row_type)
+                load_timings.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                _diff_keys(current_rows, truth_rows)
+                diff_timings.append(time.perf_counter() - started)
+            results[label] = (size, statistics.median(load_timings), statistics.median(diff_timings))
+            print(
+                f"  {label:<8} rows {size / 2**20:6.1f} MiB  load median {results[label][1] * 1000:7.1f} ms  "
+                f"key diff median {results[label][2] * 1000:7.1f} ms"
+            )
+
+        legacy, slotted = results["legacy"], results["slotted"]
+        print(
+            f"  memory {legacy[0] / slotted[0]:.2f}x smaller, load {legacy[1] / slotted[1]:.2f}x, "
+            f"key diff {legacy[2] / slotted[2]:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""End-to-end scenario latency benchmark against the local fake EduPage server.
+
+Runs `export-grades`, `fill-grades`, and `create-task` through the normal
+scenario runner, with an isolated auth file that is already logged in to the
+fake server, and prints wall-clock timings per scenario:
+
+    poetry run python tools/fake_edupage/benchmark.py --repeat 5
+
+Firefox must be installed (`edupage install-browsers`). No network access is
+needed.
+"""
+
+import argparse
+import csv
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from server import start_fake_edupage  # noqa: E402
+
+BENCHMARK_CLASS = "2.png"
+BENCHMARK_SUBJECT = "Informatika"
+SCENARIO_NAMES = ("export-grades", "fill-grades", "create-task")
+
+
+def _empty_grade_cells(export_csv: Path, limit: int) -> list[dict[str, str]]:
+    """Return exported rows for empty cells in categorized tasks, used as fill targets."""
+    with export_csv.open("r", encoding="utf-8", newline="") as handle:
+        rows = [row for row in csv.DictReader(handle) if row["task_category"] and not row["points"]]
+    return rows[:limit]
+
+
+def _build_scenarios(work_dir: Path, fill_count: int):
+    """Return scenario factories keyed by CLI command name."""
+    from edu_page_automat.scenarios.create_task import CreateTaskScenario, TaskDefinition
+    from edu_page_automat.scenarios.export_grades import ExportGradesScenario
+    from edu_page_automat.scenarios.fill_grades import FillGradesScenario, GradeEntry
+
+    export_csv = work_dir / "export.csv"
+
+    def export_grades():
+        return ExportGradesScenario(BENCHMARK_CLASS, export_csv, subject=BENCHMARK_SUBJECT)
+
+    def fill_grades():
+        if not export_csv.exists():
+            raise RuntimeError("fill-grades needs the export-grades benchmark to run first")
+        entries = [
+            GradeEntry(row["first_name"], row["last_name"], row["task_name"], 1)
+            for row in _empty_grade_cells(export_csv, fill_count)
+        ]
+        return FillGradesScenario(BENCHMARK_CLASS, entries, subject=BENCHMARK_SUBJECT)
+
+    def create_task():
+        return CreateTaskScenario(
+            BENCHMARK_CLASS,
+            [TaskDefinition(name="Benchmark task", points=10)],
+            subject=BENCHMARK_SUBJECT,
+        )
+
+    return {"export-grades": export_grades, "fill-grades": fill_grades, "create-task": create_task}
+
+
+def main() -> None:
+    """Start the fake server, run the selected scenarios, and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIO_NAMES,
+        help="Scenario to benchmark. Repeat for several; defaults to all.",
+    )
+    parser.add_argument("--fill-count", type=int, default=20, help="Grade cells filled per fill-grades run.")
+    parser.add_argument("--profile", default="fast", help="Execution profile used for the browser.")
+    args = parser.parse_args()
+
+    server = start_fake_edupage()
+    with tempfile.TemporaryDirectory(prefix="edupage-benchmark-") as temp_dir:
+        work_dir = Path(temp_dir)
+        auth_file = work_dir / "auth.json"
+        auth_file.write_text(json.dumps(server.storage_state()), encoding="utf-8")
+        os.environ["EDUPAGE_AUTH_FILE"] = str(auth_file)
+        os.environ["EDUPAGE_URL"] = server.base_url
+        os.environ["EDUPAGE_PROFILE"] = args.profile
+
+        from edu_page_automat.scenario_runner import run_scenario
+
+        factories = _build_scenarios(work_dir, args.fill_count)
+        selected = args.scenario or list(SCENARIO_NAMES)
+        if "fill-grades" in selected and "export-grades" not in selected:
+            run_scenario(factories["export-grades"])
+
+        print(f"Fake EduPage at {server.base_url}, profile {args.profile}, {args.repeat} runs per scenario")
+        try:
+            for name in selected:
+                timings = []
+                for _ in range(args.repeat):
+                    server.reset()
+                    started = time.perf_counter()
+                    run_scenario(factories[name])
+                    timings.append(time.perf_counter() - started)
+                print(
+                    f"{name:<14} min {min(timings):7.3f}s  median {statistics.median(timings):7.3f}s  "
+                    f"max {max(timings):7.3f}s"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""Local stand-in for the EduPage pages driven by the automation scenarios.
+
+This server is a development tool, not part of the packaged CLI. It serves the
+captured grade pages from `data/` behind a minimal course switcher, a new-task
+form, and save endpoints so `create-task`, `fill-grades`, and `export-grades`
+can run end to end without network access. Point the CLI at it with
+`--base-url` or `EDUPAGE_URL`:
+
+    python tools/fake_edupage/server.py --port 8765
+    EDUPAGE_URL=http://127.0.0.1:8765/ edupage --profile fast export-grades --class 2.png --output-csv out.csv
+
+Requests to the user and grade pages need the `PHPSESSID` cookie from
+`storage_state()`; without it the server redirects to `/login/` like a logged
+out EduPage session.
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from html import escape
+from http import HTTPStatus
+from http.cookies import CookieError, SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import re
+import threading
+from urllib.parse import parse_qs, quote, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = REPO_ROOT / "data"
+SESSION_COOKIE_NAME = "PHPSESSID"
+SESSION_COOKIE_VALUE = "fake-edupage-session"
+FIRST_CREATED_TASK_UID = 900000
+
+_SCRIPT_PATTERN = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+_LINK_PATTERN = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_STATIC_HOST_PATTERN = re.compile(r"(?:https?:)?//static\.edupage\.org")
+_SUBJECT_ID_PATTERN = re.compile(r'class="znamkyUdalostHeader[^"]*"[^>]*data-pid="(-?\d+)"')
+_GRADE_MODULE_HREF = 'href="/znamky/?"'
+
+_FAKE_CONTROLS = """
+<div class="fakeCourseList" hidden>{courses}</div>
+<div class="fakeSaveDialog" role="dialog" hidden>
+  <p>Uložit změny?</p>
+  <button type="button" class="fakeSaveConfirm">Uložit</button>
+</div>
+<div class="fakeTaskDialog" role="dialog" hidden>
+  <label>Název <input type="text" name="p_meno"></label>
+  <label>Kategorie <select name="kategoriaid"></select></label>
+  <label>Počet bodů <input type="number" name="p_body" min="0"></label>
+  <button type="button" class="fakeTaskSave">Uložit</button>
+</div>
+<div class="fakeCreatedTasks">{created_tasks}</div>
+"""
+
+_FAKE_SCRIPT = """<script>
+(() => {
+    const courseId = new URLSearchParams(window.location.search).get("course") || "";
+    const post = (path, payload) => fetch(`${path}?course=${encodeURIComponent(courseId)}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(payload),
+    });
+
+    const saveGrades = async () => {
+        const grades = {};
+        for (const editor of document.querySelectorAll('[name^="nzn_"]')) {
+            if (editor.value) {
+                grades[editor.name.slice(1)] = editor.value;
+            }
+        }
+        const response = await post("/znamky/save", { grades });
+        if (!response.ok) {
+            return;
+        }
+        for (const [name, value] of Object.entries(grades)) {
+            const stored = document.getElementsByName(name)[0];
+            if (stored) {
+                stored.value = value;
+            }
+            const editor = document.getElementsByName(`n${name}`)[0];
+            if (editor) {
+                editor.value = "";
+            }
+        }
+        document.querySelector(".fakeSaveDialog").hidden = true;
+    };
+
+    const openTaskForm = () => {
+        const select = document.querySelector('.fakeTaskDialog select[name="kategoriaid"]');
+        if (!select.options.length) {
+            const categories = new Set(
+                Array.from(document.querySelectorAll(".znHeaderKategoria"), (node) => node.textContent.trim())
+                    .filter(Boolean)
+            );
+            for (const category of categories) {
+                select.add(new Option(category, category));
+            }
+        }
+        document.querySelector(".fakeTaskDialog").hidden = false;
+    };
+
+    const saveTask = async () => {
+        const dialog = document.querySelector(".fakeTaskDialog");
+        const nameField = dialog.querySelector('[name="p_meno"]');
+        const categoryField = dialog.querySelector('[name="kategoriaid"]');
+        const pointsField = dialog.querySelector('[name="p_body"]');
+        const response = await post("/znamky/task", {
+            name: nameField.value,
+            category: categoryField.value,
+            points: pointsField.value,
+        });
+        if (!response.ok) {
+            return;
+        }
+        const task = await response.json();
+        document.querySelector(".fakeCreatedTasks").insertAdjacentHTML("beforeend", task.header);
+        nameField.value = "";
+        pointsField.value = "";
+        dialog.hidden = true;
+    };
+
+    document.addEventListener("click", (event) => {
+        const target = event.target instanceof Element ? event.target : null;
+        if (!target) {
+            return;
+        }
+        if (target.closest(".edubarCourseListBtn")) {
+            document.querySelector(".fakeCourseList").hidden = false;
+            return;
+        }
+        const course = target.closest(".fakeCourseList .ecourse-standards-subject-title");
+        if (course) {
+            window.location.href = `/user/?course=${encodeURIComponent(course.dataset.course)}`;
+            return;
+        }
+        if (target.closest("a.ulozitBtn")) {
+            document.querySelector(".fakeSaveDialog").hidden = false;
+        } else if (target.closest(".fakeSaveConfirm")) {
+            saveGrades();
+        } else if (target.closest("a.udalostBtn")) {
+            openTaskForm();
+        } else if (target.closest(".fakeTaskSave")) {
+            saveTask();
+        }
+    });
+})();
+</script>"""
+
+_USER_PAGE = """<!DOCTYPE html>
+<html lang="cs"><head><meta charset="utf-8"><title>EduPage</title></head>
+<body>
+<div id="edubar">
+  <a class="edubarCourseListBtn edubarCourseModuleLink" data-module="courses" tabindex="0" role="button">{course_label}</a>
+  {grade_module_link}
+</div>
+{controls}
+{script}
+</body></html>
+"""
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html lang="cs"><head><meta charset="utf-8"><title>EduPage login</title></head>
+<body><p>Fake EduPage login. Open <a href="/fake/login">/fake/login</a> to start a session.</p></body></html>
+"""
+
+
+@dataclass(frozen=True)
+class FakeCourse:
+    """One class/subject pair served from a captured grade page."""
+
+    course_id: str
+    class_name: str
+    subject: str
+    grades_page: Path
+
+
+DEFAULT_COURSES = (
+    FakeCourse("1", "2.png", "Informatika", DATA_DIR / "znamky.html"),
+    FakeCourse("2", "3.cpu", "Informatika", DATA_DIR / "znamky_rewrite.html"),
+)
+
+
+@dataclass
+class CourseState:
+    """Grades and tasks saved through the fake endpoints for one course."""
+
+    grades: dict[str, str] = field(default_factory=dict)
+    tasks: list[dict[str, str]] = field(default_factory=list)
+
+
+def sanitize_captured_page(html: str) -> str:
+    """Strip scripts and external resources from a captured EduPage page."""
+    html = _SCRIPT_PATTERN.sub("", html)
+    html = _LINK_PATTERN.sub("", html)
+    return _STATIC_HOST_PATTERN.sub("", html)
+
+
+def _render_task_header(task: dict[str, str]) -> str:
+    """Render a grade-table task header for a task created through the fake form."""
+    return (
+        f'<div class="znamkyUdalostHeader znUdalostHeader" data-uid="{escape(task["uid"])}" '
+        f'data-provider="edupage" data-pid="{escape(task["pid"])}">'
+        f'<div class="znHeaderKategoria">{escape(task["category"])}</div>'
+        f'<div class="znHeaderUdalost">{escape(task["name"])}</div>'
+        f'<div class="znHeaderUdalostSubtitle"><span>{escape(task["points"])}b</span></div></div>'
+    )
+
+
+class FakeEduPageServer(ThreadingHTTPServer):
+    """HTTP server holding the fake course catalogue and everything saved to it."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], courses=DEFAULT_COURSES, verbose: bool = False):
+        """Bind the server and index the served courses."""
+        super().__init__(address, FakeEduPageHandler)
+        self.courses = {course.course_id: course for course in courses}
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self._pages: dict[str, str] = {}
+        self._state: dict[str, CourseState] = {}
+        self._next_task_uid = FIRST_CREATED_TASK_UID
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to use as `EDUPAGE_URL`."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def storage_state(self) -> dict:
+        """Return a Playwright storage state that is logged in to this server."""
+        host = self.server_address[0]
+        return {
+            "cookies": [
+                {
+                    "name": SESSION_COOKIE_NAME,
+                    "value": SESSION_COOKIE_VALUE,
+                    "domain": host,
+                    "path": "/",
+                    "expires": -1,
+                    "httpOnly": True,
+                    "secure": False,
+                    "sameSite": "Lax",
+                }
+            ],
+            "origins": [],
+        }
+
+    def reset(self) -> None:
+        """Forget every saved grade and created task."""
+        with self.lock:
+            self._state.clear()
+            self._next_task_uid = FIRST_CREATED_TASK_UID
+
+    def snapshot(self) -> dict:
+        """Return saved grades and created tasks per course as JSON-ready data."""
+        with self.lock:
+            return {
+                course_id: {"grades": dict(state.grades), "tasks": list(state.tasks)}
+                for course_id, state in self._state.items()
+            }
+
+    def save_grades(self, course_id: str, grades: dict[str, str]) -> int:
+        """Store submitted grade values for a course."""
+        with self.lock:
+            self._state.setdefault(course_id, CourseState()).grades.update(grades)
+        return len(grades)
+
+    def create_task(self, course_id: str, name: str, category: str, points: str) -> dict[str, str]:
+        """Store a task created through the new-task form and return its header data."""
+        subject_id = _SUBJECT_ID_PATTERN.search(self._captured_page(course_id))
+        with self.lock:
+            task = {
+                "uid": str(self._next_task_uid),
+                "pid": subject_id.group(1) if subject_id else "0",
+                "name": name,
+                "category": category,
+                "points": points,
+            }
+            self._next_task_uid += 1
+            self._state.setdefault(course_id, CourseState()).tasks.append(task)
+        return task
+
+    def render_user_page(self, course_id: str | None) -> str:
+        """Render the signed-in landing page with the course switcher."""
+        course = self.courses.get(course_id or "")
+        grade_module_link = ""
+        course_label = "Moje předměty"
+        if course is not None:
+            course_label = f"<b>{escape(course.class_name)} <br> {escape(course.subject)}</b>"
+            grade_module_link = (
+                f'<a href="/znamky/?course={quote(course.course_id)}" class="edubarCourseModuleLink" '
+                'data-module="znamky" tabindex="0" role="button"><span>Známky</span></a>'
+            )
+        return _USER_PAGE.format(
+            course_label=course_label,
+            grade_module_link=grade_module_link,
+            controls=self._render_controls(course_id),
+            script=_FAKE_SCRIPT,
+        )
+
+    def render_grade_page(self, course_id: str) -> str:
+        """Render a captured grade page with saved values and fake controls applied."""
+        html = self._captured_page(course_id).replace(_GRADE_MODULE_HREF, f'href="/znamky/?course={quote(course_id)}"')
+        with self.lock:
+            grades = dict(self._state.get(course_id, CourseState()).grades)
+        for name, value in grades.items():
+            html = re.sub(
+                rf'(<input type="hidden" name="{re.escape(name)}" value=")[^"]*(")',
+                lambda match: f"{match.group(1)}{escape(value)}{match.group(2)}",
+                html,
+            )
+        extra = self._render_controls(course_id) + _FAKE_SCRIPT
+        body_end = html.rfind("</body>")
+        if body_end == -1:
+            return html + extra
+        return html[:body_end] + extra + html[body_end:]
+
+    def _render_controls(self, course_id: str | None) -> str:
+        """Render the course list, dialogs, and created task headers."""
+        courses = "".join(
+            f'<div class="ecourse-standards-subject-title" data-course="{escape(course.course_id)}">'
+            f'<div class="className">{escape(course.class_name)}</div>'
+            f'<div class="subjectName">{escape(course.subject)}</div></div>'
+            for course in self.courses.values()
+        )
+        with self.lock:
+            tasks = list(self._state.get(course_id or "", CourseState()).tasks)
+        return _FAKE_CONTROLS.format(courses=courses, created_tasks="".join(_render_task_header(task) for task in tasks))
+
+    def _captured_page(self, course_id: str) -> str:
+        """Return the sanitized captured grade page for a course, reading it once."""
+        page = self._pages.get(course_id)
+        if page is None:
+            raw_page = self.courses[course_id].grades_page.read_text(encoding="utf-8")
+            page = self._pages[course_id] = sanitize_captured_page(raw_page)
+        return page
+
+
+class FakeEduPageHandler(BaseHTTPRequestHandler):
+    """Route the handful of EduPage URLs the scenarios use."""
+
+    server: FakeEduPageServer
+
+    def do_GET(self):
+        """Serve pages and the saved-state snapshot."""
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        course_id = query.get("course", [None])[0]
+
+        if url.path == "/fake/state":
+            self._send_json(self.server.snapshot())
+        elif url.path == "/fake/login":
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE_NAME}={SESSION_COOKIE_VALUE}; Path=/; HttpOnly")
+            self.send_header("Location", "/user/")
+            self.end_headers()
+        elif url.path in {"/", "/login/"}:
+            self._send_html(_LOGIN_PAGE)
+        elif not self._has_session():
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header("Location", f"/login/?next={quote(url.path)}")
+            self.end_headers()
+        elif url.path == "/user/":
+            self._send_html(self.server.render_user_page(course_id))
+        elif url.path == "/znamky/" and course_id in self.server.courses:
+            self._send_html(self.server.render_grade_page(course_id))
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):
+        """Accept grade saves, task creation, and state resets."""
+        url = urlsplit(self.path)
+        course_id = parse_qs(url.query).get("course", [""])[0]
+        if url.path == "/fake/reset":
+            self.server.reset()
+            self._send_json({"reset": True})
+            return
+        if not self._has_session():
+            self.send_error(HTTPStatus.FORBIDDEN)
+            return
+        if course_id not in self.server.courses:
+            self.send_error(HTTPStatus.NOT_FOUND, "Unknown course")
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self.send_error(HTTPStatus.BAD_REQUEST, "Invalid JSON")
+            return
+
+        if url.path == "/znamky/save":
+            grades = {
+                str(name): str(value)
+                for name, value in payload.get("grades", {}).items()
+                if str(name).startswith("zn_")
+            }
+            self._send_json({"saved": self.server.save_grades(course_id, grades)})
+        elif url.path == "/znamky/task":
+            name = str(payload.get("name", "")).strip()
+            if not name:
+                self.send_error(HTTPStatus.BAD_REQUEST, "Missing task name")
+                return
+            task = self.server.create_task(
+                course_id,
+                name,
+                str(payload.get("category", "")),
+                str(payload.get("points", "")),
+            )
+            self._send_json({**task, "header": _render_task_header(task)})
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def log_message(self, format, *args):
+        """Log requests only when the server runs in verbose mode."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _has_session(self) -> bool:
+        """Return whether the request carries the fake session cookie."""
+        cookie = SimpleCookie()
+        try:
+            cookie.load(self.headers.get("Cookie", ""))
+        except CookieError:
+            return False
+        morsel = cookie.get(SESSION_COOKIE_NAME)
+        return morsel is not None and morsel.value == SESSION_COOKIE_VALUE
+
+    def _send_html(self, html: str) -> None:
+        """Send an HTML response."""
+        self._send_body(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_json(self, payload) -> None:
+        """Send a JSON response."""
+        self._send_body(json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _send_body(self, body: bytes, content_type: str) -> None:
+        """Send a complete 200 response."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fake_edupage(host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> FakeEduPageServer:
+    """Start the fake server in a daemon thread and return it; call `shutdown()` to stop."""
+    server = FakeEduPageServer((host, port), verbose=verbose)
+    threading.Thread(target=server.serve_forever, name="fake-edupage", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--storage-state", type=Path, help="Write a logged-in Playwright storage state to this path.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    server = FakeEduPageServer((args.host, args.port), verbose=args.verbose)
+    if args.storage_state:
+        args.storage_state.parent.mkdir(parents=True, exist_ok=True)
+        args.storage_state.write_text(json.dumps(server.storage_state()), encoding="utf-8")
+        print(f"Storage state written to {args.storage_state}")
+    print(f"Fake EduPage listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()